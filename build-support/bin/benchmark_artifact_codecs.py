@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Compare the artifact cache codecs' throughput and compression ratio on a directory.
+
+Run with e.g. `./pants run build-support/bin:benchmark_artifact_codecs -- .pants.d/compile/zinc`.
+"""
+
+import argparse
+import os
+import time
+from typing import List, Tuple
+
+from pants.cache.artifact import TarballArtifact
+from pants.cache.artifact_codec import CODECS
+from pants.util.contextutil import temporary_dir
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    root = os.path.realpath(args.directory)
+    input_bytes = directory_size(root)
+    if not input_bytes:
+        raise SystemExit(f"No files found under {root}.")
+
+    print(f"Benchmarking {input_bytes / 2 ** 20:.1f} MiB under {root}, best of {args.runs} runs.\n")
+    print(
+        f"{'codec':<6} {'level':>5} {'ratio':>7} {'compress MiB/s':>15} {'extract MiB/s':>14}"
+    )
+    for name in args.codecs:
+        for level in args.levels:
+            ratio, compress_secs, extract_secs = benchmark(root, name, level, args.runs)
+            print(
+                f"{name:<6} {level:>5} {ratio:>7.2f} "
+                f"{input_bytes / 2 ** 20 / compress_secs:>15.1f} "
+                f"{input_bytes / 2 ** 20 / extract_secs:>14.1f}"
+            )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", help="The directory to collect into artifacts.")
+    parser.add_argument(
+        "--codecs", nargs="+", choices=sorted(CODECS), default=sorted(CODECS),
+    )
+    parser.add_argument("--levels", nargs="+", type=int, default=[1, 5, 9])
+    parser.add_argument("--runs", type=int, default=3)
+    return parser
+
+
+def directory_size(root: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dirpath, filename))
+        for dirpath, _, filenames in os.walk(root)
+        for filename in filenames
+    )
+
+
+def benchmark(root: str, codec_name: str, level: int, runs: int) -> Tuple[float, float, float]:
+    """Return the compression ratio, and the best compression and extraction times in seconds.
+
+    Extraction goes through `TarballArtifact.extract_stream` for every codec, so that the codecs are
+    compared without the native gzip extractor, which requires an engine.
+    """
+    compress_times: List[float] = []
+    extract_times: List[float] = []
+    with temporary_dir() as tmpdir:
+        tarball = os.path.join(tmpdir, "artifact.tar")
+        extraction_root = os.path.join(tmpdir, "extracted")
+        for _ in range(runs):
+            artifact = TarballArtifact(
+                os.path.dirname(root),
+                extraction_root,
+                tarball,
+                compression=level,
+                codec=CODECS[codec_name],
+            )
+            start = time.perf_counter()
+            artifact.collect([root])
+            compress_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with open(tarball, "rb") as fp:
+                artifact.extract_stream(fp)
+            extract_times.append(time.perf_counter() - start)
+        ratio = directory_size(root) / os.path.getsize(tarball)
+    return ratio, min(compress_times), min(extract_times)
+
+
+if __name__ == "__main__":
+    main()
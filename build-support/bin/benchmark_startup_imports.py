@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Measure how long Pants takes to load its backends and plugins and to parse options at startup.
+
+Each command line is measured in a fresh interpreter, using the config of the current buildroot,
+so that the full set of backends it enables is loaded.
+
+Run with e.g. `./pants run build-support/bin:benchmark_startup_imports -- 'list ::' help`.
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+from typing import List, Tuple
+
+_CHILD = """\
+import sys
+import time
+
+start = time.perf_counter()
+from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
+from pants.option.options_bootstrapper import OptionsBootstrapper
+
+options_bootstrapper = OptionsBootstrapper.create(args=sys.argv[1:])
+build_config = BuildConfigInitializer.get(options_bootstrapper)
+OptionsInitializer.create(options_bootstrapper, build_config)
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    print(f"Benchmarking startup in {os.getcwd()}, best of {args.runs} runs.\n")
+    print(f"{'command':<30} {'secs':>7} {'modules':>8}")
+    for command in args.commands:
+        secs, modules = benchmark(shlex.split(command), args.runs)
+        print(f"{command:<30} {secs:>7.2f} {modules:>8}")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "commands",
+        nargs="*",
+        default=["list ::", "compile ::", "help"],
+        help="Pants command lines (without `./pants`) to measure.",
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    return parser
+
+
+def benchmark(command: List[str], runs: int) -> Tuple[float, int]:
+    """Return the best time in seconds to load backends and options, and the modules imported."""
+    # The child interpreter can't otherwise see our sources when we're run from a pex.
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _CHILD, "./pants", *command],
+            env=env,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        secs, modules = output.decode().split()[-2:]
+        results.append((float(secs), int(modules)))
+    return min(results)
+
+
+if __name__ == "__main__":
+    main()
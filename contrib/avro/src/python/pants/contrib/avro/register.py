@@ -8,14 +8,19 @@ from pants.goal.task_registrar import TaskRegistrar as task
 
 from pants.contrib.avro.rules.targets import JavaAvroLibrary
 from pants.contrib.avro.targets.java_avro_library import JavaAvroLibrary as JavaAvroLibraryV1
-from pants.contrib.avro.tasks.avro_gen import AvroJavaGenTask
 
 
 def build_file_aliases():
     return BuildFileAliases(targets={JavaAvroLibraryV1.alias(): JavaAvroLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.contrib.avro.tasks.avro_gen import AvroJavaGenTask
+
     task(name="avro-java", action=AvroJavaGenTask).install("gen")
 
 
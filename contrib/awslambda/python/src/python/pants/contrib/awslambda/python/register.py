@@ -10,15 +10,20 @@ from pants.contrib.awslambda.python.rules.targets import PythonAWSLambda
 from pants.contrib.awslambda.python.targets.python_awslambda import (
     PythonAWSLambda as PythonAWSLambdaV1,
 )
-from pants.contrib.awslambda.python.tasks.lambdex_prep import LambdexPrep
-from pants.contrib.awslambda.python.tasks.lambdex_run import LambdexRun
 
 
 def build_file_aliases():
     return BuildFileAliases(targets={"python_awslambda": PythonAWSLambdaV1})
 
 
+def registered_goals():
+    return ("bundle",)
+
+
 def register_goals():
+    from pants.contrib.awslambda.python.tasks.lambdex_prep import LambdexPrep
+    from pants.contrib.awslambda.python.tasks.lambdex_run import LambdexRun
+
     task(name="lambdex-prep", action=LambdexPrep).install("bundle")
     task(name="lambdex-run", action=LambdexRun).install("bundle")
 
@@ -5,10 +5,14 @@
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.buildrefactor.buildozer import Buildozer
-from pants.contrib.buildrefactor.meta_rename import MetaRename
+
+def registered_goals():
+    return ("buildozer", "meta-rename")
 
 
 def register_goals():
+    from pants.contrib.buildrefactor.buildozer import Buildozer
+    from pants.contrib.buildrefactor.meta_rename import MetaRename
+
     task(name="buildozer", action=Buildozer).install("buildozer")
     task(name="meta-rename", action=MetaRename).install("meta-rename")
@@ -8,12 +8,16 @@ See https://www.kythe.io.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.codeanalysis.tasks.bundle_entries import BundleEntries
-from pants.contrib.codeanalysis.tasks.extract_java import ExtractJava
-from pants.contrib.codeanalysis.tasks.index_java import IndexJava
+
+def registered_goals():
+    return ("index",)
 
 
 def register_goals():
+    from pants.contrib.codeanalysis.tasks.bundle_entries import BundleEntries
+    from pants.contrib.codeanalysis.tasks.extract_java import ExtractJava
+    from pants.contrib.codeanalysis.tasks.index_java import IndexJava
+
     task(name="kythe-java-extract", action=ExtractJava).install("index")
     task(name="kythe-java-index", action=IndexJava).install("index")
     task(name="bundle-entries", action=BundleEntries).install("index")
@@ -8,8 +8,12 @@ See https://www.atlassian.com/software/confluence.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.confluence.tasks.confluence_publish import ConfluencePublish
+
+def registered_goals():
+    return ("confluence",)
 
 
 def register_goals():
+    from pants.contrib.confluence.tasks.confluence_publish import ConfluencePublish
+
     task(name="confluence", action=ConfluencePublish).install()
@@ -10,17 +10,22 @@ from pants.goal.task_registrar import TaskRegistrar as task
 from pants.contrib.cpp.rules.targets import CppBinary, CppLibrary
 from pants.contrib.cpp.targets.cpp_binary import CppBinary as CppBinaryV1
 from pants.contrib.cpp.targets.cpp_library import CppLibrary as CppLibraryV1
-from pants.contrib.cpp.tasks.cpp_binary_create import CppBinaryCreate
-from pants.contrib.cpp.tasks.cpp_compile import CppCompile
-from pants.contrib.cpp.tasks.cpp_library_create import CppLibraryCreate
-from pants.contrib.cpp.tasks.cpp_run import CppRun
 
 
 def build_file_aliases():
     return BuildFileAliases(targets={"cpp_library": CppLibraryV1, "cpp_binary": CppBinaryV1})
 
 
+def registered_goals():
+    return ("compile", "binary", "run")
+
+
 def register_goals():
+    from pants.contrib.cpp.tasks.cpp_binary_create import CppBinaryCreate
+    from pants.contrib.cpp.tasks.cpp_compile import CppCompile
+    from pants.contrib.cpp.tasks.cpp_library_create import CppLibraryCreate
+    from pants.contrib.cpp.tasks.cpp_run import CppRun
+
     task(name="cpp", action=CppCompile).install("compile")
     task(name="cpplib", action=CppLibraryCreate).install("binary")
     task(name="cpp", action=CppBinaryCreate).install("binary")
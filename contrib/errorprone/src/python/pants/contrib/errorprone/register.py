@@ -8,8 +8,12 @@ See https://errorprone.info.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.errorprone.tasks.errorprone import ErrorProne
+
+def registered_goals():
+    return ("compile",)
 
 
 def register_goals():
+    from pants.contrib.errorprone.tasks.errorprone import ErrorProne
+
     task(name="errorprone", action=ErrorProne).install("compile")
@@ -8,8 +8,12 @@ See http://findbugs.sourceforge.net.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.findbugs.tasks.findbugs import FindBugs
+
+def registered_goals():
+    return ("compile",)
 
 
 def register_goals():
+    from pants.contrib.findbugs.tasks.findbugs import FindBugs
+
     task(name="findbugs", action=FindBugs).install("compile")
@@ -19,17 +19,6 @@ from pants.contrib.go.targets.go_library import GoLibrary as GoLibraryV1
 from pants.contrib.go.targets.go_protobuf_library import GoProtobufLibrary as GoProtobufLibraryV1
 from pants.contrib.go.targets.go_remote_library import GoRemoteLibrary as GoRemoteLibraryV1
 from pants.contrib.go.targets.go_thrift_library import GoThriftLibrary as GoThriftLibraryV1
-from pants.contrib.go.tasks.go_binary_create import GoBinaryCreate
-from pants.contrib.go.tasks.go_buildgen import GoBuildgen
-from pants.contrib.go.tasks.go_checkstyle import GoCheckstyle
-from pants.contrib.go.tasks.go_compile import GoCompile
-from pants.contrib.go.tasks.go_fetch import GoFetch
-from pants.contrib.go.tasks.go_fmt import GoFmt
-from pants.contrib.go.tasks.go_go import GoEnv, GoGo
-from pants.contrib.go.tasks.go_protobuf_gen import GoProtobufGen
-from pants.contrib.go.tasks.go_run import GoRun
-from pants.contrib.go.tasks.go_test import GoTest
-from pants.contrib.go.tasks.go_thrift_gen import GoThriftGen
 
 
 def build_file_aliases():
@@ -49,7 +38,35 @@ def build_file_aliases():
     )
 
 
+def registered_goals():
+    return (
+        "gen",
+        "buildgen",
+        "go",
+        "go-env",
+        "resolve",
+        "compile",
+        "binary",
+        "run",
+        "lint",
+        "test",
+        "fmt",
+    )
+
+
 def register_goals():
+    from pants.contrib.go.tasks.go_binary_create import GoBinaryCreate
+    from pants.contrib.go.tasks.go_buildgen import GoBuildgen
+    from pants.contrib.go.tasks.go_checkstyle import GoCheckstyle
+    from pants.contrib.go.tasks.go_compile import GoCompile
+    from pants.contrib.go.tasks.go_fetch import GoFetch
+    from pants.contrib.go.tasks.go_fmt import GoFmt
+    from pants.contrib.go.tasks.go_go import GoEnv, GoGo
+    from pants.contrib.go.tasks.go_protobuf_gen import GoProtobufGen
+    from pants.contrib.go.tasks.go_run import GoRun
+    from pants.contrib.go.tasks.go_test import GoTest
+    from pants.contrib.go.tasks.go_thrift_gen import GoThriftGen
+
     task(name="go-thrift", action=GoThriftGen).install("gen")
     task(name="go-protobuf", action=GoProtobufGen).install("gen")
     task(name="go", action=GoBuildgen).install("buildgen")
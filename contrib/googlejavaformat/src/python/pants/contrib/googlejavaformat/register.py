@@ -8,12 +8,16 @@ See https://github.com/google/google-java-format.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.googlejavaformat.googlejavaformat import (
-    GoogleJavaFormatLintTask,
-    GoogleJavaFormatTask,
-)
+
+def registered_goals():
+    return ("fmt", "lint")
 
 
 def register_goals():
+    from pants.contrib.googlejavaformat.googlejavaformat import (
+        GoogleJavaFormatLintTask,
+        GoogleJavaFormatTask,
+    )
+
     task(name="google-java-format", action=GoogleJavaFormatTask).install("fmt")
     task(name="google-java-format", action=GoogleJavaFormatLintTask).install("lint")
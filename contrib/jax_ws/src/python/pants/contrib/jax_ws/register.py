@@ -9,14 +9,19 @@ from pants.goal.task_registrar import TaskRegistrar as task
 
 from pants.contrib.jax_ws.rules.targets import JaxWsLibrary
 from pants.contrib.jax_ws.targets.jax_ws_library import JaxWsLibrary as JaxWsLibraryV1
-from pants.contrib.jax_ws.tasks.jax_ws_gen import JaxWsGen
 
 
 def build_file_aliases():
     return BuildFileAliases(targets={"jax_ws_library": JaxWsLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.contrib.jax_ws.tasks.jax_ws_gen import JaxWsGen
+
     task(name="jax-ws", action=JaxWsGen).install("gen")
 
 
@@ -8,8 +8,12 @@ See http://mypy-lang.org.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.mypy.tasks.mypy_task import MypyTask
+
+def registered_goals():
+    return ("lint",)
 
 
 def register_goals():
+    from pants.contrib.mypy.tasks.mypy_task import MypyTask
+
     task(name="mypy", action=MypyTask).install("lint")
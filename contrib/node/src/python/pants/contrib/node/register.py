@@ -24,14 +24,6 @@ from pants.contrib.node.targets.node_preinstalled_module import (
 )
 from pants.contrib.node.targets.node_remote_module import NodeRemoteModule as NodeRemoteModuleV1
 from pants.contrib.node.targets.node_test import NodeTest as NodeTestTargetV1
-from pants.contrib.node.tasks.javascript_style import JavascriptStyleFmt, JavascriptStyleLint
-from pants.contrib.node.tasks.node_build import NodeBuild
-from pants.contrib.node.tasks.node_bundle import NodeBundle as NodeBundleTask
-from pants.contrib.node.tasks.node_install import NodeInstall
-from pants.contrib.node.tasks.node_repl import NodeRepl
-from pants.contrib.node.tasks.node_resolve import NodeResolve
-from pants.contrib.node.tasks.node_run import NodeRun
-from pants.contrib.node.tasks.node_test import NodeTest as NodeTestTask
 
 
 def build_file_aliases():
@@ -46,7 +38,20 @@ def build_file_aliases():
     )
 
 
+def registered_goals():
+    return ("repl", "resolve", "run", "compile", "test", "bundle", "node-install", "lint", "fmt")
+
+
 def register_goals():
+    from pants.contrib.node.tasks.javascript_style import JavascriptStyleFmt, JavascriptStyleLint
+    from pants.contrib.node.tasks.node_build import NodeBuild
+    from pants.contrib.node.tasks.node_bundle import NodeBundle as NodeBundleTask
+    from pants.contrib.node.tasks.node_install import NodeInstall
+    from pants.contrib.node.tasks.node_repl import NodeRepl
+    from pants.contrib.node.tasks.node_resolve import NodeResolve
+    from pants.contrib.node.tasks.node_run import NodeRun
+    from pants.contrib.node.tasks.node_test import NodeTest as NodeTestTask
+
     # Register tasks.
     task(name="node", action=NodeRepl).install("repl")
     task(name="node", action=NodeResolve).install("resolve")
@@ -9,9 +9,6 @@ Instead, use the V2 backend `pants.backend.python.lint.flake8`.
 from pants.base.deprecated import deprecated_module
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.python.checks.tasks.checkstyle.checkstyle import Checkstyle
-from pants.contrib.python.checks.tasks.python_eval import PythonEval
-
 deprecated_module(
     removal_version="1.30.0.dev0",
     deprecation_start_version="1.28.0.dev0",
@@ -29,6 +26,13 @@ deprecated_module(
 )
 
 
+def registered_goals():
+    return ("lint",)
+
+
 def register_goals():
+    from pants.contrib.python.checks.tasks.checkstyle.checkstyle import Checkstyle
+    from pants.contrib.python.checks.tasks.python_eval import PythonEval
+
     task(name="python-eval", action=PythonEval).install("lint")
     task(name="pythonstyle", action=Checkstyle).install("lint")
@@ -6,13 +6,10 @@
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.node.tasks.node_resolve import NodeResolve
 from pants.contrib.scalajs.rules.targets import ScalaJSBinary, ScalaJSLibrary
 from pants.contrib.scalajs.subsystems.scala_js_platform import ScalaJSPlatform
 from pants.contrib.scalajs.targets.scala_js_binary import ScalaJSBinary as ScalaJSBinaryV1
 from pants.contrib.scalajs.targets.scala_js_library import ScalaJSLibrary as ScalaJSLibraryV1
-from pants.contrib.scalajs.tasks.scala_js_link import ScalaJSLink
-from pants.contrib.scalajs.tasks.scala_js_zinc_compile import ScalaJSZincCompile
 
 
 def build_file_aliases():
@@ -21,7 +18,15 @@ def build_file_aliases():
     )
 
 
+def registered_goals():
+    return ("resolve",)
+
+
 def register_goals():
+    from pants.contrib.node.tasks.node_resolve import NodeResolve
+    from pants.contrib.scalajs.tasks.scala_js_link import ScalaJSLink
+    from pants.contrib.scalajs.tasks.scala_js_zinc_compile import ScalaJSZincCompile
+
     NodeResolve.register_resolver_for_type(ScalaJSBinaryV1, ScalaJSPlatform)
     # NB: These task/goal assignments are pretty nuts, but are necessary in order to
     # prevent product-graph cycles between the JVM and node.js.
@@ -8,10 +8,14 @@ See https://github.com/twitter/scrooge.
 
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.scrooge.tasks.scrooge_gen import ScroogeGen
-from pants.contrib.scrooge.tasks.thrift_linter_task import ThriftLinterTask
+
+def registered_goals():
+    return ("lint", "gen")
 
 
 def register_goals():
+    from pants.contrib.scrooge.tasks.scrooge_gen import ScroogeGen
+    from pants.contrib.scrooge.tasks.thrift_linter_task import ThriftLinterTask
+
     task(name="thrift", action=ThriftLinterTask).install("lint")
     task(name="scrooge", action=ScroogeGen).install("gen")
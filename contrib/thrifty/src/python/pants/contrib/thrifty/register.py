@@ -9,7 +9,6 @@ See https://github.com/microsoft/thrifty.
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 
-from pants.contrib.thrifty.java_thrifty_gen import JavaThriftyGen
 from pants.contrib.thrifty.java_thrifty_library import JavaThriftyLibrary as JavaThriftyLibraryV1
 from pants.contrib.thrifty.targets import JavaThriftyLibrary
 
@@ -18,7 +17,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_thrifty_library": JavaThriftyLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.contrib.thrifty.java_thrifty_gen import JavaThriftyGen
+
     task(name="thrifty", action=JavaThriftyGen).install("gen")
 
 
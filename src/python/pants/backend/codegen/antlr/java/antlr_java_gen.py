@@ -44,6 +44,10 @@ class AntlrJavaGen(SimpleCodegenTask, NailgunTask):
         sources = super().find_sources(target, target_dir)
         return [source for source in sources if source.endswith(".java")]
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -56,6 +60,12 @@ class AntlrJavaGen(SimpleCodegenTask, NailgunTask):
     def synthetic_target_type(self, target):
         return JavaLibrary
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        for compiler in {target.compiler for target in targets}:
+            if compiler in ("antlr3", "antlr4"):
+                self.tool_classpath(compiler)
+
     def execute_codegen(self, target, target_workdir):
         args = ["-o", target_workdir]
         compiler = target.compiler
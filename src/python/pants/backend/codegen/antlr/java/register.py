@@ -6,7 +6,6 @@
 See https://www.antlr.org.
 """
 
-from pants.backend.codegen.antlr.java.antlr_java_gen import AntlrJavaGen
 from pants.backend.codegen.antlr.java.java_antlr_library import (
     JavaAntlrLibrary as JavaAntlrLibraryV1,
 )
@@ -19,7 +18,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_antlr_library": JavaAntlrLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.antlr.java.antlr_java_gen import AntlrJavaGen
+
     task(name="antlr-java", action=AntlrJavaGen).install("gen")
 
 
@@ -31,6 +31,10 @@ class AntlrPyGen(SimpleCodegenTask, NailgunTask):
 
     sources_globs = ("**/*.py",)
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -73,6 +77,10 @@ class AntlrPyGen(SimpleCodegenTask, NailgunTask):
         deps = self.get_options().antlr3_deps
         return list(self.resolve_deps(deps))
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        self.tool_classpath("antlr3")
+
     def execute_codegen(self, target, target_workdir):
         if target.antlr_version != _ANTLR3_REV:
             # TODO: Deprecate the antlr_version argument to PythonAntlrLibrary and replace
@@ -6,7 +6,6 @@
 See https://www.antlr.org.
 """
 
-from pants.backend.codegen.antlr.python.antlr_py_gen import AntlrPyGen
 from pants.backend.codegen.antlr.python.python_antlr_library import (
     PythonAntlrLibrary as PythonAntlrLibraryV1,
 )
@@ -19,7 +18,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"python_antlr_library": PythonAntlrLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.antlr.python.antlr_py_gen import AntlrPyGen
+
     task(name="antlr-py", action=AntlrPyGen).install("gen")
 
 
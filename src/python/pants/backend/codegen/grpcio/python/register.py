@@ -6,8 +6,6 @@
 See https://grpc.io.
 """
 
-from pants.backend.codegen.grpcio.python.grpcio_prep import GrpcioPrep
-from pants.backend.codegen.grpcio.python.grpcio_run import GrpcioRun
 from pants.backend.codegen.grpcio.python.python_grpcio_library import (
     PythonGrpcioLibrary as PythonGrpcioLibraryV1,
 )
@@ -20,7 +18,14 @@ def build_file_aliases():
     return BuildFileAliases(targets={"python_grpcio_library": PythonGrpcioLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.grpcio.python.grpcio_prep import GrpcioPrep
+    from pants.backend.codegen.grpcio.python.grpcio_run import GrpcioRun
+
     task(name="grpcio-prep", action=GrpcioPrep).install("gen")
     task(name="grpcio-run", action=GrpcioRun).install("gen")
 
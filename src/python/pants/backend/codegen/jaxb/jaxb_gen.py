@@ -21,6 +21,10 @@ class JaxbGen(SimpleCodegenTask, NailgunTask):
 
     sources_globs = ("**/*",)
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -55,6 +59,10 @@ class JaxbGen(SimpleCodegenTask, NailgunTask):
     def is_gentarget(self, target):
         return isinstance(target, JaxbLibrary)
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        self.tool_classpath("xjc")
+
     def execute_codegen(self, target, target_workdir):
         if not isinstance(target, JaxbLibrary):
             raise TaskError(
@@ -6,7 +6,6 @@
 See https://www.oracle.com/technical-resources/articles/javase/jaxb.html.
 """
 
-from pants.backend.codegen.jaxb.jaxb_gen import JaxbGen
 from pants.backend.codegen.jaxb.jaxb_library import JaxbLibrary as JaxbLibraryV1
 from pants.backend.codegen.jaxb.targets import JaxbLibrary
 from pants.build_graph.build_file_aliases import BuildFileAliases
@@ -17,7 +16,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"jaxb_library": JaxbLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.jaxb.jaxb_gen import JaxbGen
+
     task(name="jaxb", action=JaxbGen).install("gen")
 
 
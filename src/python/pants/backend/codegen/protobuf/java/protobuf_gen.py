@@ -15,6 +15,7 @@ from pants.base.exceptions import TaskError
 from pants.base.workunit import WorkUnitLabel
 from pants.fs.archive import ZIP
 from pants.task.simple_codegen_task import SimpleCodegenTask
+from pants.util.memo import memoized_property
 from pants.util.ordered_set import OrderedSet
 
 
@@ -26,6 +27,10 @@ class ProtobufGen(SimpleCodegenTask):
     def subsystem_dependencies(cls):
         return super().subsystem_dependencies() + (Protoc.scoped(cls),)
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -82,7 +87,7 @@ class ProtobufGen(SimpleCodegenTask):
         self.plugins = self.get_options().protoc_plugins or []
         self._extra_paths = self.get_options().extra_path or []
 
-    @property
+    @memoized_property
     def protobuf_binary(self):
         return Protoc.scoped_instance(self).select(context=self.context)
 
@@ -101,6 +106,10 @@ class ProtobufGen(SimpleCodegenTask):
     def is_gentarget(self, target):
         return isinstance(target, JavaProtobufLibrary)
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        self.protobuf_binary
+
     def execute_codegen(self, target, target_workdir):
         sources_by_base = self._calculate_sources(target)
         sources = target.sources_relative_to_buildroot()
@@ -9,7 +9,6 @@ See https://developers.google.com/protocol-buffers/.
 from pants.backend.codegen.protobuf.java.java_protobuf_library import (
     JavaProtobufLibrary as JavaProtobufLibraryV1,
 )
-from pants.backend.codegen.protobuf.java.protobuf_gen import ProtobufGen
 from pants.backend.codegen.protobuf.java.targets import JavaProtobufLibrary
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
@@ -19,7 +18,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_protobuf_library": JavaProtobufLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.protobuf.java.protobuf_gen import ProtobufGen
+
     task(name="protoc", action=ProtobufGen).install("gen")
 
 
@@ -9,7 +9,6 @@ See http://www.colm.net/open-source/ragel/.
 from pants.backend.codegen.ragel.java.java_ragel_library import (
     JavaRagelLibrary as JavaRagelLibraryV1,
 )
-from pants.backend.codegen.ragel.java.ragel_gen import RagelGen
 from pants.backend.codegen.ragel.java.targets import JavaRagelLibrary
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
@@ -19,7 +18,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_ragel_library": JavaRagelLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.ragel.java.ragel_gen import RagelGen
+
     task(name="ragel", action=RagelGen).install("gen")
 
 
@@ -6,7 +6,6 @@
 See https://thrift.apache.org.
 """
 
-from pants.backend.codegen.thrift.java.apache_thrift_java_gen import ApacheThriftJavaGen
 from pants.backend.codegen.thrift.java.java_thrift_library import (
     JavaThriftLibrary as JavaThriftLibraryV1,
 )
@@ -19,7 +18,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_thrift_library": JavaThriftLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.thrift.java.apache_thrift_java_gen import ApacheThriftJavaGen
+
     task(name="thrift-java", action=ApacheThriftJavaGen).install("gen")
 
 
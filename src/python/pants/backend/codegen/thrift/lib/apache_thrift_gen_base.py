@@ -25,6 +25,10 @@ class ApacheThriftGenBase(SimpleCodegenTask):
     # Subclasses may set their own default generator options.
     default_gen_options_map: Optional[Dict[str, Optional[str]]] = None
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -76,6 +80,11 @@ class ApacheThriftGenBase(SimpleCodegenTask):
                 return self._service_deps
         return self._deps
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        # Selects the thrift binary.
+        self._thrift_cmd
+
     def execute_codegen(self, target, target_workdir):
         target_cmd = self._thrift_cmd[:]
 
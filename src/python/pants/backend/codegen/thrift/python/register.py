@@ -6,10 +6,6 @@
 See https://thrift.apache.org.
 """
 
-from pants.backend.codegen.thrift.python.apache_thrift_py_gen import ApacheThriftPyGen
-from pants.backend.codegen.thrift.python.py_thrift_namespace_clash_check import (
-    PyThriftNamespaceClashCheck,
-)
 from pants.backend.codegen.thrift.python.python_thrift_library import (
     PythonThriftLibrary as PythonThriftLibraryV1,
 )
@@ -22,7 +18,16 @@ def build_file_aliases():
     return BuildFileAliases(targets={"python_thrift_library": PythonThriftLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.thrift.python.apache_thrift_py_gen import ApacheThriftPyGen
+    from pants.backend.codegen.thrift.python.py_thrift_namespace_clash_check import (
+        PyThriftNamespaceClashCheck,
+    )
+
     task(name="thrift-py", action=ApacheThriftPyGen).install("gen")
     task(name="py-thrift-namespace-clash-check", action=PyThriftNamespaceClashCheck).install("gen")
 
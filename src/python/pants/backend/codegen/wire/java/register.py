@@ -5,7 +5,6 @@
 
 from pants.backend.codegen.wire.java.java_wire_library import JavaWireLibrary as JavaWireLibraryV1
 from pants.backend.codegen.wire.java.targets import JavaWireLibrary
-from pants.backend.codegen.wire.java.wire_gen import WireGen
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 
@@ -14,7 +13,13 @@ def build_file_aliases():
     return BuildFileAliases(targets={"java_wire_library": JavaWireLibraryV1})
 
 
+def registered_goals():
+    return ("gen",)
+
+
 def register_goals():
+    from pants.backend.codegen.wire.java.wire_gen import WireGen
+
     task(name="wire", action=WireGen).install("gen")
 
 
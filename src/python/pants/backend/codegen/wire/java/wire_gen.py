@@ -23,6 +23,10 @@ class WireGen(NailgunTaskBase, SimpleCodegenTask):
 
     sources_globs = ("**/*",)
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -127,6 +131,10 @@ class WireGen(NailgunTaskBase, SimpleCodegenTask):
         args.extend(relative_sources)
         return args
 
+    def prepare_concurrent_codegen(self, targets):
+        super().prepare_concurrent_codegen(targets)
+        self.tool_classpath("wire-compiler")
+
     def execute_codegen(self, target, target_workdir):
         args = self.format_args_for_target(target, target_workdir)
         if args:
@@ -6,8 +6,6 @@
 from pants.backend.docgen.rules.targets import Page
 from pants.backend.docgen.targets.doc import Page as PageV1
 from pants.backend.docgen.targets.doc import Wiki, WikiArtifact
-from pants.backend.docgen.tasks.generate_pants_reference import GeneratePantsReference
-from pants.backend.docgen.tasks.markdown_to_html import MarkdownToHtml
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 
@@ -23,7 +21,14 @@ def build_file_aliases():
     )
 
 
+def registered_goals():
+    return ("markdown", "reference")
+
+
 def register_goals():
+    from pants.backend.docgen.tasks.generate_pants_reference import GeneratePantsReference
+    from pants.backend.docgen.tasks.markdown_to_html import MarkdownToHtml
+
     task(name="markdown", action=MarkdownToHtml).install(),
     task(name="reference", action=GeneratePantsReference).install()
 
@@ -30,7 +30,6 @@ from pants.backend.jvm.rules.targets import (
     UnpackedJars,
 )
 from pants.backend.jvm.scala_artifact import ScalaArtifact
-from pants.backend.jvm.subsystems.jar_dependency_management import JarDependencyManagementSetup
 from pants.backend.jvm.subsystems.scala_platform import ScalaPlatform
 from pants.backend.jvm.subsystems.scoverage_platform import ScoveragePlatform
 from pants.backend.jvm.subsystems.shader import Shading
@@ -59,46 +58,6 @@ from pants.backend.jvm.targets.scala_jar_dependency import ScalaJarDependency
 from pants.backend.jvm.targets.scala_library import ScalaLibrary as ScalaLibraryV1
 from pants.backend.jvm.targets.scalac_plugin import ScalacPlugin as ScalacPluginV1
 from pants.backend.jvm.targets.unpacked_jars import UnpackedJars as UnpackedJarsV1
-from pants.backend.jvm.tasks.analysis_extraction import AnalysisExtraction
-from pants.backend.jvm.tasks.benchmark_run import BenchmarkRun
-from pants.backend.jvm.tasks.binary_create import BinaryCreate
-from pants.backend.jvm.tasks.bootstrap_jvm_tools import BootstrapJvmTools
-from pants.backend.jvm.tasks.bundle_create import BundleCreate
-from pants.backend.jvm.tasks.check_published_deps import CheckPublishedDeps
-from pants.backend.jvm.tasks.checkstyle import Checkstyle
-from pants.backend.jvm.tasks.classmap import ClassmapTask
-from pants.backend.jvm.tasks.consolidate_classpath import ConsolidateClasspath
-from pants.backend.jvm.tasks.coursier_resolve import CoursierResolve
-from pants.backend.jvm.tasks.detect_duplicates import DuplicateDetector
-from pants.backend.jvm.tasks.ivy_imports import IvyImports
-from pants.backend.jvm.tasks.ivy_outdated import IvyOutdated
-from pants.backend.jvm.tasks.jar_create import JarCreate
-from pants.backend.jvm.tasks.jar_publish import JarPublish
-from pants.backend.jvm.tasks.javadoc_gen import JavadocGen
-from pants.backend.jvm.tasks.junit_run import JUnitRun
-from pants.backend.jvm.tasks.jvm_compile.javac.javac_compile import JavacCompile
-from pants.backend.jvm.tasks.jvm_compile.jvm_classpath_publisher import RuntimeClasspathPublisher
-from pants.backend.jvm.tasks.jvm_compile.rsc.rsc_compile import RscCompile
-from pants.backend.jvm.tasks.jvm_dependency_check import JvmDependencyCheck
-from pants.backend.jvm.tasks.jvm_dependency_usage import JvmDependencyUsage
-from pants.backend.jvm.tasks.jvm_platform_analysis import JvmPlatformExplain, JvmPlatformValidate
-from pants.backend.jvm.tasks.jvm_run import JvmRun
-from pants.backend.jvm.tasks.nailgun_task import NailgunKillall
-from pants.backend.jvm.tasks.prepare_resources import PrepareResources
-from pants.backend.jvm.tasks.prepare_services import PrepareServices
-from pants.backend.jvm.tasks.provide_tools_jar import ProvideToolsJar
-from pants.backend.jvm.tasks.run_jvm_prep_command import (
-    RunBinaryJvmPrepCommand,
-    RunCompileJvmPrepCommand,
-    RunTestJvmPrepCommand,
-)
-from pants.backend.jvm.tasks.scala_repl import ScalaRepl
-from pants.backend.jvm.tasks.scaladoc_gen import ScaladocGen
-from pants.backend.jvm.tasks.scalafix_task import ScalaFixCheck, ScalaFixFix
-from pants.backend.jvm.tasks.scalafmt_task import ScalaFmtCheckFormat, ScalaFmtFormat
-from pants.backend.jvm.tasks.scalastyle_task import ScalastyleTask
-from pants.backend.jvm.tasks.unpack_jars import UnpackJars
-from pants.backend.project_info.tasks.export_dep_as_jar import ExportDepAsJar
 from pants.build_graph.app_base import Bundle, DirectoryReMapper
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.goal import Goal
@@ -168,7 +127,91 @@ def global_subsystems():
 
 
 # TODO https://github.com/pantsbuild/pants/issues/604 register_goals
+def registered_goals():
+    return (
+        "ng-killall",
+        "invalidate",
+        "clean-all",
+        "bootstrap",
+        "jvm-platform-explain",
+        "jvm-platform-validate",
+        "compile",
+        "analysis",
+        "resolve",
+        "imports",
+        "unpack-jars",
+        "outdated",
+        "resources",
+        "export-classpath",
+        "export-dep-as-jar",
+        "dep-usage",
+        "classmap",
+        "doc",
+        "jar",
+        "binary",
+        "bundle",
+        "detect-duplicates",
+        "check-published-deps",
+        "publish",
+        "test",
+        "bench",
+        "lint",
+        "fmt",
+        "run",
+        "run-dirty",
+        "repl",
+        "repl-dirty",
+    )
+
+
 def register_goals():
+    from pants.backend.jvm.subsystems.jar_dependency_management import JarDependencyManagementSetup
+    from pants.backend.jvm.tasks.analysis_extraction import AnalysisExtraction
+    from pants.backend.jvm.tasks.benchmark_run import BenchmarkRun
+    from pants.backend.jvm.tasks.binary_create import BinaryCreate
+    from pants.backend.jvm.tasks.bootstrap_jvm_tools import BootstrapJvmTools
+    from pants.backend.jvm.tasks.bundle_create import BundleCreate
+    from pants.backend.jvm.tasks.check_published_deps import CheckPublishedDeps
+    from pants.backend.jvm.tasks.checkstyle import Checkstyle
+    from pants.backend.jvm.tasks.classmap import ClassmapTask
+    from pants.backend.jvm.tasks.consolidate_classpath import ConsolidateClasspath
+    from pants.backend.jvm.tasks.coursier_resolve import CoursierResolve
+    from pants.backend.jvm.tasks.detect_duplicates import DuplicateDetector
+    from pants.backend.jvm.tasks.ivy_imports import IvyImports
+    from pants.backend.jvm.tasks.ivy_outdated import IvyOutdated
+    from pants.backend.jvm.tasks.jar_create import JarCreate
+    from pants.backend.jvm.tasks.jar_publish import JarPublish
+    from pants.backend.jvm.tasks.javadoc_gen import JavadocGen
+    from pants.backend.jvm.tasks.junit_run import JUnitRun
+    from pants.backend.jvm.tasks.jvm_compile.javac.javac_compile import JavacCompile
+    from pants.backend.jvm.tasks.jvm_compile.jvm_classpath_publisher import (
+        RuntimeClasspathPublisher,
+    )
+    from pants.backend.jvm.tasks.jvm_compile.rsc.rsc_compile import RscCompile
+    from pants.backend.jvm.tasks.jvm_dependency_check import JvmDependencyCheck
+    from pants.backend.jvm.tasks.jvm_dependency_usage import JvmDependencyUsage
+    from pants.backend.jvm.tasks.jvm_platform_analysis import (
+        JvmPlatformExplain,
+        JvmPlatformValidate,
+    )
+    from pants.backend.jvm.tasks.jvm_run import JvmRun
+    from pants.backend.jvm.tasks.nailgun_task import NailgunKillall
+    from pants.backend.jvm.tasks.prepare_resources import PrepareResources
+    from pants.backend.jvm.tasks.prepare_services import PrepareServices
+    from pants.backend.jvm.tasks.provide_tools_jar import ProvideToolsJar
+    from pants.backend.jvm.tasks.run_jvm_prep_command import (
+        RunBinaryJvmPrepCommand,
+        RunCompileJvmPrepCommand,
+        RunTestJvmPrepCommand,
+    )
+    from pants.backend.jvm.tasks.scala_repl import ScalaRepl
+    from pants.backend.jvm.tasks.scaladoc_gen import ScaladocGen
+    from pants.backend.jvm.tasks.scalafix_task import ScalaFixCheck, ScalaFixFix
+    from pants.backend.jvm.tasks.scalafmt_task import ScalaFmtCheckFormat, ScalaFmtFormat
+    from pants.backend.jvm.tasks.scalastyle_task import ScalastyleTask
+    from pants.backend.jvm.tasks.unpack_jars import UnpackJars
+    from pants.backend.project_info.tasks.export_dep_as_jar import ExportDepAsJar
+
     ng_killall = task(name="ng-killall", action=NailgunKillall)
     ng_killall.install()
 
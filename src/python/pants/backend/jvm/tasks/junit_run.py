@@ -2,9 +2,11 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import fnmatch
+import heapq
 import itertools
 import os
 import sys
+import threading
 from contextlib import contextmanager
 
 from pants.backend.jvm import argfile
@@ -17,18 +19,24 @@ from pants.backend.jvm.tasks.jvm_tool_task_mixin import JvmToolTaskMixin
 from pants.backend.jvm.tasks.reports.junit_html_report import JUnitHtmlReport, NoJunitHtmlReport
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TargetDefinitionException, TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
 from pants.build_graph.target_scopes import Scopes
 from pants.java.executor import SubprocessExecutor
-from pants.java.junit.junit_xml_parser import RegistryOfTests, Test, parse_failed_targets
+from pants.java.junit.junit_xml_parser import (
+    RegistryOfTests,
+    Test,
+    parse_failed_targets,
+    parse_test_class_durations,
+)
 from pants.process.lock import OwnerPrintingInterProcessFileLock
 from pants.task.testrunner_task_mixin import PartitionedTestRunnerTaskMixin, TestResult
 from pants.util import desktop
 from pants.util.argutil import ensure_arg, remove_arg
 from pants.util.contextutil import environment_as
 from pants.util.dirutil import safe_delete, safe_mkdir, safe_rmtree, safe_walk
-from pants.util.memo import memoized_method
+from pants.util.memo import memoized_method, memoized_property
 from pants.util.ordered_set import OrderedSet
 from pants.util.strutil import pluralize
 
@@ -44,6 +52,9 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
 
     _BATCH_ALL = sys.maxsize
 
+    _BATCH_BY_NAME = "name"
+    _BATCH_BY_DURATION = "duration"
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -56,6 +67,24 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
             fingerprint=True,
             help="Run at most this many tests in a single test process.",
         )
+        register(
+            "--batch-strategy",
+            advanced=True,
+            choices=[cls._BATCH_BY_NAME, cls._BATCH_BY_DURATION],
+            default=cls._BATCH_BY_NAME,
+            fingerprint=True,
+            help="How to divide tests into batches of at most `--batch-size` tests. "
+            "'{by_name}' batches tests in order of their names. '{by_duration}' uses the time "
+            "each test class took in previous runs to make batches of roughly equal expected "
+            "duration.".format(by_name=cls._BATCH_BY_NAME, by_duration=cls._BATCH_BY_DURATION),
+        )
+        register(
+            "--batch-workers",
+            advanced=True,
+            type=int,
+            default=1,
+            help="The number of test batches to run concurrently.",
+        )
         register(
             "--test",
             type=list,
@@ -180,6 +209,10 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
         options = self.get_options()
         self._tests_to_run = options.test
         self._batch_size = options.batch_size
+        self._batch_by_duration = options.batch_strategy == self._BATCH_BY_DURATION
+        self._batch_workers = options.batch_workers
+        # Serializes spawning test processes, which temporarily modifies the environment.
+        self._spawn_lock = threading.Lock()
 
         if options.cwd and self.run_tests_in_chroot:
             raise self.OptionError(
@@ -268,17 +301,19 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
             **kwargs,
         )
 
-    def _spawn(self, distribution, executor=None, *args, **kwargs):
+    def _spawn(self, distribution, executor=None, *args, env_vars=(), **kwargs):
         """Returns a processhandler to a process executing java.
 
         :param Executor executor: the java subprocess executor to use. If not specified, construct
           using the distribution.
         :param Distribution distribution: The JDK or JRE installed.
+        :param env_vars: Pairs of environment variable names and values to set for the process.
         :rtype: ProcessHandler
         """
 
         actual_executor = executor or SubprocessExecutor(distribution)
-        return distribution.execute_java_async(*args, executor=actual_executor, **kwargs)
+        with self._spawn_lock, environment_as(**dict(env_vars)):
+            return distribution.execute_java_async(*args, executor=actual_executor, **kwargs)
 
     def execute_java_for_coverage(self, targets, *args, **kwargs):
         """Execute java for targets directly and don't use the test mixin.
@@ -344,97 +379,38 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
         # back to runtime_classpath
         classpath_product = self.context.products.get_data("instrument_classpath")
 
-        result = 0
-        for batch_id, (properties, batch) in enumerate(self._iter_batches(test_registry)):
-            (
-                workdir,
-                platform,
-                target_jvm_options,
-                target_env_vars,
-                concurrency,
-                threads,
-            ) = properties
+        batches = list(self._iter_batches(test_registry))
+        if self._batch_by_duration:
+            # The composition of batches varies from run to run, so clear the reports of previous
+            # runs' batches, which would otherwise be mistaken for results of this one.
+            for name in os.listdir(output_dir):
+                if name.startswith("batch-"):
+                    safe_rmtree(os.path.join(output_dir, name))
 
+        def run_batch(batch_id, properties, batch):
             batch_output_dir = output_dir
             if self._batched:
                 batch_output_dir = os.path.join(batch_output_dir, f"batch-{batch_id}")
-
-            run_modifications = coverage.run_modifications(batch_output_dir)
-            self.context.log.debug(f"run_modifications: {run_modifications}")
-
-            extra_jvm_options = run_modifications.extra_jvm_options
-
-            # Batches of test classes will likely exist within the same targets: dedupe them.
-            relevant_targets = {test_registry.get_owning_target(t) for t in batch}
-
-            complete_classpath = OrderedSet()
-            complete_classpath.update(run_modifications.classpath_prepend)
-            complete_classpath.update(JUnit.global_instance().runner_classpath(self.context))
-            complete_classpath.update(
-                self.classpath(relevant_targets, classpath_product=classpath_product)
+            return self._run_batch(
+                fail_fast,
+                properties,
+                batch,
+                batch_output_dir,
+                test_registry,
+                coverage,
+                classpath_product,
+                parse_error_handler,
             )
 
-            distribution = self.preferred_jvm_distribution([platform], self._strict_jvm_version)
-
-            # Override cmdline args with values from junit_test() target that specify concurrency:
-            args = self._args(fail_fast, batch_output_dir) + ["-xmlreport"]
-
-            if concurrency is not None:
-                args = remove_arg(args, "-default-parallel")
-                if concurrency == JUnitTests.CONCURRENCY_SERIAL:
-                    args = ensure_arg(args, "-default-concurrency", param="SERIAL")
-                elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES:
-                    args = ensure_arg(args, "-default-concurrency", param="PARALLEL_CLASSES")
-                elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_METHODS:
-                    args = ensure_arg(args, "-default-concurrency", param="PARALLEL_METHODS")
-                elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES_AND_METHODS:
-                    args = ensure_arg(
-                        args, "-default-concurrency", param="PARALLEL_CLASSES_AND_METHODS"
-                    )
-
-            if threads is not None:
-                args = remove_arg(args, "-parallel-threads", has_param=True)
-                args += ["-parallel-threads", str(threads)]
-
-            batch_test_specs = [test.render_test_spec() for test in batch]
-            with argfile.safe_args(batch_test_specs, self.get_options()) as batch_tests:
-                with self.chroot(relevant_targets, workdir) as chroot:
-                    self.context.log.debug(f"CWD = {chroot}")
-                    self.context.log.debug(f"platform = {platform}")
-                    with environment_as(**dict(target_env_vars)):
-                        subprocess_result = self.spawn_and_wait(
-                            relevant_targets,
-                            executor=SubprocessExecutor(distribution),
-                            distribution=distribution,
-                            classpath=complete_classpath,
-                            main=JUnit.RUNNER_MAIN,
-                            jvm_options=self.jvm_options
-                            + list(platform.jvm_options)
-                            + extra_jvm_options
-                            + list(target_jvm_options),
-                            args=args + batch_tests,
-                            workunit_factory=self.context.new_workunit,
-                            workunit_name="run",
-                            workunit_labels=[WorkUnitLabel.TEST],
-                            cwd=chroot,
-                            synthetic_jar_dir=batch_output_dir,
-                            create_synthetic_jar=self.synthetic_classpath,
-                        )
-                        self.context.log.debug(
-                            "JUnit subprocess exited with result ({})".format(subprocess_result)
-                        )
-                        result += abs(subprocess_result)
-
-                tests_info = self.parse_test_info(
-                    batch_output_dir, parse_error_handler, ["classname"]
-                )
-                for test_name, test_info in tests_info.items():
-                    test_item = Test(test_info["classname"], test_name)
-                    test_target = test_registry.get_owning_target(test_item)
-                    self.report_all_info_for_single_test(
-                        self.options_scope, test_target, test_name, test_info
-                    )
-
+        batch_args = [
+            (batch_id, properties, batch) for batch_id, (properties, batch) in enumerate(batches)
+        ]
+        if self._batch_workers > 1 and len(batches) > 1:
+            result = self._run_batches_concurrently(fail_fast, run_batch, batch_args)
+        else:
+            result = 0
+            for args in batch_args:
+                result += run_batch(*args)
                 if result != 0 and fail_fast:
                     break
 
@@ -471,6 +447,134 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
             msg="\n".join(error_message_lines), rc=result, failed_targets=failed_targets
         )
 
+    def _run_batches_concurrently(self, fail_fast, run_batch, batch_args):
+        """Runs batches on a pool of `--batch-workers` threads, returning the sum of their results.
+
+        With `fail_fast`, batches which have not started by the time a batch fails are skipped.
+        """
+        failed = threading.Event()
+
+        def run_batch_unless_failed(*args):
+            if fail_fast and failed.is_set():
+                return 0
+            batch_result = run_batch(*args)
+            if batch_result != 0:
+                failed.set()
+            return batch_result
+
+        with self.context.new_workunit(f"{self.name()}-batches") as workunit:
+            worker_pool = WorkerPool(
+                workunit.parent,
+                self.context.run_tracker,
+                min(self._batch_workers, len(batch_args)),
+                workunit.name,
+            )
+            try:
+                results = worker_pool.submit_work_and_wait(
+                    Work(run_batch_unless_failed, batch_args), workunit_parent=workunit
+                )
+            finally:
+                worker_pool.shutdown()
+        return sum(results)
+
+    def _run_batch(
+        self,
+        fail_fast,
+        properties,
+        batch,
+        batch_output_dir,
+        test_registry,
+        coverage,
+        classpath_product,
+        parse_error_handler,
+    ):
+        """Runs a single batch of tests in a JUnit subprocess, returning its absolute exit code."""
+        (
+            workdir,
+            platform,
+            target_jvm_options,
+            target_env_vars,
+            concurrency,
+            threads,
+        ) = properties
+
+        run_modifications = coverage.run_modifications(batch_output_dir)
+        self.context.log.debug(f"run_modifications: {run_modifications}")
+
+        extra_jvm_options = run_modifications.extra_jvm_options
+
+        # Batches of test classes will likely exist within the same targets: dedupe them.
+        relevant_targets = {test_registry.get_owning_target(t) for t in batch}
+
+        complete_classpath = OrderedSet()
+        complete_classpath.update(run_modifications.classpath_prepend)
+        complete_classpath.update(JUnit.global_instance().runner_classpath(self.context))
+        complete_classpath.update(
+            self.classpath(relevant_targets, classpath_product=classpath_product)
+        )
+
+        distribution = self.preferred_jvm_distribution([platform], self._strict_jvm_version)
+
+        # Override cmdline args with values from junit_test() target that specify concurrency:
+        args = self._args(fail_fast, batch_output_dir) + ["-xmlreport"]
+
+        if concurrency is not None:
+            args = remove_arg(args, "-default-parallel")
+            if concurrency == JUnitTests.CONCURRENCY_SERIAL:
+                args = ensure_arg(args, "-default-concurrency", param="SERIAL")
+            elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES:
+                args = ensure_arg(args, "-default-concurrency", param="PARALLEL_CLASSES")
+            elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_METHODS:
+                args = ensure_arg(args, "-default-concurrency", param="PARALLEL_METHODS")
+            elif concurrency == JUnitTests.CONCURRENCY_PARALLEL_CLASSES_AND_METHODS:
+                args = ensure_arg(
+                    args, "-default-concurrency", param="PARALLEL_CLASSES_AND_METHODS"
+                )
+
+        if threads is not None:
+            args = remove_arg(args, "-parallel-threads", has_param=True)
+            args += ["-parallel-threads", str(threads)]
+
+        batch_test_specs = [test.render_test_spec() for test in batch]
+        with argfile.safe_args(batch_test_specs, self.get_options()) as batch_tests:
+            with self.chroot(relevant_targets, workdir) as chroot:
+                self.context.log.debug(f"CWD = {chroot}")
+                self.context.log.debug(f"platform = {platform}")
+                # NB: The target's environment variables are applied by `_spawn`, rather than here,
+                # so that concurrent batches do not observe one another's environments.
+                subprocess_result = self.spawn_and_wait(
+                    relevant_targets,
+                    executor=SubprocessExecutor(distribution),
+                    distribution=distribution,
+                    classpath=complete_classpath,
+                    main=JUnit.RUNNER_MAIN,
+                    jvm_options=self.jvm_options
+                    + list(platform.jvm_options)
+                    + extra_jvm_options
+                    + list(target_jvm_options),
+                    args=args + batch_tests,
+                    workunit_factory=self.context.new_workunit,
+                    workunit_name="run",
+                    workunit_labels=[WorkUnitLabel.TEST],
+                    cwd=chroot,
+                    synthetic_jar_dir=batch_output_dir,
+                    create_synthetic_jar=self.synthetic_classpath,
+                    env_vars=target_env_vars,
+                )
+                self.context.log.debug(
+                    "JUnit subprocess exited with result ({})".format(subprocess_result)
+                )
+
+            tests_info = self.parse_test_info(batch_output_dir, parse_error_handler, ["classname"])
+            for test_name, test_info in tests_info.items():
+                test_item = Test(test_info["classname"], test_name)
+                test_target = test_registry.get_owning_target(test_item)
+                self.report_all_info_for_single_test(
+                    self.options_scope, test_target, test_name, test_info
+                )
+
+        return abs(subprocess_result)
+
     def _iter_batches(self, test_registry):
         tests_by_properties = test_registry.index(
             lambda tgt: tgt.cwd if tgt.cwd is not None else self._working_dir,
@@ -506,10 +610,68 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
 
         for properties, tests in sorted(tests_by_properties.items(), key=_sort_properties):
             sorted_tests = sorted(tests)
+            if self._batch_by_duration and self._batched:
+                for batch in self._balance_batches(
+                    sorted_tests, self._test_class_durations, self._batch_size
+                ):
+                    yield properties, batch
+                continue
             stride = min(self._batch_size, len(sorted_tests))
             for i in range(0, len(sorted_tests), stride):
                 yield properties, sorted_tests[i : i + stride]
 
+    @memoized_property
+    def _test_class_durations(self):
+        """The time in seconds that each test class took in its most recent run, by class name."""
+        runs_dir = os.path.join(self.workdir, "_runs")
+        if not os.path.isdir(runs_dir):
+            return {}
+
+        def parse_error_handler(parse_error):
+            # Missing timings only make for less even batches.
+            self.context.log.debug(
+                "Ignoring timings from {path}: {cause}".format(
+                    path=parse_error.xml_path, cause=parse_error.cause
+                )
+            )
+
+        return parse_test_class_durations(runs_dir, parse_error_handler)
+
+    @staticmethod
+    def _balance_batches(tests, durations, batch_size):
+        """Divides tests into batches of at most batch_size tests with similar total durations.
+
+        As many batches are made as when batching by name, and each test is assigned, longest
+        first, to the batch with the shortest total duration that still has room for it. Tests
+        without a known duration are assumed to take the average known duration.
+
+        :param list tests: The `Test`s to divide.
+        :param dict durations: The durations in seconds of test classes, by class name.
+        :param int batch_size: The maximum number of tests in a batch.
+        :returns: The batches, as sorted lists of tests, longest batch first.
+        :rtype: list
+        """
+        known = [durations[test.classname] for test in tests if test.classname in durations]
+        default_duration = sum(known) / len(known) if known else 1.0
+
+        def duration(test):
+            return durations.get(test.classname, default_duration)
+
+        num_batches = -(-len(tests) // batch_size)
+        batches = [[] for _ in range(num_batches)]
+        totals = [0.0] * num_batches
+        # A heap of (total duration, batch index) for the batches with room for more tests.
+        open_batches = [(0.0, i) for i in range(num_batches)]
+        for test in sorted(tests, key=lambda t: (-duration(t), t)):
+            total, index = heapq.heappop(open_batches)
+            batches[index].append(test)
+            totals[index] = total + duration(test)
+            if len(batches[index]) < batch_size:
+                heapq.heappush(open_batches, (totals[index], index))
+
+        order = sorted(range(num_batches), key=lambda i: (-totals[i], i))
+        return [sorted(batches[i]) for i in order]
+
     def _parse(self, test_spec_str):
         """Parses a test specification string into an object that can yield corresponding tests.
 
@@ -20,11 +20,6 @@ from pants.backend.jvm.tasks.jvm_compile.class_not_found_error_patterns import (
     CLASS_NOT_FOUND_ERROR_PATTERNS,
 )
 from pants.backend.jvm.tasks.jvm_compile.compile_context import CompileContext
-from pants.backend.jvm.tasks.jvm_compile.execution_graph import (
-    ExecutionFailure,
-    ExecutionGraph,
-    Job,
-)
 from pants.backend.jvm.tasks.jvm_compile.missing_dependency_finder import (
     CompileErrorExtractor,
     MissingDependencyFinder,
@@ -33,6 +28,12 @@ from pants.backend.jvm.tasks.jvm_dependency_analyzer import JvmDependencyAnalyze
 from pants.backend.jvm.tasks.nailgun_task import NailgunTaskBase
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.execution_graph import (
+    ExecutionFailure,
+    ExecutionGraph,
+    Job,
+    JobDurationHistory,
+)
 from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
@@ -70,6 +71,11 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
 
     size_estimators = create_size_estimators()
 
+    # Estimates job sizes from the durations of their past executions, and otherwise with
+    # `_HISTORY_FALLBACK_SIZE_ESTIMATOR`.
+    HISTORY_SIZE_ESTIMATOR = "history"
+    _HISTORY_FALLBACK_SIZE_ESTIMATOR = "filesize"
+
     class Compiler(Enum):
         ZINC = "zinc"
         RSC = "rsc"
@@ -173,12 +179,16 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
         register(
             "--size-estimator",
             advanced=True,
-            choices=list(cls.size_estimators.keys()),
+            choices=[*cls.size_estimators.keys(), cls.HISTORY_SIZE_ESTIMATOR],
             default="filesize",
             help="The method of target size estimation. The size estimator estimates the size "
             "of targets in order to build the largest targets first (subject to dependency "
             "constraints). Choose 'random' to choose random sizes for each target, which "
-            "may be useful for distributed builds.",
+            "may be useful for distributed builds. Choose '{history}' to use how long each "
+            "target took to compile in past runs, which are recorded in the task's workdir, and "
+            "to estimate targets without a history with '{fallback}'.".format(
+                history=cls.HISTORY_SIZE_ESTIMATOR, fallback=cls._HISTORY_FALLBACK_SIZE_ESTIMATOR
+            ),
         )
 
         register(
@@ -493,7 +503,16 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
             worker_count = 1
         self._worker_count = worker_count
 
-        self._size_estimator = self.size_estimator_by_name(self.get_options().size_estimator)
+        size_estimator = self.get_options().size_estimator
+        self._job_duration_history = None
+        if size_estimator == self.HISTORY_SIZE_ESTIMATOR:
+            self._job_duration_history = JobDurationHistory(
+                os.path.join(self.workdir, "job_durations.json")
+            )
+            size_estimator = self._HISTORY_FALLBACK_SIZE_ESTIMATOR
+        self._size_estimator = self.size_estimator_by_name(size_estimator)
+        # The targets which were found in the artifact cache just before they would have compiled.
+        self._double_check_cache_hits: Set[Target] = set()
 
     @memoized_property
     def _missing_deps_finder(self):
@@ -651,15 +670,38 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
                 compile_contexts, invalid_targets, invalidation_check.invalid_vts, classpath_product
             )
 
-            exec_graph = ExecutionGraph(jobs, self.get_options().print_exception_stacktrace)
+            exec_graph = ExecutionGraph(
+                jobs,
+                self.get_options().print_exception_stacktrace,
+                job_durations=(
+                    self._job_duration_history.durations if self._job_duration_history else None
+                ),
+            )
             try:
                 exec_graph.execute(worker_pool, self.context.log)
             except ExecutionFailure as e:
                 raise TaskError(f"Compilation failure: {e!r}")
+            finally:
+                self._record_job_durations(exec_graph, jobs)
         for vt in invalidation_check.all_vts:
             compile_context = self.select_runtime_context(compile_contexts[vt.target])
             self.always_do_after_compile(compile_context)
 
+    def _record_job_durations(self, exec_graph, jobs):
+        if self._job_duration_history is None:
+            return
+        # Jobs for targets which hit the cache did no work, so their durations don't reflect how
+        # long those targets take to compile.
+        cache_hit_keys = {job.key for job in jobs if job.target in self._double_check_cache_hits}
+        self._job_duration_history.record(
+            {
+                key: duration
+                for key, duration in exec_graph.successful_job_durations().items()
+                if key not in cache_hit_keys
+            }
+        )
+        self._job_duration_history.save()
+
     def _record_compile_classpath(self, classpath, target, outdir):
         relative_classpaths = [
             fast_relpath(path, self.get_options().pants_workdir) for path in classpath
@@ -1022,6 +1064,7 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
             )
             return False
         assert cached_vts == [vts], f"Cache returned unexpected target: {cached_vts} vs {[vts]}"
+        self._double_check_cache_hits.add(vts.target)
         self.context.log.info(f"Hit cache during double check for {vts.target.address.spec}")
         return True
 
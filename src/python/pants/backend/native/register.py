@@ -25,11 +25,6 @@ from pants.backend.native.targets.native_library import CppLibrary as CppLibrary
 from pants.backend.native.targets.packaged_native_library import (
     PackagedNativeLibrary as PackagedNativeLibraryV1,
 )
-from pants.backend.native.tasks.c_compile import CCompile
-from pants.backend.native.tasks.conan_fetch import ConanFetch
-from pants.backend.native.tasks.conan_prep import ConanPrep
-from pants.backend.native.tasks.cpp_compile import CppCompile
-from pants.backend.native.tasks.link_shared_libraries import LinkSharedLibraries
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 
@@ -53,7 +48,17 @@ def global_subsystems():
     return {NativeBuildSettings}
 
 
+def registered_goals():
+    return ("native-compile", "link")
+
+
 def register_goals():
+    from pants.backend.native.tasks.c_compile import CCompile
+    from pants.backend.native.tasks.conan_fetch import ConanFetch
+    from pants.backend.native.tasks.conan_prep import ConanPrep
+    from pants.backend.native.tasks.cpp_compile import CppCompile
+    from pants.backend.native.tasks.link_shared_libraries import LinkSharedLibraries
+
     # TODO(#5962): register these under the 'compile' goal when we eliminate the product transitive
     # dependency from export -> compile.
     task(name="conan-prep", action=ConanPrep).install("native-compile")
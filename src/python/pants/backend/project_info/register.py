@@ -4,11 +4,6 @@
 """Various goals for insights on your project, such as finding a target's dependencies."""
 
 from pants.backend.project_info.rules import dependencies, source_file_validator
-from pants.backend.project_info.tasks.dependencies import Dependencies
-from pants.backend.project_info.tasks.depmap import Depmap
-from pants.backend.project_info.tasks.export import Export
-from pants.backend.project_info.tasks.filedeps import FileDeps
-from pants.backend.project_info.tasks.idea_plugin_gen import IdeaPluginGen
 from pants.goal.task_registrar import TaskRegistrar as task
 
 
@@ -16,7 +11,17 @@ def build_file_aliases():
     pass
 
 
+def registered_goals():
+    return ("idea-plugin", "export", "depmap", "dependencies", "filedeps")
+
+
 def register_goals():
+    from pants.backend.project_info.tasks.dependencies import Dependencies
+    from pants.backend.project_info.tasks.depmap import Depmap
+    from pants.backend.project_info.tasks.export import Export
+    from pants.backend.project_info.tasks.filedeps import FileDeps
+    from pants.backend.project_info.tasks.idea_plugin_gen import IdeaPluginGen
+
     task(name="idea-plugin", action=IdeaPluginGen).install()
     task(name="export", action=Export).install()
 
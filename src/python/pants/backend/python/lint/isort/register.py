@@ -8,8 +8,6 @@ See https://timothycrosley.github.io/isort/.
 
 from pants.backend.python.lint import python_formatter
 from pants.backend.python.lint.isort import rules as isort_rules
-from pants.backend.python.lint.isort.isort_prep import IsortPrep
-from pants.backend.python.lint.isort.isort_run import IsortRun
 from pants.goal.task_registrar import TaskRegistrar as task
 
 
@@ -17,6 +15,13 @@ def rules():
     return (*isort_rules.rules(), *python_formatter.rules())
 
 
+def registered_goals():
+    return ("fmt",)
+
+
 def register_goals():
+    from pants.backend.python.lint.isort.isort_prep import IsortPrep
+    from pants.backend.python.lint.isort.isort_run import IsortRun
+
     task(name="isort-prep", action=IsortPrep).install("fmt")
     task(name="isort", action=IsortRun).install("fmt")
@@ -43,23 +43,6 @@ from pants.backend.python.targets.python_requirements_file import (
 )
 from pants.backend.python.targets.python_tests import PythonTests as PythonTestsV1
 from pants.backend.python.targets.unpacked_whls import UnpackedWheels as UnpackedWheelsV1
-from pants.backend.python.tasks.build_local_python_distributions import (
-    BuildLocalPythonDistributions,
-)
-from pants.backend.python.tasks.gather_sources import GatherSources
-from pants.backend.python.tasks.local_python_distribution_artifact import (
-    LocalPythonDistributionArtifact,
-)
-from pants.backend.python.tasks.pytest_prep import PytestPrep
-from pants.backend.python.tasks.pytest_run import PytestRun
-from pants.backend.python.tasks.python_binary_create import PythonBinaryCreate
-from pants.backend.python.tasks.python_bundle import PythonBundle
-from pants.backend.python.tasks.python_repl import PythonRepl
-from pants.backend.python.tasks.python_run import PythonRun
-from pants.backend.python.tasks.resolve_requirements import ResolveRequirements
-from pants.backend.python.tasks.select_interpreter import SelectInterpreter
-from pants.backend.python.tasks.setup_py import SetupPy
-from pants.backend.python.tasks.unpack_wheels import UnpackWheels
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.task_registrar import TaskRegistrar as task
 from pants.python.pex_build_util import PexBuilderWrapper
@@ -105,7 +88,29 @@ def build_file_aliases2():
     )
 
 
+def registered_goals():
+    return ("pyprep", "run", "test", "repl", "setup-py", "binary", "bundle", "unpack-wheels")
+
+
 def register_goals():
+    from pants.backend.python.tasks.build_local_python_distributions import (
+        BuildLocalPythonDistributions,
+    )
+    from pants.backend.python.tasks.gather_sources import GatherSources
+    from pants.backend.python.tasks.local_python_distribution_artifact import (
+        LocalPythonDistributionArtifact,
+    )
+    from pants.backend.python.tasks.pytest_prep import PytestPrep
+    from pants.backend.python.tasks.pytest_run import PytestRun
+    from pants.backend.python.tasks.python_binary_create import PythonBinaryCreate
+    from pants.backend.python.tasks.python_bundle import PythonBundle
+    from pants.backend.python.tasks.python_repl import PythonRepl
+    from pants.backend.python.tasks.python_run import PythonRun
+    from pants.backend.python.tasks.resolve_requirements import ResolveRequirements
+    from pants.backend.python.tasks.select_interpreter import SelectInterpreter
+    from pants.backend.python.tasks.setup_py import SetupPy
+    from pants.backend.python.tasks.unpack_wheels import UnpackWheels
+
     task(name="interpreter", action=SelectInterpreter).install("pyprep")
     task(name="build-local-dists", action=BuildLocalPythonDistributions).install("pyprep")
     task(name="requirements", action=ResolveRequirements).install("pyprep")
@@ -2,8 +2,11 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import functools
+import itertools
+import os
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple, Union, cast
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+from xml.etree import ElementTree
 
 from pants.backend.python.rules.importable_python_sources import ImportablePythonSources
 from pants.backend.python.rules.pex import (
@@ -29,8 +32,9 @@ from pants.backend.python.rules.targets import (
 )
 from pants.backend.python.subsystems.pytest import PyTest
 from pants.backend.python.subsystems.subprocess_environment import SubprocessEncodingEnvironment
+from pants.build_graph.address import Address
 from pants.engine.addressable import Addresses
-from pants.engine.fs import Digest, DirectoriesToMerge, InputFilesContent
+from pants.engine.fs import Digest, DirectoriesToMerge, FilesContent, InputFilesContent
 from pants.engine.interactive_runner import InteractiveProcessRequest
 from pants.engine.isolated_process import ExecuteProcessRequest, FallibleExecuteProcessResult
 from pants.engine.legacy.graph import HydratedTargets
@@ -41,18 +45,41 @@ from pants.option.global_options import GlobalOptions
 from pants.python.python_setup import PythonSetup
 from pants.rules.core.determine_source_files import SourceFiles, SpecifiedSourceFilesRequest
 from pants.rules.core.targets import FilesSources, ResourcesSources
-from pants.rules.core.test import TestConfiguration, TestDebugRequest, TestOptions, TestResult
+from pants.rules.core.test import (
+    AddressAndTestResult,
+    BatchedTestResults,
+    Status,
+    TestBatchRequest,
+    TestConfiguration,
+    TestDebugRequest,
+    TestOptions,
+    TestResult,
+)
+from pants.util.ordered_set import FrozenOrderedSet
+
+
+@dataclass(frozen=True)
+class PythonTestBatchRequest(TestBatchRequest):
+    """A request to run Python tests, batching targets with the same requirements together."""
 
 
 @dataclass(frozen=True)
 class PythonTestConfiguration(TestConfiguration):
     required_fields = (PythonTestsSources,)
+    batch_request_cls = PythonTestBatchRequest
 
     sources: PythonTestsSources
     timeout: PythonTestsTimeout
     coverage: PythonCoverage
 
 
+@dataclass(frozen=True)
+class PythonTestBatch:
+    """Python test targets to run in a single pytest process."""
+
+    configs: Tuple[PythonTestConfiguration, ...]
+
+
 @dataclass(frozen=True)
 class TestTargetSetup:
     test_runner_pex: Pex
@@ -64,17 +91,43 @@ class TestTargetSetup:
     __test__ = False
 
 
-@rule
-async def setup_pytest_for_target(
+# NB: We set `--not-zip-safe` because Pytest plugin discovery, which uses
+# `importlib_metadata` and thus `zipp`, does not play nicely when doing import magic directly
+# from zip files. `zipp` has pathologically bad behavior with large zipfiles.
+# TODO: this does have a performance cost as the pex must now be expanded to disk. Long term,
+# it would be better to fix Zipp (whose fix would then need to be used by importlib_metadata
+# and then by Pytest). See https://github.com/jaraco/zipp/pull/26.
+_ADDITIONAL_ARGS_FOR_PYTEST = ("--not-zip-safe",)
+
+
+def _requirements_pex_request(addresses: Addresses) -> LegacyPexFromTargetsRequest:
+    return LegacyPexFromTargetsRequest(
+        addresses=addresses,
+        output_filename="requirements.pex",
+        include_source_files=False,
+        additional_args=_ADDITIONAL_ARGS_FOR_PYTEST,
+    )
+
+
+def _specified_source_files_request(
     config: PythonTestConfiguration,
-    pytest: PyTest,
-    test_options: TestOptions,
-    python_setup: PythonSetup,
+) -> SpecifiedSourceFilesRequest:
+    return SpecifiedSourceFilesRequest([(config.sources, config.origin)], strip_source_roots=True)
+
+
+@rule
+async def setup_pytest_for_target(config: PythonTestConfiguration) -> TestTargetSetup:
+    return await Get[TestTargetSetup](PythonTestBatch((config,)))
+
+
+@rule
+async def setup_pytest_for_batch(
+    batch: PythonTestBatch, pytest: PyTest, test_options: TestOptions, python_setup: PythonSetup,
 ) -> TestTargetSetup:
     # TODO: Rather than consuming the TestOptions subsystem, the TestRunner should pass on coverage
     # configuration via #7490.
 
-    test_addresses = Addresses((config.address,))
+    test_addresses = Addresses(config.address for config in batch.configs)
 
     # TODO(John Sirois): PexInterpreterConstraints are gathered in the same way by the
     #  `create_pex_from_target_closure` rule, factor up.
@@ -104,14 +157,6 @@ async def setup_pytest_for_target(
     # CreatePex requests.
     pex_request = functools.partial(PexRequest, interpreter_constraints=interpreter_constraints)
 
-    # NB: We set `--not-zip-safe` because Pytest plugin discovery, which uses
-    # `importlib_metadata` and thus `zipp`, does not play nicely when doing import magic directly
-    # from zip files. `zipp` has pathologically bad behavior with large zipfiles.
-    # TODO: this does have a performance cost as the pex must now be expanded to disk. Long term,
-    # it would be better to fix Zipp (whose fix would then need to be used by importlib_metadata
-    # and then by Pytest). See https://github.com/jaraco/zipp/pull/26.
-    additional_args_for_pytest = ("--not-zip-safe",)
-
     run_coverage = test_options.values.run_coverage
     plugin_file_digest: Optional[Digest] = (
         await Get[Digest](InputFilesContent, COVERAGE_PLUGIN_INPUT) if run_coverage else None
@@ -120,16 +165,11 @@ async def setup_pytest_for_target(
     pytest_pex_request = pex_request(
         output_filename="pytest.pex",
         requirements=PexRequirements(pytest.get_requirement_strings()),
-        additional_args=additional_args_for_pytest,
+        additional_args=_ADDITIONAL_ARGS_FOR_PYTEST,
         input_files_digest=plugin_file_digest,
     )
 
-    requirements_pex_request = LegacyPexFromTargetsRequest(
-        addresses=test_addresses,
-        output_filename="requirements.pex",
-        include_source_files=False,
-        additional_args=additional_args_for_pytest,
-    )
+    requirements_pex_request = _requirements_pex_request(test_addresses)
 
     test_runner_pex_request = pex_request(
         output_filename="test_runner.pex",
@@ -148,12 +188,6 @@ async def setup_pytest_for_target(
         ),
     )
 
-    # Get the file names for the test_target so that we can specify to Pytest precisely which files
-    # to test, rather than using auto-discovery.
-    specified_source_files_request = SpecifiedSourceFilesRequest(
-        [(config.sources, config.origin)], strip_source_roots=True
-    )
-
     # TODO(John Sirois): Support exploiting concurrency better:
     #   https://github.com/pantsbuild/pants/issues/9294
     # Some awkward code follows in order to execute 5-6 items concurrently given the current state
@@ -163,8 +197,13 @@ async def setup_pytest_for_target(
         Get[Pex](LegacyPexFromTargetsRequest, requirements_pex_request),
         Get[Pex](PexRequest, test_runner_pex_request),
         Get[ImportablePythonSources](Targets(python_targets + resource_targets)),
-        Get[SourceFiles](SpecifiedSourceFilesRequest, specified_source_files_request),
     ]
+    # Get the file names for each test target so that we can specify to Pytest precisely which
+    # files to test, rather than using auto-discovery.
+    requests.extend(
+        Get[SourceFiles](SpecifiedSourceFilesRequest, _specified_source_files_request(config))
+        for config in batch.configs
+    )
     if run_coverage:
         # TODO: update coverage to use the Target API. Also, add tests.
         hydrated_python_targets = await Get[HydratedTargets](
@@ -176,20 +215,10 @@ async def setup_pytest_for_target(
             ),
         )
 
-    (
-        pytest_pex,
-        requirements_pex,
-        test_runner_pex,
-        prepared_sources,
-        specified_source_files,
-        *rest,
-    ) = cast(
-        Union[
-            Tuple[Pex, Pex, Pex, ImportablePythonSources, SourceFiles],
-            Tuple[Pex, Pex, Pex, ImportablePythonSources, SourceFiles, Coveragerc],
-        ],
-        await MultiGet(requests),
+    pytest_pex, requirements_pex, test_runner_pex, prepared_sources, *rest = cast(
+        Tuple[Any, ...], await MultiGet(requests)
     )
+    all_specified_source_files = cast(Tuple[SourceFiles, ...], tuple(rest[: len(batch.configs)]))
 
     directories_to_merge = [
         prepared_sources.snapshot.directory_digest,
@@ -198,7 +227,7 @@ async def setup_pytest_for_target(
         test_runner_pex.directory_digest,
     ]
     if run_coverage:
-        coveragerc = rest[0]
+        coveragerc = cast(Coveragerc, rest[-1])
         directories_to_merge.append(coveragerc.digest)
 
     merged_input_files = await Get[Digest](
@@ -210,50 +239,268 @@ async def setup_pytest_for_target(
         coverage_args = [
             "--cov-report=",  # To not generate any output. https://pytest-cov.readthedocs.io/en/latest/config.html
         ]
-        for package in config.coverage.determine_packages_to_cover(
-            specified_source_files=specified_source_files
-        ):
+        packages_to_cover = FrozenOrderedSet(
+            itertools.chain.from_iterable(
+                config.coverage.determine_packages_to_cover(
+                    specified_source_files=specified_source_files
+                )
+                for config, specified_source_files in zip(
+                    batch.configs, all_specified_source_files
+                )
+            )
+        )
+        for package in packages_to_cover:
             coverage_args.extend(["--cov", package])
 
-    specified_source_file_names = sorted(specified_source_files.snapshot.files)
+    specified_source_file_names = sorted(
+        {
+            file_name
+            for specified_source_files in all_specified_source_files
+            for file_name in specified_source_files.snapshot.files
+        }
+    )
+    # A batch may run for as long as its targets would have run for one after another.
+    timeouts = [config.timeout.calculate_from_global_options(pytest) for config in batch.configs]
     return TestTargetSetup(
         test_runner_pex=test_runner_pex,
         args=(*pytest.options.args, *coverage_args, *specified_source_file_names),
         input_files_digest=merged_input_files,
-        timeout_seconds=config.timeout.calculate_from_global_options(pytest),
+        timeout_seconds=None if None in timeouts else sum(cast(List[int], timeouts)),
     )
 
 
-@named_rule(desc="Run pytest")
-async def run_python_test(
-    config: PythonTestConfiguration,
+def _pytest_execute_request(
     test_setup: TestTargetSetup,
+    *,
+    description: str,
     python_setup: PythonSetup,
     subprocess_encoding_environment: SubprocessEncodingEnvironment,
     global_options: GlobalOptions,
     test_options: TestOptions,
-) -> TestResult:
-    """Runs pytest for one target."""
+    additional_args: Tuple[str, ...] = (),
+    output_files: Optional[Tuple[str, ...]] = None,
+) -> ExecuteProcessRequest:
     env = {"PYTEST_ADDOPTS": f"--color={'yes' if global_options.options.colors else 'no'}"}
     run_coverage = test_options.values.run_coverage
-    request = test_setup.test_runner_pex.create_execute_request(
+    return test_setup.test_runner_pex.create_execute_request(
         python_setup=python_setup,
         subprocess_encoding_environment=subprocess_encoding_environment,
         pex_path=f"./{test_setup.test_runner_pex.output_filename}",
-        pex_args=test_setup.args,
+        pex_args=(*test_setup.args, *additional_args),
         input_files=test_setup.input_files_digest,
+        output_files=output_files,
         output_directories=(".coverage",) if run_coverage else None,
-        description=f"Run Pytest for {config.address.reference()}",
+        description=description,
         timeout_seconds=(
             test_setup.timeout_seconds if test_setup.timeout_seconds is not None else 9999
         ),
         env=env,
     )
+
+
+@named_rule(desc="Run pytest")
+async def run_python_test(
+    config: PythonTestConfiguration,
+    test_setup: TestTargetSetup,
+    python_setup: PythonSetup,
+    subprocess_encoding_environment: SubprocessEncodingEnvironment,
+    global_options: GlobalOptions,
+    test_options: TestOptions,
+) -> TestResult:
+    """Runs pytest for one target."""
+    request = _pytest_execute_request(
+        test_setup,
+        description=f"Run Pytest for {config.address.reference()}",
+        python_setup=python_setup,
+        subprocess_encoding_environment=subprocess_encoding_environment,
+        global_options=global_options,
+        test_options=test_options,
+    )
     result = await Get[FallibleExecuteProcessResult](ExecuteProcessRequest, request)
+    run_coverage = test_options.values.run_coverage
     coverage_data = PytestCoverageData(result.output_directory_digest) if run_coverage else None
     return TestResult.from_fallible_execute_process_result(result, coverage_data=coverage_data)
 
 
+_JUNIT_XML = "pytest-results.xml"
+
+
+def statuses_from_junit_xml(
+    junit_xml: Optional[bytes], test_modules: Dict[Address, Iterable[str]], *, exit_code: int,
+) -> Dict[Address, Status]:
+    """Determine the status of each target in a batch from pytest's junit XML report.
+
+    Test cases are attributed to targets by their dotted module names. A target fails if any of its
+    test cases failed or errored, or if it had no test cases at all (as pytest would when run for
+    just that target). Every target fails if the report is missing or unreadable, if pytest exited
+    with anything other than success or test failures, or if a failure cannot be attributed.
+
+    :param junit_xml: The content of the report, if one was written.
+    :param test_modules: The dotted module names of each target's test files.
+    :param exit_code: The exit code of the pytest process.
+    """
+    all_failed = {address: Status.FAILURE for address in test_modules}
+    if junit_xml is None or exit_code not in (0, 1):
+        return all_failed
+    try:
+        root = ElementTree.fromstring(junit_xml)
+    except ElementTree.ParseError:
+        return all_failed
+
+    address_by_module = {
+        module: address for address, modules in test_modules.items() for module in modules
+    }
+    ran = set()
+    failed = set()
+    for testcase in root.iter("testcase"):
+        # NB: Collection errors are reported with an empty classname, and the module as the name.
+        test_id = ".".join(
+            part for part in (testcase.get("classname"), testcase.get("name")) if part
+        )
+        owning_modules = [
+            module
+            for module in address_by_module
+            if test_id == module or test_id.startswith(f"{module}.")
+        ]
+        is_failure = any(testcase.find(tag) is not None for tag in ("failure", "error"))
+        if not owning_modules:
+            if is_failure:
+                return all_failed
+            continue
+        address = address_by_module[max(owning_modules, key=len)]
+        ran.add(address)
+        if is_failure:
+            failed.add(address)
+
+    return {
+        address: (
+            Status.SUCCESS if address in ran and address not in failed else Status.FAILURE
+        )
+        for address in test_modules
+    }
+
+
+@named_rule(desc="Run pytest for a batch of targets")
+async def run_python_test_batch(
+    batch: PythonTestBatch,
+    test_setup: TestTargetSetup,
+    python_setup: PythonSetup,
+    subprocess_encoding_environment: SubprocessEncodingEnvironment,
+    global_options: GlobalOptions,
+    test_options: TestOptions,
+) -> BatchedTestResults:
+    """Runs pytest once for several targets, and splits its report into a result per target."""
+    addresses = [config.address for config in batch.configs]
+    request = _pytest_execute_request(
+        test_setup,
+        description=(
+            f"Run Pytest for {len(addresses)} targets: "
+            f"{', '.join(address.reference() for address in addresses)}"
+        ),
+        python_setup=python_setup,
+        subprocess_encoding_environment=subprocess_encoding_environment,
+        global_options=global_options,
+        test_options=test_options,
+        # NB: One target failing to import should not prevent the other targets from running.
+        additional_args=("--continue-on-collection-errors", f"--junitxml={_JUNIT_XML}"),
+        output_files=(_JUNIT_XML,),
+    )
+    result = await Get[FallibleExecuteProcessResult](ExecuteProcessRequest, request)
+    all_specified_source_files = await MultiGet(
+        Get[SourceFiles](SpecifiedSourceFilesRequest, _specified_source_files_request(config))
+        for config in batch.configs
+    )
+    output_files = await Get[FilesContent](Digest, result.output_directory_digest)
+
+    junit_xml = next(
+        (file_content.content for file_content in output_files if file_content.path == _JUNIT_XML),
+        None,
+    )
+    test_modules = {
+        config.address: [
+            os.path.splitext(file_name)[0].replace(os.sep, ".")
+            for file_name in specified_source_files.snapshot.files
+        ]
+        for config, specified_source_files in zip(batch.configs, all_specified_source_files)
+    }
+    statuses = statuses_from_junit_xml(junit_xml, test_modules, exit_code=result.exit_code)
+
+    # The batch's output and coverage data can't be split between its targets, so they are
+    # reported for the first target.
+    run_coverage = test_options.values.run_coverage
+    first_address, *other_addresses = addresses
+    results = [
+        AddressAndTestResult(
+            first_address,
+            TestResult(
+                status=statuses[first_address],
+                stdout=result.stdout.decode(),
+                stderr=result.stderr.decode(),
+                coverage_data=(
+                    PytestCoverageData(result.output_directory_digest) if run_coverage else None
+                ),
+            ),
+        )
+    ]
+    results.extend(
+        AddressAndTestResult(
+            address,
+            TestResult(
+                status=statuses[address],
+                stdout=f"Ran in a batch with {first_address.reference()}: see its output.",
+                stderr="",
+            ),
+        )
+        for address in other_addresses
+    )
+    return BatchedTestResults(tuple(results))
+
+
+@named_rule(desc="Batch Python tests")
+async def run_python_test_batches(request: PythonTestBatchRequest) -> BatchedTestResults:
+    """Groups targets which can share a test runner, and runs each group in batches."""
+    configs = cast(Tuple[PythonTestConfiguration, ...], request.configs)
+    # NB: These are the same requests made to set up each target's own test runner, so computing
+    # them costs nothing more when a target ends up running alone.
+    requirements_pex_requests = await MultiGet(
+        Get[PexRequest](
+            LegacyPexFromTargetsRequest, _requirements_pex_request(Addresses((config.address,)))
+        )
+        for config in configs
+    )
+    compatible_configs: Dict[
+        Tuple[PexRequirements, PexInterpreterConstraints], List[PythonTestConfiguration]
+    ] = {}
+    for config, pex_request in zip(configs, requirements_pex_requests):
+        key = (pex_request.requirements, pex_request.interpreter_constraints)
+        compatible_configs.setdefault(key, []).append(config)
+
+    batches = [
+        tuple(group[i : i + request.max_batch_size])
+        for group in compatible_configs.values()
+        for i in range(0, len(group), request.max_batch_size)
+    ]
+    # Run lone targets exactly as they would be without batching, so that they share its cache.
+    unbatched_configs = [batch[0] for batch in batches if len(batch) == 1]
+    requests: List[Get[Any]] = [
+        Get[TestResult](TestConfiguration, config) for config in unbatched_configs
+    ]
+    requests.extend(
+        Get[BatchedTestResults](PythonTestBatch, PythonTestBatch(batch))
+        for batch in batches
+        if len(batch) > 1
+    )
+    all_results = await MultiGet(requests)
+
+    results = [
+        AddressAndTestResult(config.address, test_result)
+        for config, test_result in zip(unbatched_configs, all_results)
+    ]
+    for batched_results in all_results[len(unbatched_configs) :]:
+        results.extend(batched_results.results)
+    return BatchedTestResults(tuple(results))
+
+
 @named_rule(desc="Run pytest in an interactive process")
 async def debug_python_test(test_setup: TestTargetSetup) -> TestDebugRequest:
     run_request = InteractiveProcessRequest(
@@ -267,9 +514,13 @@ async def debug_python_test(test_setup: TestTargetSetup) -> TestDebugRequest:
 def rules():
     return [
         run_python_test,
+        run_python_test_batch,
+        run_python_test_batches,
         debug_python_test,
         setup_pytest_for_target,
+        setup_pytest_for_batch,
         UnionRule(TestConfiguration, PythonTestConfiguration),
+        UnionRule(TestBatchRequest, PythonTestBatchRequest),
         subsystem_rule(PyTest),
         subsystem_rule(PythonSetup),
     ]
@@ -0,0 +1,82 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from textwrap import dedent
+from typing import Dict, Iterable
+
+from pants.backend.python.rules.pytest_runner import statuses_from_junit_xml
+from pants.build_graph.address import Address
+from pants.rules.core.test import Status
+
+GOOD = Address.parse("tests/python/project:good")
+BAD = Address.parse("tests/python/project:bad")
+EMPTY = Address.parse("tests/python/project:empty")
+
+TEST_MODULES: Dict[Address, Iterable[str]] = {
+    GOOD: ["project.test_good", "project.test_good_class"],
+    BAD: ["project.test_bad"],
+}
+
+
+def junit_xml(*testcases: str) -> bytes:
+    return dedent(
+        """\
+        <?xml version="1.0" encoding="utf-8"?>
+        <testsuites><testsuite name="pytest">{}</testsuite></testsuites>
+        """
+    ).format("".join(testcases)).encode()
+
+
+PASSED = '<testcase classname="project.test_good" name="test_ok"/>'
+PASSED_IN_CLASS = '<testcase classname="project.test_good_class.TestGood" name="test_ok"/>'
+FAILED = (
+    '<testcase classname="project.test_bad" name="test_fail">'
+    '<failure message="assert False">assert False</failure></testcase>'
+)
+COLLECTION_ERROR = (
+    '<testcase classname="" name="project.test_bad">'
+    '<error message="collection failure">ImportError</error></testcase>'
+)
+
+
+def test_demultiplexes_statuses() -> None:
+    assert statuses_from_junit_xml(
+        junit_xml(PASSED, PASSED_IN_CLASS, FAILED), TEST_MODULES, exit_code=1
+    ) == {GOOD: Status.SUCCESS, BAD: Status.FAILURE}
+
+
+def test_collection_error() -> None:
+    assert statuses_from_junit_xml(
+        junit_xml(PASSED, COLLECTION_ERROR), TEST_MODULES, exit_code=1
+    ) == {GOOD: Status.SUCCESS, BAD: Status.FAILURE}
+
+
+def test_target_without_testcases_fails() -> None:
+    test_modules = {**TEST_MODULES, EMPTY: ["project.test_empty"]}
+    assert statuses_from_junit_xml(junit_xml(PASSED), test_modules, exit_code=0) == {
+        GOOD: Status.SUCCESS,
+        BAD: Status.FAILURE,
+        EMPTY: Status.FAILURE,
+    }
+
+
+def test_unattributed_failure_fails_all() -> None:
+    unattributed = FAILED.replace("project.test_bad", "other.test_bad")
+    statuses = statuses_from_junit_xml(junit_xml(PASSED, unattributed), TEST_MODULES, exit_code=1)
+    assert set(statuses.values()) == {Status.FAILURE}
+
+
+def test_unexpected_exit_code_fails_all() -> None:
+    statuses = statuses_from_junit_xml(junit_xml(PASSED), {GOOD: ["project.test_good"]}, exit_code=3)
+    assert statuses == {GOOD: Status.FAILURE}
+
+
+def test_missing_or_malformed_report_fails_all() -> None:
+    assert statuses_from_junit_xml(None, TEST_MODULES, exit_code=0) == {
+        GOOD: Status.FAILURE,
+        BAD: Status.FAILURE,
+    }
+    assert statuses_from_junit_xml(b"<testsuites", TEST_MODULES, exit_code=0) == {
+        GOOD: Status.FAILURE,
+        BAD: Status.FAILURE,
+    }
@@ -5,6 +5,7 @@ import logging
 import sys
 import termios
 import time
+import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Callable, Iterator, List, Mapping, Optional
@@ -13,6 +14,7 @@ from pants.base.exception_sink import ExceptionSink
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE, ExitCode, Exiter
 from pants.bin.local_pants_runner import LocalPantsRunner
 from pants.engine.rules import UnionMembership
+from pants.goal.run_tracker import RunTracker
 from pants.help.help_printer import HelpPrinter
 from pants.init.logging import encapsulated_global_logger
 from pants.init.specs_calculator import SpecsCalculator
@@ -24,8 +26,15 @@ from pants.java.nailgun_io import (
 )
 from pants.java.nailgun_protocol import ChunkType, MaybeShutdownSocket, NailgunProtocol
 from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.pantsd.pailgun_server import ConcurrentRequestDeclined
 from pants.pantsd.service.scheduler_service import SchedulerService
-from pants.util.contextutil import hermetic_environment_as, stdio_as
+from pants.subsystem.subsystem import Subsystem
+from pants.util.contextutil import (
+    hermetic_environment_as,
+    stdio_as,
+    thread_bound_stream,
+    thread_local_stdio_as,
+)
 from pants.util.socket import teardown_socket
 
 logger = logging.getLogger(__name__)
@@ -135,25 +144,31 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
     env: The environment (i.e. os.environ) for this run.
     services: The PantsServices that are currently running.
     scheduler_service: The SchedulerService that holds the warm graph.
+    concurrent: Whether this run was admitted to run concurrently with other runs. Concurrent runs
+      must leave process-wide state (stdio file descriptors, the environment, global exiters and
+      loggers, v1 global state) untouched, and raise `ConcurrentRequestDeclined` instead of running
+      if their options turn out to require any of it.
     """
 
     maybe_shutdown_socket: MaybeShutdownSocket
     args: List[str]
     env: Mapping[str, str]
     scheduler_service: SchedulerService
+    concurrent: bool = False
 
     @classmethod
-    def create(cls, sock, args, env, scheduler_service):
+    def create(cls, sock, args, env, scheduler_service, concurrent=False):
         return cls(
             maybe_shutdown_socket=MaybeShutdownSocket(sock),
             args=args,
             env=env,
             scheduler_service=scheduler_service,
+            concurrent=concurrent,
         )
 
     @classmethod
     @contextmanager
-    def _tty_stdio(cls, env):
+    def _tty_stdio(cls, env, thread_local=False):
         """Handles stdio redirection in the case of all stdio descriptors being the same tty."""
         # If all stdio is a tty, there's only one logical I/O device (the tty device). This happens to
         # be addressable as a file in OSX and Linux, so we take advantage of that and directly open the
@@ -169,7 +184,8 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
         )
         with open(stdin_ttyname, "rb+", 0) as tty:
             tty_fileno = tty.fileno()
-            with stdio_as(stdin_fd=tty_fileno, stdout_fd=tty_fileno, stderr_fd=tty_fileno):
+            redirect_stdio = thread_local_stdio_as if thread_local else stdio_as
+            with redirect_stdio(stdin_fd=tty_fileno, stdout_fd=tty_fileno, stderr_fd=tty_fileno):
 
                 def finalizer():
                     termios.tcdrain(tty_fileno)
@@ -179,7 +195,13 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
     @classmethod
     @contextmanager
     def _pipe_stdio(
-        cls, maybe_shutdown_socket, stdin_isatty, stdout_isatty, stderr_isatty, handle_stdin
+        cls,
+        maybe_shutdown_socket,
+        stdin_isatty,
+        stdout_isatty,
+        stderr_isatty,
+        handle_stdin,
+        thread_local=False,
     ):
         """Handles stdio redirection in the case of pipes and/or mixed pipes and ttys."""
         stdio_writers = ((ChunkType.STDOUT, stdout_isatty), (ChunkType.STDERR, stderr_isatty))
@@ -194,15 +216,17 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
                 with open("/dev/null", "rb") as fh:
                     yield fh.fileno()
 
+        redirect_stdio = thread_local_stdio_as if thread_local else stdio_as
+
         # TODO https://github.com/pantsbuild/pants/issues/7653
         with maybe_handle_stdin(handle_stdin) as stdin_fd, PipedNailgunStreamWriter.open_multi(
             maybe_shutdown_socket.socket, types, ttys
-        ) as ((stdout_pipe, stderr_pipe), writer), stdio_as(
+        ) as ((stdout_pipe, stderr_pipe), writer), redirect_stdio(
             stdout_fd=stdout_pipe.write_fd, stderr_fd=stderr_pipe.write_fd, stdin_fd=stdin_fd
         ):
             # N.B. This will be passed to and called by the `DaemonExiter` prior to sending an
             # exit chunk, to avoid any socket shutdown vs write races.
-            stdout, stderr = sys.stdout, sys.stderr
+            stdout, stderr = thread_bound_stream(sys.stdout), thread_bound_stream(sys.stderr)
 
             def finalizer():
                 try:
@@ -222,22 +246,114 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
 
     @classmethod
     @contextmanager
-    def nailgunned_stdio(cls, sock, env, handle_stdin=True):
-        """Redirects stdio to the connected socket speaking the nailgun protocol."""
+    def nailgunned_stdio(cls, sock, env, handle_stdin=True, thread_local=False):
+        """Redirects stdio to the connected socket speaking the nailgun protocol.
+
+        :param bool thread_local: Whether to redirect stdio for the calling thread only.
+        """
         # Determine output tty capabilities from the environment.
         stdin_isatty, stdout_isatty, stderr_isatty = NailgunProtocol.isatty_from_env(env)
         is_tty_capable = all((stdin_isatty, stdout_isatty, stderr_isatty))
 
         if is_tty_capable:
-            with cls._tty_stdio(env) as finalizer:
+            with cls._tty_stdio(env, thread_local=thread_local) as finalizer:
                 yield finalizer
         else:
             with cls._pipe_stdio(
-                sock, stdin_isatty, stdout_isatty, stderr_isatty, handle_stdin
+                sock,
+                stdin_isatty,
+                stdout_isatty,
+                stderr_isatty,
+                handle_stdin,
+                thread_local=thread_local,
             ) as finalizer:
                 yield finalizer
 
+    @staticmethod
+    def _can_run_concurrently(options) -> bool:
+        """Whether a run with the given options may run alongside other runs in pantsd.
+
+        Only v2 runs of `--pantsd-concurrent-goals` qualify, since v1 goals rely on process-wide
+        state. Runs which render the v2 UI, loop, or run interactive processes in the foreground
+        (which inherit the process-wide stdio) are excluded too. So are runs which request reports
+        that are produced by the process-wide RunTracker, or a rule profile, which is recorded for
+        the whole process.
+        """
+        global_options = options.for_global_scope()
+        if (
+            options.help_request
+            or global_options.v1
+            or global_options.get("v2_ui")
+            or global_options.get("loop")
+            or global_options.rule_profile_file is not None
+        ):
+            return False
+        reporting_options = options.for_scope("reporting")
+        if reporting_options.chrome_trace_file is not None or reporting_options.zipkin_endpoint:
+            return False
+        run_tracker_options = options.for_scope("run-tracker")
+        if run_tracker_options.stats_upload_urls or run_tracker_options.stats_local_json_file:
+            return False
+        concurrent_goals = set(global_options.pantsd_concurrent_goals)
+        return bool(options.goals) and all(
+            goal in concurrent_goals and not options.for_scope(goal).get("debug")
+            for goal in options.goals
+        )
+
+    def _run_concurrently(self):
+        # Subsystems are initialized with the options of the runs which hold the process
+        # exclusively, and are only consulted by v2 rules for bootstrap options (which are fixed for
+        # the life of pantsd). Until an exclusive run has initialized them, there is nothing to
+        # share.
+        if not Subsystem.is_initialized():
+            raise ConcurrentRequestDeclined("Subsystems have not been initialized yet.")
+        try:
+            options_bootstrapper = OptionsBootstrapper.create(args=self.args, env=self.env)
+            # N.B. The process-wide subsystem options belong to the exclusive runs: don't clobber
+            # them.
+            options, _ = LocalPantsRunner.parse_options(options_bootstrapper, init_subsystems=False)
+        except Exception as e:
+            # Let the exclusive run report the error.
+            raise ConcurrentRequestDeclined(f"Failed to parse options: {e!r}")
+        if not self._can_run_concurrently(options):
+            raise ConcurrentRequestDeclined("The requested goals cannot run concurrently.")
+
+        with self.nailgunned_stdio(
+            self.maybe_shutdown_socket, self.env, handle_stdin=False, thread_local=True
+        ) as finalizer:
+            # N.B. The global exiter belongs to the runs which hold the process exclusively, so this
+            # run exits via its own.
+            exiter = DaemonExiter(self.maybe_shutdown_socket, finalizer, previous_exiter=None)
+            try:
+                global_options = options.for_global_scope()
+                # The RunTracker is process-wide, so identify this run independently of it.
+                build_id = RunTracker.make_run_id(time.time(), uuid.uuid4().hex)
+                session = self.scheduler_service.prepare_graph(options, build_id=build_id)
+                specs = SpecsCalculator.create(
+                    options=options,
+                    session=session.scheduler_session,
+                    exclude_patterns=tuple(global_options.exclude_target_regexp),
+                    tags=tuple(global_options.tag) if global_options.tag else (),
+                )
+                exit_code = self.scheduler_service.graph_run_v2(
+                    session, specs, options, options_bootstrapper
+                )
+            except KeyboardInterrupt:
+                exiter.exit_and_fail("Interrupted by user.\n")
+            except Exception as e:
+                logger.exception("Concurrent pants run failed")
+                error_msgs = (
+                    e.end_user_messages() if hasattr(e, "end_user_messages") else [str(e)]
+                )
+                exiter.exit_and_fail("".join(f"\nERROR: {msg}" for msg in error_msgs) + "\n")
+            else:
+                exiter.exit(exit_code)
+
     def run(self):
+        if self.concurrent:
+            self._run_concurrently()
+            return
+
         # Ensure anything referencing sys.argv inherits the Pailgun'd args.
         sys.argv = self.args
 
@@ -252,14 +368,17 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
 
             exit_code = PANTS_SUCCEEDED_EXIT_CODE
             try:
-                # Clean global state.
-                clean_global_runtime_state(reset_subsystem=True)
+                # Clean global state, but keep the backends and plugins loaded by previous runs (or
+                # pantsd startup) warm.
+                clean_global_runtime_state(reset_subsystem=True, reset_build_config=False)
 
                 options_bootstrapper = OptionsBootstrapper.create(args=self.args, env=self.env)
                 options, build_config = LocalPantsRunner.parse_options(options_bootstrapper)
 
                 global_options = options.for_global_scope()
-                session = self.scheduler_service.prepare_graph(options)
+                # The RunTracker is process-wide, so identify this run independently of it.
+                build_id = RunTracker.make_run_id(time.time(), uuid.uuid4().hex)
+                session = self.scheduler_service.prepare_graph(options, build_id=build_id)
 
                 specs = SpecsCalculator.create(
                     options=options,
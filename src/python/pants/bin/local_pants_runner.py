@@ -1,6 +1,7 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import json
 import logging
 import os
 from contextlib import contextmanager
@@ -31,6 +32,7 @@ from pants.reporting.reporting import Reporting
 from pants.reporting.streaming_workunit_handler import StreamingWorkunitHandler
 from pants.subsystem.subsystem import Subsystem
 from pants.util.contextutil import maybe_profiled
+from pants.util.dirutil import safe_mkdir_for
 
 logger = logging.getLogger(__name__)
 
@@ -125,10 +127,12 @@ class LocalPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
 
     @staticmethod
     def parse_options(
-        options_bootstrapper: OptionsBootstrapper,
+        options_bootstrapper: OptionsBootstrapper, init_subsystems: bool = True,
     ) -> Tuple[Options, BuildConfiguration]:
         build_config = BuildConfigInitializer.get(options_bootstrapper)
-        options = OptionsInitializer.create(options_bootstrapper, build_config)
+        options = OptionsInitializer.create(
+            options_bootstrapper, build_config, init_subsystems=init_subsystems
+        )
         return options, build_config
 
     @staticmethod
@@ -144,7 +148,11 @@ class LocalPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
         )
 
         v2_ui = options.for_global_scope().get("v2_ui", False)
-        zipkin_trace_v2 = options.for_scope("reporting").zipkin_trace_v2
+        reporting_options = options.for_scope("reporting")
+        # The engine records the workunits it reports to Zipkin for the Chrome trace too.
+        zipkin_trace_v2 = (
+            reporting_options.zipkin_trace_v2 or reporting_options.chrome_trace_file is not None
+        )
         # TODO(#8658) This should_report_workunits flag must be set to True for
         # StreamingWorkunitHandler to receive WorkUnits. It should eventually
         # be merged with the zipkin_trace_v2 flag, since they both involve most
@@ -156,6 +164,7 @@ class LocalPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
             RunTracker.global_instance().run_id,
             v2_ui,
             should_report_workunits=stream_workunits,
+            should_profile_rules=options.for_global_scope().rule_profile_file is not None,
         )
 
     @classmethod
@@ -314,6 +323,25 @@ class LocalPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
         engine_workunits = scheduler_session.engine_workunits(metrics)
         if engine_workunits:
             self._run_tracker.report.bulk_record_workunits(engine_workunits)
+        self._maybe_write_rule_profile(metrics)
+
+    def _maybe_write_rule_profile(self, metrics):
+        rule_profiler = self.graph_session.scheduler_session.end_rule_profiling(metrics)
+        if rule_profiler is None:
+            return
+        rule_profile_file = self.options.for_global_scope().rule_profile_file
+        if rule_profiler.decline_reason is not None:
+            logger.warning(
+                f"Not writing a rule profile to {rule_profile_file}: "
+                f"{rule_profiler.decline_reason}."
+            )
+            return
+        logger.info(
+            f"Rule profile, also written to {rule_profile_file}:\n{rule_profiler.format_table()}"
+        )
+        safe_mkdir_for(rule_profile_file)
+        with open(rule_profile_file, "w") as f:
+            json.dump(rule_profiler.to_json_dict(), f, indent=2, sort_keys=True)
 
     def run(self):
         global_options = self.options.for_global_scope()
@@ -6,7 +6,7 @@ import typing
 from collections import namedtuple
 from collections.abc import Iterable
 from dataclasses import dataclass, field
-from typing import Any, Dict, Type, Union
+from typing import Any, Callable, Dict, List, Tuple, Type, Union
 
 from pants.base.parse_context import ParseContext
 from pants.build_graph.addressable import AddressableCallProxy
@@ -16,7 +16,7 @@ from pants.engine.rules import RuleIndex
 from pants.engine.target import Target
 from pants.option.optionable import Optionable
 from pants.util.memo import memoized_method
-from pants.util.ordered_set import OrderedSet
+from pants.util.ordered_set import FrozenOrderedSet, OrderedSet
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +33,9 @@ class BuildConfiguration:
     _rules: OrderedSet = field(default_factory=OrderedSet)
     _union_rules: Dict[Type, OrderedSet[Type]] = field(default_factory=dict)
     _targets: OrderedSet[Type[Target]] = field(default_factory=OrderedSet)
+    _deferred_goal_registrations: List[Tuple[Tuple[str, ...], Callable[[], None]]] = field(
+        default_factory=list
+    )
 
     class ParseState(namedtuple("ParseState", ["parse_context", "parse_globals"])):
         @property
@@ -146,6 +149,31 @@ class BuildConfiguration:
         """
         return self._optionables
 
+    def register_deferred_goals(self, goals, register_goals):
+        """Registers a callable which installs v1 tasks into the given goals, to be called only once
+        v1 goals are needed.
+
+        Deferred registrations are all made at once, in the order they were deferred, by
+        `load_deferred_goals`.
+
+        :param goals: The names of the goals that `register_goals` installs tasks into.
+        :param register_goals: A zero-arg callable which installs the tasks.
+        """
+        self._deferred_goal_registrations.append((tuple(goals), register_goals))
+
+    def deferred_goals(self) -> FrozenOrderedSet[str]:
+        """Returns the names of the goals with deferred task registrations."""
+        return FrozenOrderedSet(
+            goal for goals, _ in self._deferred_goal_registrations for goal in goals
+        )
+
+    def load_deferred_goals(self) -> None:
+        """Makes all deferred task registrations."""
+        registrations = self._deferred_goal_registrations
+        self._deferred_goal_registrations = []
+        for _, register_goals in registrations:
+            register_goals()
+
     def register_rules(self, rules):
         """Registers the given rules.
 
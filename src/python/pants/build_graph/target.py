@@ -62,9 +62,7 @@ class Target(AbstractTarget):
     """
 
     class RecursiveDepthError(AddressLookupError):
-        """Raised when there are too many recursive calls to calculate the fingerprint."""
-
-    _MAX_RECURSION_DEPTH = 250
+        """Raised when a dependency cycle prevents calculating the fingerprint."""
 
     class WrongNumberOfAddresses(Exception):
         """Internal error, too many elements in Addresses.
@@ -475,60 +473,101 @@ class Target(AbstractTarget):
 
         :param FingerprintStrategy fingerprint_strategy: optional fingerprint strategy to use to compute
         the fingerprint of a target
+        :param int depth: Unused: retained for compatibility with callers that pass it.
         :return: A fingerprint representing this target and all of its dependencies.
           The return value can be `None`, indicating that this target and all of its transitive dependencies
           did not contribute to the fingerprint, according to the provided FingerprintStrategy.
         :rtype: string
         """
-        if depth > self._MAX_RECURSION_DEPTH:
-            # NB(zundel) without this catch, we'll eventually hit the python stack limit
-            # RuntimeError: maximum recursion depth exceeded while calling a Python object
-            raise self.RecursiveDepthError(
-                "Max depth of {} exceeded.".format(self._MAX_RECURSION_DEPTH)
-            )
-
         fingerprint_strategy = fingerprint_strategy or DefaultFingerprintStrategy()
 
-        direct = depth == 0 and fingerprint_strategy.direct(self)
-        if direct:
+        if fingerprint_strategy.direct(self):
             fingerprint_map = self._cached_direct_transitive_fingerprint_map
-        else:
-            fingerprint_map = self._cached_all_transitive_fingerprint_map
-
-        if fingerprint_strategy not in fingerprint_map:
-            hasher = sha1()
-
-            def dep_hash_iter():
-                dep_list = fingerprint_strategy.dependencies(self) if direct else self.dependencies
-                for dep in dep_list:
-                    try:
-                        if direct:
-                            dep_hash = dep.invalidation_hash(fingerprint_strategy)
-                        else:
-                            dep_hash = dep.transitive_invalidation_hash(
-                                fingerprint_strategy, depth=depth + 1
-                            )
-                        if dep_hash is not None:
-                            yield dep_hash
-                    except self.RecursiveDepthError as e:
-                        raise self.RecursiveDepthError(
-                            "{message}\n  referenced from {spec}".format(
-                                message=e, spec=dep.address.spec
+            if fingerprint_strategy not in fingerprint_map:
+                dep_hashes = [
+                    dep.invalidation_hash(fingerprint_strategy)
+                    for dep in fingerprint_strategy.dependencies(self)
+                ]
+                fingerprint_map[fingerprint_strategy] = self._combine_invalidation_hashes(
+                    fingerprint_strategy, dep_hashes
+                )
+            return fingerprint_map[fingerprint_strategy]
+
+        self.compute_transitive_invalidation_hashes([self], fingerprint_strategy)
+        return self._cached_all_transitive_fingerprint_map[fingerprint_strategy]
+
+    @classmethod
+    def compute_transitive_invalidation_hashes(cls, targets, fingerprint_strategy=None):
+        """Memoize the (non-direct) transitive invalidation hashes of targets and their closure.
+
+        Hashes are computed bottom-up in a single iterative post-order walk of the dependency graph,
+        so deep graphs don't exhaust the stack, and each target is hashed once per fingerprint
+        strategy no matter how many dependees it has. Targets hashed previously with an equal
+        strategy are not walked again.
+
+        :API: public
+
+        :param targets: The targets to hash.
+        :param FingerprintStrategy fingerprint_strategy: optional fingerprint strategy to use to
+          compute the fingerprints of the targets.
+        :raises: :class:`Target.RecursiveDepthError` if the targets depend on a cycle.
+        """
+        fingerprint_strategy = fingerprint_strategy or DefaultFingerprintStrategy()
+
+        def is_hashed(target):
+            return fingerprint_strategy in target._cached_all_transitive_fingerprint_map
+
+        # The targets on the current path from a root, in order, for cycle detection.
+        path = []
+        on_path = set()
+        for root in targets:
+            if is_hashed(root):
+                continue
+            # Each frame is a target and an iterator over its remaining dependencies.
+            stack = [(root, iter(root.dependencies))]
+            path.append(root)
+            on_path.add(root)
+            while stack:
+                target, deps = stack[-1]
+                for dep in deps:
+                    if is_hashed(dep):
+                        continue
+                    if dep in on_path:
+                        cycle = path[path.index(dep) :] + [dep]
+                        raise cls.RecursiveDepthError(
+                            "Dependency cycle detected: {}".format(
+                                " -> ".join(t.address.spec for t in cycle)
                             )
                         )
-
-            dep_hashes = sorted(list(dep_hash_iter()))
-            for dep_hash in dep_hashes:
-                hasher.update(dep_hash.encode())
-            target_hash = self.invalidation_hash(fingerprint_strategy)
-            if target_hash is None and not dep_hashes:
-                return None
-            dependencies_hash = hasher.hexdigest()[:12]
-            combined_hash = "{target_hash}.{deps_hash}".format(
-                target_hash=target_hash, deps_hash=dependencies_hash
-            )
-            fingerprint_map[fingerprint_strategy] = combined_hash
-        return fingerprint_map[fingerprint_strategy]
+                    stack.append((dep, iter(dep.dependencies)))
+                    path.append(dep)
+                    on_path.add(dep)
+                    break
+                else:
+                    # All of the target's dependencies are hashed.
+                    stack.pop()
+                    path.pop()
+                    on_path.remove(target)
+                    dep_hashes = [
+                        dep._cached_all_transitive_fingerprint_map[fingerprint_strategy]
+                        for dep in target.dependencies
+                    ]
+                    target._cached_all_transitive_fingerprint_map[
+                        fingerprint_strategy
+                    ] = target._combine_invalidation_hashes(fingerprint_strategy, dep_hashes)
+
+    def _combine_invalidation_hashes(self, fingerprint_strategy, dep_hashes):
+        dep_hashes = sorted(dep_hash for dep_hash in dep_hashes if dep_hash is not None)
+        target_hash = self.invalidation_hash(fingerprint_strategy)
+        if target_hash is None and not dep_hashes:
+            return None
+        hasher = sha1()
+        for dep_hash in dep_hashes:
+            hasher.update(dep_hash.encode())
+        dependencies_hash = hasher.hexdigest()[:12]
+        return "{target_hash}.{deps_hash}".format(
+            target_hash=target_hash, deps_hash=dependencies_hash
+        )
 
     def mark_transitive_invalidation_hash_dirty(self):
         """
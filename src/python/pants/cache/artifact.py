@@ -1,11 +1,31 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import errno
+import fcntl
+import hashlib
+import json
 import os
 import shutil
+import time
+import uuid
+from contextlib import contextmanager
 
+from pants.cache.artifact_codec import (
+    GZIP,
+    detect_codec_for_file,
+    open_tarball_for_read,
+    open_tarball_for_write,
+)
 from pants.util.contextutil import open_tar
-from pants.util.dirutil import safe_mkdir, safe_mkdir_for, safe_walk
+from pants.util.dirutil import (
+    safe_concurrent_creation,
+    safe_delete,
+    safe_mkdir,
+    safe_mkdir_for,
+    safe_walk,
+    touch,
+)
 
 
 class ArtifactError(Exception):
@@ -82,41 +102,393 @@ class TarballArtifact(Artifact):
     # TODO: Expose `dereference` for tasks.
     # https://github.com/pantsbuild/pants/issues/3961
     def __init__(
-        self, artifact_root, artifact_extraction_root, tarfile_, compression=9, dereference=True
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        tarfile_,
+        compression=9,
+        dereference=True,
+        codec=GZIP,
     ):
+        """
+        :param ArtifactCodec codec: The codec with which to compress collected artifacts. The codec
+                                    of an existing artifact is detected when it is extracted.
+        """
         super().__init__(artifact_root)
         self.artifact_extraction_root = artifact_extraction_root
         self._tarfile = tarfile_
         self._compression = compression
         self._dereference = dereference
+        self._codec = codec
 
     def exists(self):
         return os.path.isfile(self._tarfile)
 
     def collect(self, paths):
-        # In our tests, gzip is slightly less compressive than bzip2 on .class files,
-        # but decompression times are much faster.
-        mode = "w:gz"
-
         tar_kwargs = {
             "dereference": self._dereference,
             "errorlevel": 2,
-            "compresslevel": self._compression,
         }
 
-        with open_tar(self._tarfile, mode, **tar_kwargs) as tarout:
-            for path in paths or ():
-                # Adds dirs recursively.
-                relpath = os.path.relpath(path, self._artifact_root)
-                tarout.add(path, relpath)
-                self._relpaths.add(relpath)
+        if self._codec is GZIP:
+            # In our tests, gzip is slightly less compressive than bzip2 on .class files,
+            # but decompression times are much faster.
+            with open_tar(
+                self._tarfile, "w:gz", compresslevel=self._compression, **tar_kwargs
+            ) as tarout:
+                self._add_paths(tarout, paths)
+        else:
+            with open(self._tarfile, "wb") as fp:
+                with open_tarball_for_write(
+                    fp, self._codec, self._compression, **tar_kwargs
+                ) as tarout:
+                    self._add_paths(tarout, paths)
+
+    def _add_paths(self, tarout, paths):
+        for path in paths or ():
+            # Adds dirs recursively.
+            relpath = os.path.relpath(path, self._artifact_root)
+            tarout.add(path, relpath)
+            self._relpaths.add(relpath)
 
     def extract(self):
         # Note(yic): unlike the python implementation before, now we do not update self._relpath
         # after the extraction.
+        try:
+            codec = detect_codec_for_file(self._tarfile)
+        except OSError as e:
+            raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+        if codec is not GZIP:
+            # The native extractor only supports gzip.
+            with open(self._tarfile, "rb") as fp:
+                self.extract_stream(fp)
+            return
         try:
             self.NATIVE_BINARY.decompress_tarball(
                 self._tarfile.encode(), self.artifact_extraction_root.encode()
             )
         except Exception as e:
             raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+
+    def extract_stream(self, fileobj):
+        """Extract the tarball read sequentially from the given buffered binary file object.
+
+        Unlike `extract`, this does not require the tarball to exist on disk, so it may be used to
+        extract an artifact while it is still being downloaded. The codec is auto-detected.
+        """
+        try:
+            with open_tarball_for_read(fileobj, errorlevel=2) as tar:
+                for member in tar:
+                    normpath = os.path.normpath(member.name)
+                    if os.path.isabs(normpath) or normpath == ".." or normpath.startswith("../"):
+                        raise ArtifactError(
+                            "Artifact path escapes the artifact root: {}".format(member.name)
+                        )
+                    tar.extract(member, path=self.artifact_extraction_root)
+        except ArtifactError:
+            raise
+        except Exception as e:
+            raise ArtifactError("Extracting artifact stream failed:\n{}".format(e))
+
+
+class BlobStore:
+    """A directory of immutable files, each named by the sha256 digest of its content.
+
+    Blobs are shared by every artifact that references them, so a file produced identically by
+    many targets is only stored (and read from disk) once. Blobs which are no longer referenced by
+    any artifact are deleted by `collect_garbage`.
+    """
+
+    _CHUNK_SIZE = 64 * 1024
+
+    _LOCK_FILENAME = ".lock"
+    _LAST_COLLECTION_FILENAME = ".last_collection"
+
+    def __init__(self, root, permissions=None):
+        """
+        :param str root: The directory under which blobs are stored.
+        :param int permissions: File permissions to use when creating blobs.
+        """
+        self._root = root
+        self._permissions = permissions
+        safe_mkdir(self._root)
+
+    def path_for(self, digest):
+        # Shard by a digest prefix to keep directory sizes manageable.
+        return os.path.join(self._root, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.isfile(self.path_for(digest))
+
+    def store_file(self, path):
+        """Store the file at the given path, if its content is not already present.
+
+        :returns: The digest of the file's content.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as fp:
+            for chunk in iter(lambda: fp.read(self._CHUNK_SIZE), b""):
+                digest.update(chunk)
+        hexdigest = digest.hexdigest()
+        if not self.has(hexdigest):
+            self._store(hexdigest, lambda tmp_path: shutil.copyfile(path, tmp_path))
+        return hexdigest
+
+    def store_stream(self, fp):
+        """Store the content of the given binary file object, if not already present.
+
+        The stream is consumed exactly once, so this is suitable for members of a tarball.
+
+        :returns: The digest of the stream's content.
+        """
+        digest = hashlib.sha256()
+        tmp_path = os.path.join(self._root, "tmp.{}".format(uuid.uuid4().hex))
+        try:
+            with open(tmp_path, "wb") as out:
+                for chunk in iter(lambda: fp.read(self._CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+            hexdigest = digest.hexdigest()
+            if not self.has(hexdigest):
+                self._store(hexdigest, lambda blob_tmp_path: os.rename(tmp_path, blob_tmp_path))
+            return hexdigest
+        finally:
+            safe_delete(tmp_path)
+
+    def materialize(self, digest, dest, mode=None, hardlink=False):
+        """Create `dest` with the content of the given blob.
+
+        :param int mode: Permission bits for `dest`. Ignored when hardlinking, since the blob's
+                         inode is shared.
+        :param bool hardlink: Hardlink `dest` to the blob rather than copying it, falling back to a
+                              copy if the link cannot be created (e.g., across devices).
+        """
+        blob = self.path_for(digest)
+        if not os.path.isfile(blob):
+            raise ArtifactError("Missing blob {} for {}".format(digest, dest))
+        safe_mkdir_for(dest)
+        safe_delete(dest)
+        if hardlink:
+            try:
+                os.link(blob, dest)
+                return
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+        shutil.copyfile(blob, dest)
+        if mode is not None:
+            os.chmod(dest, mode)
+
+    @contextmanager
+    def referencing(self):
+        """A context in which blobs may be stored without being collected as garbage.
+
+        `collect_garbage` only sees the blobs referenced by manifests which exist, so this must be
+        held from storing the blobs of an artifact until its manifest is in place.
+        """
+        with self._locked(fcntl.LOCK_SH):
+            yield
+
+    def collection_due(self, interval_secs):
+        """Whether at least interval_secs have passed since the store was last garbage collected."""
+        try:
+            last_collection = os.path.getmtime(
+                os.path.join(self._root, self._LAST_COLLECTION_FILENAME)
+            )
+        except OSError:
+            return True
+        return time.time() - last_collection >= interval_secs
+
+    def collect_garbage(self, find_live_digests):
+        """Delete every blob which is not referenced by a manifest.
+
+        Collection is skipped rather than waiting if blobs are being stored by any process.
+
+        :param find_live_digests: A function returning the digests of the blobs referenced by all
+                                  the manifests which use this store. It is called while no blobs
+                                  may be stored.
+        :returns: The number of bytes freed, or None if collection was skipped.
+        """
+        try:
+            with self._locked(fcntl.LOCK_EX | fcntl.LOCK_NB):
+                touch(os.path.join(self._root, self._LAST_COLLECTION_FILENAME))
+                live_digests = find_live_digests()
+                freed = 0
+                for shard in os.listdir(self._root):
+                    shard_dir = os.path.join(self._root, shard)
+                    if shard.startswith(".") or not os.path.isdir(shard_dir):
+                        continue
+                    for digest in os.listdir(shard_dir):
+                        if digest not in live_digests:
+                            blob = os.path.join(shard_dir, digest)
+                            freed += os.path.getsize(blob)
+                            safe_delete(blob)
+                return freed
+        except BlockingIOError:
+            return None
+
+    @contextmanager
+    def _locked(self, operation):
+        # flock locks belong to an open file, so each holder opens the lock file itself.
+        with open(os.path.join(self._root, self._LOCK_FILENAME), "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _store(self, digest, write):
+        blob = self.path_for(digest)
+        with safe_concurrent_creation(blob) as tmp_path:
+            write(tmp_path)
+        if self._permissions:
+            os.chmod(blob, self._permissions)
+
+
+class ManifestArtifact(Artifact):
+    """An artifact stored as a manifest of content-addressed blobs in a shared BlobStore.
+
+    The manifest is a small json file mapping each relpath in the artifact to the digest of its
+    content, so collecting and extracting artifacts skips any file content already in the store.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        manifest,
+        blob_store,
+        dereference=True,
+        hardlink=False,
+    ):
+        """
+        :param str manifest: The path of the manifest file for this artifact.
+        :param BlobStore blob_store: The store holding the content of the artifact's files.
+        :param bool dereference: Store the content of symlink targets rather than the symlinks.
+        :param bool hardlink: Hardlink extracted files to their blobs instead of copying them.
+        """
+        super().__init__(artifact_root)
+        self.artifact_extraction_root = artifact_extraction_root
+        self._manifest = manifest
+        self._blob_store = blob_store
+        self._dereference = dereference
+        self._hardlink = hardlink
+
+    @staticmethod
+    def referenced_digests(manifest):
+        """Return the digests of the blobs referenced by the manifest at the given path.
+
+        A manifest which is missing or unreadable references nothing, since it cannot be extracted.
+        """
+        try:
+            with open(manifest, "r") as fp:
+                return {entry["digest"] for entry in json.load(fp)["files"]}
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return set()
+
+    def exists(self):
+        return os.path.isfile(self._manifest)
+
+    def collect(self, paths):
+        files, dirs, symlinks = [], [], []
+
+        def add(path):
+            relpath = os.path.relpath(path, self._artifact_root)
+            if os.path.islink(path) and not self._dereference:
+                symlinks.append({"path": relpath, "target": os.readlink(path)})
+            elif os.path.isdir(path):
+                dirs.append(relpath)
+            else:
+                digest = self._blob_store.store_file(path)
+                mode = os.stat(path).st_mode & 0o777
+                files.append({"path": relpath, "digest": digest, "mode": mode})
+
+        for path in paths or ():
+            add(path)
+            if os.path.isdir(path) and (self._dereference or not os.path.islink(path)):
+                # Adds dirs recursively, like `tarfile.add`.
+                for dir_name, dir_names, file_names in safe_walk(
+                    path, followlinks=self._dereference
+                ):
+                    for name in sorted(dir_names) + sorted(file_names):
+                        add(os.path.join(dir_name, name))
+            self._relpaths.add(os.path.relpath(path, self._artifact_root))
+
+        self._write_manifest(files, dirs, symlinks)
+
+    def collect_from_tarball(self, tarball):
+        """Populate this artifact from an existing tarball, as produced by TarballArtifact."""
+        files, dirs, symlinks = [], [], []
+        try:
+            with open(tarball, "rb") as fp, open_tarball_for_read(fp) as tar:
+                for member in tar:
+                    relpath = self._checked_relpath(member.name)
+                    if member.isdir():
+                        dirs.append(relpath)
+                    elif member.issym():
+                        symlinks.append({"path": relpath, "target": member.linkname})
+                    elif member.isfile():
+                        fp = tar.extractfile(member)
+                        digest = self._blob_store.store_stream(fp)
+                        files.append({"path": relpath, "digest": digest, "mode": member.mode})
+                    else:
+                        raise ArtifactError(
+                            "Unsupported tar member type for {}: {}".format(
+                                member.name, member.type
+                            )
+                        )
+        except ArtifactError:
+            raise
+        except Exception as e:
+            raise ArtifactError("Reading artifact tarball {} failed:\n{}".format(tarball, e))
+        self._write_manifest(files, dirs, symlinks)
+
+    def extract(self):
+        try:
+            with open(self._manifest, "r") as fp:
+                manifest = json.load(fp)
+            if manifest.get("version") != self.MANIFEST_VERSION:
+                raise ArtifactError(
+                    "Unsupported artifact manifest version: {}".format(manifest.get("version"))
+                )
+            for relpath in manifest["dirs"]:
+                safe_mkdir(self._dest(relpath))
+            for entry in manifest["files"]:
+                self._blob_store.materialize(
+                    entry["digest"],
+                    self._dest(entry["path"]),
+                    mode=entry["mode"],
+                    hardlink=self._hardlink,
+                )
+            for entry in manifest["symlinks"]:
+                dest = self._dest(entry["path"])
+                safe_mkdir_for(dest)
+                safe_delete(dest)
+                os.symlink(entry["target"], dest)
+        except ArtifactError:
+            raise
+        except Exception as e:
+            raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+
+    def _dest(self, relpath):
+        return os.path.join(self.artifact_extraction_root, self._checked_relpath(relpath))
+
+    @staticmethod
+    def _checked_relpath(relpath):
+        normpath = os.path.normpath(relpath)
+        if os.path.isabs(normpath) or normpath == ".." or normpath.startswith("../"):
+            raise ArtifactError("Artifact path escapes the artifact root: {}".format(relpath))
+        return normpath
+
+    def _write_manifest(self, files, dirs, symlinks):
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "dirs": dirs,
+            "files": files,
+            "symlinks": symlinks,
+        }
+        with safe_concurrent_creation(self._manifest) as tmp_path:
+            with open(tmp_path, "w") as fp:
+                json.dump(manifest, fp, sort_keys=True)
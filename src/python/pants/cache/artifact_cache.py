@@ -50,6 +50,10 @@ class ArtifactCache:
     Subclasses implement the methods below to provide this functionality.
     """
 
+    # True if `has_many` and `fetch_many` are more efficient than mapping over single keys, in which
+    # case callers should prefer them.
+    supports_bulk_requests = False
+
     def __init__(self, artifact_root, artifact_extraction_root=None):
         """Create an ArtifactCache.
 
@@ -105,6 +109,27 @@ class ArtifactCache:
     def has(self, cache_key):
         pass
 
+    def has_many(self, cache_keys):
+        """Check whether artifacts exist for each of the given keys.
+
+        :param list<CacheKey> cache_keys: The keys to check for.
+        :returns: A list of booleans, in the order of `cache_keys`.
+        """
+        return [self.has(cache_key) for cache_key in cache_keys]
+
+    def fetch_many(self, cache_keys_and_results_dirs):
+        """Use the files cached for each of the given keys.
+
+        :param list cache_keys_and_results_dirs: Pairs of (CacheKey, results_dir), as passed to
+                                                 `use_cached_files`.
+        :returns: A list of the results of `use_cached_files` for each pair, in the input order. A
+                  NonfatalArtifactCacheError for a key is reported as a miss.
+        """
+        return [
+            call_use_cached_files((self, cache_key, results_dir))
+            for cache_key, results_dir in cache_keys_and_results_dirs
+        ]
+
     def use_cached_files(self, cache_key, results_dir=None):
         """Use the files cached for the given key.
 
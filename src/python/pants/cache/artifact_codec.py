@@ -0,0 +1,167 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import gzip
+import importlib
+import tarfile
+from contextlib import contextmanager
+
+
+class ArtifactCodecError(Exception):
+    pass
+
+
+class ArtifactCodec:
+    """A compression format for artifact tarballs.
+
+    Every supported format starts with a distinct magic number, so the codec used to write an
+    artifact is recorded in the artifact itself, and readers detect it rather than configuring it.
+    """
+
+    # The name of this codec, as used in options.
+    name: str
+    # The bytes every stream compressed with this codec starts with.
+    magic: bytes
+    # The module implementing this codec, if it is not in the standard library.
+    module_name = None
+    # The range of compression levels this codec supports, from fastest to smallest output.
+    min_level: int
+    max_level: int
+
+    def clamp_level(self, level):
+        """Return the closest compression level to the given one which this codec supports."""
+        return max(self.min_level, min(level, self.max_level))
+
+    def _module(self):
+        try:
+            return importlib.import_module(self.module_name)
+        except ImportError as e:
+            raise ArtifactCodecError(
+                "The {} artifact codec requires the `{}` module, which could not be "
+                "imported: {}".format(self.name, self.module_name, e)
+            )
+
+    def compressor(self, fileobj, level):
+        """Return a writable file object which compresses into the given binary file object.
+
+        Closing the returned object finishes the compressed stream, but does not close fileobj.
+        """
+        raise NotImplementedError()
+
+    def decompressor(self, fileobj):
+        """Return a readable file object which decompresses the given binary file object."""
+        raise NotImplementedError()
+
+
+class GzipCodec(ArtifactCodec):
+    name = "gzip"
+    magic = b"\x1f\x8b"
+    min_level = 1
+    max_level = 9
+
+    def compressor(self, fileobj, level):
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=level)
+
+    def decompressor(self, fileobj):
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+
+class ZstdCodec(ArtifactCodec):
+    """Zstandard compression, using all available cores to compress."""
+
+    name = "zstd"
+    magic = b"\x28\xb5\x2f\xfd"
+    module_name = "zstandard"
+    min_level = 1
+    max_level = 22
+
+    def compressor(self, fileobj, level):
+        # A negative thread count uses one thread per available core.
+        compressor = self._module().ZstdCompressor(level=level, threads=-1)
+        return compressor.stream_writer(fileobj, closefd=False)
+
+    def decompressor(self, fileobj):
+        return self._module().ZstdDecompressor().stream_reader(fileobj, closefd=False)
+
+
+class Lz4Codec(ArtifactCodec):
+    """LZ4 frame compression: a lower compression ratio than gzip, but much faster."""
+
+    name = "lz4"
+    magic = b"\x04\x22\x4d\x18"
+    module_name = "lz4.frame"
+    # Levels below 3 use the fast compressor, and higher ones the high compression compressor.
+    min_level = 0
+    max_level = 16
+
+    def compressor(self, fileobj, level):
+        return self._module().LZ4FrameFile(fileobj, mode="wb", compression_level=level)
+
+    def decompressor(self, fileobj):
+        return self._module().LZ4FrameFile(fileobj, mode="rb")
+
+
+GZIP = GzipCodec()
+ZSTD = ZstdCodec()
+LZ4 = Lz4Codec()
+
+CODECS = {codec.name: codec for codec in (GZIP, ZSTD, LZ4)}
+
+_MAGIC_LENGTH = max(len(codec.magic) for codec in CODECS.values())
+
+
+def codec_named(name):
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ArtifactCodecError(
+            "Unknown artifact codec {!r}: must be one of {}".format(name, ", ".join(sorted(CODECS)))
+        )
+
+
+def detect_codec(header):
+    """Return the codec for a stream starting with the given bytes, or None if uncompressed.
+
+    :param bytes header: At least the first few bytes of the stream.
+    """
+    for codec in CODECS.values():
+        if header.startswith(codec.magic):
+            return codec
+    return None
+
+
+def detect_codec_for_file(path):
+    with open(path, "rb") as fp:
+        return detect_codec(fp.read(_MAGIC_LENGTH))
+
+
+def peek_codec(fileobj):
+    """Detect the codec of a buffered binary file object, without consuming any of it."""
+    return detect_codec(fileobj.peek(_MAGIC_LENGTH)[:_MAGIC_LENGTH])
+
+
+@contextmanager
+def open_tarball_for_write(fileobj, codec, level, **kwargs):
+    """Yield a TarFile writing sequentially to fileobj, compressed with the given codec.
+
+    :param kwargs: Additional arguments for `tarfile.open`.
+    """
+    with codec.compressor(fileobj, level) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w|", **kwargs) as tar:
+            yield tar
+
+
+@contextmanager
+def open_tarball_for_read(fileobj, **kwargs):
+    """Yield a TarFile reading sequentially from a buffered fileobj, in any supported codec.
+
+    :param kwargs: Additional arguments for `tarfile.open`.
+    """
+    codec = peek_codec(fileobj)
+    if codec is None:
+        with tarfile.open(fileobj=fileobj, mode="r|", **kwargs) as tar:
+            yield tar
+    else:
+        with codec.decompressor(fileobj) as decompressed:
+            with tarfile.open(fileobj=decompressed, mode="r|", **kwargs) as tar:
+                yield tar
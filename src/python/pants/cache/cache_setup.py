@@ -9,7 +9,13 @@ from urllib.parse import urlparse
 from pants.base.build_environment import get_buildroot
 from pants.cache.artifact import TarballArtifact
 from pants.cache.artifact_cache import ArtifactCacheError
-from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
+from pants.cache.artifact_codec import CODECS, codec_named
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+    TempLocalArtifactCache,
+)
+from pants.cache.local_cache_index import EvictionPolicy, LocalCacheIndex
 from pants.cache.pinger import BestUrlSelector, Pinger
 from pants.cache.resolver import NoopResolver, Resolver, RESTfulResolver
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
@@ -113,12 +119,53 @@ class CacheSetup(Subsystem):
             default=4.0,
             help="The write timeout for any remote caches in use, in seconds.",
         )
+        register(
+            "--stream-remote-artifacts",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="Extract artifacts fetched from a remote cache while they are downloading, "
+            "writing them to the local cache at the same time, rather than extracting them "
+            "after the download has been written to disk.",
+        )
+        register(
+            "--max-concurrent-requests",
+            advanced=True,
+            type=int,
+            default=RESTfulArtifactCache.DEFAULT_MAX_CONCURRENT_REQUESTS,
+            help="The maximum number of concurrent requests to make to a remote cache when "
+            "checking for or fetching the artifacts of many targets at once. Values larger than "
+            "--http-artifact-cache-max-connections-within-pool will open connections that "
+            "cannot be kept alive.",
+        )
         register(
             "--compression-level",
             advanced=True,
             type=int,
             default=5,
-            help="The gzip compression level (0-9) for created artifacts.",
+            help="The compression level for created artifacts. Each codec has its own range of "
+            "levels: 1-9 for gzip, 1-22 for zstd, and 0-16 for lz4, where levels from 3 use "
+            "lz4's slower high compression mode. The level is clamped to the range of the codec "
+            "in use, so the same level may be used with different local and remote codecs.",
+        )
+        register(
+            "--local-codec",
+            advanced=True,
+            choices=sorted(CODECS),
+            default="gzip",
+            help="The compression codec for artifacts created for a local-only cache. The codec "
+            "of an existing artifact is detected when it is read, so this may be changed "
+            "without invalidating existing caches. lz4 trades compression ratio for much "
+            "faster compression and extraction.",
+        )
+        register(
+            "--remote-codec",
+            advanced=True,
+            choices=sorted(CODECS),
+            default="gzip",
+            help="The compression codec for artifacts created for a remote cache, including "
+            "those stored in a local cache that backs a remote cache. zstd compresses using "
+            "all available cores. All readers of the remote cache must support the codec.",
         )
         register(
             "--dereference-symlinks",
@@ -127,6 +174,46 @@ class CacheSetup(Subsystem):
             fingerprint=True,
             help="Dereference symlinks when creating cache tarball.",
         )
+        register(
+            "--local-format",
+            advanced=True,
+            choices=["tarball", "content-addressed"],
+            default="tarball",
+            help="How local caches store artifacts. tarball: one compressed tarball per artifact. "
+            "content-addressed: a manifest per artifact, referencing file contents stored once "
+            "in a blob store shared by all tasks, which skips storing and extracting identical "
+            "files repeatedly.",
+        )
+        register(
+            "--hardlink-extracted-files",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="When reading from a content-addressed local cache, hardlink extracted files to "
+            "the blobs in the cache rather than copying them. Only safe if no task modifies "
+            "its extracted outputs in place.",
+        )
+        register(
+            "--max-local-bytes",
+            advanced=True,
+            type=int,
+            default=None,
+            help="If set, hold each local cache to this many bytes, evicting artifacts according "
+            "to --local-eviction-policy. Artifact accesses are recorded in an index in the "
+            "local cache directory, and eviction runs incrementally as artifacts are written. "
+            "pantsd also evicts in the background, but only from the caches configured in the "
+            "[cache] scope itself, rather than in task-specific scopes. Replaces "
+            "--max-entries-per-target. Not supported with --local-format=content-addressed, "
+            "whose shared blobs cannot be evicted per artifact.",
+        )
+        register(
+            "--local-eviction-policy",
+            advanced=True,
+            type=EvictionPolicy,
+            default=EvictionPolicy.lru,
+            help="Which artifacts to evict first when a local cache exceeds --max-local-bytes: "
+            "the least recently used, or the least frequently used.",
+        )
         register(
             "--max-entries-per-target",
             advanced=True,
@@ -156,6 +243,27 @@ class CacheSetup(Subsystem):
             help="Permissions to use when writing artifacts to a local cache, in octal.",
         )
 
+    @classmethod
+    def local_cache_indexes(cls, options):
+        """Return the indexes of the local caches configured by the given options.
+
+        :param options: The options for a CacheSetup scope.
+        :returns: A list of LocalCacheIndex, empty unless --max-local-bytes is set.
+        """
+        if options.max_local_bytes is None or options.local_format == "content-addressed":
+            return []
+        local_specs = {
+            spec
+            for spec in (options.read_from or []) + (options.write_to or [])
+            if CacheFactory.is_local(spec)
+        }
+        return [
+            LocalCacheIndex.for_cache_dir(
+                spec, options.max_local_bytes, policy=options.local_eviction_policy
+            )
+            for spec in sorted(local_specs)
+        ]
+
     @classmethod
     def create_cache_factory_for_task(cls, task, **kwargs):
         scoped_options = cls.scoped_instance(task).get_options()
@@ -163,6 +271,9 @@ class CacheSetup(Subsystem):
 
 
 class CacheFactory:
+    # The directory, under a local cache path, holding the blobs shared by all tasks' caches.
+    _BLOB_DIRNAME = ".blobs"
+
     def __init__(self, options, log, task, pinger=None, resolver=None):
         """Create a cache factory from settings.
 
@@ -348,9 +459,31 @@ class CacheFactory:
           - a bar-separated list of URLs, where we'll pick the one with the best ping times.
           - A list or tuple of two specs, local, then remote, each as described above
         """
+        if (
+            self._options.max_local_bytes is not None
+            and self._options.local_format == "content-addressed"
+        ):
+            raise ValueError(
+                "max_local_bytes is not supported for content-addressed local caches: use "
+                "max_entries_per_target to bound them instead."
+            )
         compression = self._options.compression_level
-        if compression not in range(1, 10):
-            raise ValueError("compression_level must be an integer 1-9: {}".format(compression))
+        if compression < 0:
+            raise ValueError(
+                "compression_level must be a non-negative integer: {}".format(compression)
+            )
+        if self._options.max_concurrent_requests < 1:
+            raise ValueError(
+                "max_concurrent_requests must be a positive integer: {}".format(
+                    self._options.max_concurrent_requests
+                )
+            )
+
+        # A local cache backing a remote cache stores the same artifacts that it uploads.
+        codec = codec_named(
+            self._options.remote_codec if spec.remote else self._options.local_codec
+        )
+        compression = codec.clamp_level(compression)
 
         artifact_root = self._options.pants_workdir
         # If the artifact root is a symlink it is more efficient to readlink the symlink
@@ -365,6 +498,30 @@ class CacheFactory:
             self._log.debug(
                 "{0} {1} local artifact cache at {2}".format(self._task.stable_name(), action, path)
             )
+            index = (
+                LocalCacheIndex.for_cache_dir(
+                    parent_path,
+                    self._options.max_local_bytes,
+                    policy=self._options.local_eviction_policy,
+                )
+                if self._options.max_local_bytes is not None
+                else None
+            )
+            if self._options.local_format == "content-addressed":
+                return ContentAddressedLocalArtifactCache(
+                    artifact_root,
+                    artifact_extraction_root,
+                    path,
+                    os.path.join(parent_path, self._BLOB_DIRNAME),
+                    compression,
+                    self._options.max_entries_per_target,
+                    permissions=self._options.write_permissions,
+                    dereference=self._options.dereference_symlinks,
+                    hardlink=self._options.hardlink_extracted_files,
+                    stream_extraction=self._options.stream_remote_artifacts,
+                    codec=codec,
+                    index=index,
+                )
             return LocalArtifactCache(
                 artifact_root,
                 artifact_extraction_root,
@@ -373,6 +530,9 @@ class CacheFactory:
                 self._options.max_entries_per_target,
                 permissions=self._options.write_permissions,
                 dereference=self._options.dereference_symlinks,
+                stream_extraction=self._options.stream_remote_artifacts,
+                codec=codec,
+                index=index,
             )
 
         def create_remote_cache(remote_spec, local_cache):
@@ -383,7 +543,11 @@ class CacheFactory:
                     ["{}/{}".format(url.rstrip("/"), self._cache_dirname) for url in urls]
                 )
                 local_cache = local_cache or TempLocalArtifactCache(
-                    artifact_root, artifact_extraction_root, compression
+                    artifact_root,
+                    artifact_extraction_root,
+                    compression,
+                    stream_extraction=self._options.stream_remote_artifacts,
+                    codec=codec,
                 )
                 return RESTfulArtifactCache(
                     artifact_root,
@@ -391,6 +555,7 @@ class CacheFactory:
                     local_cache,
                     read_timeout=self._options.read_timeout,
                     write_timeout=self._options.write_timeout,
+                    max_concurrent_requests=self._options.max_concurrent_requests,
                 )
 
         local_cache = create_local_cache(spec.local) if spec.local else None
@@ -1,11 +1,13 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import io
 import logging
 import os
 from contextlib import contextmanager
 
-from pants.cache.artifact import TarballArtifact
+from pants.cache.artifact import BlobStore, ManifestArtifact, TarballArtifact
+from pants.cache.artifact_codec import GZIP
 from pants.cache.artifact_cache import ArtifactCache, UnreadableArtifact
 from pants.util.contextutil import temporary_file
 from pants.util.dirutil import (
@@ -14,12 +16,16 @@ from pants.util.dirutil import (
     safe_mkdir_for,
     safe_rm_oldest_items_in_dir,
     safe_rmtree,
+    safe_walk,
 )
 
 logger = logging.getLogger(__name__)
 
 
 class BaseLocalArtifactCache(ArtifactCache):
+    # True if `_store_tarball` retains the artifact, and so needs its bytes written to disk.
+    _stores_artifacts = True
+
     def __init__(
         self,
         artifact_root,
@@ -27,28 +33,40 @@ class BaseLocalArtifactCache(ArtifactCache):
         compression,
         permissions=None,
         dereference=True,
+        stream_extraction=False,
+        codec=GZIP,
     ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
         :param str artifact_extraction_root: The path to where we should extract artifacts. Usually a reified artifact_path.
-        :param int compression: The gzip compression level for created artifacts.
-                                Valid values are 0-9.
+        :param int compression: The compression level for created artifacts, within the range
+                                supported by `codec`.
         :param str permissions: File permissions to use when creating artifact files.
         :param bool dereference: Dereference symlinks when creating the cache tarball.
+        :param bool stream_extraction: Extract artifacts passed to `store_and_use_artifact` while
+                                       their bytes arrive, rather than after they have been stored.
+        :param ArtifactCodec codec: The codec with which to compress created artifacts. Artifacts
+                                    in any codec can be read.
         """
         super().__init__(artifact_root, artifact_extraction_root)
         self._compression = compression
         self._cache_root = None
         self._permissions = permissions
         self._dereference = dereference
+        self._stream_extraction = stream_extraction
+        self._codec = codec
 
     def _artifact(self, path):
+        return self._tarball_artifact(path)
+
+    def _tarball_artifact(self, path):
         return TarballArtifact(
             self.artifact_root,
             self.artifact_extraction_root,
             path,
             self._compression,
             dereference=self._dereference,
+            codec=self._codec,
         )
 
     @contextmanager
@@ -75,6 +93,9 @@ class BaseLocalArtifactCache(ArtifactCache):
         :param str results_dir: The path to the expected destination of the artifact extraction: will
           be cleared both before extraction, and after a failure to extract.
         """
+        if self._stream_extraction:
+            return self._stream_and_use_artifact(cache_key, src, results_dir)
+
         with self._tmpfile(cache_key, "read") as tmp:
             for chunk in src:
                 tmp.write(chunk)
@@ -82,12 +103,7 @@ class BaseLocalArtifactCache(ArtifactCache):
             tarball = self._store_tarball(cache_key, tmp.name)
             artifact = self._artifact(tarball)
 
-            # NOTE(mateo): The two clean=True args passed in this method are likely safe, since the cache will by
-            # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
-            # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
-            # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
-            if results_dir is not None:
-                safe_mkdir(results_dir, clean=True)
+            self._clean_results_dir(results_dir)
 
             try:
                 artifact.extract()
@@ -95,17 +111,50 @@ class BaseLocalArtifactCache(ArtifactCache):
                 # Do our best to clean up after a failed artifact extraction. If a results_dir has been
                 # specified, it is "expected" to represent the output destination of the extracted
                 # artifact, and so removing it should clear any partially extracted state.
-                if results_dir is not None:
-                    safe_mkdir(results_dir, clean=True)
-                safe_delete(tarball)
+                self._clean_results_dir(results_dir)
+                self._delete_cache_file(tarball)
                 raise
 
             return True
 
+    def _stream_and_use_artifact(self, cache_key, src, results_dir):
+        """Extract the artifact from the given `src` iterator while teeing its bytes to disk.
+
+        This avoids writing the whole artifact to disk and then reading it back to extract it. The
+        artifact is only stored once it has been extracted successfully.
+        """
+        with self._tmpfile(cache_key, "read") as tmp:
+            stream = _TeeReader(src, tmp if self._stores_artifacts else None)
+            self._clean_results_dir(results_dir)
+            try:
+                self._tarball_artifact(tmp.name).extract_stream(io.BufferedReader(stream))
+                # The tar reader may stop before the end of the compressed stream: consume the rest
+                # so that the stored artifact is complete.
+                stream.drain()
+            except Exception:
+                self._clean_results_dir(results_dir)
+                raise
+            tmp.close()
+            if self._stores_artifacts:
+                self._store_tarball(cache_key, tmp.name)
+            return True
+
+    @staticmethod
+    def _clean_results_dir(results_dir):
+        # NOTE(mateo): The clean=True args passed to this method are likely safe, since the cache will by
+        # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
+        # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
+        # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
+        if results_dir is not None:
+            safe_mkdir(results_dir, clean=True)
+
     def _store_tarball(self, cache_key, src):
         """Given a src path to an artifact tarball, store it and return stored artifact's path."""
         pass
 
+    def _delete_cache_file(self, path):
+        safe_delete(path)
+
 
 class LocalArtifactCache(BaseLocalArtifactCache):
     """An artifact cache that stores the artifacts in local files."""
@@ -119,15 +168,26 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         max_entries_per_target=None,
         permissions=None,
         dereference=True,
+        stream_extraction=False,
+        codec=GZIP,
+        index=None,
     ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
         :param str artifact_extraction_root: The path to where we should extract artifacts. Usually a reified artifact_path.
         :param str cache_root: The locally cached files are stored under this directory.
-        :param int compression: The gzip compression level for created artifacts (1-9 or false-y).
+        :param int compression: The compression level for created artifacts, within the range
+                                supported by `codec`.
         :param int max_entries_per_target: The maximum number of old cache files to leave behind on a cache miss.
+                                           Ignored if an `index` is given.
         :param str permissions: File permissions to use when creating artifact files.
         :param bool dereference: Dereference symlinks when creating the cache tarball.
+        :param bool stream_extraction: Extract artifacts passed to `store_and_use_artifact` while
+                                       their bytes arrive, rather than after they have been stored.
+        :param ArtifactCodec codec: The codec with which to compress created artifacts.
+        :param LocalCacheIndex index: An index in which to record the cache's files and their
+                                      accesses, used to evict files once the cache exceeds the
+                                      index's byte budget.
         """
         super().__init__(
             artifact_root,
@@ -135,19 +195,31 @@ class LocalArtifactCache(BaseLocalArtifactCache):
             compression,
             permissions=int(permissions.strip(), base=8) if permissions else None,
             dereference=dereference,
+            stream_extraction=stream_extraction,
+            codec=codec,
         )
         self._cache_root = os.path.realpath(os.path.expanduser(cache_root))
         self._max_entries_per_target = max_entries_per_target
+        self._index = index
         safe_mkdir(self._cache_root)
 
+    # The maximum number of files evicted by a single call to `prune`, to bound the cost of a write
+    # while still making progress towards the budget when pantsd is not evicting in the background.
+    _PRUNE_EVICTION_LIMIT = 16
+
     def prune(self, root):
         """Prune stale cache files.
 
-        If the option --cache-target-max-entry is greater than zero, then prune will remove all but n
-        old cache files for each target/task.
+        If the cache has an index, prune will incrementally evict files in the order of its policy
+        until the whole cache is within the index's byte budget. Otherwise, if the option
+        --cache-target-max-entry is greater than zero, then prune will remove all but n old cache files
+        for each target/task.
 
         :param str root: The path under which cacheable artifacts will be cleaned
         """
+        if self._index:
+            self._index.evict(limit=self._PRUNE_EVICTION_LIMIT)
+            return
 
         max_entries_per_target = self._max_entries_per_target
         if os.path.isdir(root) and max_entries_per_target:
@@ -167,13 +239,15 @@ class LocalArtifactCache(BaseLocalArtifactCache):
                 if results_dir is not None:
                     safe_rmtree(results_dir)
                 artifact.extract()
+                if self._index:
+                    self._index.record_access(tarfile)
                 return True
         except Exception as e:
             # TODO(davidt): Consider being more granular in what is caught.
             logger.warning(
                 "Error while reading {0} from local artifact cache: {1}".format(tarfile, e)
             )
-            safe_delete(tarfile)
+            self._delete_cache_file(tarfile)
             return UnreadableArtifact(cache_key, e)
 
         return False
@@ -183,14 +257,25 @@ class LocalArtifactCache(BaseLocalArtifactCache):
             pass
 
     def delete(self, cache_key):
-        safe_delete(self._cache_file_for_key(cache_key))
+        self._delete_cache_file(self._cache_file_for_key(cache_key))
+
+    def _delete_cache_file(self, path):
+        super()._delete_cache_file(path)
+        if self._index:
+            self._index.record_removal(path)
 
     def _store_tarball(self, cache_key, src):
+        return self._store_cache_file(cache_key, src)
+
+    def _store_cache_file(self, cache_key, src):
+        """Move the given src file into place as the cache file for cache_key."""
         dest = self._cache_file_for_key(cache_key)
         safe_mkdir_for(dest)
         os.rename(src, dest)
         if self._permissions:
             os.chmod(dest, self._permissions)
+        if self._index:
+            self._index.record_store(dest, os.path.getsize(dest))
         self.prune(os.path.dirname(dest))  # Remove old cache files.
         return dest
 
@@ -200,6 +285,129 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         return os.path.join(self._cache_root, cache_key.id, cache_key.hash) + ".tgz"
 
 
+class ContentAddressedLocalArtifactCache(LocalArtifactCache):
+    """A local artifact cache that stores each artifact as a manifest of content-addressed blobs.
+
+    Blobs live in a store that may be shared between caches (e.g., by all tasks), so identical files
+    produced by many targets are stored once, and neither inserts nor extractions need to compress
+    or decompress anything.
+
+    Pruning removes only manifests: the blobs they no longer reference are periodically deleted by a
+    mark-and-sweep over all the manifests which share the store.
+    """
+
+    # The minimum interval between garbage collections of the blob store, each of which reads every
+    # manifest which shares it.
+    _BLOB_COLLECTION_INTERVAL_SECS = 10 * 60
+
+    def __init__(
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        cache_root,
+        blob_root,
+        compression,
+        max_entries_per_target=None,
+        permissions=None,
+        dereference=True,
+        hardlink=False,
+        stream_extraction=False,
+        codec=GZIP,
+        index=None,
+        manifest_root=None,
+    ):
+        """
+        :param str blob_root: The directory under which the content of cached files is stored.
+        :param bool hardlink: Hardlink extracted files to the blobs in the cache rather than copying
+                              them. Extracted files must then never be modified in place.
+        :param str manifest_root: The directory under which the manifests of every cache sharing
+                                  blob_root are stored. Defaults to the parent of blob_root.
+
+        See LocalArtifactCache for the remaining params. `compression` and `codec` only apply to the
+        tarballs produced for a remote cache by `insert_paths`.
+        """
+        super().__init__(
+            artifact_root,
+            artifact_extraction_root,
+            cache_root,
+            compression,
+            max_entries_per_target=max_entries_per_target,
+            permissions=permissions,
+            dereference=dereference,
+            stream_extraction=stream_extraction,
+            codec=codec,
+            index=index,
+        )
+        self._blob_store = BlobStore(blob_root, permissions=self._permissions)
+        self._blob_root = os.path.realpath(blob_root)
+        self._manifest_root = os.path.realpath(manifest_root or os.path.dirname(blob_root))
+        self._hardlink = hardlink
+
+    def _artifact(self, path):
+        return ManifestArtifact(
+            self.artifact_root,
+            self.artifact_extraction_root,
+            path,
+            self._blob_store,
+            dereference=self._dereference,
+            hardlink=self._hardlink,
+        )
+
+    @contextmanager
+    def insert_paths(self, cache_key, paths):
+        """Store paths as a manifest, and yield the path to an equivalent artifact tarball.
+
+        The tarball is only used to upload the artifact to a remote cache, and is not retained.
+        """
+        self.try_insert(cache_key, paths)
+        with self._tmpfile(cache_key, "write") as tmp:
+            self._tarball_artifact(tmp.name).collect(paths)
+            yield tmp.name
+
+    def try_insert(self, cache_key, paths):
+        with self._blob_store.referencing(), self._tmpfile(cache_key, "manifest") as tmp:
+            tmp.close()
+            self._artifact(tmp.name).collect(paths)
+            self._store_cache_file(cache_key, tmp.name)
+        self._maybe_collect_blob_garbage()
+
+    def _store_tarball(self, cache_key, src):
+        """Ingest the given artifact tarball into the blob store, and return its manifest's path."""
+        with self._blob_store.referencing(), self._tmpfile(cache_key, "manifest") as tmp:
+            tmp.close()
+            self._artifact(tmp.name).collect_from_tarball(src)
+            manifest = self._store_cache_file(cache_key, tmp.name)
+        self._maybe_collect_blob_garbage()
+        return manifest
+
+    def _maybe_collect_blob_garbage(self):
+        if not self._blob_store.collection_due(self._BLOB_COLLECTION_INTERVAL_SECS):
+            return
+        try:
+            freed = self._blob_store.collect_garbage(self._live_digests)
+        except OSError as e:
+            logger.warning("Failed to collect unreferenced cache blobs: {}".format(e))
+            return
+        if freed:
+            logger.debug(
+                "Deleted {} bytes of unreferenced blobs from {}.".format(freed, self._blob_root)
+            )
+
+    def _live_digests(self):
+        """Return the digests referenced by every manifest which shares this cache's blob store."""
+        live_digests = set()
+        for dirpath, dirnames, filenames in safe_walk(self._manifest_root):
+            dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != self._blob_root]
+            for filename in filenames:
+                if filename.endswith(".manifest"):
+                    manifest = os.path.join(dirpath, filename)
+                    live_digests.update(ManifestArtifact.referenced_digests(manifest))
+        return live_digests
+
+    def _cache_file_for_key(self, cache_key):
+        return os.path.join(self._cache_root, cache_key.id, cache_key.hash) + ".manifest"
+
+
 class TempLocalArtifactCache(BaseLocalArtifactCache):
     """A local cache that does not actually store any files between calls.
 
@@ -207,15 +415,30 @@ class TempLocalArtifactCache(BaseLocalArtifactCache):
     calls, but is useful for handling file IO for a remote cache.
     """
 
-    def __init__(self, artifact_root, artifact_extraction_root, compression, permissions=None):
+    _stores_artifacts = False
+
+    def __init__(
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        compression,
+        permissions=None,
+        stream_extraction=False,
+        codec=GZIP,
+    ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
+        :param bool stream_extraction: Extract artifacts passed to `store_and_use_artifact` while
+                                       their bytes arrive, without writing them to disk at all.
+        :param ArtifactCodec codec: The codec with which to compress created artifacts.
         """
         super().__init__(
             artifact_root,
             artifact_extraction_root,
             compression=compression,
             permissions=permissions,
+            stream_extraction=stream_extraction,
+            codec=codec,
         )
 
     def _store_tarball(self, cache_key, src):
@@ -229,3 +452,36 @@ class TempLocalArtifactCache(BaseLocalArtifactCache):
 
     def delete(self, cache_key):
         pass
+
+
+class _TeeReader(io.RawIOBase):
+    """A readable stream over an iterator of byte chunks, which copies every byte read to a sink."""
+
+    def __init__(self, chunks, sink=None):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._sink = sink
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+            if self._sink is not None:
+                self._sink.write(self._pending)
+        size = min(len(buf), len(self._pending))
+        buf[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def drain(self):
+        """Consume any remaining chunks, copying them to the sink."""
+        self._pending = b""
+        for chunk in self._chunks:
+            if self._sink is not None:
+                self._sink.write(chunk)
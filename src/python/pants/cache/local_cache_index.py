@@ -0,0 +1,223 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+
+from pants.util.dirutil import safe_delete, safe_mkdir_for, safe_walk
+
+logger = logging.getLogger(__name__)
+
+
+class EvictionPolicy(Enum):
+    lru = "lru"
+    lfu = "lfu"
+
+
+class LocalCacheIndex:
+    """An index of the files in a local artifact cache, with their sizes and access history.
+
+    The index allows a cache to be held to a byte budget by evicting its least recently (or least
+    frequently) used files, without scanning the cache's directories. It is stored in a sqlite
+    database, so that it may be shared by concurrent pants processes and by pantsd. The total size
+    of the indexed files is maintained by triggers as entries change, so that checking the budget
+    does not read every entry.
+
+    Failures to read or write the index are logged rather than raised: at worst they cause the
+    cache to temporarily exceed its budget.
+    """
+
+    FILENAME = ".index.sqlite"
+
+    _TIMEOUT_SECS = 10
+
+    _ORDER_BY = {
+        EvictionPolicy.lru: "last_access ASC",
+        EvictionPolicy.lfu: "hits ASC, last_access ASC",
+    }
+
+    @classmethod
+    def for_cache_dir(cls, cache_dir, max_bytes, policy=EvictionPolicy.lru):
+        """Return the index for all caches under the given local cache spec directory."""
+        return cls(
+            os.path.join(os.path.realpath(os.path.expanduser(cache_dir)), cls.FILENAME),
+            max_bytes,
+            policy=policy,
+        )
+
+    def __init__(self, path, max_bytes, policy=EvictionPolicy.lru):
+        """
+        :param str path: The path of the index database.
+        :param int max_bytes: The total size the indexed files are evicted down to.
+        :param EvictionPolicy policy: Which files to evict first.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._policy = policy
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads, and caches are used from worker
+        # pools, so connect per operation: this is cheap relative to the file operations indexed.
+        self._maybe_initialize()
+        conn = sqlite3.connect(self.path, timeout=self._TIMEOUT_SECS)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _maybe_initialize(self):
+        with self._init_lock:
+            if self._initialized:
+                return
+            safe_mkdir_for(self.path)
+            conn = sqlite3.connect(self.path, timeout=self._TIMEOUT_SECS)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS entries ("
+                        "path TEXT PRIMARY KEY, "
+                        "size INTEGER NOT NULL, "
+                        "last_access REAL NOT NULL, "
+                        "hits INTEGER NOT NULL DEFAULT 0)"
+                    )
+                    # A single row holding the total size of all entries. It is initialized from
+                    # any entries of an index created before the total was maintained.
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS total (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                        "size INTEGER NOT NULL)"
+                    )
+                    conn.execute(
+                        "INSERT OR IGNORE INTO total (id, size) "
+                        "SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+                    )
+                    conn.execute(
+                        "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries "
+                        "BEGIN UPDATE total SET size = size + NEW.size; END"
+                    )
+                    conn.execute(
+                        "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries "
+                        "BEGIN UPDATE total SET size = size - OLD.size; END"
+                    )
+            finally:
+                conn.close()
+            self._initialized = True
+
+    def _execute(self, description, sql, *params):
+        return self._execute_all(description, (sql, params))
+
+    def _execute_all(self, description, *statements):
+        """Execute the given (sql, params) statements in one transaction.
+
+        :returns: The rows returned by the last statement, or None if the transaction failed.
+        """
+        try:
+            with self._connection() as conn:
+                rows = None
+                for sql, params in statements:
+                    rows = conn.execute(sql, params).fetchall()
+                return rows
+        except sqlite3.Error as e:
+            logger.warning("Failed to {} in cache index {}: {}".format(description, self.path, e))
+            return None
+
+    def record_store(self, path, size):
+        """Record that the file at path has been (re)written with the given size."""
+        # A REPLACE would not fire the delete trigger for a replaced entry, so its size would not be
+        # removed from the total: delete it explicitly instead.
+        self._execute_all(
+            "record store",
+            ("DELETE FROM entries WHERE path = ?", (path,)),
+            (
+                "INSERT INTO entries (path, size, last_access, hits) VALUES (?, ?, ?, 0)",
+                (path, size, time.time()),
+            ),
+        )
+
+    def record_access(self, path):
+        """Record a read of the file at path."""
+        self._execute(
+            "record access",
+            "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE path = ?",
+            time.time(),
+            path,
+        )
+
+    def record_removal(self, path):
+        self._execute("record removal", "DELETE FROM entries WHERE path = ?", path)
+
+    def total_bytes(self):
+        rows = self._execute("read total size", "SELECT size FROM total")
+        return rows[0][0] if rows else 0
+
+    def evict(self, limit=None):
+        """Delete indexed files, in policy order, until their total size is within the budget.
+
+        :param int limit: The maximum number of files to evict in this call, so that eviction can be
+                          done incrementally. Unlimited if None.
+        :returns: The paths which were evicted.
+        """
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return []
+
+        query = "SELECT path, size FROM entries ORDER BY {}".format(self._ORDER_BY[self._policy])
+        if limit is not None:
+            query += " LIMIT {:d}".format(limit)
+        candidates = self._execute("select eviction candidates", query) or []
+
+        evicted = []
+        for path, size in candidates:
+            if excess <= 0:
+                break
+            safe_delete(path)
+            self.record_removal(path)
+            evicted.append(path)
+            excess -= size
+        if evicted:
+            logger.debug("Evicted {} files from cache index {}.".format(len(evicted), self.path))
+        return evicted
+
+    def reconcile(self, root):
+        """Bring the index in line with the files actually under root.
+
+        Files not yet indexed (e.g., written before the index was enabled) are added with their
+        modification time as their last access, and entries for missing files are dropped.
+        """
+        indexed = {
+            path for (path,) in self._execute("list entries", "SELECT path FROM entries") or []
+        }
+        present = set()
+        for dirpath, dirnames, filenames in safe_walk(root):
+            # Skip hidden files and dirs, such as the index database itself and its journals, and
+            # the blobs of content-addressed caches.
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                path = os.path.join(dirpath, filename)
+                present.add(path)
+                if path not in indexed:
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    self._execute(
+                        "index existing file",
+                        "INSERT OR IGNORE INTO entries (path, size, last_access) VALUES (?, ?, ?)",
+                        path,
+                        stat.st_size,
+                        stat.st_mtime,
+                    )
+        for path in indexed - present:
+            if path.startswith(os.path.join(root, "")):
+                self.record_removal(path)
@@ -8,6 +8,7 @@ import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
+from multiprocessing.pool import ThreadPool
 from typing import Generator, Optional
 
 import requests
@@ -15,7 +16,12 @@ from requests import RequestException
 from urllib3.exceptions import MaxRetryError
 from urllib3.util.retry import Retry
 
-from pants.cache.artifact_cache import ArtifactCache, NonfatalArtifactCacheError, UnreadableArtifact
+from pants.cache.artifact_cache import (
+    ArtifactCache,
+    NonfatalArtifactCacheError,
+    UnreadableArtifact,
+    call_use_cached_files,
+)
 from pants.subsystem.subsystem import Subsystem
 from pants.util.memo import memoized_classmethod
 
@@ -208,8 +214,18 @@ class RESTfulArtifactCache(ArtifactCache):
 
     READ_SIZE_BYTES = 4 * 1024 * 1024
 
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 16
+
+    supports_bulk_requests = True
+
     def __init__(
-        self, artifact_root, best_url_selector, local, read_timeout=4.0, write_timeout=4.0
+        self,
+        artifact_root,
+        best_url_selector,
+        local,
+        read_timeout=4.0,
+        write_timeout=4.0,
+        max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS,
     ):
         """
         :param string artifact_root: The path under which cacheable products will be read/written.
@@ -217,6 +233,8 @@ class RESTfulArtifactCache(ArtifactCache):
           url represents prefix for some RESTful service. We must be able to PUT and GET to any path
           under this base.
         :param BaseLocalArtifactCache local: local cache instance for storing and creating artifacts
+        :param int max_concurrent_requests: The maximum number of requests in flight at once for
+          `has_many` and `fetch_many`.
         """
         super().__init__(artifact_root)
 
@@ -224,6 +242,7 @@ class RESTfulArtifactCache(ArtifactCache):
         self._read_timeout_secs = read_timeout
         self._write_timeout_secs = write_timeout
         self._localcache = local
+        self._max_concurrent_requests = max_concurrent_requests
 
     def try_insert(self, cache_key, paths):
         # Delegate creation of artifact to local cache.
@@ -238,6 +257,45 @@ class RESTfulArtifactCache(ArtifactCache):
             return True
         return self._request("HEAD", cache_key) is not None
 
+    def has_many(self, cache_keys):
+        def has_or_false(cache_key):
+            try:
+                return self.has(cache_key)
+            except NonfatalArtifactCacheError as e:
+                logger.warning("Error while checking the remote artifact cache: {0}".format(e))
+                return False
+
+        return self._map_concurrently(has_or_false, cache_keys)
+
+    def fetch_many(self, cache_keys_and_results_dirs):
+        return self._map_concurrently(
+            lambda pair: call_use_cached_files((self,) + tuple(pair)), cache_keys_and_results_dirs,
+        )
+
+    def _map_concurrently(self, func, items):
+        """Map func over items using up to `max_concurrent_requests` threads.
+
+        All threads share the pooled keep-alive connections of `RequestsSession.session()`, so the
+        HTTP round trips for independent keys overlap rather than happening one at a time.
+        """
+        items = list(items)
+        if not items:
+            return []
+        pool = ThreadPool(processes=min(self._max_concurrent_requests, len(items)))
+        try:
+            # As in `Context.subproc_map`, wait with a timeout, since a wait without one can miss
+            # SIGINT.
+            res = pool.map_async(func, items, chunksize=1)
+            while not res.ready():
+                res.wait(60)
+            return res.get()
+        except KeyboardInterrupt:
+            pool.terminate()
+            raise
+        finally:
+            pool.close()
+            pool.join()
+
     def use_cached_files(self, cache_key, results_dir=None):
         if self._localcache.has(cache_key):
             return self._localcache.use_cached_files(cache_key, results_dir)
@@ -6,27 +6,46 @@
 These are always activated and cannot be disabled.
 """
 
-from pants.core_tasks.bash_completion import BashCompletion
-from pants.core_tasks.clean import Clean
-from pants.core_tasks.deferred_sources_mapper import DeferredSourcesMapper
-from pants.core_tasks.explain_options_task import ExplainOptionsTask
-from pants.core_tasks.login import Login
-from pants.core_tasks.noop import NoopCompile, NoopTest
-from pants.core_tasks.pantsd_kill import PantsDaemonKill
-from pants.core_tasks.reporting_server_kill import ReportingServerKill
-from pants.core_tasks.reporting_server_run import ReportingServerRun
-from pants.core_tasks.run_prep_command import (
-    RunBinaryPrepCommand,
-    RunCompilePrepCommand,
-    RunTestPrepCommand,
-)
-from pants.core_tasks.substitute_aliased_targets import SubstituteAliasedTargets
-from pants.core_tasks.targets_help import TargetsHelp
 from pants.goal.goal import Goal
 from pants.goal.task_registrar import TaskRegistrar as task
 
 
+def registered_goals():
+    return (
+        "clean-all",
+        "kill-pantsd",
+        "server",
+        "killserver",
+        "login",
+        "options",
+        "targets",
+        "compile",
+        "test",
+        "binary",
+        "bash-completion",
+        "deferred-sources",
+        "bootstrap",
+    )
+
+
 def register_goals():
+    from pants.core_tasks.bash_completion import BashCompletion
+    from pants.core_tasks.clean import Clean
+    from pants.core_tasks.deferred_sources_mapper import DeferredSourcesMapper
+    from pants.core_tasks.explain_options_task import ExplainOptionsTask
+    from pants.core_tasks.login import Login
+    from pants.core_tasks.noop import NoopCompile, NoopTest
+    from pants.core_tasks.pantsd_kill import PantsDaemonKill
+    from pants.core_tasks.reporting_server_kill import ReportingServerKill
+    from pants.core_tasks.reporting_server_run import ReportingServerRun
+    from pants.core_tasks.run_prep_command import (
+        RunBinaryPrepCommand,
+        RunCompilePrepCommand,
+        RunTestPrepCommand,
+    )
+    from pants.core_tasks.substitute_aliased_targets import SubstituteAliasedTargets
+    from pants.core_tasks.targets_help import TargetsHelp
+
     # Register descriptions for the standard multiple-task goals.  Single-task goals get
     # their descriptions from their single task.
     Goal.register("buildgen", "Automatically generate BUILD files.")
@@ -8,6 +8,7 @@ from colors import blue, cyan, green, magenta, red
 
 from pants.engine.native import Native
 from pants.engine.rules import side_effecting
+from pants.util.contextutil import thread_bound_stream
 
 
 # TODO this needs to be a file-like object/stream
@@ -55,8 +56,14 @@ class Console:
 
         has_scheduler = session is not None
 
-        self._stdout = stdout or (NativeStdOut(session) if has_scheduler else sys.stdout)
-        self._stderr = stderr or (NativeStdErr(session) if has_scheduler else sys.stderr)
+        # NB: Rules write to the console from engine threads, so we bind to the streams of the
+        # thread which creates the console, in case they are redirected for that thread only.
+        self._stdout = stdout or (
+            NativeStdOut(session) if has_scheduler else thread_bound_stream(sys.stdout)
+        )
+        self._stderr = stderr or (
+            NativeStdErr(session) if has_scheduler else thread_bound_stream(sys.stderr)
+        )
         self._use_colors = use_colors
 
     @property
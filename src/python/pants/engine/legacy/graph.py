@@ -8,7 +8,20 @@ from collections import defaultdict, deque
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import PurePath
-from typing import Any, DefaultDict, Dict, Iterable, Iterator, List, Set, Tuple, Type, Union, cast
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from pants.base.exceptions import ResolveError, TargetDefinitionException
 from pants.base.parse_context import ParseContext
@@ -37,7 +50,6 @@ from pants.engine.addressable import (
     assert_single_address,
 )
 from pants.engine.fs import EMPTY_SNAPSHOT, PathGlobs, Snapshot
-from pants.engine.legacy.address_mapper import LegacyAddressMapper
 from pants.engine.legacy.structs import (
     BundleAdaptor,
     BundlesField,
@@ -303,11 +315,7 @@ class _DependentGraph:
     def from_iterable(cls, target_types, address_mapper, adaptor_iter):
         """Create a new DependentGraph from an iterable of TargetAdaptor subclasses."""
         inst = cls(target_types, address_mapper)
-        all_valid_addresses = set()
-        for target_adaptor in adaptor_iter:
-            inst._inject_target(target_adaptor)
-            all_valid_addresses.add(target_adaptor.address)
-        inst._validate(all_valid_addresses)
+        inst.update(adaptor_iter)
         return inst
 
     def __init__(self, target_types, address_mapper):
@@ -320,6 +328,30 @@ class _DependentGraph:
         self._implicit_dependent_address_map = defaultdict(set)
         self._target_types = target_types
         self._address_mapper = address_mapper
+        # The TargetAdaptor for each target in the graph, and the addresses of its declared and
+        # implicit dependencies, so that its edges can be removed when it changes.
+        self._target_adaptors = {}
+        self._dependencies = {}
+
+    def update(self, adaptor_iter):
+        """Update the graph to contain exactly the given TargetAdaptors.
+
+        Only targets whose adaptors have changed since the previous update (i.e., the targets in
+        BUILD files that have been re-parsed) are re-injected, so a long-lived graph can be kept
+        current cheaply.
+        """
+        target_adaptors = {adaptor.address: adaptor for adaptor in adaptor_iter}
+        for address in self._target_adaptors.keys() - target_adaptors.keys():
+            self._remove_target(address)
+        for address, adaptor in target_adaptors.items():
+            previous = self._target_adaptors.get(address)
+            if previous is adaptor:
+                continue
+            if previous is not None:
+                self._remove_target(address)
+            self._inject_target(adaptor)
+        self._target_adaptors = target_adaptors
+        self._validate(target_adaptors.keys())
 
     def _validate(self, all_valid_addresses):
         """Validate that all of the dependencies in the graph exist in the given addresses set."""
@@ -344,17 +376,33 @@ class _DependentGraph:
             )
             for s in target_cls.compute_dependency_address_specs(kwargs=target_adaptor.kwargs())
         )
+        declared_deps = tuple(declared_deps)
+        implicit_deps = tuple(implicit_deps)
         for dep in declared_deps:
             self._dependent_address_map[dep].add(target_adaptor.address)
         for dep in implicit_deps:
             self._implicit_dependent_address_map[dep].add(target_adaptor.address)
+        self._dependencies[target_adaptor.address] = (declared_deps, implicit_deps)
+
+    def _remove_target(self, address):
+        """Remove the edges from a target to its dependencies."""
+        declared_deps, implicit_deps = self._dependencies.pop(address)
+        for dependent_address_map, deps in (
+            (self._dependent_address_map, declared_deps),
+            (self._implicit_dependent_address_map, implicit_deps),
+        ):
+            for dep in deps:
+                dependents = dependent_address_map[dep]
+                dependents.discard(address)
+                if not dependents:
+                    del dependent_address_map[dep]
 
     def dependents_of_addresses(self, addresses):
         """Given an iterable of addresses, return all of those addresses dependents."""
         seen = OrderedSet(addresses)
         for address in addresses:
-            seen.update(self._dependent_address_map[address])
-            seen.update(self._implicit_dependent_address_map[address])
+            seen.update(self._dependent_address_map.get(address, ()))
+            seen.update(self._implicit_dependent_address_map.get(address, ()))
         return seen
 
     def transitive_dependents_of_addresses(self, addresses):
@@ -371,8 +419,8 @@ class _DependentGraph:
 
             closure.add(address)
             result.append(address)
-            to_visit.extend(self._dependent_address_map[address])
-            to_visit.extend(self._implicit_dependent_address_map[address])
+            to_visit.extend(self._dependent_address_map.get(address, ()))
+            to_visit.extend(self._implicit_dependent_address_map.get(address, ()))
 
         return result
 
@@ -513,40 +561,113 @@ class Owners:
     addresses: Addresses
 
 
+class SourceOwnersIndex:
+    """An index from paths to the candidate targets that could own them.
+
+    Each target is indexed by its BUILD file and by the include globs of its `sources`. A glob
+    without wildcards is indexed by its exact path, and any other glob is indexed by its longest
+    literal directory prefix, so only the targets with a glob rooted at one of a path's ancestor
+    directories need to be matched against that path.
+
+    NB: Deleted files can only be matched against the 'filespec' (ie, `PathGlobs`) for a target,
+    so the index is built from the filespecs rather than from the expanded sources.
+    """
+
+    _WILDCARD_CHARS = frozenset("*?[{")
+
+    def __init__(self, targets_and_build_files: Iterable[Tuple[HydratedTarget, BuildFileAddress]]):
+        self._addresses: List[Address] = []
+        self._filespecs: List[Any] = []
+        self._owners_by_build_file: DefaultDict[str, List[int]] = defaultdict(list)
+        self._owners_by_path: DefaultDict[str, List[int]] = defaultdict(list)
+        self._owners_by_glob_prefix: DefaultDict[str, List[int]] = defaultdict(list)
+
+        for i, (hydrated_target, build_file_address) in enumerate(targets_and_build_files):
+            self._addresses.append(hydrated_target.adaptor.address)
+            self._owners_by_build_file[build_file_address.rel_path].append(i)
+
+            target_sources = hydrated_target.adaptor.kwargs().get("sources", None)
+            filespec = target_sources.filespec if target_sources else None
+            self._filespecs.append(filespec)
+            if not filespec:
+                continue
+            # An excluded path must be matched against the full filespec, even if it is included by
+            # a literal glob.
+            has_excludes = bool(filespec.get("exclude"))
+            for glob in filespec.get("globs", ()):
+                prefix = self._literal_prefix(glob)
+                if prefix is not None:
+                    self._owners_by_glob_prefix[prefix].append(i)
+                elif has_excludes:
+                    self._owners_by_glob_prefix[os.path.dirname(glob)].append(i)
+                else:
+                    self._owners_by_path[glob].append(i)
+
+    @classmethod
+    def _literal_prefix(cls, glob: str) -> Optional[str]:
+        """Return the directory before the first wildcard in the glob, or None if it has none."""
+        components = glob.split(os.sep)
+        for i, component in enumerate(components):
+            if cls._WILDCARD_CHARS.intersection(component):
+                return os.sep.join(components[:i])
+        return None
+
+    @staticmethod
+    def _ancestor_dirs(path: str) -> Iterator[str]:
+        """Yield the directories containing the path, from the buildroot down."""
+        yield ""
+        components = path.split(os.sep)[:-1]
+        for i in range(1, len(components) + 1):
+            yield os.sep.join(components[:i])
+
+    def owners(self, sources: Iterable[str]) -> List[Address]:
+        """Return the addresses of the targets that declare or own any of the given sources."""
+        owners: Set[int] = set()
+        paths_to_match: DefaultDict[int, List[str]] = defaultdict(list)
+        for source in sources:
+            owners.update(self._owners_by_build_file.get(source, ()))
+            owners.update(self._owners_by_path.get(source, ()))
+            for directory in self._ancestor_dirs(source):
+                for i in self._owners_by_glob_prefix.get(directory, ()):
+                    paths_to_match[i].append(source)
+
+        for i, paths in paths_to_match.items():
+            if i not in owners and any_matches_filespec(paths=paths, spec=self._filespecs[i]):
+                owners.add(i)
+        return [self._addresses[i] for i in sorted(owners)]
+
+
 @rule
-async def find_owners(owners_request: OwnersRequest) -> Owners:
-    sources_set = FrozenOrderedSet(owners_request.sources)
-    dirs_set = FrozenOrderedSet(os.path.dirname(source) for source in sources_set)
-
-    # Walk up the buildroot looking for targets that would conceivably claim changed sources.
-    candidate_specs = tuple(AscendantAddresses(directory=d) for d in dirs_set)
-    candidate_targets = await Get[HydratedTargets](AddressSpecs(candidate_specs))
-
-    # Match the source globs against the expanded candidate targets.
-    def owns_any_source(legacy_target: HydratedTarget) -> bool:
-        """Given a `HydratedTarget` instance, check if it owns the given source file."""
-        target_kwargs = legacy_target.adaptor.kwargs()
-
-        # Handle `sources`-declaring targets.
-        # NB: Deleted files can only be matched against the 'filespec' (ie, `PathGlobs`) for a target,
-        # so we don't actually call `fileset.matches` here.
-        # TODO: This matching logic should be implemented using the rust `fs` crate for two reasons:
-        #  1) having two implementations isn't great
-        #  2) we're expanding sources via HydratedTarget, but it isn't necessary to do that to match
-        target_sources = target_kwargs.get("sources", None)
-        return target_sources and any_matches_filespec(
-            paths=sources_set, spec=target_sources.filespec
-        )
+async def source_owners_index(address_specs: AddressSpecs) -> SourceOwnersIndex:
+    """Index the candidate owners matched by the given specs.
 
+    The index is memoized by the engine, so in pantsd it is reused across runs until one of the
+    BUILD files it was built from changes.
+    """
+    hydrated_targets = await Get[HydratedTargets](AddressSpecs, address_specs)
     build_file_addresses = await MultiGet(
-        Get[BuildFileAddress](Address, ht.adaptor.address) for ht in candidate_targets
+        Get[BuildFileAddress](Address, ht.adaptor.address) for ht in hydrated_targets
     )
-    owners = Addresses(
-        ht.adaptor.address
-        for ht, bfa in zip(candidate_targets, build_file_addresses)
-        if LegacyAddressMapper.any_is_declaring_file(bfa, sources_set) or owns_any_source(ht)
+    return SourceOwnersIndex(zip(hydrated_targets, build_file_addresses))
+
+
+@rule
+async def find_owners(owners_request: OwnersRequest) -> Owners:
+    sources_by_dir: DefaultDict[str, List[str]] = defaultdict(list)
+    for source in FrozenOrderedSet(owners_request.sources):
+        sources_by_dir[os.path.dirname(source)].append(source)
+
+    # Walk up the buildroot from each directory looking for targets that would conceivably claim
+    # its sources. Each directory's candidates are indexed separately, so that the indexes can be
+    # reused by later requests for different sets of sources.
+    indexes = await MultiGet(
+        Get[SourceOwnersIndex](AddressSpecs((AscendantAddresses(directory=d),)))
+        for d in sources_by_dir
     )
-    return Owners(owners)
+    owners: OrderedSet[Address] = OrderedSet()
+    for index, sources in zip(indexes, sources_by_dir.values()):
+        owners.update(index.owners(sources))
+    return Owners(Addresses(owners))
 
 
 @rule
@@ -958,6 +1079,7 @@ def create_legacy_graph_tasks():
         hydrate_target_with_origin,
         hydrated_targets,
         hydrated_targets_with_origins,
+        source_owners_index,
         find_owners,
         hydrate_sources,
         hydrate_bundles,
@@ -0,0 +1,191 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.engine.parser import SymbolTable
+from pants.option.global_options import BuildFileImportsBehavior
+from pants.util.dirutil import safe_mkdir_for
+from pants.version import VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedBuildFileCache:
+    """A persistent cache of the objects parsed from BUILD files.
+
+    Entries are keyed by the path of a BUILD file, and are only valid for the digest of its content
+    and the fingerprint of the symbols it was parsed with: so the cache holds at most one entry per
+    BUILD file. It is stored in a sqlite database, so that it may be shared by concurrent pants
+    processes and by pantsd, and outlives both.
+
+    Failures to read or write the cache are logged rather than raised: at worst they cause BUILD
+    files to be parsed again.
+    """
+
+    FILENAME = "parsed_build_files.sqlite"
+
+    _TIMEOUT_SECS = 10
+
+    @classmethod
+    def for_symbols(
+        cls,
+        cache_dir: str,
+        symbol_table: SymbolTable,
+        aliases: BuildFileAliases,
+        build_file_imports_behavior: BuildFileImportsBehavior,
+    ) -> "ParsedBuildFileCache":
+        """Return the cache for BUILD files parsed with the given symbols."""
+        return cls(
+            os.path.join(cache_dir, cls.FILENAME),
+            cls.fingerprint_symbols(symbol_table, aliases, build_file_imports_behavior),
+        )
+
+    @staticmethod
+    def fingerprint_symbols(
+        symbol_table: SymbolTable,
+        aliases: BuildFileAliases,
+        build_file_imports_behavior: BuildFileImportsBehavior,
+    ) -> str:
+        """Fingerprint the symbols available to BUILD files, and the code that implements them.
+
+        The source of each module defining a symbol is included, so that editing an in-repo plugin
+        invalidates the BUILD files parsed with it. Changes to code that those modules call into are
+        not detected, other than by a change in the pants version.
+        """
+        symbols: Dict[str, Any] = {
+            **symbol_table.table,
+            **aliases.objects,
+            **aliases.context_aware_object_factories,
+            **aliases.target_macro_factories,
+        }
+        module_digests: Dict[str, str] = {}
+
+        def module_digest(module) -> str:
+            path = getattr(module, "__file__", None)
+            if not path:
+                return ""
+            if path not in module_digests:
+                try:
+                    with open(path, "rb") as fp:
+                        module_digests[path] = hashlib.sha1(fp.read()).hexdigest()
+                except OSError:
+                    module_digests[path] = ""
+            return module_digests[path]
+
+        hasher = hashlib.sha1()
+        hasher.update(f"{VERSION}:{build_file_imports_behavior.value}".encode())
+        for alias, symbol in sorted(symbols.items()):
+            if inspect.isclass(symbol) or inspect.isroutine(symbol):
+                implementation = symbol
+            else:
+                implementation = type(symbol)
+            module = inspect.getmodule(implementation)
+            hasher.update(
+                "\0{}={}.{}:{}".format(
+                    alias,
+                    implementation.__module__,
+                    implementation.__qualname__,
+                    module_digest(module),
+                ).encode()
+            )
+        return hasher.hexdigest()
+
+    def __init__(self, path: str, fingerprint: str) -> None:
+        """
+        :param path: The path of the cache database.
+        :param fingerprint: The fingerprint of the symbols that BUILD files are parsed with.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        # sqlite3 connections may not be shared between threads, but BUILD files are parsed on
+        # many of the engine's threads, and connecting per parse would cost about as much as the
+        # parse: so keep a connection per thread.
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        self._maybe_initialize()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self._TIMEOUT_SECS)
+            # Losing the most recent entries on a power failure only costs re-parsing them.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _maybe_initialize(self) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            safe_mkdir_for(self.path)
+            conn = sqlite3.connect(self.path, timeout=self._TIMEOUT_SECS)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS parsed ("
+                        "path TEXT PRIMARY KEY, "
+                        "digest TEXT NOT NULL, "
+                        "fingerprint TEXT NOT NULL, "
+                        "objects BLOB NOT NULL)"
+                    )
+            finally:
+                conn.close()
+            self._initialized = True
+
+    @staticmethod
+    def _digest(filecontent: bytes) -> str:
+        return hashlib.sha1(filecontent).hexdigest()
+
+    def get(self, filepath: str, filecontent: bytes) -> Optional[List]:
+        """Return the objects previously parsed from this content of the BUILD file, if any."""
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT objects FROM parsed WHERE path = ? AND digest = ? AND fingerprint = ?",
+                    (filepath, self._digest(filecontent), self.fingerprint),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read {filepath} from BUILD file cache {self.path}: {e}")
+            return None
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            # E.g. a class that a cached object was an instance of has since been removed.
+            logger.debug(f"Failed to load cached objects for {filepath}: {e!r}")
+            return None
+
+    def put(self, filepath: str, filecontent: bytes, objects: List) -> None:
+        """Store the objects parsed from this content of the BUILD file."""
+        try:
+            pickled = pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # Objects created by plugins' BUILD file symbols are not necessarily picklable: such
+            # BUILD files are always parsed.
+            logger.debug(f"Not caching the objects parsed from {filepath}: {e!r}")
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO parsed (path, digest, fingerprint, objects) "
+                    "VALUES (?, ?, ?, ?)",
+                    (filepath, self._digest(filecontent), self.fingerprint, pickled),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write {filepath} to BUILD file cache {self.path}: {e}")
@@ -1,16 +1,19 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import builtins
+import itertools
 import logging
 import os
 import tokenize
 from io import StringIO
-from typing import Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
 from pants.base.build_file_target_factory import BuildFileTargetFactory
 from pants.base.exceptions import UnaddressableObjectError
 from pants.base.parse_context import ParseContext
 from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.engine.legacy.parsed_build_file_cache import ParsedBuildFileCache
 from pants.engine.legacy.structs import BundleAdaptor, TargetAdaptor
 from pants.engine.objects import Serializable
 from pants.engine.parser import ParseError, Parser, SymbolTable
@@ -35,6 +38,7 @@ class LegacyPythonCallbacksParser(Parser):
         symbol_table: SymbolTable,
         aliases: BuildFileAliases,
         build_file_imports_behavior: BuildFileImportsBehavior,
+        cache: Optional[ParsedBuildFileCache] = None,
     ) -> None:
         """
         :param symbol_table: A SymbolTable for this parser, which will be overlaid with the given
@@ -42,14 +46,41 @@ class LegacyPythonCallbacksParser(Parser):
         :param aliases: Additional BuildFileAliases to register.
         :param build_file_imports_behavior: How to behave if a BUILD file being parsed tries to use
           import statements.
+        :param cache: A persistent cache of parsed BUILD files to consult before parsing them, which
+          must have been created for the same symbols.
         """
         super().__init__()
-        self._symbols, self._parse_context = self._generate_symbols(symbol_table, aliases)
+        self._symbols, self._parse_context = self._generate_symbols(
+            symbol_table, aliases, self._mark_uncacheable
+        )
         self._build_file_imports_behavior = build_file_imports_behavior
+        self._cache = cache
+        # Whether the objects of the most recent parse depend only on the content of the BUILD file
+        # (and the symbols), and so may be cached.
+        self._cacheable = False
+
+        def recording_import(*args, **kwargs):
+            self._mark_uncacheable()
+            return builtins.__import__(*args, **kwargs)
+
+        def recording_open(*args, **kwargs):
+            self._mark_uncacheable()
+            return builtins.open(*args, **kwargs)
+
+        self._builtins = {
+            **builtins.__dict__,
+            "__import__": recording_import,
+            "open": recording_open,
+        }
+
+    def _mark_uncacheable(self) -> None:
+        self._cacheable = False
 
     @staticmethod
     def _generate_symbols(
-        symbol_table: SymbolTable, aliases: BuildFileAliases,
+        symbol_table: SymbolTable,
+        aliases: BuildFileAliases,
+        on_uncacheable_call: Callable[[], None],
     ) -> Tuple[Dict, ParseContext]:
         symbols: Dict = {}
 
@@ -108,11 +139,44 @@ class LegacyPythonCallbacksParser(Parser):
             for target_type in target_macro_factory.target_types:
                 symbols[target_type] = Registrar(parse_context, alias, underlying_symbol)
 
+        # Context aware object factories and target macros may read files other than the BUILD file
+        # (e.g. `python_requirements` reads a requirements.txt), so their results can't be cached.
+        class UncacheableSymbol:
+            def __init__(self, symbol):
+                self._symbol = symbol
+
+            def __call__(self, *args, **kwargs):
+                on_uncacheable_call()
+                return self._symbol(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self._symbol, name)
+
+        for alias in itertools.chain(
+            aliases.context_aware_object_factories, aliases.target_macro_factories
+        ):
+            symbols[alias] = UncacheableSymbol(symbols[alias])
+
         symbols["bundle"] = BundleAdaptor
 
         return symbols, parse_context
 
     def parse(self, filepath: str, filecontent: bytes):
+        if self._cache is None:
+            return self._parse(filepath, filecontent)
+
+        objects = self._cache.get(filepath, filecontent)
+        if objects is None:
+            self._cacheable = False
+            objects = self._parse(filepath, filecontent)
+            # BUILD files which import modules or call symbols that may read other files are not
+            # cached: their objects may depend on more than their content, and imports should be
+            # warned about every time they are parsed.
+            if self._cacheable:
+                self._cache.put(filepath, filecontent, objects)
+        return objects
+
+    def _parse(self, filepath: str, filecontent: bytes):
         python = filecontent.decode()
 
         # Mutate the parse context for the new path, then exec, and copy the resulting objects.
@@ -121,7 +185,8 @@ class LegacyPythonCallbacksParser(Parser):
         # _intentional_ mutation would require a deep clone, which doesn't seem worth the cost at
         # this juncture.
         self._parse_context._storage.clear(os.path.dirname(filepath))
-        exec(python, dict(self._symbols))
+        self._cacheable = True
+        exec(python, {**self._symbols, "__builtins__": self._builtins})
 
         # Perform this check after successful execution, so we know the python is valid (and should
         # tokenize properly!)
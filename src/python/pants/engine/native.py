@@ -10,7 +10,7 @@ import sysconfig
 import traceback
 from contextlib import closing
 from types import CoroutineType
-from typing import Any, Iterable, NamedTuple, Tuple, Type, cast
+from typing import Any, Iterable, NamedTuple, Optional, Tuple, Type, cast
 
 import cffi
 import pkg_resources
@@ -39,6 +39,7 @@ from pants.engine.isolated_process import (
 )
 from pants.engine.objects import union
 from pants.engine.platform import Platform
+from pants.engine.rule_profiler import RuleProfiler
 from pants.engine.selectors import Get
 from pants.util.contextutil import temporary_dir
 from pants.util.dirutil import read_file, safe_mkdir, safe_mkdtemp
@@ -245,9 +246,10 @@ def _extern_decl(return_type, arg_types):
 
 
 class _FFISpecification(object):
-    def __init__(self, ffi, lib):
+    def __init__(self, ffi, lib, native):
         self._ffi = ffi
         self._lib = lib
+        self._native = native
 
     @memoized_classproperty
     def _extern_fields(cls):
@@ -487,7 +489,13 @@ class _FFISpecification(object):
         c = self._ffi.from_handle(context_handle)
         response = self._ffi.new("PyGeneratorResponse*")
         try:
-            res = c.from_value(func[0]).send(c.from_value(arg[0]))
+            coroutine = c.from_value(func[0])
+            value = c.from_value(arg[0])
+            rule_profiler = self._native.rule_profiler
+            if rule_profiler:
+                res = rule_profiler.send(coroutine, value)
+            else:
+                res = coroutine.send(value)
 
             if isinstance(res, Get):
                 # Get.
@@ -530,6 +538,9 @@ class _FFISpecification(object):
         c = self._ffi.from_handle(context_handle)
         runnable = c.from_value(func[0])
         args = tuple(c.from_value(arg[0]) for arg in self._ffi.unpack(args_ptr, args_len))
+        rule_profiler = self._native.rule_profiler
+        if rule_profiler:
+            runnable = rule_profiler.profiled(runnable)
         return self.call(c, runnable, args)
 
 
@@ -711,6 +722,9 @@ class Native(metaclass=SingletonMetaclass):
 
     _errors_during_execution = None
 
+    # If set, profiles the @rules run by the engine.
+    rule_profiler: Optional[RuleProfiler] = None
+
     class CFFIExternMethodRuntimeErrorInfo(NamedTuple):
         """Encapsulates an exception raised when a CFFI extern is called so that it can be
         displayed.
@@ -774,7 +788,7 @@ class Native(metaclass=SingletonMetaclass):
     def lib(self):
         """Load and return the native engine module."""
         lib = self.ffi.dlopen(self.binary)
-        _FFISpecification(self.ffi, lib).register_cffi_externs(self)
+        _FFISpecification(self.ffi, lib, self).register_cffi_externs(self)
         return lib
 
     @memoized_property
@@ -911,6 +925,7 @@ class Native(metaclass=SingletonMetaclass):
         ui_worker_count,
         build_id,
         should_report_workunits: bool,
+        should_profile_rules: bool = False,
     ):
         return self.gc(
             self.lib.session_create(
@@ -920,6 +935,7 @@ class Native(metaclass=SingletonMetaclass):
                 ui_worker_count,
                 self.context.utf8_buf(build_id),
                 should_report_workunits,
+                should_profile_rules,
             ),
             self.lib.session_destroy,
         )
@@ -984,6 +1000,7 @@ class Native(metaclass=SingletonMetaclass):
             self.to_ids_buf(root_subject_types),
             # Remote execution config.
             execution_options.remote_execution,
+            execution_options.remote_cache_only,
             self.context.utf8_buf_buf(execution_options.remote_store_server),
             # We can't currently pass Options to the rust side, so we pass empty strings for None.
             self.context.utf8_buf(execution_options.remote_execution_server or ""),
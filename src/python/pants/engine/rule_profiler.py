@@ -0,0 +1,171 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from types import CoroutineType, GeneratorType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+
+@dataclass
+class RuleStats:
+    """The profile of a single @rule over a run."""
+
+    # The number of times the rule was run.
+    invocations: int = 0
+    # The number of times the result of the rule was requested, including requests which were
+    # served by an earlier invocation, if known.
+    requests: Optional[int] = None
+    # The wall time from the start of each invocation until it completed, including the time spent
+    # waiting for the results of its `Get`s.
+    total_time: float = 0.0
+    # The wall time spent in the rule's own Python code.
+    self_time: float = 0.0
+    # The CPU time spent in the rule's own Python code.
+    self_cpu_time: float = 0.0
+
+    @property
+    def memoized(self) -> Optional[int]:
+        """The number of requests for the rule which were served by an earlier invocation."""
+        if self.requests is None:
+            return None
+        return max(self.requests - self.invocations, 0)
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """The fraction of requests for the rule which were served by an earlier invocation."""
+        if not self.requests:
+            return None
+        return self.memoized / self.requests  # type: ignore[operator]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), memoized=self.memoized, hit_ratio=self.hit_ratio)
+
+
+class RuleProfiler:
+    """Profiles the @rules run by the engine.
+
+    The engine calls into Python to invoke a rule, and then, for a rule which is a coroutine, once
+    per step of the coroutine until it completes. The profiler times each of those calls, and each
+    invocation as a whole. The engine separately counts the requests for the result of each rule:
+    see `record_requests`.
+
+    The profiler can't tell which session a rule runs for, so a profile is declined (see `decline`)
+    if other sessions execute while it is being recorded.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, RuleStats] = defaultdict(RuleStats)
+        # Map coroutine -> (the name of its rule, the time its invocation started).
+        self._running: Dict[Any, Tuple[str, float]] = {}
+        self._decline_reason: Optional[str] = None
+
+    @property
+    def decline_reason(self) -> Optional[str]:
+        """Why this profile was declined, if it was: a declined profile may be misleading."""
+        return self._decline_reason
+
+    def decline(self, reason: str) -> None:
+        """Declines this profile for the given reason, if it has not already been declined."""
+        with self._lock:
+            if self._decline_reason is None:
+                self._decline_reason = reason
+
+    @staticmethod
+    def rule_name(func: Callable) -> Optional[str]:
+        """The name which the engine uses for the given function, if it implements a rule."""
+        if not hasattr(func, "rule"):
+            return None
+        line_number = func.__line_number__  # type: ignore[attr-defined]
+        return f"{func.__module__}:{line_number}:{func.__name__}"
+
+    def profiled(self, func: Callable) -> Callable:
+        """Returns a function which invokes the given function, profiling it if it is a rule."""
+        name = self.rule_name(func)
+        if name is None:
+            return func
+
+        def invoke(*args):
+            start = time.time()
+            start_cpu = time.thread_time()
+            result = None
+            try:
+                result = func(*args)
+                return result
+            finally:
+                end = time.time()
+                with self._lock:
+                    stats = self._stats[name]
+                    stats.invocations += 1
+                    stats.self_time += end - start
+                    stats.self_cpu_time += time.thread_time() - start_cpu
+                    if isinstance(result, (CoroutineType, GeneratorType)):
+                        self._running[result] = (name, start)
+                    else:
+                        stats.total_time += end - start
+
+        return invoke
+
+    def send(self, coroutine: Any, arg: Any) -> Any:
+        """Sends the given value to the given coroutine, profiling it if it is that of a rule."""
+        running = self._running.get(coroutine)
+        if running is None:
+            return coroutine.send(arg)
+        name, invocation_start = running
+        start = time.time()
+        start_cpu = time.thread_time()
+        completed = True
+        try:
+            result = coroutine.send(arg)
+            completed = False
+            return result
+        finally:
+            end = time.time()
+            with self._lock:
+                stats = self._stats[name]
+                stats.self_time += end - start
+                stats.self_cpu_time += time.thread_time() - start_cpu
+                if completed:
+                    del self._running[coroutine]
+                    stats.total_time += end - invocation_start
+
+    def record_requests(self, requests: Mapping[str, int]) -> None:
+        """Records the number of times the engine requested the result of each rule."""
+        with self._lock:
+            for name, count in requests.items():
+                self._stats[name].requests = count
+
+    def stats(self) -> Dict[str, RuleStats]:
+        """Returns the stats of each rule which was invoked or requested, by rule name."""
+        with self._lock:
+            return {name: RuleStats(**asdict(stats)) for name, stats in self._stats.items()}
+
+    def to_json_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in sorted(self.stats().items())}
+
+    def format_table(self) -> str:
+        """Formats the stats of each rule as a table, in decreasing order of total time."""
+        rows: List[Tuple[str, ...]] = [
+            ("total(s)", "self(s)", "cpu(s)", "invoked", "requested", "memoized", "hit%", "rule")
+        ]
+        for name, stats in sorted(self.stats().items(), key=lambda item: -item[1].total_time):
+            rows.append(
+                (
+                    f"{stats.total_time:.3f}",
+                    f"{stats.self_time:.3f}",
+                    f"{stats.self_cpu_time:.3f}",
+                    str(stats.invocations),
+                    "-" if stats.requests is None else str(stats.requests),
+                    "-" if stats.memoized is None else str(stats.memoized),
+                    "-" if stats.hit_ratio is None else f"{stats.hit_ratio:.0%}",
+                    name,
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+        return "\n".join(
+            "  ".join([cell.rjust(width) for cell, width in zip(row, widths)] + [row[-1]])
+            for row in rows
+        )
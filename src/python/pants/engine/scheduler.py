@@ -5,8 +5,11 @@ import logging
 import multiprocessing
 import os
 import sys
+import threading
 import time
 import traceback
+from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from textwrap import dedent
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, cast
@@ -23,6 +26,7 @@ from pants.engine.fs import (
 from pants.engine.native import Function, TypeId
 from pants.engine.nodes import Return, Throw
 from pants.engine.objects import Collection, union
+from pants.engine.rule_profiler import RuleProfiler
 from pants.engine.rules import Rule, RuleIndex, TaskRule
 from pants.engine.selectors import Params
 from pants.option.global_options import ExecutionOptions
@@ -93,6 +97,11 @@ class Scheduler:
         self._native = native
         self.include_trace_on_error = include_trace_on_error
         self._visualize_to_dir = visualize_to_dir
+        # The externs which run @rules are shared by all sessions, so @rules are only profiled while
+        # the session which profiles them is the only one executing. Guarded by `_sessions_lock`.
+        self._sessions_lock = threading.Lock()
+        self._executing_sessions: Dict[Any, int] = defaultdict(int)
+        self._rule_profiling_session = None
         # Validate and register all provided and intrinsic tasks.
         rule_index = RuleIndex.create(list(rules), union_rules)
         self._root_subject_types = [r.output_type for r in rule_index.roots]
@@ -319,25 +328,77 @@ class Scheduler:
             )
         return roots
 
+    @contextmanager
+    def _executing(self, session):
+        """Marks the given session as executing for the duration of the context."""
+        with self._sessions_lock:
+            self._executing_sessions[session] += 1
+            if self._native.rule_profiler is not None and set(self._executing_sessions) != {
+                self._rule_profiling_session
+            }:
+                self._stop_rule_profiling(
+                    decline_reason="other sessions executed concurrently with the profiled session"
+                )
+        try:
+            yield
+        finally:
+            with self._sessions_lock:
+                self._executing_sessions[session] -= 1
+                if not self._executing_sessions[session]:
+                    del self._executing_sessions[session]
+
+    def _stop_rule_profiling(self, decline_reason=None):
+        """Stops profiling @rules, declining the profile for the given reason if there is one.
+
+        Called with `_sessions_lock` held.
+        """
+        if decline_reason is not None and self._native.rule_profiler is not None:
+            self._native.rule_profiler.decline(decline_reason)
+        self._native.rule_profiler = None
+        self._rule_profiling_session = None
+
+    def end_rule_profiling(self, rule_profiler):
+        with self._sessions_lock:
+            if self._native.rule_profiler is rule_profiler:
+                self._stop_rule_profiling()
+
     def lease_files_in_graph(self, session):
         self._native.lib.lease_files_in_graph(self._scheduler, session)
 
     def garbage_collect_store(self):
         self._native.lib.garbage_collect_store(self._scheduler)
 
-    def new_session(self, zipkin_trace_v2, build_id, v2_ui=False, should_report_workunits=False):
+    def new_session(
+        self,
+        zipkin_trace_v2,
+        build_id,
+        v2_ui=False,
+        should_report_workunits=False,
+        should_profile_rules=False,
+    ):
         """Creates a new SchedulerSession for this Scheduler."""
-        return SchedulerSession(
-            self,
-            self._native.new_session(
-                self._scheduler,
-                zipkin_trace_v2,
-                v2_ui,
-                multiprocessing.cpu_count(),
-                build_id,
-                should_report_workunits,
-            ),
+        session = self._native.new_session(
+            self._scheduler,
+            zipkin_trace_v2,
+            v2_ui,
+            multiprocessing.cpu_count(),
+            build_id,
+            should_report_workunits,
+            should_profile_rules,
         )
+        rule_profiler = None
+        if should_profile_rules:
+            rule_profiler = RuleProfiler()
+            with self._sessions_lock:
+                if self._executing_sessions:
+                    rule_profiler.decline("other sessions were executing when profiling started")
+                else:
+                    # Any other session which is still profiling @rules is not executing, so it
+                    # ended without ending its profile.
+                    self._stop_rule_profiling(decline_reason="a later session profiled @rules")
+                    self._native.rule_profiler = rule_profiler
+                    self._rule_profiling_session = session
+        return SchedulerSession(self, session, rule_profiler=rule_profiler)
 
 
 class _PathGlobsAndRootCollection(Collection[PathGlobsAndRoot]):
@@ -361,9 +422,10 @@ class SchedulerSession:
 
     execution_error_type = ExecutionError
 
-    def __init__(self, scheduler, session):
+    def __init__(self, scheduler, session, rule_profiler=None):
         self._scheduler = scheduler
         self._session = session
+        self._rule_profiler = rule_profiler
         self._run_count = 0
 
     @property
@@ -440,6 +502,19 @@ class SchedulerSession:
     def engine_workunits(metrics):
         return metrics.get("engine_workunits")
 
+    def end_rule_profiling(self, metrics) -> Optional[RuleProfiler]:
+        """Stops profiling @rules, if this session profiles them, and returns the profile.
+
+        :param metrics: The metrics of this session, which include the engine's counts of the
+                        requests for each rule.
+        """
+        rule_profiler = self._rule_profiler
+        if rule_profiler is None:
+            return None
+        self._scheduler.end_rule_profiling(rule_profiler)
+        rule_profiler.record_requests(metrics.get("rule_requests", {}))
+        return rule_profiler
+
     def with_fork_context(self, func):
         return self._scheduler.with_fork_context(func)
 
@@ -455,12 +530,13 @@ class SchedulerSession:
         :return: A tuple of (root, Return) tuples and (root, Throw) tuples.
         """
         start_time = time.time()
-        roots = list(
-            zip(
-                execution_request.roots,
-                self._scheduler._run_and_return_roots(self._session, execution_request.native),
-            ),
-        )
+        with self._scheduler._executing(self._session):
+            roots = list(
+                zip(
+                    execution_request.roots,
+                    self._scheduler._run_and_return_roots(self._session, execution_request.native),
+                ),
+            )
 
         ExceptionSink.toggle_ignoring_sigint_v2_engine(False)
 
@@ -4,6 +4,7 @@
 import os
 from collections import defaultdict
 
+from pants.goal.stats_log import StatsLog
 from pants.util.dirutil import safe_mkdir_for
 
 
@@ -11,15 +12,33 @@ class AggregatedTimings:
     """Aggregates timings over multiple invocations of 'similar' work.
 
     If filepath is not none, stores the timings in that file. Useful for finding bottlenecks.
+
+    Each timing is appended to a log adjacent to the file as it is added, and the file itself is
+    only written by `write`: see `AggregatedTimings.log_path` and `AggregatedTimings.from_log`.
     """
 
+    @staticmethod
+    def log_path(path):
+        """The path of the log of the timings which are summarized at the given path."""
+        return f"{path}.jsonl"
+
+    @classmethod
+    def from_log(cls, log_path):
+        """Aggregates the timings recorded in the given log, which may still be being written."""
+        timings = cls()
+        for record in StatsLog.read(log_path):
+            timings.add_timing(record["label"], record["secs"], record["is_tool"])
+        return timings
+
     def __init__(self, path=None):
         # Map path -> timing in seconds (a float)
         self._timings_by_path = defaultdict(float)
         self._tool_labels = set()
         self._path = path
+        self._log = None
         if path:
             safe_mkdir_for(self._path)
+            self._log = StatsLog(self.log_path(path))
 
     def add_timing(self, label, secs, is_tool=False):
         """Aggregate timings by label.
@@ -30,6 +49,16 @@ class AggregatedTimings:
         self._timings_by_path[label] += secs
         if is_tool:
             self._tool_labels.add(label)
+        if self._log:
+            self._log.append(label=label, secs=secs, is_tool=is_tool)
+
+    def write(self):
+        """Writes all the timings to the file, sorted in decreasing order.
+
+        Called once all timings have been added: timings added later are not logged.
+        """
+        if self._log:
+            self._log.close()
         # Check existence in case we're a clean-all. We don't want to write anything in that case.
         if self._path and os.path.exists(os.path.dirname(self._path)):
             with open(self._path, "w") as f:
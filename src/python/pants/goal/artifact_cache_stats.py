@@ -22,6 +22,9 @@ class ArtifactCacheStats:
             return CacheStat([], [])
 
         self.stats_per_cache = defaultdict(init_stat)
+        # Incremented whenever the stats change, so that renderings of them may be kept up to date
+        # without re-rendering unchanged stats.
+        self.version = 0
         self._dir = dir
         safe_mkdir(self._dir)
 
@@ -62,6 +65,7 @@ class ArtifactCacheStats:
         causes = causes or [True] * len(targets)
         target_with_causes = [format_vts(tgt, cause) for tgt, cause in zip(targets, causes)]
         self.stats_per_cache[cache_name][hit_or_miss].extend(target_with_causes)
+        self.version += 1
         suffix = "misses" if hit_or_miss else "hits"
         if self._dir and os.path.exists(self._dir):  # Check existence in case of a clean-all.
             with open(os.path.join(self._dir, "{}.{}".format(cache_name, suffix)), "a") as f:
@@ -138,6 +138,13 @@ class RunTracker(Subsystem):
             "GLOBAL^enable_pantsd",
         )
 
+    @staticmethod
+    def make_run_id(run_timestamp: float, run_uuid: str) -> str:
+        """Select a globally unique ID for a run, that sorts by time."""
+        millis = int((run_timestamp * 1000) % 1000)
+        str_time = time.strftime("%Y_%m_%d_%H_%M_%S", time.localtime(run_timestamp))
+        return f"pants_run_{str_time}_{millis}_{run_uuid}"
+
     def __init__(self, *args, **kwargs):
         """
         :API: public
@@ -149,11 +156,8 @@ class RunTracker(Subsystem):
         self._v2_goal_rule_names = tuple()
 
         self.run_uuid = uuid.uuid4().hex
-        # Select a globally unique ID for the run, that sorts by time.
-        millis = int((self._run_timestamp * 1000) % 1000)
         # run_uuid is used as a part of run_id and also as a trace_id for Zipkin tracing
-        str_time = time.strftime("%Y_%m_%d_%H_%M_%S", time.localtime(self._run_timestamp))
-        self.run_id = f"pants_run_{str_time}_{millis}_{self.run_uuid}"
+        self.run_id = self.make_run_id(self._run_timestamp, self.run_uuid)
 
         # Initialized in `initialize()`.
         self.run_info_dir = None
@@ -299,7 +303,7 @@ class RunTracker(Subsystem):
         if self._stats_version == 2:
             json_reporter_settings = JsonReporter.Settings(log_level=Report.INFO)
             self.json_reporter = JsonReporter(self, json_reporter_settings)
-            report.add_reporter("json", self.json_reporter)
+            report.add_reporter("json", self.json_reporter, asynchronous=True)
 
         self.report.open()
 
@@ -583,6 +587,10 @@ class RunTracker(Subsystem):
 
         self.end_workunit(self._main_root_workunit)
 
+        # The timings are only logged as they are added: summarize them now that they are final.
+        self.cumulative_timings.write()
+        self.self_timings.write()
+
         outcome = self._main_root_workunit.outcome()
         if self._background_root_workunit:
             outcome = min(outcome, self._background_root_workunit.outcome())
@@ -0,0 +1,104 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+
+class StatsLog:
+    """An append-only log of stats records, stored as newline-delimited JSON.
+
+    Appending a record costs the same however many records came before it, unlike rewriting a
+    summary of all of them. Summaries are instead materialized from the records when they are
+    needed: see `StatsLog.read`.
+
+    Writes are buffered, and flushed at most once per `flush_interval_secs`: records appended in
+    between are flushed by a timer once the interval has elapsed, so readers in other processes see
+    them at most that long after they were appended.
+    """
+
+    def __init__(self, path: str, flush_interval_secs: float = 1.0) -> None:
+        self._path = path
+        self._flush_interval_secs = flush_interval_secs
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self._last_flush_time = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def append(self, **record: Any) -> None:
+        """Append a record, which must be serializable as JSON."""
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            f = self._open()
+            if f is None:
+                return
+            f.write(line)
+            f.write("\n")
+            now = time.time()
+            if now - self._last_flush_time >= self._flush_interval_secs:
+                self._flush(now)
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self._last_flush_time + self._flush_interval_secs - now, self._flush_from_timer
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush(time.time())
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._cancel_flush_timer()
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _flush(self, now: float) -> None:
+        self._cancel_flush_timer()
+        if self._file:
+            self._file.flush()
+        self._last_flush_time = now
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            self._flush(time.time())
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _open(self) -> Optional[TextIO]:
+        if self._file is None and not self._closed:
+            # Check existence in case we're a clean-all: we don't want to write anything then.
+            if not os.path.isdir(os.path.dirname(self._path)):
+                return None
+            self._file = open(self._path, "a")
+        return self._file
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict[str, Any]]:
+        """Yields the records in the log at the given path, if it exists.
+
+        A log may be read while it is being written: a final record which has only been partially
+        written is skipped.
+        """
+        if not os.path.isfile(path):
+            return
+        with open(path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    return
+                yield json.loads(line)
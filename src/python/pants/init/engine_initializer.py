@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import logging
+import os
 from dataclasses import dataclass
 from typing import Any, Iterable, List, Optional, Tuple, cast
 
@@ -30,6 +31,7 @@ from pants.engine.isolated_process import create_process_rules
 from pants.engine.legacy.address_mapper import LegacyAddressMapper
 from pants.engine.legacy.graph import LegacyBuildGraph, create_legacy_graph_tasks
 from pants.engine.legacy.options_parsing import create_options_parsing_rules
+from pants.engine.legacy.parsed_build_file_cache import ParsedBuildFileCache
 from pants.engine.legacy.parser import LegacyPythonCallbacksParser
 from pants.engine.legacy.structs import (
     FilesAdaptor,
@@ -66,6 +68,7 @@ from pants.option.global_options import (
 )
 from pants.option.options import Options
 from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.scm.subsystems.changed import DependentGraphCache
 from pants.scm.subsystems.changed import rules as changed_rules
 
 logger = logging.getLogger(__name__)
@@ -182,10 +185,15 @@ class LegacyGraphScheduler:
     goal_map: Any
 
     def new_session(
-        self, zipkin_trace_v2, build_id, v2_ui=False, should_report_workunits=False
+        self,
+        zipkin_trace_v2,
+        build_id,
+        v2_ui=False,
+        should_report_workunits=False,
+        should_profile_rules=False,
     ) -> "LegacyGraphSession":
         session = self.scheduler.new_session(
-            zipkin_trace_v2, build_id, v2_ui, should_report_workunits
+            zipkin_trace_v2, build_id, v2_ui, should_report_workunits, should_profile_rules
         )
         return LegacyGraphSession(session, self.build_file_aliases, self.goal_map)
 
@@ -312,6 +320,11 @@ class EngineInitializer:
             build_configuration,
             build_root=build_root,
             native=native,
+            build_file_cache_dir=(
+                os.path.join(bootstrap_options.pants_workdir, "build_file_cache")
+                if bootstrap_options.build_file_cache
+                else None
+            ),
             glob_match_error_behavior=(
                 bootstrap_options.files_not_found_behavior.to_glob_match_error_behavior()
             ),
@@ -337,6 +350,7 @@ class EngineInitializer:
         subproject_roots=None,
         include_trace_on_error: bool = True,
         execution_options: Optional[ExecutionOptions] = None,
+        build_file_cache_dir: Optional[str] = None,
     ) -> LegacyGraphScheduler:
         """Construct and return the components necessary for LegacyBuildGraph construction.
 
@@ -357,6 +371,8 @@ class EngineInitializer:
         :param include_trace_on_error: If True, when an error occurs, the error message will include
                                        the graph trace.
         :param execution_options: Option values for (remote) process execution.
+        :param build_file_cache_dir: A directory to persist the objects parsed from BUILD files in.
+                                     If None, BUILD files are always parsed.
         """
 
         build_root = build_root or get_buildroot()
@@ -377,8 +393,18 @@ class EngineInitializer:
         execution_options = execution_options or DEFAULT_EXECUTION_OPTIONS
 
         # Register "literal" subjects required for these rules.
+        build_file_cache = (
+            ParsedBuildFileCache.for_symbols(
+                build_file_cache_dir,
+                symbol_table,
+                build_file_aliases,
+                build_file_imports_behavior,
+            )
+            if build_file_cache_dir
+            else None
+        )
         parser = LegacyPythonCallbacksParser(
-            symbol_table, build_file_aliases, build_file_imports_behavior
+            symbol_table, build_file_aliases, build_file_imports_behavior, cache=build_file_cache
         )
         address_mapper = AddressMapper(
             parser=parser,
@@ -411,6 +437,12 @@ class EngineInitializer:
         def build_root_singleton() -> BuildRoot:
             return cast(BuildRoot, BuildRoot.instance)
 
+        dependent_graph_cache = DependentGraphCache()
+
+        @rule
+        def dependent_graph_cache_singleton() -> DependentGraphCache:
+            return dependent_graph_cache
+
         # Create a Scheduler containing graph and filesystem rules, with no installed goals. The
         # LegacyBuildGraph will explicitly request the products it needs.
         rules = (
@@ -421,6 +453,7 @@ class EngineInitializer:
             registered_target_types_singleton,
             union_membership_singleton,
             build_root_singleton,
+            dependent_graph_cache_singleton,
             *create_legacy_graph_tasks(),
             *create_fs_rules(),
             *create_interactive_runner_rules(),
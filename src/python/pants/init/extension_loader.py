@@ -32,6 +32,7 @@ def load_backends_and_plugins(
     backends1: List[str],
     backends2: List[str],
     build_configuration: BuildConfiguration,
+    defer_goals: bool = False,
 ) -> BuildConfiguration:
     """Load named plugins and source backends.
 
@@ -41,6 +42,8 @@ def load_backends_and_plugins(
     :param backends1: v1 backends to load.
     :param backends2: v2 backends to load.
     :param build_configuration: The BuildConfiguration (for adding aliases).
+    :param defer_goals: Whether to defer the registration of v1 tasks by backends which declare
+      the goals they install tasks into. See `load_backend`.
     """
     if "pants.backend.python.lint.isort" in backends1:
         warn_or_error(
@@ -68,7 +71,9 @@ def load_backends_and_plugins(
                 "Ensure that you have `--v2` enabled (the default value)."
             ),
         )
-    load_build_configuration_from_source(build_configuration, backends1, backends2)
+    load_build_configuration_from_source(
+        build_configuration, backends1, backends2, defer_goals=defer_goals
+    )
     load_plugins(build_configuration, plugins1, working_set, is_v1_plugin=True)
     load_plugins(build_configuration, plugins2, working_set, is_v1_plugin=False)
     return build_configuration
@@ -129,6 +134,9 @@ def load_plugins(
 
         if is_v1_plugin:
             if "register_goals" in entries:
+                # Plugins may install tasks relative to those of backends, so any deferred task
+                # registrations must be made first.
+                build_configuration.load_deferred_goals()
                 entries["register_goals"].load()()
             if "global_subsystems" in entries:
                 subsystems = entries["global_subsystems"].load()()
@@ -152,20 +160,26 @@ def load_plugins(
 
 
 def load_build_configuration_from_source(
-    build_configuration: BuildConfiguration, backends1: List[str], backends2: List[str]
+    build_configuration: BuildConfiguration,
+    backends1: List[str],
+    backends2: List[str],
+    defer_goals: bool = False,
 ) -> None:
     """Installs pants backend packages to provide BUILD file symbols and cli goals.
 
     :param build_configuration: The BuildConfiguration (for adding aliases).
     :param backends1: An list of packages to load v1 backends from.
     :param backends2: An list of packages to load v2 backends from.
+    :param defer_goals: Whether to defer the registration of v1 tasks where possible.
     :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
       the build configuration.
     """
     # pants.build_graph and pants.core_task must always be loaded, and before any other backends.
     backend_packages1 = FrozenOrderedSet(["pants.build_graph", "pants.core_tasks", *backends1])
     for backend_package in backend_packages1:
-        load_backend(build_configuration, backend_package, is_v1_backend=True)
+        load_backend(
+            build_configuration, backend_package, is_v1_backend=True, defer_goals=defer_goals
+        )
 
     backend_packages2 = FrozenOrderedSet(["pants.rules.core", *backends2])
     for backend_package in backend_packages2:
@@ -173,14 +187,25 @@ def load_build_configuration_from_source(
 
 
 def load_backend(
-    build_configuration: BuildConfiguration, backend_package: str, is_v1_backend: bool
+    build_configuration: BuildConfiguration,
+    backend_package: str,
+    is_v1_backend: bool,
+    defer_goals: bool = False,
 ) -> None:
     """Installs the given backend package into the build configuration.
 
+    A v1 backend's `register_goals` entrypoint typically imports all of its tasks, which is
+    expensive and unnecessary for runs that only use v2 goals. If the backend also provides a
+    `registered_goals` entrypoint, returning the names of the goals that `register_goals` installs
+    tasks into, then the call to `register_goals` may be deferred until one of those goals is used.
+    See `BuildConfiguration.load_deferred_goals`.
+
     :param build_configuration: the BuildConfiguration to install the backend plugin into.
     :param backend_package: the package name containing the backend plugin register module that
       provides the plugin entrypoints.
     :param is_v1_backend: Is this a v1 or v2 backend.
+    :param defer_goals: Whether to defer the `register_goals` entrypoint, if the backend declares
+      its goals.
     :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
       the build configuration.
     """
@@ -208,7 +233,17 @@ def load_backend(
         build_configuration.register_targets(targets)
 
     if is_v1_backend:
-        invoke_entrypoint("register_goals")
+        if hasattr(module, "register_goals"):
+            goals = invoke_entrypoint("registered_goals")
+            if defer_goals and goals is not None:
+                build_configuration.register_deferred_goals(
+                    goals, lambda: invoke_entrypoint("register_goals")
+                )
+            else:
+                # Tasks may be installed relative to those of previously loaded backends, so any
+                # deferred task registrations must be made first.
+                build_configuration.load_deferred_goals()
+                invoke_entrypoint("register_goals")
         subsystems = invoke_entrypoint("global_subsystems")
         if subsystems:
             build_configuration.register_optionables(subsystems)
@@ -1,10 +1,12 @@
 # Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import itertools
 import logging
 import os
 import re
 import sys
+import threading
 
 import pkg_resources
 
@@ -15,6 +17,7 @@ from pants.goal.goal import Goal
 from pants.init.extension_loader import load_backends_and_plugins
 from pants.init.global_subsystems import GlobalSubsystems
 from pants.init.plugin_resolver import PluginResolver
+from pants.option.arg_splitter import ArgSplitter
 from pants.option.global_options import GlobalOptions
 from pants.subsystem.subsystem import Subsystem
 from pants.util.dirutil import fast_relpath_optional
@@ -31,16 +34,94 @@ class BuildConfigInitializer:
     """
 
     _cached_build_config = None
+    _cached_build_config_key = None
+    # Guards initialization, which may be requested by concurrent runs in pantsd.
+    _lock = threading.Lock()
+
+    # The bootstrap options which determine the backends and plugins that are loaded.
+    _BUILD_CONFIG_OPTIONS = (
+        "pythonpath",
+        "plugins",
+        "plugins2",
+        "backend_packages",
+        "backend_packages2",
+    )
+
+    @classmethod
+    def _build_config_key(cls, options_bootstrapper):
+        bootstrap_options = options_bootstrapper.get_bootstrap_options().for_global_scope()
+        return tuple(
+            tuple(getattr(bootstrap_options, name)) for name in cls._BUILD_CONFIG_OPTIONS
+        )
 
     @classmethod
     def get(cls, options_bootstrapper):
-        if cls._cached_build_config is None:
-            cls._cached_build_config = cls(options_bootstrapper).setup()
-        return cls._cached_build_config
+        """Return the BuildConfiguration for the given options, loading backends and plugins only if
+        they differ from those of the cached BuildConfiguration.
+
+        This allows pantsd to keep the same BuildConfiguration (and the goals registered with it)
+        warm across runs.
+
+        The v1 tasks of backends which declare their goals are only registered once the command line
+        refers to one of those goals.
+        """
+        key = cls._build_config_key(options_bootstrapper)
+        with cls._lock:
+            if cls._cached_build_config is not None and cls._cached_build_config_key != key:
+                # The goals registered by the previously loaded backends and plugins are stale too.
+                Goal.clear()
+                cls._cached_build_config = None
+            if cls._cached_build_config is None:
+                cls._cached_build_config = cls(options_bootstrapper).setup()
+                cls._cached_build_config_key = key
+            build_config = cls._cached_build_config
+            deferred_goals = build_config.deferred_goals()
+            if deferred_goals and cls._uses_goals(options_bootstrapper, deferred_goals):
+                build_config.load_deferred_goals()
+            return build_config
+
+    @staticmethod
+    def _uses_goals(options_bootstrapper, goals):
+        """Whether the run may use any of the given goals, or any of the options of their tasks.
+
+        This errs on the side of caution: any argument, config section or environment variable
+        with one of the goals as a component of its scope counts, since options may be scoped to a
+        task (e.g. `compile.rsc`) or to a subsystem of a task (e.g. `jvm.test.junit`). So does a
+        request for help or a command line without goals or specs (which prints help).
+        """
+
+        def uses_goals(name):
+            # Goal names may contain dashes, so match the dash-separated components of the name.
+            name = f"-{name.replace('.', '-')}-"
+            return any(f"-{goal}-" in name for goal in goals)
+
+        # Args after `--` are passthrough args.
+        args = list(itertools.takewhile(lambda arg: arg != "--", options_bootstrapper.args))
+        # The first arg is the binary name, unless it has been omitted (as it may be in tests).
+        if args and not args[0].startswith("-"):
+            args = args[1:]
+        if not any(not arg.startswith("-") for arg in args):
+            return True
+        for arg in args:
+            if ArgSplitter.is_help_arg(arg):
+                return True
+            name = arg.lstrip("-").split("=", 1)[0]
+            if name.startswith("no-"):
+                name = name[len("no-") :]
+            if uses_goals(name):
+                return True
+        env_names = (
+            name[len("PANTS_") :].lower().replace("_", "-") for name in options_bootstrapper.env
+        )
+        return any(
+            uses_goals(name)
+            for name in itertools.chain(options_bootstrapper.config.sections(), env_names)
+        )
 
     @classmethod
     def reset(cls):
         cls._cached_build_config = None
+        cls._cached_build_config_key = None
 
     def __init__(self, options_bootstrapper):
         self._options_bootstrapper = options_bootstrapper
@@ -62,6 +143,7 @@ class BuildConfigInitializer:
             self._bootstrap_options.backend_packages,
             self._bootstrap_options.backend_packages2,
             BuildConfiguration(),
+            defer_goals=True,
         )
 
     def setup(self):
@@ -51,17 +51,21 @@ def init_workdir(global_options: OptionValueContainer) -> str:
     return workdir_src
 
 
-def clean_global_runtime_state(reset_subsystem=False):
+def clean_global_runtime_state(reset_subsystem=False, reset_build_config=True):
     """Resets the global runtime state of a pants runtime for cleaner forking.
 
     :param bool reset_subsystem: Whether or not to clean Subsystem global state.
+    :param bool reset_build_config: Whether or not to clean the loaded backends and plugins, and the
+                                    goals and tasks they registered. If not, they are reloaded only
+                                    if the next run's options call for different ones.
     """
     if reset_subsystem:
         # Reset subsystem state.
         Subsystem.reset()
 
-    # Reset Goals and Tasks.
-    Goal.clear()
+    if reset_build_config:
+        # Reset Goals and Tasks.
+        Goal.clear()
 
-    # Reset global plugin state.
-    BuildConfigInitializer.reset()
+        # Reset global plugin state.
+        BuildConfigInitializer.reset()
@@ -4,14 +4,17 @@
 import errno
 import hashlib
 import os
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
 from collections import namedtuple
+from contextlib import contextmanager
 
 from pants.base.hash_utils import hash_all
 from pants.build_graph.target import Target
 from pants.fs.fs import safe_filename
 from pants.subsystem.subsystem import Subsystem
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import safe_mkdir, safe_mkdir_for
 
 # Bump this to invalidate all existing keys in artifact caches across all pants deployments in the
 # world. Do this if you've made a change that invalidates existing artifacts, e.g.,  fixed a bug
@@ -116,15 +119,148 @@ class UncacheableCacheKeyGenerator(CacheKeyGeneratorInterface):
         return CacheKey.uncacheable(target.id)
 
 
+class _FileFingerprintStore:
+    """Stores the hash for each cache key id in its own file."""
+
+    def __init__(self, root):
+        self._root = root
+
+    def _path(self, id):
+        return os.path.join(self._root, safe_filename(id, extension=".hash"))
+
+    def get_many(self, ids):
+        return {id: self._get(id) for id in ids}
+
+    def _get(self, id):
+        try:
+            with open(self._path(id), "r") as fd:
+                return fd.read().strip()
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return None  # File doesn't exist.
+
+    def put_many(self, ids_and_hashes):
+        for id, hash in ids_and_hashes:
+            with open(self._path(id), "w") as fd:
+                fd.write(hash)
+
+    def delete(self, id):
+        try:
+            os.unlink(self._path(id))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+
+class _SqliteFingerprintStore:
+    """Stores the hashes for all cache key ids in a single sqlite database.
+
+    This avoids opening a file per target, and allows the hashes for a whole invalidation check to
+    be read, and those of its successfully built targets written, with one transaction.
+    """
+
+    FILENAME = "fingerprints.sqlite"
+
+    _TIMEOUT_SECS = 30
+
+    # The maximum number of parameters in one sqlite query is 999 in older sqlite versions.
+    _BATCH_SIZE = 500
+
+    def __init__(self, root):
+        self._path = os.path.join(root, self.FILENAME)
+        # sqlite connections may not be shared between threads, so each thread keeps its own.
+        self._local = threading.local()
+
+    @contextmanager
+    def _connection(self):
+        """Yield this thread's connection to the database, within a transaction."""
+        conn = getattr(self._local, "conn", None)
+        # The database may have been deleted out from under an open connection by a
+        # `force_invalidate_all` on an enclosing invalidator, so check that the connection is to the
+        # current database file before using it.
+        try:
+            stat = os.stat(self._path)
+            current = conn is not None and (stat.st_dev, stat.st_ino) == self._local.file_id
+        except FileNotFoundError:
+            current = False
+        if not current:
+            if conn is not None:
+                conn.close()
+            conn = self._local.conn = self._connect()
+            stat = os.stat(self._path)
+            self._local.file_id = (stat.st_dev, stat.st_ino)
+        with conn:
+            yield conn
+
+    def _connect(self):
+        safe_mkdir_for(self._path)
+        conn = sqlite3.connect(self._path, timeout=self._TIMEOUT_SECS)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints (id TEXT PRIMARY KEY, hash TEXT NOT NULL)"
+            )
+        return conn
+
+    def get_many(self, ids):
+        ids = list(ids)
+        hashes = dict.fromkeys(ids)
+        with self._connection() as conn:
+            for i in range(0, len(ids), self._BATCH_SIZE):
+                batch = ids[i : i + self._BATCH_SIZE]
+                rows = conn.execute(
+                    "SELECT id, hash FROM fingerprints WHERE id IN ({})".format(
+                        ", ".join("?" * len(batch))
+                    ),
+                    batch,
+                )
+                hashes.update(rows)
+        return hashes
+
+    def put_many(self, ids_and_hashes):
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (id, hash) VALUES (?, ?)", ids_and_hashes
+            )
+
+    def delete(self, id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM fingerprints WHERE id = ?", (id,))
+
+
 # A persistent map from target set to cache key, which is a fingerprint of all
 # the inputs to the current version of that target set. That cache key can then be used
 # to look up build artifacts in an artifact cache.
 class BuildInvalidator:
     """Invalidates build targets based on the SHA1 hash of source files and other inputs."""
 
+    FILES_STORE = "files"
+    SQLITE_STORE = "sqlite"
+
+    _STORES = {
+        FILES_STORE: _FileFingerprintStore,
+        SQLITE_STORE: _SqliteFingerprintStore,
+    }
+
     class Factory(Subsystem):
         options_scope = "build-invalidator"
 
+        @classmethod
+        def register_options(cls, register):
+            super().register_options(register)
+            register(
+                "--store",
+                advanced=True,
+                choices=sorted(BuildInvalidator._STORES),
+                default=BuildInvalidator.FILES_STORE,
+                help="How to persist the fingerprints of successfully built targets. `files` "
+                "writes a small file per target, while `sqlite` keeps all of a task's "
+                "fingerprints in a single database, which is much cheaper to check for large "
+                "numbers of targets.",
+            )
+
         @classmethod
         def create(cls, build_task=None):
             """Creates a build invalidator optionally scoped to a task.
@@ -133,10 +269,9 @@ class BuildInvalidator:
                                    supplied the build invalidator will act globally across all build
                                    tasks.
             """
-            root = os.path.join(
-                cls.global_instance().get_options().pants_workdir, "build_invalidator"
-            )
-            return BuildInvalidator(root, scope=build_task)
+            options = cls.global_instance().get_options()
+            root = os.path.join(options.pants_workdir, "build_invalidator")
+            return BuildInvalidator(root, scope=build_task, store=options.store)
 
     @staticmethod
     def cacheable(cache_key):
@@ -147,17 +282,19 @@ class BuildInvalidator:
         """
         return cache_key.cacheable
 
-    def __init__(self, root, scope=None):
+    def __init__(self, root, scope=None, store=FILES_STORE):
         """Create a build invalidator using the given root fingerprint database directory.
 
         :param str root: The root directory to use for storing build invalidation fingerprints.
         :param str scope: The scope of this invalidator; if `None` then this invalidator will be global.
+        :param str store: The kind of store to persist fingerprints in: one of `files` or `sqlite`.
         """
         root = os.path.join(root, GLOBAL_CACHE_KEY_GEN_VERSION)
         if scope:
             root = os.path.join(root, scope)
         self._root = root
         safe_mkdir(self._root)
+        self._store = self._STORES[store](self._root)
 
     def previous_key(self, cache_key):
         """If there was a previous successful build for the given key, return the previous key.
@@ -165,14 +302,28 @@ class BuildInvalidator:
         :param cache_key: A CacheKey object (as returned by CacheKeyGenerator.key_for().
         :returns: The previous cache_key, or None if there was not a previous build.
         """
-        if not self.cacheable(cache_key):
-            # We should never successfully cache an uncacheable CacheKey.
-            return None
+        return self.previous_keys([cache_key])[0]
 
-        previous_hash = self._read_sha(cache_key)
-        if not previous_hash:
-            return None
-        return CacheKey(cache_key.id, previous_hash)
+    def previous_keys(self, cache_keys):
+        """Return the previous key for each of the given keys, with a single read of the store.
+
+        :param cache_keys: A list of CacheKey objects.
+        :returns: A list containing the previous cache_key (or None if there was not a previous
+                  build) for each of the given keys, in order.
+        """
+        # We should never successfully cache an uncacheable CacheKey.
+        cacheable_keys = [cache_key for cache_key in cache_keys if self.cacheable(cache_key)]
+        previous_hashes = self._store.get_many({cache_key.id for cache_key in cacheable_keys})
+
+        def previous_key(cache_key):
+            if not self.cacheable(cache_key):
+                return None
+            previous_hash = previous_hashes[cache_key.id]
+            if not previous_hash:
+                return None
+            return CacheKey(cache_key.id, previous_hash)
+
+        return [previous_key(cache_key) for cache_key in cache_keys]
 
     def needs_update(self, cache_key):
         """Check if the given cached item is invalid.
@@ -180,19 +331,39 @@ class BuildInvalidator:
         :param cache_key: A CacheKey object (as returned by CacheKeyGenerator.key_for().
         :returns: True if the cached version of the item is out of date.
         """
-        if not self.cacheable(cache_key):
-            # An uncacheable CacheKey is always out of date.
-            return True
+        return self.needs_update_many([cache_key])[0]
+
+    def needs_update_many(self, cache_keys):
+        """Check whether each of the given cached items is invalid, with a single read of the store.
 
-        return self._read_sha(cache_key) != cache_key.hash
+        An uncacheable CacheKey is always out of date.
+
+        :param cache_keys: A list of CacheKey objects.
+        :returns: A list of booleans which are True for the items that are out of date.
+        """
+        return [
+            previous_key != cache_key
+            for cache_key, previous_key in zip(cache_keys, self.previous_keys(cache_keys))
+        ]
 
     def update(self, cache_key):
         """Makes cache_key the valid version of the corresponding target set.
 
         :param cache_key: A CacheKey object (typically returned by CacheKeyGenerator.key_for()).
         """
-        if self.cacheable(cache_key):
-            self._write_sha(cache_key)
+        self.update_many([cache_key])
+
+    def update_many(self, cache_keys):
+        """Makes each of the given cache_keys the valid version of its target set, with a single
+        write of the store.
+
+        :param cache_keys: A list of CacheKey objects.
+        """
+        ids_and_hashes = [
+            (cache_key.id, cache_key.hash) for cache_key in cache_keys if self.cacheable(cache_key)
+        ]
+        if ids_and_hashes:
+            self._store.put_many(ids_and_hashes)
 
     def force_invalidate_all(self):
         """Force-invalidates all cached items."""
@@ -200,31 +371,5 @@ class BuildInvalidator:
 
     def force_invalidate(self, cache_key):
         """Force-invalidate the cached item."""
-        try:
-            if self.cacheable(cache_key):
-                os.unlink(self._sha_file(cache_key))
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
-
-    def _sha_file(self, cache_key):
-        return self._sha_file_by_id(cache_key.id)
-
-    def _sha_file_by_id(self, id):
-        return os.path.join(self._root, safe_filename(id, extension=".hash"))
-
-    def _write_sha(self, cache_key):
-        with open(self._sha_file(cache_key), "w") as fd:
-            fd.write(cache_key.hash)
-
-    def _read_sha(self, cache_key):
-        return self._read_sha_by_id(cache_key.id)
-
-    def _read_sha_by_id(self, id):
-        try:
-            with open(self._sha_file_by_id(id), "r") as fd:
-                return fd.read().strip()
-        except IOError as e:
-            if e.errno != errno.ENOENT:
-                raise
-            return None  # File doesn't exist.
+        if self.cacheable(cache_key):
+            self._store.delete(cache_key.id)
@@ -12,6 +12,10 @@ from pants.util.dirutil import relative_symlink, safe_delete, safe_mkdir, safe_r
 from pants.util.memo import memoized_method
 
 
+# Indicates that a previous cache key has not been looked up yet.
+_UNKNOWN = object()
+
+
 class VersionedTargetSet:
     """Represents a list of targets, a corresponding CacheKey, and a flag determining whether the
     list of targets is currently valid.
@@ -48,7 +52,7 @@ class VersionedTargetSet:
                 )
         return VersionedTargetSet(cache_manager, versioned_targets)
 
-    def __init__(self, cache_manager, versioned_targets):
+    def __init__(self, cache_manager, versioned_targets, previous_cache_key=_UNKNOWN):
         self._cache_manager = cache_manager
         self.versioned_targets = versioned_targets
         self.targets = [vt.target for vt in versioned_targets]
@@ -56,7 +60,9 @@ class VersionedTargetSet:
         # The following line is a no-op if cache_key was set in the VersionedTarget __init__ method.
         self.cache_key = CacheKey.combine_cache_keys([vt.cache_key for vt in versioned_targets])
         # NB: previous_cache_key may be None on the first build of a target.
-        self.previous_cache_key = cache_manager.previous_key(self.cache_key)
+        if previous_cache_key is _UNKNOWN:
+            previous_cache_key = cache_manager.previous_key(self.cache_key)
+        self.previous_cache_key = previous_cache_key
         self.valid = self.previous_cache_key == self.cache_key
 
         if cache_manager.invalidation_report:
@@ -177,9 +183,12 @@ class VersionedTarget(VersionedTargetSet):
     :API: public
     """
 
-    def __init__(self, cache_manager, target, cache_key):
+    def __init__(self, cache_manager, target, cache_key, previous_cache_key=_UNKNOWN):
         """
         :API: public
+
+        :param previous_cache_key: The key of the previous successful build of the target, or None
+                                   if there was none, if it has already been looked up.
         """
         if not isinstance(target, Target):
             raise ValueError(
@@ -189,7 +198,7 @@ class VersionedTarget(VersionedTargetSet):
         self.target = target
         self.cache_key = cache_key
         # Must come after the assignments above, as they are used in the parent's __init__.
-        super().__init__(cache_manager, [self])
+        super().__init__(cache_manager, [self], previous_cache_key=previous_cache_key)
         self.id = target.id
 
     @property
@@ -309,15 +318,16 @@ class InvalidationCacheManager:
         """Mark a changed or invalidated VersionedTargetSet as successfully processed."""
         for vt in vts.versioned_targets:
             vt.ensure_legal()
-            if not vt.valid:
-                self._invalidator.update(vt.cache_key)
-                vt.valid = True
-                self._artifact_write_callback(vt)
-        if not vts.valid:
+        invalid = [vt for vt in vts.versioned_targets if not vt.valid]
+        # A VersionedTarget is its own only versioned target.
+        if not vts.valid and not any(vt is vts for vt in invalid):
             vts.ensure_legal()
-            self._invalidator.update(vts.cache_key)
-            vts.valid = True
-            self._artifact_write_callback(vts)
+            invalid.append(vts)
+        # Record all the new keys with one write of the invalidator's store.
+        self._invalidator.update_many([vt.cache_key for vt in invalid])
+        for vt in invalid:
+            vt.valid = True
+            self._artifact_write_callback(vt)
 
     def force_invalidate(self, vts):
         """Force invalidation of a VersionedTargetSet."""
@@ -377,9 +387,15 @@ class InvalidationCacheManager:
             for target in sorted_targets:
                 target_key = self._key_for(target)
                 if target_key is not None:
-                    yield VersionedTarget(self, target, target_key)
-
-        return list(vt_iter())
+                    yield target, target_key
+
+        targets_and_keys = list(vt_iter())
+        # Look up the previous keys for all targets at once, which is much cheaper for some stores.
+        previous_keys = self._invalidator.previous_keys([key for _, key in targets_and_keys])
+        return [
+            VersionedTarget(self, target, key, previous_cache_key=previous_key)
+            for (target, key), previous_key in zip(targets_and_keys, previous_keys)
+        ]
 
     def cacheable(self, cache_key):
         """Indicates whether artifacts associated with the given `cache_key` should be cached.
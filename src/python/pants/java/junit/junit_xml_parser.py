@@ -207,11 +207,54 @@ def parse_failed_targets(test_registry, junit_xml_path, error_handler):
         except (XmlParser.XmlError, ValueError) as e:
             error_handler(ParseError(path, e))
 
+    for path in _iter_junit_xml_files(junit_xml_path):
+        parse_junit_xml_file(path)
+
+    return dict(failed_targets)
+
+
+def parse_test_class_durations(junit_xml_path, error_handler):
+    """Parses junit xml reports for the time taken by each test class.
+
+    If a test class appears in several reports, its time in the most recently modified report is
+    used.
+
+    :param string junit_xml_path: A path to a file or directory containing test junit xml reports
+                                  to analyze.
+    :param error_handler: An error handler that will be called with any junit xml parsing errors.
+    :type error_handler: callable that accepts a single :class:`ParseError` argument.
+    :returns: A mapping from test classname to the total time of its test cases, in seconds.
+    :rtype: dict from string to float
+    """
+    durations = {}
+    report_mtimes = {}
+
+    def parse_junit_xml_file(path):
+        try:
+            mtime = os.path.getmtime(path)
+            xml = XmlParser.from_file(path)
+            class_durations = defaultdict(float)
+            for testcase in xml.parsed.getElementsByTagName("testcase"):
+                time = testcase.getAttribute("time")
+                class_durations[testcase.getAttribute("classname")] += float(time) if time else 0.0
+        except (OSError, XmlParser.XmlError, ValueError) as e:
+            error_handler(ParseError(path, e))
+            return
+        for classname, duration in class_durations.items():
+            if mtime >= report_mtimes.get(classname, mtime):
+                report_mtimes[classname] = mtime
+                durations[classname] = duration
+
+    for path in _iter_junit_xml_files(junit_xml_path):
+        parse_junit_xml_file(path)
+
+    return durations
+
+
+def _iter_junit_xml_files(junit_xml_path):
     if os.path.isdir(junit_xml_path):
         for root, _, files in safe_walk(junit_xml_path):
             for junit_xml_file in fnmatch.filter(files, "TEST-*.xml"):
-                parse_junit_xml_file(os.path.join(root, junit_xml_file))
+                yield os.path.join(root, junit_xml_file)
     else:
-        parse_junit_xml_file(junit_xml_path)
-
-    return dict(failed_targets)
+        yield junit_xml_path
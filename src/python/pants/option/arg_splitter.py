@@ -128,6 +128,11 @@ class ArgSplitter:
     def help_request(self) -> Optional[HelpRequest]:
         return self._help_request
 
+    @classmethod
+    def is_help_arg(cls, arg: str) -> bool:
+        """Whether the given arg is a request for help, which will print all goals."""
+        return arg in cls._HELP_ARGS
+
     def _check_for_help_request(self, arg: str) -> bool:
         if arg not in self._HELP_ARGS:
             return False
@@ -79,6 +79,7 @@ class ExecutionOptions:
     """
 
     remote_execution: Any
+    remote_cache_only: Any
     remote_store_server: Any
     remote_store_thread_count: Any
     remote_execution_server: Any
@@ -105,6 +106,7 @@ class ExecutionOptions:
     def from_bootstrap_options(cls, bootstrap_options):
         return cls(
             remote_execution=bootstrap_options.remote_execution,
+            remote_cache_only=bootstrap_options.remote_cache_only,
             remote_store_server=bootstrap_options.remote_store_server,
             remote_execution_server=bootstrap_options.remote_execution_server,
             remote_store_thread_count=bootstrap_options.remote_store_thread_count,
@@ -131,6 +133,7 @@ class ExecutionOptions:
 
 DEFAULT_EXECUTION_OPTIONS = ExecutionOptions(
     remote_execution=False,
+    remote_cache_only=False,
     remote_store_server=[],
     remote_store_thread_count=1,
     remote_execution_server=None,
@@ -545,8 +548,9 @@ class GlobalOptions(Subsystem):
             daemon=False,
             help="The maximum amount of time to wait for the invocation to start until "
             "raising a timeout exception. "
-            "Because pantsd currently does not support parallel runs, "
-            "any prior running Pants command must be finished for the current one to start. "
+            "Because pantsd only runs `--pantsd-concurrent-goals` in parallel, "
+            "any prior running Pants command must usually be finished for the current one to "
+            "start. "
             "To never timeout, use the value -1.",
         )
 
@@ -635,6 +639,16 @@ class GlobalOptions(Subsystem):
             default=None,
             help="The directory to log pantsd output to.",
         )
+        register(
+            "--pantsd-concurrent-goals",
+            advanced=True,
+            type=list,
+            default=["dependencies", "filedeps", "lint", "list", "test"],
+            help="Goals which pantsd may run concurrently with other runs of these goals, rather "
+            "than one run at a time. This only applies to runs which use the v2 engine "
+            "exclusively (i.e., with `--no-v1`), without `--v2-ui`, `--loop` or `--debug`: "
+            "other runs wait for exclusive use of pantsd.",
+        )
         register(
             "--pantsd-invalidation-globs",
             advanced=True,
@@ -643,6 +657,16 @@ class GlobalOptions(Subsystem):
             help="Filesystem events matching any of these globs will trigger a daemon restart. "
             "The `--pythonpath` and `--pants-config-files` are inherently invalidated.",
         )
+        register(
+            "--pantsd-invalidation-debounce",
+            advanced=True,
+            type=float,
+            default=0.1,
+            help="The length of time (in seconds) to wait for further filesystem events after "
+            "an event, so that the files changed by bursts of events (e.g., from `git checkout`) "
+            "are invalidated together. Runs which start meanwhile wait for the invalidation. "
+            "Bursts are debounced for at most ten times this long.",
+        )
 
         # Watchman options.
         register(
@@ -704,6 +728,18 @@ class GlobalOptions(Subsystem):
             ),
             help="Whether to allow import statements in BUILD files",
         )
+        register(
+            "--build-file-cache",
+            type=bool,
+            default=False,
+            advanced=True,
+            help="Persist the objects parsed from BUILD files under the workdir, so that pantsd "
+            "restarts and runs without pantsd only parse the BUILD files which have changed since. "
+            "BUILD files are parsed again when any plugin module that defines their symbols "
+            "changes, but not when only code which those modules call into changes. BUILD files "
+            "which import modules, open files, or use context aware object factories or target "
+            "macros (which may read other files, e.g. `python_requirements()`) are never cached.",
+        )
 
         register(
             "--local-store-dir",
@@ -721,6 +757,16 @@ class GlobalOptions(Subsystem):
             default=DEFAULT_EXECUTION_OPTIONS.remote_execution,
             help="Enables remote workers for increased parallelism. (Alpha)",
         )
+        register(
+            "--remote-cache-only",
+            advanced=True,
+            type=bool,
+            default=DEFAULT_EXECUTION_OPTIONS.remote_cache_only,
+            help="Run processes locally, but share their results via the action cache and file "
+            "store of --remote-store-server: results are read from it before running a process, "
+            "and successful results are written to it. Only servers implementing the CAS and "
+            "ActionCache services of the Remote Execution API are required. (Alpha)",
+        )
         register(
             "--remote-store-server",
             advanced=True,
@@ -854,6 +900,8 @@ class GlobalOptions(Subsystem):
             "and fall back to remote execution if available.\n"
             "`remote_first`: Run the process on the remote execution backend if available, "
             "and fall back to the local host if remote calls take longer than the speculation timeout.\n"
+            "The remote action cache is checked first, and a miss starts the local process "
+            "immediately rather than after the speculation timeout.\n"
             "`none`: Do not speculate about long running processes.",
             advanced=True,
         )
@@ -1023,6 +1071,18 @@ class GlobalOptions(Subsystem):
             "For instance, `--streaming-workunits-handlers=\"['pants.reporting.workunit.Workunits']\"` will "
             'register a Subsystem called Workunits defined in the module "pants.reporting.workunit".',
         )
+        register(
+            "--rule-profile-file",
+            advanced=True,
+            metavar="<file>",
+            default=None,
+            help="Profile the @rules run by the v2 engine: for each rule, how many times it was "
+            "run and how many of the requests for it were served by an earlier run, its total "
+            "time, and the wall and CPU time spent in its own Python code. The profile is printed "
+            "at the end of the run, and written to this file as JSON, e.g. to compare runs at "
+            "different commits. The profile is not written if other pantsd runs execute while "
+            "it is being recorded.",
+        )
 
     @classmethod
     def validate_instance(cls, opts):
@@ -1046,6 +1106,17 @@ class GlobalOptions(Subsystem):
                 "`--remote-execution-server` to work properly."
             )
 
+        if opts.remote_cache_only and not opts.remote_store_server:
+            raise OptionsError(
+                "The `--remote-cache-only` option requires also setting `--remote-store-server`."
+            )
+
+        if opts.remote_cache_only and opts.remote_execution:
+            raise OptionsError(
+                "The `--remote-cache-only` and `--remote-execution` options are mutually "
+                "exclusive: remote execution already uses the action cache of the server."
+            )
+
         if opts.remote_execution_server and not opts.remote_store_server:
             raise OptionsError(
                 "The `--remote-execution-server` option requires also setting "
@@ -4,6 +4,8 @@
 import itertools
 import os
 import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Type
@@ -16,7 +18,7 @@ from pants.option.optionable import Optionable
 from pants.option.options import Options
 from pants.option.scope import GLOBAL_SCOPE, ScopeInfo
 from pants.util.dirutil import read_file
-from pants.util.memo import memoized_method, memoized_property
+from pants.util.memo import memoized, memoized_property
 from pants.util.ordered_set import FrozenOrderedSet
 from pants.util.strutil import ensure_text
 
@@ -40,6 +42,25 @@ class IsV2Exclusive:
 is_v2_exclusive = IsV2Exclusive()
 
 
+class _LRUCache(OrderedDict):
+    """A mapping which holds at most `max_size` entries, evicting the least recently used."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self._max_size = max_size
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self._max_size:
+            self.popitem(last=False)
+
+
 @dataclass(frozen=True)
 class OptionsBootstrapper:
     """Holds the result of the first stage of options parsing, and assists with parsing full
@@ -207,29 +228,46 @@ class OptionsBootstrapper:
         """Returns an Options instance that only knows about the bootstrap options."""
         return self.bootstrap_options
 
-    @memoized_method
-    def _full_options(self, known_scope_infos: FrozenOrderedSet[ScopeInfo]) -> Options:
-        bootstrap_option_values = self.get_bootstrap_options().for_global_scope()
-        options = Options.create(
-            self.env,
-            self.config,
-            known_scope_infos,
-            args=self.args,
-            bootstrap_option_values=bootstrap_option_values,
-        )
+    @memoized_property
+    def _uses_fromfile(self) -> bool:
+        """Whether any arg, env var or config value may be read from a file (i.e. `@path`).
 
-        distinct_optionable_classes: Set[Type[Optionable]] = set()
-        for ksi in known_scope_infos:
-            if not ksi.optionable_cls or ksi.optionable_cls in distinct_optionable_classes:
-                continue
-            distinct_optionable_classes.add(ksi.optionable_cls)
-            ksi.optionable_cls.register_options_on_scope(options)
+        The contents of such files are not part of the identity of this object.
+        """
+
+        def is_fromfile(value: Optional[str]) -> bool:
+            return value is not None and value.startswith("@") and not value.startswith("@@")
+
+        args = (arg.split("=", 1)[-1] for arg in self.args)
+        env_values = (value for _, value in self.env_tuples)
+        config_values = (
+            value
+            for config in self.config.configs()
+            for value in itertools.chain(
+                config.values.defaults.values(),
+                (
+                    config.values.get_value(section, option)
+                    for section in config.values.sections
+                    for option in config.values.options(section)
+                ),
+            )
+        )
+        return any(is_fromfile(value) for value in itertools.chain(args, env_values, config_values))
 
-        return options
+    def _full_options(self, known_scope_infos: FrozenOrderedSet[ScopeInfo]) -> Options:
+        with _full_options_lock:
+            if self._uses_fromfile:
+                # Values read from files could have changed since a cached Options was created.
+                return _parse_full_options(self, known_scope_infos)
+            return _create_full_options(self, known_scope_infos)
 
     def get_full_options(self, known_scope_infos: Iterable[ScopeInfo]) -> Options:
         """Get the full Options instance bootstrapped by this object for the given known scopes.
 
+        N.B. The returned Options (and the option values for each of its scopes) may be shared with
+        other OptionsBootstrappers with the same env, args and config, and so must be treated as
+        immutable.
+
         :param known_scope_infos: ScopeInfos for all scopes that may be encountered.
         :returns: A bootrapped Options instance that also carries options for all the supplied known
                   scopes.
@@ -237,3 +275,39 @@ class OptionsBootstrapper:
         return self._full_options(
             FrozenOrderedSet(sorted(known_scope_infos, key=lambda si: si.scope))
         )
+
+
+_full_options_lock = threading.Lock()
+
+
+# NB: Full options are memoized by the content of the OptionsBootstrapper (its env, args and config
+# file contents) rather than by instance, so that repeated runs in the same process (i.e. in pantsd)
+# skip re-registering and re-parsing options for all scopes. Bootstrappers with values read from
+# files bypass the cache, since those files' contents are not part of the key.
+@memoized(cache_factory=lambda: _LRUCache(max_size=8))
+def _create_full_options(
+    options_bootstrapper: OptionsBootstrapper, known_scope_infos: FrozenOrderedSet[ScopeInfo]
+) -> Options:
+    return _parse_full_options(options_bootstrapper, known_scope_infos)
+
+
+def _parse_full_options(
+    options_bootstrapper: OptionsBootstrapper, known_scope_infos: FrozenOrderedSet[ScopeInfo]
+) -> Options:
+    bootstrap_option_values = options_bootstrapper.get_bootstrap_options().for_global_scope()
+    options = Options.create(
+        options_bootstrapper.env,
+        options_bootstrapper.config,
+        known_scope_infos,
+        args=options_bootstrapper.args,
+        bootstrap_option_values=bootstrap_option_values,
+    )
+
+    distinct_optionable_classes: Set[Type[Optionable]] = set()
+    for ksi in known_scope_infos:
+        if not ksi.optionable_cls or ksi.optionable_cls in distinct_optionable_classes:
+            continue
+        distinct_optionable_classes.add(ksi.optionable_cls)
+        ksi.optionable_cls.register_options_on_scope(options)
+
+    return options
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional
 
 from pants.base.build_environment import get_buildroot
 from pants.option.option_value_container import OptionValueContainer
+from pants.option.options import Options
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.option.scope import ScopeInfo
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
@@ -285,6 +286,54 @@ class OptionsBootstrapperTest(unittest.TestCase):
             assert opts4 is opts5
             assert opts1 is not opts5
 
+    def test_full_options_caching_across_bootstrappers(self) -> None:
+        known_scope_infos = [ScopeInfo("", ScopeInfo.GLOBAL), ScopeInfo("foo", ScopeInfo.TASK)]
+        with temporary_file_path() as config:
+
+            def full_options(*args: str) -> Options:
+                bootstrapper = OptionsBootstrapper.create(
+                    env={}, args=[*self._config_path(config), *args]
+                )
+                return bootstrapper.get_full_options(known_scope_infos)
+
+            with open(config, "w") as fp:
+                fp.write("[foo]\nbar = 1\n")
+            opts1 = full_options()
+            # Equal env, args and config contents hit the cache, even for a new bootstrapper.
+            assert opts1 is full_options()
+            assert opts1 is not full_options("--no-colors")
+
+            with open(config, "w") as fp:
+                fp.write("[foo]\nbar = 2\n")
+            assert opts1 is not full_options()
+
+    def test_full_options_fromfile_not_cached(self) -> None:
+        known_scope_infos = [ScopeInfo("", ScopeInfo.GLOBAL), ScopeInfo("foo", ScopeInfo.TASK)]
+        with temporary_file_path() as config, temporary_file_path() as fromfile:
+
+            def full_options(*args: str) -> Options:
+                bootstrapper = OptionsBootstrapper.create(
+                    env={}, args=[*self._config_path(config), *args]
+                )
+                return bootstrapper.get_full_options(known_scope_infos)
+
+            with open(config, "w") as fp:
+                fp.write("[foo]\nbar = 1\n")
+            # Values read from files are not part of the cache key, so are never cached.
+            opts1 = full_options(f"--foo-bar=@{fromfile}")
+            assert opts1 is not full_options(f"--foo-bar=@{fromfile}")
+
+            with open(config, "w") as fp:
+                fp.write(f"[foo]\nbar = @{fromfile}\n")
+            opts2 = full_options()
+            assert opts2 is not full_options()
+
+            # A literal `@` is not read from a file.
+            with open(config, "w") as fp:
+                fp.write("[foo]\nbar = 1\n")
+            opts3 = full_options("--foo-bar=@@literal")
+            assert opts3 is full_options("--foo-bar=@@literal")
+
     def test_bootstrap_short_options(self) -> None:
         def parse_options(*args: str) -> OptionValueContainer:
             full_args = [*args, *self._config_path(None)]
@@ -29,13 +29,17 @@ class PailgunHandlerBase(BaseRequestHandler):
         self.client_address = client_address
         self.server = server
         self.logger = logging.getLogger(__name__)
+        self.concurrent = False
 
-    def handle_request(self):
+    def handle_request(self, concurrent=False):
         """Handle a request (the equivalent of the latter half of BaseRequestHandler.__init__()).
 
         This is invoked by a TCPServer subclass that spawns a thread from process_request() that
         invokes an overridden process_request_thread().
+
+        :param bool concurrent: Whether the request is being handled concurrently with others.
         """
+        self.concurrent = concurrent
         self.setup()
         try:
             self.handle()
@@ -58,6 +62,11 @@ class PailgunHandler(PailgunHandlerBase):
 
     def _run_pants(self, sock, arguments, environment):
         """Execute a given run with a pants runner."""
+        if self.concurrent:
+            # Concurrent runs share the process' stderr, so their native logging stays in the
+            # pantsd log.
+            self.server.runner_factory(sock, arguments, environment, concurrent=True).run()
+            return
         # For the pants run, we want to log to stderr.
         # TODO Might be worth to make contextmanagers for this?
         Native().override_thread_logging_destination_to_just_stderr()
@@ -75,7 +84,7 @@ class PailgunHandler(PailgunHandlerBase):
 
         # Prepend the command to our arguments so it aligns with the expected sys.argv format of python
         # (e.g. [list', '::'] -> ['./pants', 'list', '::']).
-        arguments.insert(0, "./pants")
+        arguments = ["./pants", *arguments]
 
         self.logger.info(f"handling pailgun request: `{' '.join(arguments)}`")
         self.logger.debug("pailgun request environment: %s", environment)
@@ -100,43 +109,64 @@ class ExclusiveRequestTimeout(Exception):
     """Represents a timeout while waiting for another request to complete."""
 
 
-class PailgunHandleRequestLock:
-    """Convenience lock to implement Lock.acquire(timeout), which is not available in Python 2."""
+class ConcurrentRequestDeclined(Exception):
+    """Raised by a runner before it has interacted with its client, if it turns out that a request
+    which was admitted concurrently cannot safely run concurrently with others.
+
+    The request is then retried exclusively.
+    """
+
+
+class PailgunRequestLock:
+    """A lock which is held either by any number of concurrent requests, or by one exclusive
+    request.
 
-    # TODO(#6071): remove and replace for the py3 Lock() when we don't have to support py2 anymore.
+    Exclusive requests that are waiting for the lock take priority over new concurrent requests, so
+    that a steady stream of concurrent requests cannot starve them.
+    """
 
     def __init__(self):
-        self.cond = threading.Condition()
-        self.available = True
+        self._cond = threading.Condition()
+        self._concurrent_holders = 0
+        self._exclusive_held = False
+        self._exclusive_waiters = 0
+
+    def _available(self, concurrent):
+        if concurrent:
+            return not self._exclusive_held and self._exclusive_waiters == 0
+        return not self._exclusive_held and self._concurrent_holders == 0
 
-    def acquire(self, timeout=0.0):
+    def acquire(self, concurrent=False, timeout=0.0):
         """Try to acquire the lock, blocking until the timeout is reached. Will return immediately
         if the lock is acquired.
 
+        :param bool concurrent: Whether to acquire the lock alongside other concurrent holders,
+                                rather than exclusively.
         :return True if the lock was acquired, False if the timeout was reached.
         """
-        self.cond.acquire()
-        if self.available:
-            self.available = False
-            self.cond.release()
-            return True
-        else:
-            self.cond.wait(timeout=timeout)
-            # We have the lock!
-            if not self.available:
-                self.cond.release()
-                return False
+        with self._cond:
+            if not concurrent:
+                self._exclusive_waiters += 1
+            try:
+                if not self._cond.wait_for(lambda: self._available(concurrent), timeout=timeout):
+                    return False
+            finally:
+                if not concurrent:
+                    self._exclusive_waiters -= 1
+            if concurrent:
+                self._concurrent_holders += 1
             else:
-                self.available = False
-                self.cond.release()
-                return True
+                self._exclusive_held = True
+            return True
 
-    def release(self):
+    def release(self, concurrent=False):
         """Release the lock."""
-        self.cond.acquire()
-        self.available = True
-        self.cond.notify()
-        self.cond.release()
+        with self._cond:
+            if concurrent:
+                self._concurrent_holders -= 1
+            else:
+                self._exclusive_held = False
+            self._cond.notify_all()
 
 
 class PailgunServer(ThreadingMixIn, TCPServer):
@@ -158,6 +188,7 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         request_complete_callback,
         handler_class=None,
         bind_and_activate=True,
+        request_is_concurrent=None,
     ):
         """Override of TCPServer.__init__().
 
@@ -173,6 +204,9 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         :param class handler_class: The request handler class to use for each request. (Optional)
         :param bool bind_and_activate: If True, binds and activates networking at __init__ time.
                                        (Optional)
+        :param function request_is_concurrent: A function of a request's arguments and environment
+                                               which returns True if the request may be handled
+                                               concurrently with other such requests. (Optional)
         """
         # Old-style class, so we must invoke __init__() this way.
         BaseServer.__init__(self, server_address, handler_class or PailgunHandler)
@@ -183,7 +217,8 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         self.server_port = None  # Set during server_bind() once the port is bound.
         self.request_complete_callback = request_complete_callback
         self.logger = logging.getLogger(__name__)
-        self.free_to_handle_request_lock = PailgunHandleRequestLock()
+        self.request_is_concurrent = request_is_concurrent or (lambda arguments, environment: False)
+        self.free_to_handle_request_lock = PailgunRequestLock()
 
         if bind_and_activate:
             try:
@@ -249,31 +284,47 @@ class PailgunServer(ThreadingMixIn, TCPServer):
     def ensure_request_is_exclusive(self, environment, request):
         """Ensure that this is the only pants running.
 
-        We currently don't allow parallel pants runs, so this function blocks a request thread until
-        there are no more requests being handled.
+        This blocks a request thread until there are no more requests being handled.
         """
+        with self._request_lock_held(environment, request, concurrent=False):
+            yield
+
+    @contextmanager
+    def ensure_request_is_concurrent(self, environment, request):
+        """Ensure that only other concurrent requests are running alongside this one.
+
+        This blocks a request thread until there are no exclusive requests being handled or waiting
+        to be handled.
+        """
+        with self._request_lock_held(environment, request, concurrent=True):
+            yield
+
+    @contextmanager
+    def _request_lock_held(self, environment, request, concurrent):
         # TODO add `did_poll` to pantsd metrics
 
         timeout = float(environment["PANTSD_REQUEST_TIMEOUT_LIMIT"])
+        lock_mode = "concurrently" if concurrent else "exclusively"
 
         @contextmanager
         def yield_and_release(time_waited):
             try:
                 self.logger.debug(
-                    f"request lock acquired {('on the first try' if time_waited == 0 else f'in {time_waited} seconds')}."
+                    f"request lock acquired {lock_mode} "
+                    f"{('on the first try' if time_waited == 0 else f'in {time_waited} seconds')}."
                 )
                 yield
             finally:
-                self.free_to_handle_request_lock.release()
+                self.free_to_handle_request_lock.release(concurrent=concurrent)
                 self.logger.debug("released request lock.")
 
         time_polled = 0.0
         user_notification_interval = 5.0  # Stop polling to notify the user every second.
-        self.logger.debug(f"request {request} is trying to acquire the request lock.")
+        self.logger.debug(f"request {request} is trying to acquire the request lock {lock_mode}.")
 
         # NB: Optimistically try to acquire the lock without blocking, in case we are the only request being handled.
         # This could be merged into the `while` loop below, but separating this special case for logging helps.
-        if self.free_to_handle_request_lock.acquire(timeout=0):
+        if self.free_to_handle_request_lock.acquire(concurrent=concurrent, timeout=0):
             with yield_and_release(time_polled):
                 yield
         else:
@@ -296,7 +347,9 @@ class PailgunServer(ThreadingMixIn, TCPServer):
                 "press Ctrl-C and run this command with PANTS_CONCURRENT=True "
                 "in the environment.\n",
             )
-            while not self.free_to_handle_request_lock.acquire(timeout=user_notification_interval):
+            while not self.free_to_handle_request_lock.acquire(
+                concurrent=concurrent, timeout=user_notification_interval
+            ):
                 time_polled += user_notification_interval
                 if self._should_keep_polling(timeout, time_polled):
                     self._send_stderr(
@@ -310,6 +363,20 @@ class PailgunServer(ThreadingMixIn, TCPServer):
             with yield_and_release(time_polled):
                 yield
 
+    def _handle_request_under_lock(self, handler, environment, request):
+        _, _, arguments, _ = handler.parsed_request()
+        if self.request_is_concurrent(list(arguments), environment):
+            try:
+                with self.ensure_request_is_concurrent(environment, request):
+                    handler.handle_request(concurrent=True)
+                    self.request_complete_callback()
+                return
+            except ConcurrentRequestDeclined as e:
+                self.logger.debug(f"request {request} will run exclusively: {e}")
+        with self.ensure_request_is_exclusive(environment, request):
+            handler.handle_request()
+            self.request_complete_callback()
+
     def process_request_thread(self, request, client_address):
         """Override of ThreadingMixIn.process_request_thread() that delegates to the request
         handler."""
@@ -320,10 +387,8 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         _, _, _, environment = handler.parsed_request()
 
         try:
-            with self.ensure_request_is_exclusive(environment, request):
-                # Attempt to handle a request with the handler.
-                handler.handle_request()
-                self.request_complete_callback()
+            # Attempt to handle a request with the handler.
+            self._handle_request_under_lock(handler, environment, request)
         except BrokenPipeError as e:
             # The client has closed the connection, most likely from a SIGINT
             self.logger.error(
@@ -15,16 +15,19 @@ from pants.base.build_environment import get_buildroot
 from pants.base.exception_sink import ExceptionSink, SignalHandler
 from pants.base.exiter import Exiter
 from pants.bin.daemon_pants_runner import DaemonPantsRunner
+from pants.cache.cache_setup import CacheSetup
 from pants.engine.native import Native
 from pants.engine.rules import UnionMembership
 from pants.init.engine_initializer import EngineInitializer
 from pants.init.logging import init_rust_logger, setup_logging
 from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
+from pants.option.global_options import GlobalOptions
 from pants.option.option_value_container import OptionValueContainer
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.option.options_fingerprinter import OptionsFingerprinter
 from pants.option.scope import GLOBAL_SCOPE
 from pants.pantsd.process_manager import FingerprintedProcessManager
+from pants.pantsd.service.artifact_cache_eviction_service import ArtifactCacheEvictionService
 from pants.pantsd.service.fs_event_service import FSEventService
 from pants.pantsd.service.pailgun_service import PailgunService
 from pants.pantsd.service.pants_service import PantsServices
@@ -179,6 +182,7 @@ class PantsDaemon(FingerprintedProcessManager):
                     legacy_graph_scheduler,
                     watchman,
                     union_membership=UnionMembership(build_config.union_rules()),
+                    local_cache_indexes=cls._local_cache_indexes(options_bootstrapper),
                 )
             else:
                 services = PantsServices()
@@ -193,6 +197,19 @@ class PantsDaemon(FingerprintedProcessManager):
                 bootstrap_options=bootstrap_options,
             )
 
+        @staticmethod
+        def _local_cache_indexes(options_bootstrapper):
+            """Return the indexes of the local artifact caches configured for the `cache` scope.
+
+            Command line flags are ignored, since they only apply to the run that launched pantsd.
+            """
+            optionables = (GlobalOptions, CacheSetup)
+            known_scope_infos = [
+                ksi for optionable in optionables for ksi in optionable.known_scope_infos()
+            ]
+            options = options_bootstrapper.get_full_options(known_scope_infos).drop_flag_values()
+            return CacheSetup.local_cache_indexes(options.for_scope(CacheSetup.options_scope))
+
         @staticmethod
         def _setup_services(
             build_root,
@@ -200,6 +217,7 @@ class PantsDaemon(FingerprintedProcessManager):
             legacy_graph_scheduler,
             watchman,
             union_membership: UnionMembership,
+            local_cache_indexes=(),
         ):
             """Initialize pantsd services.
 
@@ -233,6 +251,7 @@ class PantsDaemon(FingerprintedProcessManager):
                 ),
                 pantsd_pidfile=pidfile,
                 union_membership=union_membership,
+                invalidation_debounce=bootstrap_options.pantsd_invalidation_debounce,
             )
 
             pailgun_service = PailgunService(
@@ -240,10 +259,15 @@ class PantsDaemon(FingerprintedProcessManager):
                 DaemonPantsRunner,
                 scheduler_service,
                 should_shutdown_after_run,
+                concurrent_goals=bootstrap_options.pantsd_concurrent_goals,
             )
 
             store_gc_service = StoreGCService(legacy_graph_scheduler.scheduler)
 
+            artifact_cache_eviction_service = (
+                ArtifactCacheEvictionService(local_cache_indexes) if local_cache_indexes else None
+            )
+
             return PantsServices(
                 services=tuple(
                     service
@@ -252,6 +276,7 @@ class PantsDaemon(FingerprintedProcessManager):
                         scheduler_service,
                         pailgun_service,
                         store_gc_service,
+                        artifact_cache_eviction_service,
                     )
                     if service is not None
                 ),
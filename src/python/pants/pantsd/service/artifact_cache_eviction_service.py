@@ -0,0 +1,78 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import logging
+import os
+import time
+from typing import Sequence
+
+from pants.cache.local_cache_index import LocalCacheIndex
+from pants.pantsd.service.pants_service import PantsService
+
+
+class ArtifactCacheEvictionService(PantsService):
+    """Artifact Cache Eviction Service.
+
+    This service periodically evicts artifacts from local artifact caches which have a byte budget,
+    so that runs only need to evict the few artifacts they push over budget themselves.
+    """
+
+    def __init__(
+        self,
+        indexes: Sequence[LocalCacheIndex],
+        period_secs=10,
+        eviction_interval_secs=(5 * 60),
+        eviction_batch_size=1000,
+    ):
+        """
+        :param indexes: The indexes of the caches to evict from.
+        :param eviction_batch_size: The maximum number of artifacts to evict from a cache at once,
+                                    between checks for pausing or termination.
+        """
+        super().__init__()
+        self._indexes = indexes
+        self._logger = logging.getLogger(__name__)
+
+        self._period_secs = period_secs
+        self._eviction_interval_secs = eviction_interval_secs
+        self._eviction_batch_size = eviction_batch_size
+
+        self._reconciled = False
+        self._next_eviction = time.time()
+
+    def _maybe_reconcile(self):
+        # Index any artifacts which were written before the index was enabled, so that they count
+        # against the budget.
+        if self._reconciled:
+            return
+        for index in self._indexes:
+            self._logger.debug("Reconciling cache index {}".format(index.path))
+            index.reconcile(os.path.dirname(index.path))
+        self._reconciled = True
+
+    def _maybe_evict(self):
+        if time.time() < self._next_eviction:
+            return
+        for index in self._indexes:
+            self._logger.debug("Evicting from cache index {}".format(index.path))
+            while (
+                not self._state.is_terminating
+                and len(index.evict(limit=self._eviction_batch_size)) == self._eviction_batch_size
+            ):
+                pass
+        self._logger.debug("Done evicting")
+        self._next_eviction = time.time() + self._eviction_interval_secs
+
+    def run(self):
+        """Main service entrypoint.
+
+        Called via Thread.start() via PantsDaemon.run().
+        """
+        while not self._state.is_terminating:
+            self._maybe_reconcile()
+            self._maybe_evict()
+            # Waiting with a timeout in maybe_pause has the effect of waiting until:
+            # 1) we are paused and then resumed
+            # 2) we are terminated (which will break the loop)
+            # 3) the timeout is reached, which will cause us to wake up and check for eviction
+            self._state.maybe_pause(timeout=self._period_secs)
@@ -0,0 +1,46 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import threading
+import time
+import unittest
+
+from pants.cache.local_cache_index import LocalCacheIndex
+from pants.pantsd.service.artifact_cache_eviction_service import ArtifactCacheEvictionService
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class ArtifactCacheEvictionServiceTest(unittest.TestCase):
+    def test_run(self):
+        interval_secs = 0.1
+        with temporary_dir() as cache_dir:
+            # Artifacts written before the index existed are reconciled into it, and then evicted.
+            artifacts = [os.path.join(cache_dir, "task", name) for name in ("a", "b", "c")]
+            for artifact in artifacts:
+                safe_file_dump(artifact, b"x" * 10, mode="wb")
+            index = LocalCacheIndex.for_cache_dir(cache_dir, max_bytes=15)
+
+            # Start the service in another thread (`setup` is a required part of the service
+            # lifecycle, but is unused in this case.)
+            aces = ArtifactCacheEvictionService(
+                [index],
+                period_secs=(interval_secs / 4),
+                eviction_interval_secs=interval_secs,
+                eviction_batch_size=1,
+            )
+            aces.setup(services=None)
+            t = threading.Thread(target=aces.run, name="aces")
+            t.daemon = True
+            t.start()
+
+            time.sleep(interval_secs * 10)
+            assert t.is_alive()
+            assert 10 == index.total_bytes()
+            assert 1 == len([artifact for artifact in artifacts if os.path.exists(artifact)])
+
+            # Exit the thread, and then join it.
+            aces.terminate()
+            t.join(timeout=interval_secs * 10)
+            assert not t.is_alive()
@@ -11,7 +11,14 @@ from pants.pantsd.service.pants_service import PantsService
 class PailgunService(PantsService):
     """A service that runs the Pailgun server."""
 
-    def __init__(self, bind_addr, runner_class, scheduler_service, shutdown_after_run):
+    def __init__(
+        self,
+        bind_addr,
+        runner_class,
+        scheduler_service,
+        shutdown_after_run,
+        concurrent_goals=(),
+    ):
         """
         :param tuple bind_addr: The (hostname, port) tuple to bind the Pailgun server to.
         :param class runner_class: The `PantsRunner` class to be used for Pailgun runs. Generally this
@@ -20,11 +27,13 @@ class PailgunService(PantsService):
         :param SchedulerService scheduler_service: The SchedulerService instance for access to the
                                                    resident scheduler.
         :param bool shutdown_after_run: PailgunService should shut down after running the first request.
+        :param concurrent_goals: The goals which may be run concurrently with other requests.
         """
         super().__init__()
         self._bind_addr = bind_addr
         self._runner_class = runner_class
         self._scheduler_service = scheduler_service
+        self._concurrent_goals = frozenset(concurrent_goals)
 
         self._logger = logging.getLogger(__name__)
         self._pailgun = None
@@ -44,11 +53,21 @@ class PailgunService(PantsService):
         if self._shutdown_after_run:
             self.terminate()
 
+    def _request_is_concurrent(self, arguments, environment):
+        """A cheap check of whether a request may run concurrently, based on its goal names.
+
+        This needn't be exact: runners verify that their parsed options permit running concurrently,
+        and otherwise decline, so that the request is retried exclusively.
+        """
+        return any(arg in self._concurrent_goals for arg in arguments)
+
     def _setup_pailgun(self):
         """Sets up a PailgunServer instance."""
         # Constructs and returns a runnable PantsRunner.
-        def runner_factory(sock, arguments, environment):
-            return self._runner_class.create(sock, arguments, environment, self._scheduler_service,)
+        def runner_factory(sock, arguments, environment, concurrent=False):
+            return self._runner_class.create(
+                sock, arguments, environment, self._scheduler_service, concurrent=concurrent
+            )
 
         # Plumb the daemon's lifecycle lock to the `PailgunServer` to safeguard teardown.
         # This indirection exists to allow the server to be created before PantsService.setup
@@ -59,7 +78,11 @@ class PailgunService(PantsService):
                 yield
 
         return PailgunServer(
-            self._bind_addr, runner_factory, lifecycle_lock, self._request_complete_callback
+            self._bind_addr,
+            runner_factory,
+            lifecycle_lock,
+            self._request_complete_callback,
+            request_is_concurrent=self._request_is_concurrent,
         )
 
     def run(self):
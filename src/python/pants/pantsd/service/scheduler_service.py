@@ -28,6 +28,9 @@ class SchedulerService(PantsService):
 
     QUEUE_SIZE = 64
     INVALIDATION_WATCHER_LIVENESS_CHECK_INTERVAL = 1
+    # The longest a batch of events is debounced for, as a multiple of the debounce window, so that
+    # a steady stream of events can't defer invalidation indefinitely.
+    MAX_DEBOUNCE_WINDOWS = 10
 
     def __init__(
         self,
@@ -38,6 +41,7 @@ class SchedulerService(PantsService):
         invalidation_globs: List[str],
         pantsd_pidfile: Optional[str],
         union_membership: UnionMembership,
+        invalidation_debounce: float = 0.0,
     ) -> None:
         """
         :param fs_event_service: An unstarted FSEventService instance for setting up filesystem event handlers.
@@ -46,6 +50,9 @@ class SchedulerService(PantsService):
         :param invalidation_globs: A list of `globs` that when encountered in filesystem event
                                    subscriptions will tear down the daemon.
         :param pantsd_pidfile: The path to the pantsd pidfile for fs event monitoring.
+        :param invalidation_debounce: The number of seconds to wait for further filesystem events
+                                      after an event, so that the files changed by a burst of events
+                                      are invalidated together.
         """
         super().__init__()
         self._fs_event_service = fs_event_service
@@ -54,6 +61,7 @@ class SchedulerService(PantsService):
         self._build_root = build_root
         self._pantsd_pidfile = pantsd_pidfile
         self._union_membership = union_membership
+        self._invalidation_debounce = invalidation_debounce
 
         self._scheduler = legacy_graph_scheduler.scheduler
         # This session is only used for checking whether any invalidation globs have been invalidated.
@@ -66,6 +74,12 @@ class SchedulerService(PantsService):
         self._watchman_is_running = threading.Event()
         self._invalidating_snapshot = None
         self._invalidating_files: Set[str] = set()
+        # Counts of the events enqueued and of those fully processed. Runs wait for the events
+        # enqueued before they started to be processed, so that they don't see partially applied
+        # changes.
+        self._events_enqueued = 0
+        self._events_processed = 0
+        self._events_processed_condition = threading.Condition()
 
         self._loop_condition = LoopCondition()
 
@@ -109,14 +123,15 @@ class SchedulerService(PantsService):
                 len(event["files"]), event["subscription"]
             )
         )
+        with self._events_processed_condition:
+            self._events_enqueued += 1
         self._event_queue.put(event)
 
     def _maybe_invalidate_scheduler_batch(self):
+        if not self._invalidating_snapshot:
+            return
         new_snapshot = self._get_snapshot()
-        if (
-            self._invalidating_snapshot
-            and new_snapshot.directory_digest != self._invalidating_snapshot.directory_digest
-        ):
+        if new_snapshot.directory_digest != self._invalidating_snapshot.directory_digest:
             self._logger.critical(
                 "saw file events covered by invalidation globs [{}], terminating the daemon.".format(
                     self._invalidating_files
@@ -156,45 +171,98 @@ class SchedulerService(PantsService):
 
         self._maybe_invalidate_scheduler_batch()
 
-    def _process_event_queue(self):
-        """File event notification queue processor."""
+    def _drain_event_queue(self):
+        """Returns the next events from the queue, debounced, or an empty list if there are none.
+
+        After each event, waits up to the debounce window for another event, but for no longer than
+        `MAX_DEBOUNCE_WINDOWS` windows overall. Events which have already been enqueued are always
+        included.
+        """
         try:
-            event = self._event_queue.get(timeout=0.05)
+            events = [self._event_queue.get(timeout=0.05)]
         except queue.Empty:
-            return
+            return []
 
-        try:
-            subscription, is_initial_event, files = (
-                event["subscription"],
-                event["is_fresh_instance"],
-                event["files"],
-            )
-        except (KeyError, UnicodeDecodeError) as e:
-            self._logger.warning("%r raised by invalid watchman event: %s", e, event)
-            return
+        deadline = time.time() + self._invalidation_debounce * self.MAX_DEBOUNCE_WINDOWS
+        while True:
+            timeout = min(self._invalidation_debounce, deadline - time.time())
+            if timeout <= 0:
+                break
+            try:
+                events.append(self._event_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        for _ in range(self._event_queue.qsize()):
+            try:
+                events.append(self._event_queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
 
-        self._logger.debug(
-            "processing {} files for subscription {} (first_event={})".format(
-                len(files), subscription, is_initial_event
-            )
-        )
+    def _process_event_queue(self):
+        """File event notification queue processor.
+
+        Coalesces the files changed by a debounced batch of events into a single invalidation.
+        """
+        events = self._drain_event_queue()
+        if not events:
+            return
 
-        # The first watchman event for all_files is a listing of all files - ignore it.
-        if (
-            not is_initial_event
-            and self._fs_event_service is not None
-            and subscription == self._fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME
-        ):
-            self._handle_batch_event(files)
+        try:
+            changed_files: Set[str] = set()
+            pidfile_changed = False
+            for event in events:
+                try:
+                    subscription, is_initial_event, files = (
+                        event["subscription"],
+                        event["is_fresh_instance"],
+                        event["files"],
+                    )
+                except (KeyError, UnicodeDecodeError) as e:
+                    self._logger.warning("%r raised by invalid watchman event: %s", e, event)
+                    continue
+
+                self._logger.debug(
+                    "processing {} files for subscription {} (first_event={})".format(
+                        len(files), subscription, is_initial_event
+                    )
+                )
 
-        # However, we do want to check for the initial event in the pid file creation.
-        if subscription == self._fs_event_service.PANTS_PID_SUBSCRIPTION_NAME:
-            self._maybe_invalidate_scheduler_pidfile()
+                # The first watchman event for all_files is a listing of all files - ignore it.
+                if (
+                    not is_initial_event
+                    and self._fs_event_service is not None
+                    and subscription == self._fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME
+                ):
+                    changed_files.update(files)
+
+                # However, we do want to check for the initial event in the pid file creation.
+                if subscription == self._fs_event_service.PANTS_PID_SUBSCRIPTION_NAME:
+                    pidfile_changed = True
+
+            if changed_files:
+                self._handle_batch_event(changed_files)
+            if pidfile_changed:
+                self._maybe_invalidate_scheduler_pidfile()
+        finally:
+            with self._events_processed_condition:
+                self._events_processed += len(events)
+                self._events_processed_condition.notify_all()
+            for _ in events:
+                self._event_queue.task_done()
 
         if not self._watchman_is_running.is_set():
             self._watchman_is_running.set()
 
-        self._event_queue.task_done()
+    def _wait_for_enqueued_events(self):
+        """Waits until the filesystem events enqueued so far have been processed."""
+        with self._events_processed_condition:
+            enqueued = self._events_enqueued
+            while not self._events_processed_condition.wait_for(
+                lambda: self._events_processed >= enqueued, timeout=1
+            ):
+                if self._state.is_terminating:
+                    return
 
     def _check_invalidation_watcher_liveness(self):
         time.sleep(self.INVALIDATION_WATCHER_LIVENESS_CHECK_INTERVAL)
@@ -205,7 +273,7 @@ class SchedulerService(PantsService):
             )
             self.terminate()
 
-    def prepare_graph(self, options: Options) -> LegacyGraphSession:
+    def prepare_graph(self, options: Options, build_id: Optional[str] = None) -> LegacyGraphSession:
         # If any nodes exist in the product graph, wait for the initial watchman event to avoid
         # racing watchman startup vs invalidation events.
         if self._fs_event_service is not None and self._scheduler.graph_len() > 0:
@@ -213,12 +281,24 @@ class SchedulerService(PantsService):
                 f"fs event service is running and graph_len > 0: waiting for initial watchman event"
             )
             self._watchman_is_running.wait()
+        # Wait for any changes which are being debounced or invalidated to be fully applied.
+        self._wait_for_enqueued_events()
 
         global_options = options.for_global_scope()
-        build_id = RunTracker.global_instance().run_id
+        if build_id is None:
+            build_id = RunTracker.global_instance().run_id
         v2_ui = global_options.get("v2_ui", False)
-        zipkin_trace_v2 = options.for_scope("reporting").zipkin_trace_v2
-        return self._graph_helper.new_session(zipkin_trace_v2, build_id, v2_ui)
+        reporting_options = options.for_scope("reporting")
+        # The engine records the workunits it reports to Zipkin for the Chrome trace too.
+        zipkin_trace_v2 = (
+            reporting_options.zipkin_trace_v2 or reporting_options.chrome_trace_file is not None
+        )
+        return self._graph_helper.new_session(
+            zipkin_trace_v2,
+            build_id,
+            v2_ui,
+            should_profile_rules=global_options.rule_profile_file is not None,
+        )
 
     def graph_run_v2(
         self,
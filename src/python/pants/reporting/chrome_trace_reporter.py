@@ -0,0 +1,196 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import threading
+from dataclasses import dataclass
+
+from pants.base.workunit import WorkUnitLabel
+from pants.reporting.reporter import Reporter
+from pants.util.dirutil import safe_mkdir_for
+
+MICROSECONDS_PER_SECOND = 1000000.0
+NANOSECONDS_PER_SECOND = 1000000000.0
+
+
+class ChromeTraceReporter(Reporter):
+    """Writes the workunits of a run to a file in the Chrome Trace Event format.
+
+    The file can be loaded into chrome://tracing or https://ui.perfetto.dev to profile a run.
+
+    v1 workunits are shown in a lane per thread which ran them. v2 engine workunits don't record the
+    thread which ran them, so they are packed into as few lanes as they can be while still nesting.
+    Process executions are categorized as such, and annotated with the cache they were served from,
+    if any.
+
+    This reporter must not be asynchronous, as it tracks the threads which start v1 workunits.
+    """
+
+    @dataclass(frozen=True)
+    class Settings(Reporter.Settings):
+        trace_file: str
+
+    # The pseudo-processes under which v1 and v2 workunits are shown.
+    V1_PID = 1
+    V2_PID = 2
+
+    # The prefix of the names of v2 engine workunits which execute processes.
+    PROCESS_NAME_PREFIX = "Executing process: "
+
+    # The names of the v2 engine workunits which record cache hits, by the cache that was hit.
+    CACHE_HITS = {
+        "local cache hit": "local",
+        "remote cache hit": "remote",
+        "speculation: primary cache hit": "remote",
+    }
+
+    def __init__(self, run_tracker, settings):
+        super().__init__(run_tracker, settings)
+        self._events = []
+        # Map thread name -> the id of the lane for the v1 workunits it runs.
+        self._thread_lanes = {}
+        # Map workunit id -> the id of the lane it is shown in, while the workunit is running.
+        self._workunit_lanes = {}
+        # Map span id -> v2 engine workunit.
+        self._engine_workunits = {}
+
+    def start_workunit(self, workunit):
+        """Implementation of Reporter callback."""
+        thread_name = threading.current_thread().name
+        lane = self._thread_lanes.setdefault(thread_name, len(self._thread_lanes) + 1)
+        self._workunit_lanes[workunit.id] = lane
+
+    def end_workunit(self, workunit):
+        """Implementation of Reporter callback."""
+        lane = self._workunit_lanes.pop(workunit.id, None)
+        if lane is None:
+            return
+        labels = sorted(workunit.labels)
+        args = {"outcome": workunit.outcome_string(workunit.outcome()), "labels": labels}
+        if workunit.cmd:
+            args["cmd"] = workunit.cmd
+        self._events.append(
+            self._complete_event(
+                name=workunit.name,
+                category="tool" if WorkUnitLabel.TOOL in labels else "workunit",
+                start_secs=workunit.start_time,
+                duration_secs=workunit.duration(),
+                pid=self.V1_PID,
+                tid=lane,
+                args=args,
+            )
+        )
+
+    def bulk_record_workunits(self, engine_workunits):
+        """Implementation of Reporter callback."""
+        for workunit in engine_workunits:
+            self._engine_workunits[workunit["span_id"]] = workunit
+
+    def close(self):
+        """Implementation of Reporter callback."""
+        events = self._metadata_events() + self._events + self._engine_events()
+        safe_mkdir_for(self.settings.trace_file)
+        with open(self.settings.trace_file, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def _metadata_events(self):
+        events = [
+            self._metadata_event("process_name", self.V1_PID, name="v1 workunits"),
+            self._metadata_event("process_name", self.V2_PID, name="v2 engine workunits"),
+        ]
+        for thread_name, lane in self._thread_lanes.items():
+            events.append(self._metadata_event("thread_name", self.V1_PID, lane, name=thread_name))
+        return events
+
+    def _engine_events(self):
+        # Map span id -> the cache which the process execution with that span id was served from.
+        cache_hits = {}
+        for workunit in self._engine_workunits.values():
+            cache = self.CACHE_HITS.get(workunit["name"])
+            if cache and "parent_id" in workunit:
+                cache_hits[workunit["parent_id"]] = cache
+
+        spans = [
+            (
+                from_secs_and_nanos_to_float(workunit["start_secs"], workunit["start_nanos"]),
+                from_secs_and_nanos_to_float(workunit["duration_secs"], workunit["duration_nanos"]),
+                workunit,
+            )
+            for workunit in self._engine_workunits.values()
+        ]
+        # Sort parents before any children which start at the same time.
+        spans.sort(key=lambda span: (span[0], -span[1]))
+
+        events = []
+        lanes = assign_lanes((start, start + duration) for start, duration, _ in spans)
+        for (start, duration, workunit), lane in zip(spans, lanes):
+            name = workunit["name"]
+            args = {"span_id": workunit["span_id"]}
+            if "parent_id" in workunit:
+                args["parent_id"] = workunit["parent_id"]
+            if "description" in workunit:
+                args["description"] = workunit["description"]
+            if name.startswith(self.PROCESS_NAME_PREFIX):
+                category = "process"
+                cache = cache_hits.get(workunit["span_id"])
+                if cache:
+                    args["cache_hit"] = cache
+            elif name in self.CACHE_HITS:
+                category = "cache"
+            else:
+                category = "rule"
+            events.append(
+                self._complete_event(
+                    name=name,
+                    category=category,
+                    start_secs=start,
+                    duration_secs=duration,
+                    pid=self.V2_PID,
+                    tid=lane + 1,
+                    args=args,
+                )
+            )
+        return events
+
+    @staticmethod
+    def _complete_event(name, category, start_secs, duration_secs, pid, tid, args):
+        return {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_secs * MICROSECONDS_PER_SECOND,
+            "dur": duration_secs * MICROSECONDS_PER_SECOND,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+
+    @staticmethod
+    def _metadata_event(kind, pid, tid=0, **args):
+        return {"name": kind, "ph": "M", "pid": pid, "tid": tid, "args": args}
+
+
+def assign_lanes(spans):
+    """Assigns each of the given spans to a lane, in which the spans nest within one another.
+
+    :param spans: An iterable of (start, end) pairs, sorted by start, with any spans which start at
+                  the same time sorted by decreasing length.
+    :returns: An iterator of the index of the lane of each span.
+    """
+    # The ends of the spans which are open in each lane, innermost last.
+    lanes = []
+    for start, end in spans:
+        for index, open_ends in enumerate(lanes):
+            while open_ends and open_ends[-1] <= start:
+                open_ends.pop()
+            if not open_ends or end <= open_ends[-1]:
+                open_ends.append(end)
+                yield index
+                break
+        else:
+            lanes.append([end])
+            yield len(lanes) - 1
+
+
+def from_secs_and_nanos_to_float(secs, nanos):
+    return secs + (nanos / NANOSECONDS_PER_SECOND)
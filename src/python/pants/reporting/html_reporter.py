@@ -21,6 +21,24 @@ from pants.reporting.reporting_utils import items_to_report_element
 from pants.util.dirutil import safe_mkdir
 
 
+def render_timings(timings):
+    """Renders the given AggregatedTimings as an HTML table."""
+    res = ["<table>"]
+    for item in timings.get_all():
+        res.append(
+            """<tr><td class="timing-string">{timing:.3f}</td>
+                  <td class="timing-label">{label}""".format(
+                timing=item["timing"], label=item["label"]
+            )
+        )
+        if item["is_tool"]:
+            res.append("""<i class="icon-cog"></i>""")
+        res.append("""</td></tr>""")
+    res.append("<table>")
+
+    return "".join(res)
+
+
 class HtmlReporter(Reporter):
     """HTML reporting to files.
 
@@ -65,6 +83,8 @@ class HtmlReporter(Reporter):
         # Useful for preventing too-frequent overwrites of, e.g., timing stats,
         # which can noticeably slow down short pants runs with many workunits.
         self._last_overwrite_time = {}
+        # The version of the artifact cache stats which were last rendered.
+        self._rendered_artifact_cache_stats_version = None
 
     def report_path(self):
         """The path to the main report file."""
@@ -83,6 +103,15 @@ class HtmlReporter(Reporter):
             for f in files.values():
                 f.close()
 
+    def flush(self):
+        """Implementation of Reporter callback."""
+        # We must flush in the same thread as the write, which our caller ensures.
+        if self._report_file:
+            self._report_file.flush()
+        for files in self._output_files.values():
+            for f in files.values():
+                f.flush()
+
     # Creates a collapsible div in which to nest the reporting for a workunit.
     # To add content to this div, append it to ${'#WORKUNITID-content'}.
     # Note that definitive workunit timing is done in pants, but the client-side timer in the js
@@ -259,39 +288,20 @@ class HtmlReporter(Reporter):
         # If we're a root workunit, force an overwrite, as we may be the last ever write in this run.
         force_overwrite = workunit.parent is None
 
-        # Update the timings.
-        def render_timings(timings):
-            timings_dict = timings.get_all()
-            for item in timings_dict:
-                item["timing_string"] = "{:.3f}".format(item["timing"])
-
-            res = ["<table>"]
-            for item in timings_dict:
-                res.append(
-                    """<tr><td class="timing-string">{timing:.3f}</td>
-                          <td class="timing-label">{label}""".format(
-                        timing=item["timing"], label=item["label"]
-                    )
-                )
-                if item["is_tool"]:
-                    res.append("""<i class="icon-cog"></i>""")
-                res.append("""</td></tr>""")
-            res.append("<table>")
-
-            return "".join(res)
-
-        self._overwrite(
-            "cumulative_timings",
-            lambda: render_timings(self.run_tracker.cumulative_timings),
-            force=force_overwrite,
-        )
-        self._overwrite(
-            "self_timings",
-            lambda: render_timings(self.run_tracker.self_timings),
-            force=force_overwrite,
-        )
+        # The timings change whenever a workunit ends, so re-rendering them as the run goes would
+        # cost time quadratic in the number of workunits. Instead they are rendered when the run
+        # ends, and until then the ReportingServer renders them on demand from the timings logs.
+        if force_overwrite:
+            self._overwrite(
+                "cumulative_timings",
+                lambda: render_timings(self.run_tracker.cumulative_timings),
+                force=True,
+            )
+            self._overwrite(
+                "self_timings", lambda: render_timings(self.run_tracker.self_timings), force=True,
+            )
 
-        # Update the artifact cache stats.
+        # Update the artifact cache stats, if they have changed since they were last rendered.
         def render_cache_stats(artifact_cache_stats):
             def fix_detail_id(e, _id):
                 return e if isinstance(e, str) else e + (_id,)
@@ -319,13 +329,17 @@ class HtmlReporter(Reporter):
                 msg_elements = ["No artifact cache use."]
             return self._render_message(*msg_elements)
 
-        self._overwrite(
-            "artifact_cache_stats",
-            lambda: render_cache_stats(self.run_tracker.artifact_cache_stats),
-            force=force_overwrite,
-        )
-
-        for f in self._output_files[workunit.id].values():
+        artifact_cache_stats = self.run_tracker.artifact_cache_stats
+        version = artifact_cache_stats.version
+        if force_overwrite or version != self._rendered_artifact_cache_stats_version:
+            if self._overwrite(
+                "artifact_cache_stats",
+                lambda: render_cache_stats(artifact_cache_stats),
+                force=force_overwrite,
+            ):
+                self._rendered_artifact_cache_stats_version = version
+
+        for f in self._output_files.pop(workunit.id, {}).values():
             f.close()
 
     def handle_output(self, workunit, label, s):
@@ -339,8 +353,6 @@ class HtmlReporter(Reporter):
             else:
                 f = output_files[path]
             f.write(self._htmlify_text(s))
-            # We must flush in the same thread as the write.
-            f.flush()
 
     _log_level_css_map = {
         Report.ERROR: "error",
@@ -471,7 +483,6 @@ class HtmlReporter(Reporter):
         """Append content to the main report file."""
         if os.path.exists(self._html_dir):  # Make sure we're not immediately after a clean-all.
             self._report_file.write(s)
-            self._report_file.flush()  # We must flush in the same thread as the write.
 
     def _overwrite(self, filename, func, force=False):
         """Overwrite a file with the specified contents.
@@ -481,6 +492,7 @@ class HtmlReporter(Reporter):
         :param filename: The path under the html dir to write to.
         :param func: A no-arg function that returns the contents to write.
         :param force: Whether to force a write now, regardless of the last overwrite time.
+        :returns: Whether the file was overwritten.
         """
         now = int(time.time() * 1000)
         last_overwrite_time = self._last_overwrite_time.get(filename) or now
@@ -490,6 +502,8 @@ class HtmlReporter(Reporter):
                 with open(os.path.join(self._html_dir, filename), "w") as f:
                     f.write(func())
             self._last_overwrite_time[filename] = now
+            return True
+        return False
 
     def _htmlify_text(self, s):
         """Make text HTML-friendly."""
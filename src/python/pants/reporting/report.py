@@ -1,16 +1,30 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import logging
+import queue
 import threading
 import time
+from enum import Enum
 
 from pants.util.logging import LogLevel
 
+logger = logging.getLogger(__name__)
+
 
 class ReportingError(Exception):
     pass
 
 
+class OverflowPolicy(Enum):
+    """What to do with an event reported when the queue of the report writer thread is full."""
+
+    # Wait until there is room in the queue.
+    block = "block"
+    # Drop tool output, but wait to report anything else.
+    drop_output = "drop-output"
+
+
 class EmitterThread(threading.Thread):
     """Periodically flush the report buffers.
 
@@ -38,6 +52,69 @@ class EmitterThread(threading.Thread):
         self._stopper.set()
 
 
+class WriterThread(threading.Thread):
+    """Writes reports on a dedicated thread.
+
+    Reported events are handed to this thread through a bounded queue, so that rendering and writing
+    reports doesn't happen on the threads doing the work being reported on. Events are dispatched in
+    batches, and reporters are flushed after each batch rather than after each event.
+    """
+
+    # The maximum number of events dispatched between flushes of the reporters.
+    MAX_BATCH_SIZE = 256
+
+    _STOP = object()
+
+    def __init__(self, write, queue_size, name):
+        """
+        :param write: A function which dispatches a list of events to reporters.
+        :param queue_size: The maximum number of events which may be waiting to be written.
+        """
+        super().__init__(name=name)
+        self._write = write
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.daemon = True
+
+    def put(self, event, block=True):
+        """Queue an event to be written.
+
+        :returns: False if the event was dropped because the queue was full and block was False.
+        """
+        try:
+            self._queue.put(event, block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def drain(self):
+        """Wait until all queued events have been written."""
+        self._queue.join()
+
+    def stop_thread(self):
+        """Write all queued events, and then stop."""
+        self._queue.put(self._STOP)
+        self.join()
+
+    def run(self):
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            while len(batch) < self.MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [event for event in batch if event is not self._STOP]
+            stopped = len(events) < len(batch)
+            try:
+                self._write(events)
+            except Exception:  # Broad catch - a failure to report must not block reporting threads.
+                logger.exception("Failed to write reports.")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
 class Report:
     """A report of a pants run."""
 
@@ -58,7 +135,12 @@ class Report:
     def report_level_from_log_level(cls, log_level: LogLevel) -> int:
         return cls._log_level_name_map.get(log_level, Report.INFO)
 
-    def __init__(self):
+    def __init__(self, queue_size=0, overflow_policy=OverflowPolicy.block):
+        """
+        :param queue_size: The maximum number of events which may be waiting to be written by
+                           asynchronous reporters. If 0, all reporters are called synchronously.
+        :param overflow_policy: What to do when that many events are waiting to be written.
+        """
         # We periodically emit newly gathered output from tool invocations.
         self._emitter_thread = EmitterThread(report=self, name="output-emitter")
 
@@ -68,33 +150,55 @@ class Report:
         # We report to these reporters.
         self._reporters = {}  # name -> Reporter instance.
 
+        # And to these from the writer thread, if any, once the report is open.
+        self._async_reporters = {}  # name -> Reporter instance.
+        self._writer_thread = (
+            WriterThread(write=self._write, queue_size=queue_size, name="report-writer")
+            if queue_size > 0
+            else None
+        )
+        self._drop_output_on_overflow = overflow_policy == OverflowPolicy.drop_output
+        self._dropped_output_count = 0
+
         # We synchronize on this, to support parallel execution.
         self._lock = threading.Lock()
 
     def open(self):
         with self._lock:
-            for reporter in self._reporters.values():
+            for reporter in self._all_reporters():
                 reporter.open()
+            if self._writer_thread:
+                self._writer_thread.start()
         self._emitter_thread.start()
 
     # Note that if you addr/remove reporters after open() has been called you have
     # to ensure that their state is set up correctly. Best only to do this with
     # stateless reporters, such as ConsoleReporter.
-    def add_reporter(self, name, reporter):
+    def add_reporter(self, name, reporter, asynchronous=False):
+        """Add a reporter.
+
+        If asynchronous, the reporter is called from the writer thread while the report is open, if
+        this report has one: so it must not depend on the thread its callbacks are called from.
+        """
         with self._lock:
-            self._reporters[name] = reporter
+            if asynchronous and self._writer_thread:
+                self._async_reporters[name] = reporter
+            else:
+                self._reporters[name] = reporter
 
     def remove_reporter(self, name):
         with self._lock:
-            ret = self._reporters[name]
-            del self._reporters[name]
-            return ret
+            if name in self._reporters:
+                return self._reporters.pop(name)
+        # Let an asynchronous reporter write the events reported before it was removed.
+        self._drain()
+        with self._lock:
+            return self._async_reporters.pop(name)
 
     def start_workunit(self, workunit):
         with self._lock:
             self._workunits[workunit.id] = workunit
-            for reporter in self._reporters.values():
-                reporter.start_workunit(workunit)
+            self._report("start_workunit", workunit)
 
     def log(self, workunit, level, *msg_elements):
         """Log a message.
@@ -110,14 +214,12 @@ class Report:
             "Union[str, bytes, Tuple[str, str]]:\n {}".format(msg_elements)
         )
         with self._lock:
-            for reporter in self._reporters.values():
-                reporter.handle_log(workunit, level, *msg_elements)
+            self._report("handle_log", workunit, level, *msg_elements)
 
     def end_workunit(self, workunit):
         with self._lock:
             self._notify()  # Make sure we flush everything reported until now.
-            for reporter in self._reporters.values():
-                reporter.end_workunit(workunit)
+            self._report("end_workunit", workunit)
             if workunit.id in self._workunits:
                 del self._workunits[workunit.id]
 
@@ -129,8 +231,15 @@ class Report:
         self._emitter_thread.stop_thread()
         with self._lock:
             self._notify()  # One final time.
-            for reporter in self._reporters.values():
+            if self._writer_thread and self._writer_thread.is_alive():
+                self._writer_thread.stop_thread()
+            for reporter in self._all_reporters():
                 reporter.close()
+        if self._dropped_output_count:
+            logger.warning(
+                "Dropped {} chunks of tool output from reports, because they were reported faster "
+                "than they could be written.".format(self._dropped_output_count)
+            )
 
     def _notify(self):
         # Notify for output in all workunits. Note that output may be coming in from workunits other
@@ -145,10 +254,42 @@ class Report:
             for label, output in list(workunit.outputs().items()):
                 s = output.read().decode()
                 if len(s) > 0:
-                    for reporter in self._reporters.values():
-                        reporter.handle_output(workunit, label, s)
+                    self._report("handle_output", workunit, label, s, droppable=True)
+
+    def _all_reporters(self):
+        return list(self._reporters.values()) + list(self._async_reporters.values())
+
+    def _report(self, callback_name, *args, droppable=False):
+        """Call the named callback of all reporters.
+
+        Asynchronous reporters are called from the writer thread, if it is running. If its queue is
+        full, the event is dropped if it is droppable and the overflow policy allows it.
+        """
+        # Assumes self._lock is held by the caller.
+        for reporter in self._reporters.values():
+            getattr(reporter, callback_name)(*args)
+            reporter.flush()
+        if self._async_reporters:
+            event = (callback_name, args)
+            if self._writer_thread.is_alive():
+                block = not (droppable and self._drop_output_on_overflow)
+                if not self._writer_thread.put(event, block=block):
+                    self._dropped_output_count += 1
+            else:
+                self._write([event])
+
+    def _write(self, events):
+        reporters = list(self._async_reporters.values())
+        for callback_name, args in events:
+            for reporter in reporters:
+                getattr(reporter, callback_name)(*args)
+        for reporter in reporters:
+            reporter.flush()
+
+    def _drain(self):
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.drain()
 
     def bulk_record_workunits(self, engine_workunits):
         with self._lock:
-            for reporter in self._reporters.values():
-                reporter.bulk_record_workunits(engine_workunits)
+            self._report("bulk_record_workunits", engine_workunits)
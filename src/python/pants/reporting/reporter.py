@@ -42,6 +42,14 @@ class Reporter:
         """End the report."""
         pass
 
+    def flush(self):
+        """Flush anything written since the last flush.
+
+        Called on the thread which called the callbacks that did the writing, after each callback
+        or batch of callbacks.
+        """
+        pass
+
     def start_workunit(self, workunit):
         """A new workunit has started."""
         pass
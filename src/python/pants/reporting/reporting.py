@@ -6,11 +6,12 @@ import sys
 from io import BytesIO
 
 from pants.base.workunit import WorkUnitLabel
+from pants.reporting.chrome_trace_reporter import ChromeTraceReporter
 from pants.reporting.html_reporter import HtmlReporter
 from pants.reporting.invalidation_report import InvalidationReport
 from pants.reporting.plaintext_reporter import LabelFormat, PlainTextReporter, ToolOutputFormat
 from pants.reporting.quiet_reporter import QuietReporter
-from pants.reporting.report import Report
+from pants.reporting.report import OverflowPolicy, Report
 from pants.reporting.reporter import ReporterDestination
 from pants.reporting.reporting_server import ReportingServerManager
 from pants.reporting.zipkin_reporter import ZipkinReporter
@@ -115,6 +116,33 @@ class Reporting(Subsystem):
             help="Spans in a Zipkin trace are sent to the Zipkin server in batches."
             "zipkin-max-span-batch-size sets the max size of one batch.",
         )
+        register(
+            "--chrome-trace-file",
+            advanced=True,
+            metavar="<file>",
+            default=None,
+            help="Write the v1 workunits and v2 engine workunits of the run to this file, in the "
+            "Chrome Trace Event format, to profile the run in chrome://tracing or Perfetto.",
+        )
+        register(
+            "--queue-size",
+            advanced=True,
+            type=int,
+            default=1024,
+            help="The HTML and JSON reports are written by a dedicated thread, rather than by the "
+            "threads doing the work being reported on. This is the maximum number of events which "
+            "may be waiting to be written by that thread. If 0, all reports are written "
+            "synchronously.",
+        )
+        register(
+            "--queue-overflow-policy",
+            advanced=True,
+            type=OverflowPolicy,
+            default=OverflowPolicy.block,
+            help="What to do when the queue of events waiting to be written to the reports is "
+            "full: `block` until there is room, or `drop-output` to drop tool output from the "
+            "reports rather than wait to queue it. Other events are never dropped.",
+        )
 
     def initialize(self, run_tracker, all_options, start_time=None):
         """Initialize with the given RunTracker.
@@ -129,7 +157,10 @@ class Reporting(Subsystem):
         safe_mkdir(html_dir)
         relative_symlink(run_dir, os.path.join(self.get_options().reports_dir, "latest"))
 
-        report = Report()
+        report = Report(
+            queue_size=self.get_options().queue_size,
+            overflow_policy=self.get_options().queue_overflow_policy,
+        )
 
         # Capture initial console reporting into a buffer. We'll do something with it once
         # we know what the cmd-line flag settings are.
@@ -154,7 +185,7 @@ class Reporting(Subsystem):
             log_level=Report.INFO, html_dir=html_dir, template_dir=self.get_options().template_dir
         )
         html_reporter = HtmlReporter(run_tracker, html_reporter_settings)
-        report.add_reporter("html", html_reporter)
+        report.add_reporter("html", html_reporter, asynchronous=True)
 
         # Set up Zipkin reporting.
         zipkin_endpoint = self.get_options().zipkin_endpoint
@@ -206,6 +237,15 @@ class Reporting(Subsystem):
             )
             report.add_reporter("zipkin", zipkin_reporter)
 
+        # Set up Chrome trace reporting.
+        chrome_trace_file = self.get_options().chrome_trace_file
+        if chrome_trace_file is not None:
+            chrome_trace_reporter_settings = ChromeTraceReporter.Settings(
+                log_level=Report.INFO, trace_file=chrome_trace_file
+            )
+            chrome_trace_reporter = ChromeTraceReporter(run_tracker, chrome_trace_reporter_settings)
+            report.add_reporter("chrome_trace", chrome_trace_reporter)
+
         # Add some useful RunInfo.
         run_tracker.run_info.add_info("default_report", html_reporter.report_path())
         port = ReportingServerManager().socket
@@ -19,7 +19,9 @@ import pystache
 from pants.base.build_environment import get_buildroot
 from pants.base.mustache import MustacheRenderer
 from pants.base.run_info import RunInfo
+from pants.goal.aggregated_timings import AggregatedTimings
 from pants.pantsd.process_manager import ProcessManager
+from pants.reporting.html_reporter import render_timings
 
 logger = logging.getLogger(__name__)
 
@@ -231,9 +233,31 @@ class PantsHandler(http.server.BaseHTTPRequestHandler):
                             infile.seek(pos)
                         content = infile.read()
                         ret[_id] = content.decode()
+                elif not pos:
+                    rendered = self._render_aggregated_timings(abspath)
+                    if rendered is not None:
+                        ret[_id] = rendered
         content = json.dumps(ret).encode()
         self._send_content(content, "application/json")
 
+    # The HtmlReporter only renders these once a run has ended.
+    _AGGREGATED_TIMINGS_NAMES = ("cumulative_timings", "self_timings")
+
+    def _render_aggregated_timings(self, abspath):
+        """Render the aggregated timings of a run in progress from its timings log.
+
+        Returns None if the path is not that of the aggregated timings of a run in progress.
+        """
+        name = os.path.basename(abspath)
+        if name not in self._AGGREGATED_TIMINGS_NAMES:
+            return None
+        # The path is <reports dir>/<run id>/html/<name>, and the log is under the run's info dir.
+        run_id = os.path.basename(os.path.dirname(os.path.dirname(abspath)))
+        log_path = AggregatedTimings.log_path(os.path.join(self._settings.info_dir, run_id, name))
+        if not os.path.isfile(log_path):
+            return None
+        return render_timings(AggregatedTimings.from_log(log_path))
+
     def _handle_latest_runid(self, relpath, params):
         """Handle request for the latest run id.
 
@@ -8,7 +8,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import PurePath
-from typing import ClassVar, Dict, Iterable, Optional, Tuple, Type
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple, Type
 
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE
 from pants.base.specs import OriginSpec
@@ -82,6 +82,8 @@ class TestConfiguration(ABC):
     """An ad hoc collection of the fields necessary to run tests on a target."""
 
     required_fields: ClassVar[Tuple[Type[Field], ...]]
+    # If set, `--test-max-batch-size` may run configurations of this type together via this request.
+    batch_request_cls: ClassVar[Optional[Type["TestBatchRequest"]]] = None
 
     address: Address
     origin: OriginSpec
@@ -137,6 +139,28 @@ class AddressAndTestResult:
     test_result: TestResult
 
 
+@union
+@dataclass(frozen=True)
+class TestBatchRequest:
+    """A request to run several test configurations of the same type, batching where possible.
+
+    Implementations must return `BatchedTestResults` with one result per configuration, in any
+    order, and should not run more than `max_batch_size` configurations in one process.
+    """
+
+    configs: Tuple[TestConfiguration, ...]
+    max_batch_size: int
+
+    __test__ = False
+
+
+@dataclass(frozen=True)
+class BatchedTestResults:
+    results: Tuple[AddressAndTestResult, ...]
+
+    __test__ = False
+
+
 class CoverageData(ABC):
     """Base class for inputs to a coverage report.
 
@@ -230,6 +254,16 @@ class TestOptions(GoalSubsystem):
             help="If a coverage report file is generated, open it on the local system if the "
             "system supports this.",
         )
+        register(
+            "--max-batch-size",
+            type=int,
+            default=1,
+            advanced=True,
+            help="The maximum number of test targets to run in a single process, for test "
+            "implementations which support batching. Targets are only batched together when they "
+            "are compatible, e.g. when they have the same requirements. Batching avoids the "
+            "startup cost of a process per target, at the cost of isolation between targets.",
+        )
 
 
 class Test(Goal):
@@ -304,11 +338,46 @@ async def run_tests(
         for test_target in configs
     )
 
-    results = await MultiGet(
-        Get[AddressAndTestResult](WrappedTestConfiguration(config))
+    configs_to_run = [
+        config
         for config, hydrated_sources in zip(configs, all_hydrated_sources)
         if hydrated_sources.snapshot.files
+    ]
+
+    batch_size = options.values.max_batch_size
+    unbatched_configs: List[TestConfiguration] = []
+    batched_configs: Dict[Type[TestBatchRequest], List[TestConfiguration]] = {}
+    for config in configs_to_run:
+        if batch_size > 1 and config.batch_request_cls is not None:
+            batched_configs.setdefault(config.batch_request_cls, []).append(config)
+        else:
+            unbatched_configs.append(config)
+
+    requests: List[Get[Any]] = [
+        Get[AddressAndTestResult](WrappedTestConfiguration(config))
+        for config in unbatched_configs
+    ]
+    requests.extend(
+        Get[BatchedTestResults](
+            TestBatchRequest,
+            batch_request_cls(configs=tuple(batch_configs), max_batch_size=batch_size),
+        )
+        for batch_request_cls, batch_configs in batched_configs.items()
     )
+    all_results = await MultiGet(requests)
+
+    # Report results in the order of the input targets, regardless of how they were batched.
+    result_by_config: Dict[TestConfiguration, AddressAndTestResult] = dict(
+        zip(unbatched_configs, all_results[: len(unbatched_configs)])
+    )
+    for batch_configs, batched_results in zip(
+        batched_configs.values(), all_results[len(unbatched_configs) :]
+    ):
+        result_by_address = {result.address: result for result in batched_results.results}
+        result_by_config.update(
+            (config, result_by_address[config.address]) for config in batch_configs
+        )
+    results = tuple(result_by_config[config] for config in configs_to_run)
 
     did_any_fail = False
     for result in results:
@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass
 from pathlib import PurePath
 from textwrap import dedent
 from typing import List, Optional, Tuple, Type, cast
@@ -33,11 +34,13 @@ from pants.engine.target import (
 )
 from pants.rules.core.test import (
     AddressAndTestResult,
+    BatchedTestResults,
     CoverageDataBatch,
     CoverageReport,
     FilesystemCoverageReport,
     Status,
     Test,
+    TestBatchRequest,
     TestConfiguration,
     TestDebugRequest,
     TestResult,
@@ -129,6 +132,15 @@ class InvalidConfiguration(MockTestConfiguration):
         return Status.FAILURE
 
 
+@dataclass(frozen=True)
+class MockTestBatchRequest(TestBatchRequest):
+    pass
+
+
+class BatchedConfiguration(ConditionallySucceedsConfiguration):
+    batch_request_cls = MockTestBatchRequest
+
+
 class TestTest(TestBase):
     def make_ipr(self) -> InteractiveProcessRequest:
         input_files_content = InputFilesContent(
@@ -155,22 +167,42 @@ class TestTest(TestBase):
         targets: List[TargetWithOrigin],
         debug: bool = False,
         include_sources: bool = True,
+        batch_size: int = 1,
     ) -> Tuple[int, str]:
         console = MockConsole(use_colors=False)
-        options = MockOptions(debug=debug, run_coverage=False)
+        options = MockOptions(debug=debug, run_coverage=False, max_batch_size=batch_size)
         interactive_runner = InteractiveRunner(self.scheduler)
         workspace = Workspace(self.scheduler)
-        union_membership = UnionMembership({TestConfiguration: OrderedSet([config])})
+        union_membership = UnionMembership(
+            {
+                TestConfiguration: OrderedSet([config]),
+                TestBatchRequest: OrderedSet([MockTestBatchRequest]),
+            }
+        )
 
         def mock_coordinator_of_tests(
             wrapped_config: WrappedTestConfiguration,
         ) -> AddressAndTestResult:
             config = wrapped_config.config
+            assert batch_size == 1 or config.batch_request_cls is None
             return AddressAndTestResult(
                 address=config.address,
                 test_result=config.test_result,  # type: ignore[attr-defined]
             )
 
+        def mock_batch_of_tests(batch_request: TestBatchRequest) -> BatchedTestResults:
+            assert batch_request.max_batch_size == batch_size
+            # Return the results out of order, to check that the goal restores the target order.
+            return BatchedTestResults(
+                tuple(
+                    AddressAndTestResult(
+                        address=config.address,
+                        test_result=config.test_result,  # type: ignore[attr-defined]
+                    )
+                    for config in reversed(batch_request.configs)
+                )
+            )
+
         result: Test = run_rule(
             run_tests,
             rule_args=[
@@ -188,6 +220,11 @@ class TestTest(TestBase):
                     subject_type=WrappedTestConfiguration,
                     mock=lambda wrapped_config: mock_coordinator_of_tests(wrapped_config),
                 ),
+                MockGet(
+                    product_type=BatchedTestResults,
+                    subject_type=TestBatchRequest,
+                    mock=lambda batch_request: mock_batch_of_tests(batch_request),
+                ),
                 MockGet(
                     product_type=TestDebugRequest,
                     subject_type=TestConfiguration,
@@ -290,3 +327,28 @@ class TestTest(TestBase):
                 ],
                 debug=True,
             )
+
+    def test_batched_targets(self) -> None:
+        good_address = Address.parse(":good")
+        bad_address = Address.parse(":bad")
+
+        exit_code, stdout = self.run_test_rule(
+            config=BatchedConfiguration,
+            targets=[
+                self.make_target_with_origin(address=good_address),
+                self.make_target_with_origin(bad_address),
+            ],
+            batch_size=2,
+        )
+        assert exit_code == 1
+        assert stdout == dedent(
+            f"""\
+            {good_address} stdout:
+            {BatchedConfiguration.stdout(good_address)}
+            {bad_address} stderr:
+            {BatchedConfiguration.stderr(bad_address)}
+
+            {good_address}                                                                         .....   SUCCESS
+            {bad_address}                                                                          .....   FAILURE
+            """
+        )
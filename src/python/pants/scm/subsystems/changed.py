@@ -1,6 +1,7 @@
 # Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Tuple, cast
@@ -44,10 +45,52 @@ class ChangedAddresses:
     addresses: Addresses
 
 
+class DependentGraphCache:
+    """Holds the dependent graph computed by the previous run of a scheduler.
+
+    In pantsd, the graph outlives the run that computed it, and is updated on the next run with
+    just the targets whose BUILD files have been invalidated (by watchman) and re-parsed since,
+    rather than being rebuilt from every target in the repo.
+
+    Each scheduler owns one cache, which is provided to its rules as a singleton. The graph is only
+    ever accessed under the cache's lock, so that concurrent runs may share it. Every query first
+    updates the graph to contain exactly the given targets, so the result of a query depends only
+    on its arguments, as the engine's memoization requires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._graph = None
+
+    def dependents(self, target_types, address_mapper, target_adaptors, addresses, transitive):
+        """Return the dependents of the given addresses among the given TargetAdaptors.
+
+        :param bool transitive: Whether to return transitive dependents, rather than only direct
+                                dependents.
+        :returns: A tuple of the given addresses and their dependents.
+        """
+        key = (address_mapper, target_types)
+        with self._lock:
+            if self._graph is None or self._key != key:
+                self._key = key
+                self._graph = _DependentGraph(target_types, address_mapper)
+            try:
+                self._graph.update(target_adaptors)
+            except Exception:
+                # Don't trust a graph which was only partially updated.
+                self._graph = None
+                raise
+            if transitive:
+                return tuple(self._graph.transitive_dependents_of_addresses(addresses))
+            return tuple(self._graph.dependents_of_addresses(addresses))
+
+
 @rule
 async def find_owners(
     build_configuration: BuildConfiguration,
     address_mapper: AddressMapper,
+    dependent_graph_cache: DependentGraphCache,
     changed_request: ChangedRequest,
 ) -> ChangedAddresses:
     owners = await Get[Owners](OwnersRequest(sources=changed_request.sources))
@@ -63,12 +106,14 @@ async def find_owners(
     ]
 
     bfa = build_configuration.registered_aliases()
-    graph = _DependentGraph.from_iterable(
-        target_types_from_build_file_aliases(bfa), address_mapper, all_structs
+    dependents = dependent_graph_cache.dependents(
+        target_types_from_build_file_aliases(bfa),
+        address_mapper,
+        all_structs,
+        owners.addresses,
+        transitive=changed_request.include_dependees == IncludeDependeesOption.TRANSITIVE,
     )
-    if changed_request.include_dependees == IncludeDependeesOption.DIRECT:
-        return ChangedAddresses(Addresses(graph.dependents_of_addresses(owners.addresses)))
-    return ChangedAddresses(Addresses(graph.transitive_dependents_of_addresses(owners.addresses)))
+    return ChangedAddresses(Addresses(dependents))
 
 
 @dataclass(frozen=True)
@@ -5,10 +5,17 @@ import logging
 import os
 from abc import abstractmethod
 from collections import OrderedDict
+from multiprocessing import cpu_count
 from typing import Optional, Tuple, Type
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.execution_graph import (
+    ExecutionFailure,
+    ExecutionGraph,
+    Job,
+)
+from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
@@ -55,6 +62,28 @@ class SimpleCodegenTask(Task):
         # scala. See https://rbcommons.com/s/twitter/r/2540/.
         return ["java", "scala", "python"]
 
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        """Subclasses may override to indicate that `execute_codegen` may be called concurrently.
+
+        If so, targets which do not depend on one another are generated concurrently, by up to
+        `--worker-count` threads. Implementations must not mutate shared state, or change the
+        working directory.
+
+        :API: public
+        """
+        return False
+
+    def prepare_concurrent_codegen(self, targets):
+        """Prepares to generate code concurrently for the given targets.
+
+        Called on the main thread before any code is generated concurrently. Subclasses should
+        resolve anything that `execute_codegen` would otherwise resolve lazily (e.g. tool binaries
+        or classpaths) here, so that concurrent calls don't race to resolve it.
+
+        :API: public
+        """
+
     @classmethod
     def register_options(cls, register):
         super().register_options(register)
@@ -75,6 +104,15 @@ class SimpleCodegenTask(Task):
             "targets that generate them.",
             advanced=True,
         )
+        if cls.supports_concurrent_codegen():
+            register(
+                "--worker-count",
+                type=int,
+                default=cpu_count(),
+                advanced=True,
+                help="The number of targets to generate code for concurrently. Defaults to the "
+                "current machine's CPU count.",
+            )
 
     @classmethod
     def get_fingerprint_strategy(cls):
@@ -226,22 +264,41 @@ class SimpleCodegenTask(Task):
         ) as invalidation_check:
 
             with self.context.new_workunit(name="execute", labels=[WorkUnitLabel.MULTITOOL]):
+                vts_to_generate = [
+                    vt
+                    for vt in invalidation_check.all_vts
+                    if not vt.valid and self._do_validate_sources_present(vt.target)
+                ]
+                generated_vts, failure = self._generate(vts_to_generate)
+                generated_vts = set(generated_vts)
+                skipped_vts = set(vts_to_generate) - generated_vts
+
+                # Capture the sources of all generated targets at once, and then handle them in the
+                # order of the invalidation check, so that the result does not depend on the order
+                # in which generation finished.
                 vts_to_sources = OrderedDict()
+                vts_to_capture = tuple(
+                    vt for vt in invalidation_check.all_vts if vt in generated_vts
+                )
+                filesets = self._capture_sources(vts_to_capture)
+                generated_sources = dict(zip(vts_to_capture, filesets))
                 for vt in invalidation_check.all_vts:
-
                     vts_to_sources[vt] = None
 
-                    # Build the target and handle duplicate sources.
-                    if not vt.valid:
-                        if self._do_validate_sources_present(vt.target):
-                            self.execute_codegen(vt.target, vt.current_results_dir)
-                            sources = self._capture_sources((vt,))[0]
-                            # _handle_duplicate_sources may delete files from the filesystem, so we need to
-                            # re-capture the sources.
-                            if not self._handle_duplicate_sources(vt, sources):
-                                vts_to_sources[vt] = sources
+                    # Handle duplicate sources.
+                    if vt in generated_sources:
+                        sources = generated_sources[vt]
+                        # _handle_duplicate_sources may delete files from the filesystem, so we
+                        # need to re-capture the sources.
+                        if not self._handle_duplicate_sources(vt, sources):
+                            vts_to_sources[vt] = sources
+                    if not vt.valid and vt not in skipped_vts:
                         vt.update()
 
+                # Targets which were generated successfully are kept valid even if others failed.
+                if failure:
+                    raise failure
+
                 vts_to_capture = tuple(
                     key for key, sources in vts_to_sources.items() if sources is None
                 )
@@ -254,6 +311,83 @@ class SimpleCodegenTask(Task):
                     vt.target.address for vt in invalidation_check.all_vts
                 )
 
+    def _generate(self, vts):
+        """Generates code for each of the given VersionedTargets.
+
+        If the task supports concurrent codegen, targets are generated concurrently, but only once
+        code has been generated for the targets that they depend on.
+
+        :return: A tuple of the VersionedTargets which were generated successfully, and the
+                 exception to raise for the others, if any of them failed.
+        """
+        worker_count = self.get_options().worker_count if self.supports_concurrent_codegen() else 1
+        if worker_count <= 1 or len(vts) <= 1:
+            generated_vts = []
+            for vt in vts:
+                try:
+                    self._generate_target(vt)
+                except Exception as e:
+                    return generated_vts, e
+                generated_vts.append(vt)
+            return generated_vts, None
+
+        vts_by_target = OrderedDict((vt.target, vt) for vt in vts)
+        generated_targets = set()
+        jobs = [
+            Job(
+                key=target.address.spec,
+                fn=lambda vt=vt: self._generate_target(vt),
+                dependencies=[
+                    dep.address.spec for dep in self._nearest_dependencies(target, vts_by_target)
+                ],
+                on_success=lambda target=target: generated_targets.add(target),
+                target=target,
+            )
+            for target, vt in vts_by_target.items()
+        ]
+        exec_graph = ExecutionGraph(jobs, self.get_options().print_exception_stacktrace)
+
+        self.prepare_concurrent_codegen(list(vts_by_target))
+        with self.context.new_workunit(f"{self.name()}-pool-bootstrap") as workunit:
+            worker_pool = WorkerPool(
+                workunit.parent,
+                self.context.run_tracker,
+                min(worker_count, len(jobs)),
+                workunit.name,
+            )
+        try:
+            exec_graph.execute(worker_pool, self.context.log)
+            failure = None
+        except ExecutionFailure as e:
+            failure = TaskError(f"Code generation failure: {e!r}")
+        finally:
+            worker_pool.shutdown()
+        generated_vts = [vt for target, vt in vts_by_target.items() if target in generated_targets]
+        return generated_vts, failure
+
+    def _generate_target(self, vt):
+        with self.context.new_workunit(name=vt.target.address.spec):
+            self.execute_codegen(vt.target, vt.current_results_dir)
+
+    @staticmethod
+    def _nearest_dependencies(target, targets):
+        """Returns the closest transitive dependencies of the target which are in `targets`."""
+        nearest = OrderedSet()
+        walked = set()
+
+        def walk(tgt):
+            for dep in tgt.dependencies:
+                if dep in walked:
+                    continue
+                walked.add(dep)
+                if dep in targets:
+                    nearest.add(dep)
+                else:
+                    walk(dep)
+
+        walk(target)
+        return nearest
+
     def _mark_transitive_invalidation_hashes_dirty(self, addresses):
         self.context.build_graph.walk_transitive_dependee_graph(
             addresses, work=lambda t: t.mark_transitive_invalidation_hash_dirty(),
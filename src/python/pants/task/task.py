@@ -633,10 +633,16 @@ class TaskBase(SubsystemClientMixin, Optionable, metaclass=ABCMeta):
 
         read_cache = self._cache_factory.get_read_cache()
         items = [
-            (read_cache, vt.cache_key, vt.current_results_dir if self.cache_target_dirs else None)
-            for vt in vts
+            (vt.cache_key, vt.current_results_dir if self.cache_target_dirs else None) for vt in vts
         ]
-        res = self.context.subproc_map(call_use_cached_files, items)
+        if read_cache.supports_bulk_requests:
+            # Fetch without checking for each key first: a fetch which misses costs a round trip,
+            # as a check would, and a check before each hit would double the round trips.
+            res = read_cache.fetch_many(items)
+        else:
+            res = self.context.subproc_map(
+                call_use_cached_files, [(read_cache,) + item for item in items]
+            )
 
         cached_vts = []
         uncached_vts = []
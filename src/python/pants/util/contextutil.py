@@ -130,6 +130,94 @@ def stdio_as(stdout_fd: int, stderr_fd: int, stdin_fd: int) -> Iterator[None]:
         yield
 
 
+class _ThreadLocalStream:
+    """A stand-in for one of sys.std{out,err,in} which may be redirected per-thread."""
+
+    def __init__(self, default: IO) -> None:
+        self._default = default
+        self._local = threading.local()
+        # The number of threads which currently have a stream bound: guarded by
+        # `_thread_local_stream_lock`.
+        self._bindings = 0
+
+    def bound_stream(self) -> IO:
+        return getattr(self._local, "stream", None) or self._default
+
+    def set_stream(self, stream: Optional[IO]) -> None:
+        self._local.stream = stream
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.bound_stream(), name)
+
+
+_thread_local_stream_lock = threading.Lock()
+
+
+def _bind_thread_local_stream(sys_attribute: str, bound: IO) -> _ThreadLocalStream:
+    """Bind the given stream for the calling thread, installing a `_ThreadLocalStream` if needed."""
+    with _thread_local_stream_lock:
+        stream = getattr(sys, sys_attribute)
+        if not isinstance(stream, _ThreadLocalStream):
+            stream = _ThreadLocalStream(stream)
+            setattr(sys, sys_attribute, stream)
+        stream.set_stream(bound)
+        stream._bindings += 1
+        return stream
+
+
+def _unbind_thread_local_stream(sys_attribute: str, stream: _ThreadLocalStream) -> None:
+    """Unbind the calling thread's stream, restoring the original sys stream after the last one."""
+    with _thread_local_stream_lock:
+        stream.set_stream(None)
+        stream._bindings -= 1
+        if stream._bindings == 0 and getattr(sys, sys_attribute) is stream:
+            setattr(sys, sys_attribute, stream._default)
+
+
+@contextmanager
+def thread_local_stdio_as(stdout_fd: int, stderr_fd: int, stdin_fd: int) -> Iterator[None]:
+    """Redirect sys.{stdout, stderr, stdin} to alternate file descriptors for the calling thread
+    only.
+
+    Unlike `stdio_as`, the process-wide file descriptors `0, 1, 2` are untouched, so output written
+    directly to them (e.g. by subprocesses which inherit them) is not redirected. Code which hands
+    sys.{stdout, stderr} to other threads should first resolve them with `thread_bound_stream`.
+
+    The original sys.{stdout, stderr, stdin} are restored once no thread has them redirected. The
+    given file descriptors are not closed.
+    """
+    redirections = [
+        ("stdin", stdin_fd, "r"),
+        ("stdout", stdout_fd, "w"),
+        ("stderr", stderr_fd, "w"),
+    ]
+    bindings = []
+    try:
+        for sys_attribute, fd, mode in redirections:
+            bound = os.fdopen(fd, mode, closefd=False)
+            try:
+                stream = _bind_thread_local_stream(sys_attribute, bound)
+            except BaseException:
+                bound.close()
+                raise
+            bindings.append((sys_attribute, stream, bound))
+        yield
+    finally:
+        for sys_attribute, stream, bound in bindings:
+            _unbind_thread_local_stream(sys_attribute, stream)
+            bound.close()
+
+
+def thread_bound_stream(stream: IO) -> IO:
+    """Return the stream which the given sys.std{out,err,in} currently refers to for this thread.
+
+    This is the stream itself unless it has been redirected with `thread_local_stdio_as`.
+    """
+    if isinstance(stream, _ThreadLocalStream):
+        return stream.bound_stream()
+    return stream
+
+
 @contextmanager
 def signal_handler_as(
     sig: int, handler: Union[int, Callable[[int, FrameType], None]]
@@ -187,6 +187,7 @@ pub extern "C" fn scheduler_create(
   ignore_patterns_buf: BufferBuffer,
   root_type_ids: TypeIdBuffer,
   remote_execution: bool,
+  remote_cache_only: bool,
   remote_store_servers_buf: BufferBuffer,
   remote_execution_server: Buffer,
   remote_execution_process_cache_namespace: Buffer,
@@ -217,6 +218,7 @@ pub extern "C" fn scheduler_create(
     ignore_patterns_buf,
     root_type_ids,
     remote_execution,
+    remote_cache_only,
     remote_store_servers_buf,
     remote_execution_server,
     remote_execution_process_cache_namespace,
@@ -260,6 +262,7 @@ fn make_core(
   ignore_patterns_buf: BufferBuffer,
   root_type_ids: TypeIdBuffer,
   remote_execution: bool,
+  remote_cache_only: bool,
   remote_store_servers_buf: BufferBuffer,
   remote_execution_server: Buffer,
   remote_execution_process_cache_namespace: Buffer,
@@ -355,6 +358,7 @@ fn make_core(
     &ignore_patterns,
     PathBuf::from(local_store_dir_buf.to_os_string()),
     remote_execution,
+    remote_cache_only,
     remote_store_servers_vec,
     if remote_execution_server_string.is_empty() {
       None
@@ -482,6 +486,16 @@ pub extern "C" fn scheduler_metrics(
         let value = workunits_to_py_tuple_value(&mut iter);
         values.push((externs::store_utf8("engine_workunits"), value));
       };
+      if let Some(rule_requests) = session.rule_requests() {
+        let rule_requests = rule_requests
+          .into_iter()
+          .map(|(func, count)| (externs::store_utf8(&func.name()), externs::store_u64(count)))
+          .collect::<Vec<_>>();
+        values.push((
+          externs::store_utf8("rule_requests"),
+          externs::store_dict(rule_requests.as_slice()),
+        ));
+      }
       externs::store_dict(values.as_slice()).into()
     })
   })
@@ -715,6 +729,7 @@ pub extern "C" fn session_create(
   ui_worker_count: u64,
   build_id: Buffer,
   should_report_workunits: bool,
+  should_profile_rules: bool,
 ) -> *const Session {
   let build_id = build_id
     .to_string()
@@ -727,6 +742,7 @@ pub extern "C" fn session_create(
       ui_worker_count as usize,
       build_id,
       should_report_workunits,
+      should_profile_rules,
     )))
   })
 }
@@ -3,6 +3,7 @@ use crate::{
   FallibleExecuteProcessResultWithPlatform, MultiPlatformExecuteProcessRequest, Platform,
 };
 use std::sync::Arc;
+use std::time::SystemTime;
 
 use bincode;
 use bytes::Bytes;
@@ -12,10 +13,12 @@ use log::{debug, warn};
 use protobuf::Message;
 
 use boxfuture::{BoxFuture, Boxable};
+use concrete_time::TimeSpan;
 use hashing::Fingerprint;
 use serde::{Deserialize, Serialize};
 use sharded_lmdb::ShardedLmdb;
 use store::Store;
+use workunit_store::{get_parent_id, WorkUnit};
 
 #[allow(dead_code)]
 #[derive(Serialize, Deserialize)]
@@ -56,7 +59,6 @@ impl crate::CommandRunner for CommandRunner {
     self.underlying.extract_compatible_request(req)
   }
 
-  // TODO: Maybe record WorkUnits for local cache checks.
   fn run(
     &self,
     req: MultiPlatformExecuteProcessRequest,
@@ -64,13 +66,22 @@ impl crate::CommandRunner for CommandRunner {
   ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
     let digest = crate::digest(req.clone(), &self.metadata);
     let key = digest.0;
+    let start = SystemTime::now();
+    let parent_id = get_parent_id();
 
     let command_runner = self.clone();
     self
       .lookup(key, context.clone())
       .then(move |maybe_result| {
         match maybe_result {
-          Ok(Some(result)) => return future::ok(result).to_boxed(),
+          Ok(Some(result)) => {
+            context.workunit_store.add_workunit(WorkUnit::new(
+              "local cache hit".to_string(),
+              TimeSpan::since(&start),
+              parent_id,
+            ));
+            return future::ok(result).to_boxed();
+          }
           Err(err) => {
             warn!("Error loading process execution result from local cache: {} - continuing to execute", err);
             // Falling through to re-execute.
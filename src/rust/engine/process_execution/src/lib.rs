@@ -58,6 +58,10 @@ pub mod remote;
 #[cfg(test)]
 pub mod remote_tests;
 
+pub mod remote_cache;
+#[cfg(test)]
+mod remote_cache_tests;
+
 pub mod speculate;
 #[cfg(test)]
 mod speculate_tests;
@@ -380,6 +384,33 @@ pub trait CommandRunner: Send + Sync {
   fn num_waiters(&self) -> usize {
     panic!("This method is abstract and not implemented for this type")
   }
+
+  ///
+  /// Check whether a result for the request is already available without running it: for example,
+  /// in a remote action cache. Resolves to None if there is no such result.
+  ///
+  /// Returns None if this CommandRunner has no cheaper way to find a result than to run the
+  /// request, which is the default.
+  ///
+  fn lookup(
+    &self,
+    _req: &MultiPlatformExecuteProcessRequest,
+    _context: Context,
+  ) -> Option<BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String>> {
+    None
+  }
+
+  ///
+  /// Run the request, given that a `lookup` of it has just missed. CommandRunners which would
+  /// otherwise look the request up again before running it may skip doing so.
+  ///
+  fn run_without_lookup(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    self.run(req, context)
+  }
 }
 
 // TODO(#8513) possibly move to the MEPR struct, or to the hashing crate?
@@ -448,6 +479,32 @@ impl CommandRunner for BoundedCommandRunner {
   ) -> Option<ExecuteProcessRequest> {
     self.inner.0.extract_compatible_request(&req)
   }
+
+  // Lookups are not bounded by the semaphore: they are cheap, and are used to decide whether to
+  // wait for a slot at all.
+  fn lookup(
+    &self,
+    req: &MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> Option<BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String>> {
+    self.inner.0.lookup(req, context)
+  }
+
+  fn run_without_lookup(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    let inner = self.inner.clone();
+    self
+      .inner
+      .1
+      .clone()
+      .with_acquired(move || inner.0.run_without_lookup(req, context).compat())
+      .boxed()
+      .compat()
+      .to_boxed()
+  }
 }
 
 impl From<Box<BoundedCommandRunner>> for Arc<dyn CommandRunner> {
@@ -110,6 +110,7 @@ pub struct CommandRunner {
   env: Arc<grpcio::Environment>,
   execution_client: Arc<bazel_protos::remote_execution_grpc::ExecutionClient>,
   operations_client: Arc<bazel_protos::operations_grpc::OperationsClient>,
+  action_cache_client: Arc<bazel_protos::remote_execution_grpc::ActionCacheClient>,
   store: Store,
   platform: Platform,
   executor: task_executor::Executor,
@@ -118,6 +119,9 @@ pub struct CommandRunner {
   queue_buffer_time: Duration,
   backoff_incremental_wait: Duration,
   backoff_max_wait: Duration,
+  // Whether to ask the server not to check the ActionCache before executing, because the caller
+  // has just checked it. See `run_without_lookup`.
+  skip_cache_lookup: bool,
 }
 
 #[derive(Debug, PartialEq)]
@@ -220,6 +224,50 @@ impl super::CommandRunner for CommandRunner {
     None
   }
 
+  ///
+  /// Checks the remote ActionCache for a result of the request, without executing it.
+  ///
+  /// The Execute API checks the ActionCache too, but only after the inputs of the request have
+  /// been uploaded: checking it up front allows a caller to learn about a cache miss quickly.
+  ///
+  fn lookup(
+    &self,
+    req: &MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> Option<BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String>> {
+    let compatible_request = self.extract_compatible_request(req)?;
+    let action_digest = make_execute_request(&compatible_request, self.metadata.clone())
+      .and_then(|(action, _command, _execute_request)| digest(&action));
+    Some(match action_digest {
+      Ok(action_digest) => check_action_cache(
+        action_digest,
+        &self.metadata,
+        &self.headers,
+        &self.action_cache_client,
+        self.store.clone(),
+        self.platform,
+        context,
+      ),
+      Err(err) => future::err(err).to_boxed(),
+    })
+  }
+
+  ///
+  /// Executes the request without the Execute API checking the ActionCache first: the caller has
+  /// just looked the request up there, so checking again would only cost another round trip.
+  ///
+  fn run_without_lookup(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    let command_runner = CommandRunner {
+      skip_cache_lookup: true,
+      ..self.clone()
+    };
+    command_runner.run(req, context)
+  }
+
   ///
   /// Runs a command via a gRPC service implementing the Bazel Remote Execution API
   /// (https://docs.google.com/document/d/1AaGk7fOPByEvpAbqeXIyE8HX_A3_axxNnvroblTZ_6s/edit).
@@ -261,8 +309,9 @@ impl super::CommandRunner for CommandRunner {
     let description2 = description.clone();
 
     match execute_request_result {
-      Ok((action, command, execute_request)) => {
+      Ok((action, command, mut execute_request)) => {
         let command_runner = self.clone();
+        execute_request.set_skip_cache_lookup(self.skip_cache_lookup);
         let execute_request = Arc::new(execute_request);
 
         let mut history = ExecutionHistory::default();
@@ -505,6 +554,9 @@ impl CommandRunner {
     let operations_client = Arc::new(bazel_protos::operations_grpc::OperationsClient::new(
       channel.clone(),
     ));
+    let action_cache_client = Arc::new(
+      bazel_protos::remote_execution_grpc::ActionCacheClient::new(channel.clone()),
+    );
 
     let mut headers = headers;
     if let Some(oauth_bearer_token) = oauth_bearer_token {
@@ -524,12 +576,14 @@ impl CommandRunner {
       env,
       execution_client,
       operations_client,
+      action_cache_client,
       store,
       platform,
       executor,
       queue_buffer_time,
       backoff_incremental_wait,
       backoff_max_wait,
+      skip_cache_lookup: false,
     };
 
     Ok(command_runner)
@@ -949,6 +1003,62 @@ pub fn make_execute_request(
   Ok((action, command, execute_request))
 }
 
+///
+/// Look up the ActionResult for the given Action digest in an ActionCache, and load it as a process
+/// result.
+///
+/// Returns None if the ActionCache does not have an entry for the Action. The outputs of the
+/// ActionResult are not fetched until they are used: at which point the Store will fetch them
+/// from the CAS.
+///
+pub(crate) fn check_action_cache(
+  action_digest: Digest,
+  metadata: &ExecuteProcessRequestMetadata,
+  headers: &BTreeMap<String, String>,
+  action_cache_client: &bazel_protos::remote_execution_grpc::ActionCacheClient,
+  store: Store,
+  platform: Platform,
+  context: Context,
+) -> BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String> {
+  let mut request = bazel_protos::remote_execution::GetActionResultRequest::new();
+  if let Some(ref instance_name) = metadata.instance_name {
+    request.set_instance_name(instance_name.clone());
+  }
+  request.set_action_digest((&action_digest).into());
+
+  let call_option = try_future!(call_option(headers, Some(context.build_id.clone())));
+  try_future!(action_cache_client
+    .get_action_result_async_opt(&request, call_option)
+    .map_err(rpcerror_to_string))
+  .then(|result| match result {
+    Ok(action_result) => Ok(Some(action_result)),
+    Err(grpcio::Error::RpcFailure(ref status))
+      if status.status == grpcio::RpcStatusCode::NOT_FOUND =>
+    {
+      Ok(None)
+    }
+    Err(err) => Err(rpcerror_to_string(err)),
+  })
+  .and_then(move |maybe_action_result| match maybe_action_result {
+    Some(action_result) => {
+      let mut execute_response = bazel_protos::remote_execution::ExecuteResponse::new();
+      execute_response.set_cached_result(true);
+      execute_response.set_result(action_result);
+      populate_fallible_execution_result(
+        store,
+        execute_response,
+        vec![],
+        context.workunit_store,
+        platform,
+      )
+      .map(Some)
+      .to_boxed()
+    }
+    None => future::ok(None).to_boxed(),
+  })
+  .to_boxed()
+}
+
 pub fn populate_fallible_execution_result(
   store: Store,
   execute_response: bazel_protos::remote_execution::ExecuteResponse,
@@ -1218,7 +1328,7 @@ fn rpcerror_to_status_or_string(
   }
 }
 
-fn rpcerror_to_string(error: grpcio::Error) -> String {
+pub(crate) fn rpcerror_to_string(error: grpcio::Error) -> String {
   match error {
     grpcio::Error::RpcFailure(status) => format!(
       "{:?}: {:?}",
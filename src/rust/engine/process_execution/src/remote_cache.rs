@@ -0,0 +1,288 @@
+use std::collections::BTreeMap;
+use std::sync::Arc;
+use std::time::SystemTime;
+
+use bazel_protos::{self, call_option};
+use boxfuture::{try_future, BoxFuture, Boxable};
+use bytes::Bytes;
+use concrete_time::TimeSpan;
+use futures01::{future, Future};
+use grpcio;
+use hashing::Digest;
+use log::{debug, warn};
+use store::Store;
+use workunit_store::{get_parent_id, WorkUnit};
+
+use crate::{
+  Context, ExecuteProcessRequest, ExecuteProcessRequestMetadata,
+  FallibleExecuteProcessResultWithPlatform, MultiPlatformExecuteProcessRequest, Platform,
+};
+
+///
+/// A CommandRunner which looks up the results of processes in the ActionCache of a remote store
+/// before running them with an underlying (usually local) CommandRunner, and writes successful
+/// results back to the ActionCache and CAS.
+///
+/// This allows machines to share process results via a server which implements only the CAS and
+/// ActionCache services of the Remote Execution API, without any remote workers.
+///
+#[derive(Clone)]
+pub struct CommandRunner {
+  underlying: Arc<dyn crate::CommandRunner>,
+  metadata: ExecuteProcessRequestMetadata,
+  headers: BTreeMap<String, String>,
+  // Held to keep the channel to the action cache open.
+  _env: Arc<grpcio::Environment>,
+  action_cache_client: Arc<bazel_protos::remote_execution_grpc::ActionCacheClient>,
+  store: Store,
+  platform: Platform,
+}
+
+impl CommandRunner {
+  pub fn new(
+    underlying: Arc<dyn crate::CommandRunner>,
+    address: &str,
+    metadata: ExecuteProcessRequestMetadata,
+    root_ca_certs: Option<Vec<u8>>,
+    oauth_bearer_token: Option<String>,
+    headers: BTreeMap<String, String>,
+    store: Store,
+    platform: Platform,
+  ) -> Result<CommandRunner, String> {
+    let env = Arc::new(grpcio::EnvBuilder::new().build());
+    let channel = {
+      let builder = grpcio::ChannelBuilder::new(env.clone());
+      if let Some(root_ca_certs) = root_ca_certs {
+        let creds = grpcio::ChannelCredentialsBuilder::new()
+          .root_cert(root_ca_certs)
+          .build();
+        builder.secure_connect(address, creds)
+      } else {
+        builder.connect(address)
+      }
+    };
+    let action_cache_client = Arc::new(
+      bazel_protos::remote_execution_grpc::ActionCacheClient::new(channel),
+    );
+
+    let mut headers = headers;
+    if let Some(oauth_bearer_token) = oauth_bearer_token {
+      headers.insert(
+        String::from("authorization"),
+        format!("Bearer {}", oauth_bearer_token),
+      );
+    }
+
+    // Validate that any configured static headers are valid.
+    call_option(&headers, None)?;
+
+    // The outputs of a process may depend on the platform it ran on, even when it did not request
+    // a particular platform: so results are only shared between machines of the same platform.
+    let mut metadata = metadata;
+    metadata
+      .platform_properties
+      .push(("execution_platform".to_owned(), platform.into()));
+
+    Ok(CommandRunner {
+      underlying,
+      metadata,
+      headers,
+      _env: env,
+      action_cache_client,
+      store,
+      platform,
+    })
+  }
+
+  fn instance_name(&self) -> String {
+    self.metadata.instance_name.clone().unwrap_or_default()
+  }
+
+  fn store_proto_locally<P: protobuf::Message>(
+    &self,
+    proto: &P,
+  ) -> impl Future<Item = Digest, Error = String> {
+    let store = self.store.clone();
+    future::done(
+      proto
+        .write_to_bytes()
+        .map_err(|e| format!("Error serializing proto {:?}", e)),
+    )
+    .and_then(move |bytes| store.store_file_bytes(Bytes::from(bytes), true))
+  }
+
+  ///
+  /// Look up the ActionResult for the given Action digest, and load it as a process result.
+  ///
+  fn check_cache(
+    &self,
+    action_digest: Digest,
+    context: Context,
+  ) -> BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String> {
+    crate::remote::check_action_cache(
+      action_digest,
+      &self.metadata,
+      &self.headers,
+      &self.action_cache_client,
+      self.store.clone(),
+      self.platform,
+      context,
+    )
+  }
+
+  ///
+  /// Upload the outputs of a successful process to the CAS, and then record its ActionResult.
+  ///
+  /// The Action and Command are uploaded too, as the Remote Execution API requires, so that the
+  /// server may verify or garbage collect the entry.
+  ///
+  fn store(
+    &self,
+    action: bazel_protos::remote_execution::Action,
+    command: bazel_protos::remote_execution::Command,
+    result: &FallibleExecuteProcessResultWithPlatform,
+    context: Context,
+  ) -> impl Future<Item = (), Error = String> {
+    let mut action_result = bazel_protos::remote_execution::ActionResult::new();
+    action_result.set_exit_code(result.exit_code);
+    // As in the local process cache, the tree digest of the root output directory is the digest of
+    // its Directory rather than of a Tree.
+    action_result.mut_output_directories().push({
+      let mut directory = bazel_protos::remote_execution::OutputDirectory::new();
+      directory.set_path(String::new());
+      directory.set_tree_digest((&result.output_directory).into());
+      directory
+    });
+    let output_directory = result.output_directory;
+
+    let command_runner = self.clone();
+    self
+      .store_proto_locally(&action)
+      .join(self.store_proto_locally(&command))
+      .join(
+        self
+          .store
+          .store_file_bytes(result.stdout.clone(), true)
+          .join(self.store.store_file_bytes(result.stderr.clone(), true)),
+      )
+      .and_then({
+        let store = self.store.clone();
+        let workunit_store = context.workunit_store.clone();
+        move |((action_digest, command_digest), (stdout_digest, stderr_digest))| {
+          action_result.set_stdout_digest((&stdout_digest).into());
+          action_result.set_stderr_digest((&stderr_digest).into());
+          store
+            .ensure_remote_has_recursive(
+              vec![
+                action_digest,
+                command_digest,
+                output_directory,
+                stdout_digest,
+                stderr_digest,
+              ],
+              workunit_store,
+            )
+            .map(move |_summary| (action_digest, action_result))
+        }
+      })
+      .and_then(move |(action_digest, action_result)| {
+        let mut request = bazel_protos::remote_execution::UpdateActionResultRequest::new();
+        request.set_instance_name(command_runner.instance_name());
+        request.set_action_digest((&action_digest).into());
+        request.set_action_result(action_result);
+        command_runner
+          .action_cache_client
+          .update_action_result_async_opt(
+            &request,
+            call_option(&command_runner.headers, Some(context.build_id))?,
+          )
+          .map_err(crate::remote::rpcerror_to_string)
+      })
+      .and_then(|receiver| receiver.map_err(crate::remote::rpcerror_to_string))
+      .map(|_action_result| ())
+  }
+}
+
+impl crate::CommandRunner for CommandRunner {
+  fn extract_compatible_request(
+    &self,
+    req: &MultiPlatformExecuteProcessRequest,
+  ) -> Option<ExecuteProcessRequest> {
+    self.underlying.extract_compatible_request(req)
+  }
+
+  fn run(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    let compatible_request = match self.extract_compatible_request(&req) {
+      Some(compatible_request) => compatible_request,
+      None => return self.underlying.run(req, context),
+    };
+    // Files which are materialized without being part of the input digest are not part of the
+    // cache key, so such processes must not be shared.
+    if compatible_request
+      .unsafe_local_only_files_because_we_favor_speed_over_correctness_for_this_rule
+      != hashing::EMPTY_DIGEST
+    {
+      return self.underlying.run(req, context);
+    }
+    let (action, command, _execute_request) = try_future!(crate::remote::make_execute_request(
+      &compatible_request,
+      self.metadata.clone()
+    ));
+    let action_digest = try_future!(crate::remote::digest(&action));
+    let start = SystemTime::now();
+    let parent_id = get_parent_id();
+
+    let command_runner = self.clone();
+    self
+      .check_cache(action_digest, context.clone())
+      .then(move |maybe_result| {
+        match maybe_result {
+          Ok(Some(result)) => {
+            context.workunit_store.add_workunit(WorkUnit::new(
+              "remote cache hit".to_string(),
+              TimeSpan::since(&start),
+              parent_id,
+            ));
+            return future::ok(result).to_boxed();
+          }
+          Err(err) => {
+            warn!(
+              "Error loading process execution result from remote cache: {} - continuing to execute",
+              err
+            );
+            // Falling through to execute.
+          }
+          Ok(None) => {
+            // Falling through to execute.
+          }
+        }
+        command_runner
+          .underlying
+          .run(req, context.clone())
+          .and_then(move |result| {
+            if result.exit_code == 0 {
+              command_runner
+                .store(action, command, &result, context)
+                .then(|store_result| {
+                  if let Err(err) = store_result {
+                    debug!(
+                      "Error storing process execution result to remote cache: {} - ignoring and continuing",
+                      err
+                    );
+                  }
+                  Ok(result)
+                })
+                .to_boxed()
+            } else {
+              future::ok(result).to_boxed()
+            }
+          })
+          .to_boxed()
+      })
+      .to_boxed()
+  }
+}
@@ -0,0 +1,205 @@
+use crate::{
+  CommandRunner as CommandRunnerTrait, Context, ExecuteProcessRequest,
+  ExecuteProcessRequestMetadata, FallibleExecuteProcessResultWithPlatform, Platform,
+  PlatformConstraint,
+};
+use futures::compat::Future01CompatExt;
+use hashing::EMPTY_DIGEST;
+use mock::StubCAS;
+use std::collections::{BTreeMap, BTreeSet};
+use std::io::Write;
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use std::time::Duration;
+use store::Store;
+use tempfile::TempDir;
+use testutil::data::TestData;
+use tokio::runtime::Handle;
+use workunit_store::WorkUnitStore;
+
+struct RoundtripResults {
+  uncached: Result<FallibleExecuteProcessResultWithPlatform, String>,
+  maybe_cached: Result<FallibleExecuteProcessResultWithPlatform, String>,
+}
+
+fn make_store(store_dir: &Path, cas: &StubCAS) -> Store {
+  Store::with_remote(
+    task_executor::Executor::new(Handle::current()),
+    store_dir,
+    vec![cas.address()],
+    None,
+    None,
+    None,
+    1,
+    10 * 1024 * 1024,
+    Duration::from_secs(1),
+    store::BackoffConfig::new(Duration::from_millis(10), 1.0, Duration::from_millis(10)).unwrap(),
+    1,
+    1,
+  )
+  .expect("Failed to make store")
+}
+
+///
+/// Creates a remote caching CommandRunner with its own local store and work dir, as if on a
+/// separate machine from any others which share the given CAS.
+///
+fn make_remote_caching_runner(
+  cas: &StubCAS,
+  store_dir: &Path,
+  work_dir: &Path,
+) -> (crate::remote_cache::CommandRunner, Store) {
+  let store = make_store(store_dir, cas);
+  let local = crate::local::CommandRunner::new(
+    store.clone(),
+    task_executor::Executor::new(Handle::current()),
+    work_dir.to_owned(),
+    true,
+  );
+  let metadata = ExecuteProcessRequestMetadata {
+    instance_name: None,
+    cache_key_gen_version: None,
+    platform_properties: vec![],
+  };
+  let runner = crate::remote_cache::CommandRunner::new(
+    Arc::new(local),
+    &cas.address(),
+    metadata,
+    None,
+    None,
+    BTreeMap::new(),
+    store.clone(),
+    Platform::current().unwrap(),
+  )
+  .expect("Failed to make command runner");
+  (runner, store)
+}
+
+async fn run_roundtrip(script_exit_code: i8) -> RoundtripResults {
+  let cas = StubCAS::empty();
+
+  let script_dir = TempDir::new().unwrap();
+  let script_path = script_dir.path().join("script");
+  std::fs::File::create(&script_path)
+    .and_then(|mut file| {
+      writeln!(
+        file,
+        "echo -n {} > roland && echo Hello && echo >&2 World; exit {}",
+        TestData::roland().string(),
+        script_exit_code
+      )
+    })
+    .unwrap();
+
+  let request = ExecuteProcessRequest {
+    argv: vec![
+      testutil::path::find_bash(),
+      format!("{}", script_path.display()),
+    ],
+    env: BTreeMap::new(),
+    working_directory: None,
+    input_files: EMPTY_DIGEST,
+    output_files: vec![PathBuf::from("roland")].into_iter().collect(),
+    output_directories: BTreeSet::new(),
+    timeout: Duration::from_millis(1000),
+    description: "bash".to_string(),
+    unsafe_local_only_files_because_we_favor_speed_over_correctness_for_this_rule:
+      hashing::EMPTY_DIGEST,
+    jdk_home: None,
+    target_platform: PlatformConstraint::None,
+    is_nailgunnable: false,
+  };
+
+  let store_dir1 = TempDir::new().unwrap();
+  let work_dir1 = TempDir::new().unwrap();
+  let (runner1, _store1) = make_remote_caching_runner(&cas, store_dir1.path(), work_dir1.path());
+  let uncached_result = runner1
+    .run(request.clone().into(), Context::default())
+    .compat()
+    .await;
+
+  // Removing the script means that were the command to be run again without any caching, it would
+  // fail due to a FileNotFound error. So if the second run succeeds, on a "machine" which shares
+  // nothing but the CAS with the first, the remote cache was used.
+  std::fs::remove_file(&script_path).unwrap();
+  let store_dir2 = TempDir::new().unwrap();
+  let work_dir2 = TempDir::new().unwrap();
+  let (runner2, store2) = make_remote_caching_runner(&cas, store_dir2.path(), work_dir2.path());
+  let maybe_cached_result = runner2
+    .run(request.into(), Context::default())
+    .compat()
+    .await;
+
+  if let Ok(ref result) = maybe_cached_result {
+    if result.exit_code == 0 {
+      // The outputs of the cached result are fetched from the CAS.
+      let (directory, _metadata) = store2
+        .load_directory(result.output_directory, WorkUnitStore::new())
+        .compat()
+        .await
+        .unwrap()
+        .expect("Output directory was not found");
+      let roland = &directory.get_files()[0];
+      let roland_digest: Result<hashing::Digest, String> = roland.get_digest().into();
+      let content = store2
+        .load_file_bytes_with(roland_digest.unwrap(), |b| b, WorkUnitStore::new())
+        .compat()
+        .await
+        .unwrap()
+        .expect("Output file was not found")
+        .0;
+      assert_eq!(TestData::roland().bytes(), content);
+    }
+  }
+
+  RoundtripResults {
+    uncached: uncached_result,
+    maybe_cached: maybe_cached_result,
+  }
+}
+
+#[tokio::test]
+async fn cache_success() {
+  let results = run_roundtrip(0).await;
+  assert_eq!(results.uncached, results.maybe_cached);
+}
+
+#[tokio::test]
+async fn failures_not_cached() {
+  let results = run_roundtrip(1).await;
+  assert_ne!(results.uncached, results.maybe_cached);
+  assert_eq!(results.uncached.unwrap().exit_code, 1);
+  assert_eq!(results.maybe_cached.unwrap().exit_code, 127); // aka the return code for file not found
+}
+
+#[tokio::test]
+async fn cache_errors_fall_back_to_running() {
+  let cas = StubCAS::always_errors();
+  let store_dir = TempDir::new().unwrap();
+  let work_dir = TempDir::new().unwrap();
+  let (runner, _store) = make_remote_caching_runner(&cas, store_dir.path(), work_dir.path());
+
+  let request = ExecuteProcessRequest {
+    argv: vec!["/bin/echo".to_owned(), "-n".to_owned(), "foo".to_owned()],
+    env: BTreeMap::new(),
+    working_directory: None,
+    input_files: EMPTY_DIGEST,
+    output_files: BTreeSet::new(),
+    output_directories: BTreeSet::new(),
+    timeout: Duration::from_millis(1000),
+    description: "echo foo".to_string(),
+    unsafe_local_only_files_because_we_favor_speed_over_correctness_for_this_rule:
+      hashing::EMPTY_DIGEST,
+    jdk_home: None,
+    target_platform: PlatformConstraint::None,
+    is_nailgunnable: false,
+  };
+
+  let result = runner
+    .run(request.into(), Context::default())
+    .compat()
+    .await
+    .unwrap();
+  assert_eq!(result.exit_code, 0);
+  assert_eq!(result.stdout, bytes::Bytes::from("foo"));
+}
@@ -3,12 +3,15 @@ use crate::{
   MultiPlatformExecuteProcessRequest,
 };
 use boxfuture::{BoxFuture, Boxable};
+use concrete_time::TimeSpan;
 use futures::future::{FutureExt, TryFutureExt};
 use futures01::future::{err, ok, Either, Future};
 use log::{debug, trace};
+use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::Arc;
-use std::time::Duration;
+use std::time::{Duration, SystemTime};
 use tokio::time::delay_for;
+use workunit_store::{get_parent_id, WorkUnit};
 
 #[derive(Clone)]
 pub struct SpeculatingCommandRunner {
@@ -30,65 +33,176 @@ impl SpeculatingCommandRunner {
     }
   }
 
+  ///
+  /// Runs the request on the primary, and also on the secondary once the speculation timeout has
+  /// elapsed, and returns whichever result is available first: the other request is cancelled.
+  ///
+  /// If the primary is able to look up an existing result for the request (e.g. in a remote
+  /// action cache), the lookup is given the speculation timeout instead: a hit is returned
+  /// without running anything, while a miss (or a lookup which does not complete within the
+  /// timeout) starts both requests immediately. After a miss, the primary runs the request
+  /// without looking it up again. Each outcome is recorded as a workunit.
+  ///
   fn speculate(
     &self,
     req: MultiPlatformExecuteProcessRequest,
     context: Context,
   ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    let start = SystemTime::now();
+    let parent_id = get_parent_id();
+    let lookup = match self.primary.lookup(&req, context.clone()) {
+      Some(lookup) => lookup,
+      None => {
+        return self.race(
+          req,
+          context,
+          self.speculation_timeout,
+          false,
+          start,
+          parent_id,
+        )
+      }
+    };
     let delay = delay_for(self.speculation_timeout)
       .unit_error()
       .boxed()
       .compat();
+    let command_runner = self.clone();
+    lookup
+      .select2(delay)
+      .then(move |lookup_result| {
+        let (outcome, speculation_timeout, missed) = match lookup_result {
+          Ok(Either::A((Some(result), _))) => {
+            record_speculation(&context, "primary cache hit", &start, parent_id);
+            return ok(result).to_boxed();
+          }
+          Ok(Either::A((None, _))) => ("primary cache miss", Duration::from_millis(0), true),
+          // A failed lookup says nothing about whether the primary will be fast, so the secondary
+          // waits out whatever remains of the timeout as usual.
+          Err(Either::A((failed_lookup, _))) => {
+            debug!("primary cache lookup FAILED: {}", failed_lookup);
+            let elapsed = start.elapsed().unwrap_or_default();
+            (
+              "primary cache lookup failed",
+              command_runner
+                .speculation_timeout
+                .checked_sub(elapsed)
+                .unwrap_or_default(),
+              false,
+            )
+          }
+          // Dropping the outstanding lookup cancels it.
+          Ok(Either::B(_)) | Err(Either::B(_)) => (
+            "primary cache lookup timed out",
+            Duration::from_millis(0),
+            false,
+          ),
+        };
+        record_speculation(&context, outcome, &start, parent_id.clone());
+        command_runner.race(req, context, speculation_timeout, missed, start, parent_id)
+      })
+      .to_boxed()
+  }
+
+  fn race(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+    speculation_timeout: Duration,
+    primary_lookup_missed: bool,
+    start: SystemTime,
+    parent_id: Option<String>,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    let delay = delay_for(speculation_timeout).unit_error().boxed().compat();
     let req2 = req.clone();
+    let speculated = Arc::new(AtomicBool::new(false));
     trace!(
       "Primary command runner queue length: {:?}",
       self.primary.num_waiters()
     );
-    self
-      .primary
-      .run(req, context.clone())
+    let primary = if primary_lookup_missed {
+      self.primary.run_without_lookup(req, context.clone())
+    } else {
+      self.primary.run(req, context.clone())
+    };
+    primary
       .select2({
         let command_runner = self.clone();
+        let context = context.clone();
+        let speculated = speculated.clone();
         delay.then(move |_| {
           trace!(
             "Secondary command runner queue length: {:?}",
             command_runner.secondary.num_waiters()
           );
+          speculated.store(true, Ordering::SeqCst);
           command_runner.secondary.run(req2, context)
         })
       })
-      .then(|raced_result| match raced_result {
-        Ok(either_success) => {
-          // .split() takes out the homogeneous success type for either primary or
-          // secondary successes.
-          ok::<FallibleExecuteProcessResultWithPlatform, String>(either_success.split().0)
-            .to_boxed()
-        }
-        Err(Either::A((failed_primary_res, _))) => {
-          debug!("primary request FAILED, aborting");
-          err::<FallibleExecuteProcessResultWithPlatform, String>(failed_primary_res).to_boxed()
-        }
-        // We handle the case of the secondary failing specially. We only want to show
-        // a failure to the user if the primary execution source fails. This maintains
-        // feel between speculation on and off states.
-        Err(Either::B((_failed_secondary_res, outstanding_primary_request))) => {
-          debug!("secondary request FAILED, waiting for primary!");
-          outstanding_primary_request
-            .then(|primary_result| {
-              if primary_result.is_ok() {
-                debug!("primary request eventually SUCCEEDED after secondary failed");
-              } else {
-                debug!("primary request eventually FAILED after secondary failed");
-              }
-              primary_result
-            })
-            .to_boxed()
+      .then(move |raced_result| {
+        // Only requests which were actually raced are recorded, to avoid a workunit per process
+        // when the primary is usually fast enough.
+        let record = move |outcome: &str| {
+          if speculated.load(Ordering::SeqCst) {
+            record_speculation(&context, outcome, &start, parent_id);
+          }
+        };
+        match raced_result {
+          Ok(Either::A((primary_res, _))) => {
+            record("primary won");
+            ok::<FallibleExecuteProcessResultWithPlatform, String>(primary_res).to_boxed()
+          }
+          Ok(Either::B((secondary_res, _))) => {
+            record("secondary won");
+            ok::<FallibleExecuteProcessResultWithPlatform, String>(secondary_res).to_boxed()
+          }
+          Err(Either::A((failed_primary_res, _))) => {
+            debug!("primary request FAILED, aborting");
+            record("primary failed");
+            err::<FallibleExecuteProcessResultWithPlatform, String>(failed_primary_res).to_boxed()
+          }
+          // We handle the case of the secondary failing specially. We only want to show
+          // a failure to the user if the primary execution source fails. This maintains
+          // feel between speculation on and off states.
+          Err(Either::B((_failed_secondary_res, outstanding_primary_request))) => {
+            debug!("secondary request FAILED, waiting for primary!");
+            outstanding_primary_request
+              .then(move |primary_result| {
+                if primary_result.is_ok() {
+                  debug!("primary request eventually SUCCEEDED after secondary failed");
+                  record("primary won after secondary failed");
+                } else {
+                  debug!("primary request eventually FAILED after secondary failed");
+                  record("primary failed after secondary failed");
+                }
+                primary_result
+              })
+              .to_boxed()
+          }
         }
       })
       .to_boxed()
   }
 }
 
+///
+/// Records the outcome of speculating on a request as a workunit spanning from the start of the
+/// request until the outcome was known.
+///
+fn record_speculation(
+  context: &Context,
+  outcome: &str,
+  start: &SystemTime,
+  parent_id: Option<String>,
+) {
+  debug!("speculation: {}", outcome);
+  context.workunit_store.add_workunit(WorkUnit::new(
+    format!("speculation: {}", outcome),
+    TimeSpan::since(start),
+    parent_id,
+  ));
+}
+
 impl CommandRunner for SpeculatingCommandRunner {
   fn extract_compatible_request(
     &self,
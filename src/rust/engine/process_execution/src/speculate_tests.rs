@@ -6,15 +6,17 @@ use crate::{
 };
 use boxfuture::{BoxFuture, Boxable};
 use bytes::Bytes;
+use concrete_time::TimeSpan;
 use futures::compat::Future01CompatExt;
 use futures::future::{FutureExt, TryFutureExt};
 use futures01::future::Future;
 use hashing::EMPTY_DIGEST;
 use parking_lot::Mutex;
 use std::sync::Arc;
-use std::time::Duration;
+use std::time::{Duration, Instant, SystemTime};
 use tokio;
 use tokio::time::delay_for;
+use workunit_store::WorkUnit;
 
 #[tokio::test]
 async fn test_no_speculation() {
@@ -97,6 +99,117 @@ async fn platform_compatible_with_both_speculates() {
   assert_eq![result.unwrap().stdout, Bytes::from("m1")]
 }
 
+#[tokio::test]
+async fn lookup_hit_runs_nothing() {
+  let (result, call_counter, _finished_counter, outcomes) =
+    run_lookup_speculation_test(0, true, 1000, 1000, 100).await;
+  assert_eq![0, *call_counter.lock()];
+  assert_eq![result.unwrap().stdout, Bytes::from("m1")];
+  assert_eq![outcomes, vec!["speculation: primary cache hit".to_owned()]];
+}
+
+#[tokio::test]
+async fn lookup_miss_speculates_immediately() {
+  let start = Instant::now();
+  let (result, call_counter, finished_counter, outcomes) =
+    run_lookup_speculation_test(0, false, 1000, 0, 500).await;
+  assert![start.elapsed() < Duration::from_millis(500)];
+  assert_eq![2, *call_counter.lock()];
+  assert_eq![1, *finished_counter.lock()];
+  assert_eq![result.unwrap().stdout, Bytes::from("m2")];
+  assert_eq![
+    outcomes,
+    vec![
+      "speculation: primary cache miss".to_owned(),
+      "run without lookup".to_owned(),
+      "speculation: secondary won".to_owned()
+    ]
+  ];
+}
+
+#[tokio::test]
+async fn slow_lookup_speculates_after_timeout() {
+  let (result, call_counter, finished_counter, outcomes) =
+    run_lookup_speculation_test(1000, true, 1000, 0, 100).await;
+  assert_eq![2, *call_counter.lock()];
+  assert_eq![1, *finished_counter.lock()];
+  assert_eq![result.unwrap().stdout, Bytes::from("m2")];
+  assert_eq![
+    outcomes,
+    vec![
+      "speculation: primary cache lookup timed out".to_owned(),
+      "speculation: secondary won".to_owned()
+    ]
+  ];
+}
+
+#[tokio::test]
+async fn lookup_miss_primary_still_wins() {
+  let (result, call_counter, finished_counter, outcomes) =
+    run_lookup_speculation_test(0, false, 0, 1000, 500).await;
+  assert_eq![2, *call_counter.lock()];
+  assert_eq![1, *finished_counter.lock()];
+  assert_eq![result.unwrap().stdout, Bytes::from("m1")];
+  assert_eq![
+    outcomes,
+    vec![
+      "speculation: primary cache miss".to_owned(),
+      "run without lookup".to_owned(),
+      "speculation: primary won".to_owned()
+    ]
+  ];
+}
+
+async fn run_lookup_speculation_test(
+  lookup_latency_ms: u64,
+  lookup_is_hit: bool,
+  r1_latency_ms: u64,
+  r2_latency_ms: u64,
+  speculation_delay_ms: u64,
+) -> (
+  Result<FallibleExecuteProcessResultWithPlatform, String>,
+  Arc<Mutex<u32>>,
+  Arc<Mutex<u32>>,
+  Vec<String>,
+) {
+  let execute_request = echo_foo_request();
+  let context = Context::default();
+  let call_counter = Arc::new(Mutex::new(0));
+  let finished_counter = Arc::new(Mutex::new(0));
+  let runner = SpeculatingCommandRunner::new(
+    Box::new(
+      make_delayed_command_runner(
+        "m1".into(),
+        r1_latency_ms,
+        false,
+        true,
+        call_counter.clone(),
+        finished_counter.clone(),
+      )
+      .with_lookup(Duration::from_millis(lookup_latency_ms), lookup_is_hit),
+    ),
+    Box::new(make_delayed_command_runner(
+      "m2".into(),
+      r2_latency_ms,
+      false,
+      true,
+      call_counter.clone(),
+      finished_counter.clone(),
+    )),
+    Duration::from_millis(speculation_delay_ms),
+  );
+  let result = runner.run(execute_request, context.clone()).compat().await;
+  let outcomes = context
+    .workunit_store
+    .get_workunits()
+    .lock()
+    .workunits
+    .iter()
+    .map(|workunit| workunit.name.clone())
+    .collect();
+  (result, call_counter, finished_counter, outcomes)
+}
+
 async fn run_speculation_test(
   r1_latency_ms: u64,
   r2_latency_ms: u64,
@@ -178,6 +291,8 @@ struct DelayedCommandRunner {
   is_compatible: bool,
   call_counter: Arc<Mutex<u32>>,
   finished_counter: Arc<Mutex<u32>>,
+  // The latency of a lookup, and whether it finds the result.
+  lookup: Option<(Duration, bool)>,
 }
 
 impl DelayedCommandRunner {
@@ -194,6 +309,13 @@ impl DelayedCommandRunner {
       is_compatible,
       call_counter,
       finished_counter,
+      lookup: None,
+    }
+  }
+  pub fn with_lookup(self, delay: Duration, is_hit: bool) -> DelayedCommandRunner {
+    DelayedCommandRunner {
+      lookup: Some((delay, is_hit)),
+      ..self
     }
   }
   fn incr_call_counter(&self) {
@@ -228,6 +350,40 @@ impl CommandRunner for DelayedCommandRunner {
       .to_boxed()
   }
 
+  // Runs without a lookup are recorded as workunits, so that they show up in the outcomes.
+  fn run_without_lookup(
+    &self,
+    req: MultiPlatformExecuteProcessRequest,
+    context: Context,
+  ) -> BoxFuture<FallibleExecuteProcessResultWithPlatform, String> {
+    context.workunit_store.add_workunit(WorkUnit::new(
+      "run without lookup".to_owned(),
+      TimeSpan::since(&SystemTime::now()),
+      None,
+    ));
+    self.run(req, context)
+  }
+
+  fn lookup(
+    &self,
+    _req: &MultiPlatformExecuteProcessRequest,
+    _context: Context,
+  ) -> Option<BoxFuture<Option<FallibleExecuteProcessResultWithPlatform>, String>> {
+    let (delay, is_hit) = self.lookup?;
+    let result = self.result.clone();
+    Some(
+      delay_for(delay)
+        .unit_error()
+        .compat()
+        .then(move |delay_res| match delay_res {
+          Ok(_) if is_hit => result.map(Some),
+          Ok(_) => Ok(None),
+          Err(_) => Err(String::from("Timer failed during testing")),
+        })
+        .to_boxed(),
+    )
+  }
+
   fn extract_compatible_request(
     &self,
     req: &MultiPlatformExecuteProcessRequest,
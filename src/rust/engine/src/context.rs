@@ -67,6 +67,7 @@ impl Core {
     ignore_patterns: &[String],
     local_store_dir: PathBuf,
     remote_execution: bool,
+    remote_cache_only: bool,
     remote_store_servers: Vec<String>,
     remote_execution_server: Option<String>,
     remote_execution_process_cache_namespace: Option<String>,
@@ -92,6 +93,7 @@ impl Core {
     // Randomize CAS address order to avoid thundering herds from common config.
     let mut remote_store_servers = remote_store_servers;
     remote_store_servers.shuffle(&mut rand::thread_rng());
+    let remote_cache_server = remote_store_servers.first().cloned();
 
     let runtime = Builder::new()
       // This use of Builder (rather than just Runtime::new()) is to allow us to lower the
@@ -129,7 +131,7 @@ impl Core {
     let store = safe_create_dir_all_ioerror(&local_store_dir)
       .map_err(|e| format!("Error making directory {:?}: {:?}", local_store_dir, e))
       .and_then(|()| {
-        if !remote_execution || remote_store_servers.is_empty() {
+        if !(remote_execution || remote_cache_only) || remote_store_servers.is_empty() {
           Store::local_only(executor.clone(), local_store_dir)
         } else {
           Store::with_remote(
@@ -219,6 +221,19 @@ impl Core {
         "none" => remote_command_runner,
         _ => unreachable!(),
       };
+    } else if remote_cache_only {
+      command_runner = Box::new(process_execution::remote_cache::CommandRunner::new(
+        command_runner.into(),
+        // No problem unwrapping here because the global options validation
+        // requires the remote_store_server be present when remote_cache_only is set.
+        &remote_cache_server.unwrap(),
+        process_execution_metadata.clone(),
+        root_ca_certs,
+        oauth_bearer_token,
+        remote_execution_headers,
+        store.clone(),
+        Platform::current()?,
+      )?);
     }
 
     if process_execution_use_local_cache {
@@ -301,10 +316,16 @@ impl Context {
   pub fn get<N: WrappedNode>(&self, node: N) -> BoxFuture<N::Item, Failure> {
     // TODO: Odd place for this... could do it periodically in the background?
     maybe_drop_handles();
+    let node: NodeKey = node.into();
+    if let NodeKey::Task(ref task) = node {
+      if self.session.should_profile_rules() {
+        self.session.record_rule_request(task.func());
+      }
+    }
     let result = if let Some(entry_id) = self.entry_id {
-      self.core.graph.get(entry_id, self, node.into()).to_boxed()
+      self.core.graph.get(entry_id, self, node).to_boxed()
     } else {
-      self.core.graph.create(node.into(), self).to_boxed()
+      self.core.graph.create(node, self).to_boxed()
     };
     result
       .map(|node_result| {
@@ -18,7 +18,7 @@ use futures01::future::{self, Future};
 use url::Url;
 
 use crate::context::{Context, Core};
-use crate::core::{throw, Failure, Key, Params, TypeId, Value};
+use crate::core::{throw, Failure, Function, Key, Params, TypeId, Value};
 use crate::externs;
 use crate::intrinsics;
 use crate::selectors;
@@ -771,6 +771,13 @@ pub struct Task {
 }
 
 impl Task {
+  ///
+  /// The function which implements the @rule that this Task runs.
+  ///
+  pub fn func(&self) -> Function {
+    self.task.func
+  }
+
   fn gen_get(
     context: &Context,
     params: &Params,
@@ -12,7 +12,7 @@ use futures::compat::Future01CompatExt;
 use futures01::future::{self, Future};
 
 use crate::context::{Context, Core};
-use crate::core::{Failure, Params, TypeId, Value};
+use crate::core::{Failure, Function, Params, TypeId, Value};
 use crate::nodes::{NodeKey, Select, Tracer, Visualizer};
 use crate::watch::InvalidationWatcher;
 use graph::{Graph, InvalidationResult};
@@ -50,6 +50,9 @@ struct InnerSession {
   // The unique id for this run. Used as the id of the session, and for metrics gathering purposes.
   build_id: String,
   should_report_workunits: bool,
+  // If enabled, the number of times that the result of each @rule was requested, whether or not
+  // the request was served by an existing Node.
+  rule_requests: Option<Mutex<HashMap<Function, u64>>>,
 }
 
 #[derive(Clone)]
@@ -63,6 +66,7 @@ impl Session {
     ui_worker_count: usize,
     build_id: String,
     should_report_workunits: bool,
+    should_profile_rules: bool,
   ) -> Session {
     let display = if should_render_ui && EngineDisplay::stdout_is_tty() {
       let mut display = EngineDisplay::new(0);
@@ -80,6 +84,11 @@ impl Session {
       workunit_store: WorkUnitStore::new(),
       build_id,
       should_report_workunits,
+      rule_requests: if should_profile_rules {
+        Some(Mutex::new(HashMap::new()))
+      } else {
+        None
+      },
     };
     Session(Arc::new(inner_session))
   }
@@ -110,6 +119,28 @@ impl Session {
     self.0.should_report_workunits
   }
 
+  pub fn should_profile_rules(&self) -> bool {
+    self.0.rule_requests.is_some()
+  }
+
+  pub fn record_rule_request(&self, func: Function) {
+    if let Some(ref rule_requests) = self.0.rule_requests {
+      *rule_requests.lock().entry(func).or_insert(0) += 1;
+    }
+  }
+
+  ///
+  /// The number of times that the result of each @rule was requested in this Session, if rule
+  /// profiling is enabled.
+  ///
+  pub fn rule_requests(&self) -> Option<HashMap<Function, u64>> {
+    self
+      .0
+      .rule_requests
+      .as_ref()
+      .map(|rule_requests| rule_requests.lock().clone())
+  }
+
   pub fn workunit_store(&self) -> WorkUnitStore {
     self.0.workunit_store.clone()
   }
@@ -37,7 +37,10 @@ fn main() -> Result<(), String> {
   let mut stdin = io::stdin();
 
   let matches = &App::new("local_cas")
-    .about("An in-memory implementation of a CAS, to test remote execution utilities.")
+    .about(
+      "An in-memory implementation of a CAS and ActionCache, to test remote execution and remote \
+       caching utilities.",
+    )
     .arg(
       Arg::with_name("port")
         .long("port")
@@ -14,11 +14,14 @@ use testutil::data::{TestData, TestDirectory};
 /// Implements the ContentAddressableStorage gRPC API, answering read requests with either known
 /// content, NotFound for valid but unknown content, or InvalidArguments for bad arguments.
 ///
+/// Also implements the ActionCache gRPC API, storing ActionResults in memory.
+///
 pub struct StubCAS {
   server_transport: grpcio::Server,
   read_request_count: Arc<Mutex<usize>>,
   pub write_message_sizes: Arc<Mutex<Vec<usize>>>,
   pub blobs: Arc<Mutex<HashMap<Fingerprint, Bytes>>>,
+  pub action_results: Arc<Mutex<HashMap<Digest, bazel_protos::remote_execution::ActionResult>>>,
 }
 
 pub struct StubCASBuilder {
@@ -136,10 +139,12 @@ impl StubCAS {
     let read_request_count = Arc::new(Mutex::new(0));
     let write_message_sizes = Arc::new(Mutex::new(Vec::new()));
     let blobs = Arc::new(Mutex::new(blobs));
+    let action_results = Arc::new(Mutex::new(HashMap::new()));
     let responder = StubCASResponder {
       chunk_size_bytes: chunk_size_bytes,
       instance_name: instance_name,
       blobs: blobs.clone(),
+      action_results: action_results.clone(),
       always_errors: always_errors,
       read_request_count: read_request_count.clone(),
       write_message_sizes: write_message_sizes.clone(),
@@ -150,8 +155,13 @@ impl StubCAS {
         responder.clone(),
       ))
       .register_service(
-        bazel_protos::remote_execution_grpc::create_content_addressable_storage(responder),
+        bazel_protos::remote_execution_grpc::create_content_addressable_storage(
+          responder.clone(),
+        ),
       )
+      .register_service(bazel_protos::remote_execution_grpc::create_action_cache(
+        responder,
+      ))
       .bind("localhost", port)
       .build()
       .unwrap();
@@ -162,6 +172,7 @@ impl StubCAS {
       read_request_count,
       write_message_sizes,
       blobs,
+      action_results,
     }
   }
 
@@ -191,6 +202,7 @@ pub struct StubCASResponder {
   chunk_size_bytes: usize,
   instance_name: Option<String>,
   blobs: Arc<Mutex<HashMap<Fingerprint, Bytes>>>,
+  action_results: Arc<Mutex<HashMap<Digest, bazel_protos::remote_execution::ActionResult>>>,
   always_errors: bool,
   required_auth_header: Option<String>,
   pub read_request_count: Arc<Mutex<usize>>,
@@ -534,3 +546,90 @@ impl bazel_protos::remote_execution_grpc::ContentAddressableStorage for StubCASR
     unimplemented!()
   }
 }
+
+impl StubCASResponder {
+  ///
+  /// Checks the common fields of ActionCache requests, returning the Digest of the Action.
+  ///
+  fn action_digest(
+    &self,
+    instance_name: &str,
+    action_digest: &bazel_protos::remote_execution::Digest,
+  ) -> Result<Digest, grpcio::RpcStatus> {
+    if self.always_errors {
+      return Err(grpcio::RpcStatus::new(
+        grpcio::RpcStatusCode::INTERNAL,
+        Some("StubCAS is configured to always fail".to_owned()),
+      ));
+    }
+    if instance_name != self.instance_name() {
+      return Err(grpcio::RpcStatus::new(
+        grpcio::RpcStatusCode::NOT_FOUND,
+        Some(format!(
+          "Wrong instance_name; want {:?} got {:?}",
+          self.instance_name(),
+          instance_name
+        )),
+      ));
+    }
+    let digest: Result<Digest, String> = action_digest.into();
+    digest.map_err(|err| {
+      grpcio::RpcStatus::new(
+        grpcio::RpcStatusCode::INVALID_ARGUMENT,
+        Some(format!("Bad action digest: {}", err)),
+      )
+    })
+  }
+}
+
+impl bazel_protos::remote_execution_grpc::ActionCache for StubCASResponder {
+  fn get_action_result(
+    &self,
+    ctx: grpcio::RpcContext<'_>,
+    req: bazel_protos::remote_execution::GetActionResultRequest,
+    sink: grpcio::UnarySink<bazel_protos::remote_execution::ActionResult>,
+  ) {
+    check_auth!(self, ctx, sink);
+
+    let result = self
+      .action_digest(req.get_instance_name(), req.get_action_digest())
+      .and_then(|action_digest| {
+        self
+          .action_results
+          .lock()
+          .get(&action_digest)
+          .cloned()
+          .ok_or_else(|| {
+            grpcio::RpcStatus::new(
+              grpcio::RpcStatusCode::NOT_FOUND,
+              Some(format!("Did not find action result for {:?}", action_digest)),
+            )
+          })
+      });
+    match result {
+      Ok(action_result) => sink.success(action_result),
+      Err(err) => sink.fail(err),
+    };
+  }
+
+  fn update_action_result(
+    &self,
+    ctx: grpcio::RpcContext<'_>,
+    req: bazel_protos::remote_execution::UpdateActionResultRequest,
+    sink: grpcio::UnarySink<bazel_protos::remote_execution::ActionResult>,
+  ) {
+    check_auth!(self, ctx, sink);
+
+    match self.action_digest(req.get_instance_name(), req.get_action_digest()) {
+      Ok(action_digest) => {
+        let action_result = req.get_action_result().clone();
+        self
+          .action_results
+          .lock()
+          .insert(action_digest, action_result.clone());
+        sink.success(action_result)
+      }
+      Err(err) => sink.fail(err),
+    };
+  }
+}
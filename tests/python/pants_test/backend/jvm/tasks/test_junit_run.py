@@ -23,6 +23,7 @@ from pants.build_graph.files import Files
 from pants.build_graph.resources import Resources
 from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import SubprocessExecutor
+from pants.java.junit.junit_xml_parser import Test as JUnitTest
 from pants.testutil.jvm.jvm_tool_task_test_base import JvmToolTaskTestBase
 from pants.testutil.subsystem.util import global_subsystem_instance, init_subsystem
 from pants.testutil.task_test_base import ensure_cached
@@ -748,3 +749,25 @@ class JUnitRunnerTest(JvmToolTaskTestBase):
         with self.assertRaises(CodeCoverage.InvalidCoverageEngine):
             with self._coverage_engine():
                 self.fail("We should never get here.")
+
+    def test_balance_batches(self):
+        tests = [JUnitTest(f"org.pantsbuild.Test{i}") for i in range(6)]
+        durations = {
+            "org.pantsbuild.Test0": 10.0,
+            "org.pantsbuild.Test1": 1.0,
+            "org.pantsbuild.Test2": 6.0,
+            "org.pantsbuild.Test3": 5.0,
+            "org.pantsbuild.Test4": 1.0,
+        }
+        # Test5 has no recorded duration, and so is assumed to take the average of 4.6 seconds.
+        batches = JUnitRun._balance_batches(tests, durations, batch_size=3)
+        self.assertEqual(
+            [[tests[0], tests[4], tests[5]], [tests[1], tests[2], tests[3]]], batches,
+        )
+
+    def test_balance_batches_respects_batch_size(self):
+        tests = [JUnitTest(f"org.pantsbuild.Test{i}") for i in range(5)]
+        durations = {test.classname: 1.0 for test in tests}
+        durations["org.pantsbuild.Test0"] = 100.0
+        batches = JUnitRun._balance_batches(tests, durations, batch_size=2)
+        self.assertEqual([[tests[0]], [tests[1], tests[3]], [tests[2], tests[4]]], batches)
@@ -15,8 +15,8 @@ class SourceMapperTest(TestBase):
     def alias_groups(cls):
         return BuildFileAliases(targets={"java_library": JavaLibrary})
 
-    def owner(self, owner, f):
-        request = OwnersRequest(sources=(f,))
+    def owner(self, owner, *files):
+        request = OwnersRequest(sources=files)
         owners = self.request_single_product(Owners, request)
         self.assertEqual(set(owner), {i.spec for i in owners.addresses})
 
@@ -108,3 +108,34 @@ class SourceMapperTest(TestBase):
         self.owner(["//:top", "text/common/const:const"], "text/common/const/emoji.py")
         self.owner(["//:top"], "foo.py")
         self.owner([], "bar.py")
+
+    def test_globs(self):
+        self.add_to_build_file(
+            "src",
+            dedent(
+                """
+                java_library(name='all', sources=['**/*.py', '!gen/*.py'])
+                java_library(name='gen', sources=['gen/*.py'])
+                """
+            ),
+        )
+        self.create_files("src/gen", ["a.py"])
+        self.create_files("src/lib", ["b.py", "c.txt"])
+
+        self.owner(["src:all"], "src/lib/b.py")
+        self.owner(["src:gen"], "src/gen/a.py")
+        self.owner([], "src/lib/c.txt")
+        # Deleted files are matched against the globs.
+        self.owner(["src:all"], "src/lib/deleted.py")
+
+    def test_multiple_sources(self):
+        self.create_library(
+            path="lib", target_type="java_library", name="lib", sources=["a.py", "rpc/net.py"]
+        )
+        self.create_library(
+            path="lib/rpc", target_type="java_library", name="rpc", sources=["err.py"]
+        )
+        self.create_library(path="other", target_type="java_library", name="other", sources=[])
+
+        self.owner(["lib:lib", "lib/rpc:rpc"], "lib/a.py", "lib/rpc/err.py", "unowned.py")
+        self.owner(["lib:lib", "other:other"], "lib/rpc/net.py", "other/BUILD")
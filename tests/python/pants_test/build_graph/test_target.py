@@ -178,9 +178,44 @@ class TargetTest(TestBase):
         target_b = self.make_target("b", Target, dependencies=[target_a])
         self.make_target("c", Target, dependencies=[target_b])
         target_a.inject_dependency(Address.parse("c"))
-        with self.assertRaises(Target.RecursiveDepthError):
+        with self.assertRaisesRegex(Target.RecursiveDepthError, "a:a -> c:c -> b:b -> a:a"):
             target_a.transitive_invalidation_hash()
 
+    def test_deep_transitive_invalidation_hash(self):
+        # Deeper than the interpreter's recursion limit.
+        targets = [self.make_target("dep0", Target)]
+        for i in range(1, 2000):
+            targets.append(self.make_target(f"dep{i}", Target, dependencies=[targets[-1]]))
+        root_hash = targets[-1].transitive_invalidation_hash()
+        self.assertIsNotNone(root_hash)
+
+        # Each target was hashed once, in the same walk as the root.
+        for target in targets:
+            self.assertIn(
+                DefaultFingerprintStrategy(), target._cached_all_transitive_fingerprint_map
+            )
+        self.assertEqual(root_hash, targets[-1].transitive_invalidation_hash())
+
+    def test_compute_transitive_invalidation_hashes(self):
+        target_a = self.make_target("a", Target)
+        target_b = self.make_target("b", Target, dependencies=[target_a])
+        target_c = self.make_target("c", Target, dependencies=[target_a, target_b])
+
+        Target.compute_transitive_invalidation_hashes([target_b, target_c])
+        expected = {
+            target: target.transitive_invalidation_hash()
+            for target in (target_a, target_b, target_c)
+        }
+        for target in expected:
+            target.mark_transitive_invalidation_hash_dirty()
+        self.assertEqual(
+            expected,
+            {
+                target: target.transitive_invalidation_hash()
+                for target in (target_c, target_b, target_a)
+            },
+        )
+
     def test_transitive_invalidation_hash(self):
         target_a = self.make_target("a", Target)
         target_b = self.make_target("b", Target, dependencies=[target_a])
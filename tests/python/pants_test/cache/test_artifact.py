@@ -4,10 +4,17 @@
 import os
 import unittest
 
-from pants.cache.artifact import ArtifactError, DirectoryArtifact, TarballArtifact
+from pants.cache.artifact import (
+    ArtifactError,
+    BlobStore,
+    DirectoryArtifact,
+    ManifestArtifact,
+    TarballArtifact,
+)
+from pants.cache.artifact_codec import CODECS, detect_codec_for_file
 from pants.testutil.test_base import TestBase
-from pants.util.contextutil import temporary_dir
-from pants.util.dirutil import safe_mkdir, safe_open
+from pants.util.contextutil import open_tar, temporary_dir
+from pants.util.dirutil import safe_mkdir, safe_open, safe_rmtree
 
 
 class TarballArtifactTest(TestBase):
@@ -81,6 +88,24 @@ class TarballArtifactTest(TestBase):
             f.write(content)
         return path
 
+    def test_collect_and_extract_with_codecs(self):
+        for codec in CODECS.values():
+            with temporary_dir() as tmpdir:
+                artifact_root = os.path.join(tmpdir, "artifacts")
+                cache_root = os.path.join(tmpdir, "cache")
+                safe_mkdir(cache_root)
+
+                file_path = self.touch_file_in(artifact_root)
+                tarball = os.path.join(cache_root, "some.tar")
+
+                artifact = TarballArtifact(artifact_root, artifact_root, tarball, codec=codec)
+                artifact.collect([file_path])
+                self.assertIs(codec, detect_codec_for_file(tarball))
+
+                os.unlink(file_path)
+                artifact.extract()
+                self.assertTrue(os.path.isfile(file_path))
+
 
 class DirectoryArtifactTest(unittest.TestCase):
     def test_exists_when_dir_exists(self):
@@ -101,3 +126,106 @@ class DirectoryArtifactTest(unittest.TestCase):
 
             artifact = DirectoryArtifact(artifact_root, artifact_dir)
             self.assertFalse(artifact.exists())
+
+
+class ManifestArtifactTest(unittest.TestCase):
+    def test_collect_and_extract(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            blob_store = BlobStore(os.path.join(tmpdir, "blobs"))
+            manifest = os.path.join(tmpdir, "cache", "some.manifest")
+
+            with safe_open(os.path.join(artifact_root, "dir", "a.txt"), "w") as fp:
+                fp.write("same")
+            with safe_open(os.path.join(artifact_root, "dir", "b.txt"), "w") as fp:
+                fp.write("same")
+
+            artifact = ManifestArtifact(artifact_root, artifact_root, manifest, blob_store)
+            artifact.collect([os.path.join(artifact_root, "dir")])
+            self.assertTrue(artifact.exists())
+
+            safe_rmtree(artifact_root)
+            artifact.extract()
+            for name in ("a.txt", "b.txt"):
+                with open(os.path.join(artifact_root, "dir", name)) as fp:
+                    self.assertEqual("same", fp.read())
+
+    def test_collect_from_tarball(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            blob_store = BlobStore(os.path.join(tmpdir, "blobs"))
+            tarball = os.path.join(tmpdir, "some.tar")
+            with safe_open(os.path.join(artifact_root, "a.txt"), "w") as fp:
+                fp.write("content")
+            with open_tar(tarball, "w:gz") as tar:
+                tar.add(os.path.join(artifact_root, "a.txt"), "a.txt")
+
+            manifest = os.path.join(tmpdir, "some.manifest")
+            artifact = ManifestArtifact(artifact_root, artifact_root, manifest, blob_store)
+            artifact.collect_from_tarball(tarball)
+
+            safe_rmtree(artifact_root)
+            artifact.extract()
+            with open(os.path.join(artifact_root, "a.txt")) as fp:
+                self.assertEqual("content", fp.read())
+
+    def test_extract_rejects_escaping_paths(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            blob_store = BlobStore(os.path.join(tmpdir, "blobs"))
+            tarball = os.path.join(tmpdir, "some.tar")
+            with safe_open(os.path.join(tmpdir, "evil.txt"), "w") as fp:
+                fp.write("content")
+            with open_tar(tarball, "w") as tar:
+                tar.add(os.path.join(tmpdir, "evil.txt"), "../evil.txt")
+
+            manifest = os.path.join(tmpdir, "some.manifest")
+            artifact = ManifestArtifact(artifact_root, artifact_root, manifest, blob_store)
+            with self.assertRaises(ArtifactError):
+                artifact.collect_from_tarball(tarball)
+
+
+class BlobStoreTest(unittest.TestCase):
+    def test_collect_garbage(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            blob_store = BlobStore(os.path.join(tmpdir, "blobs"))
+            with safe_open(os.path.join(artifact_root, "live.txt"), "w") as fp:
+                fp.write("live")
+            with safe_open(os.path.join(artifact_root, "dead.txt"), "w") as fp:
+                fp.write("dead")
+            manifest = os.path.join(tmpdir, "some.manifest")
+            artifact = ManifestArtifact(artifact_root, artifact_root, manifest, blob_store)
+            artifact.collect([os.path.join(artifact_root, "live.txt")])
+            dead_digest = blob_store.store_file(os.path.join(artifact_root, "dead.txt"))
+
+            live_digests = ManifestArtifact.referenced_digests(manifest)
+            self.assertEqual(1, len(live_digests))
+            self.assertTrue(blob_store.collection_due(60))
+            self.assertEqual(4, blob_store.collect_garbage(lambda: live_digests))
+            self.assertFalse(blob_store.collection_due(60))
+            self.assertFalse(blob_store.has(dead_digest))
+            self.assertTrue(all(blob_store.has(digest) for digest in live_digests))
+
+            safe_rmtree(artifact_root)
+            artifact.extract()
+            with open(os.path.join(artifact_root, "live.txt")) as fp:
+                self.assertEqual("live", fp.read())
+
+    def test_collect_garbage_skipped_while_referencing(self):
+        with temporary_dir() as tmpdir:
+            blob_store = BlobStore(os.path.join(tmpdir, "blobs"))
+            with safe_open(os.path.join(tmpdir, "a.txt"), "w") as fp:
+                fp.write("content")
+            with blob_store.referencing():
+                digest = blob_store.store_file(os.path.join(tmpdir, "a.txt"))
+                self.assertIsNone(blob_store.collect_garbage(set))
+            self.assertTrue(blob_store.has(digest))
+            self.assertEqual(7, blob_store.collect_garbage(set))
+            self.assertFalse(blob_store.has(digest))
+
+    def test_referenced_digests_of_missing_manifest(self):
+        with temporary_dir() as tmpdir:
+            self.assertEqual(
+                set(), ManifestArtifact.referenced_digests(os.path.join(tmpdir, "missing"))
+            )
@@ -3,26 +3,31 @@
 
 import logging
 import os
+import time
 import unittest.mock
 from contextlib import contextmanager
 from typing import Iterator
 
 import pytest
 
-from pants.cache.artifact import TarballArtifact
+from pants.cache.artifact import ArtifactError, TarballArtifact
 from pants.cache.artifact_cache import (
     NonfatalArtifactCacheError,
     call_insert,
     call_use_cached_files,
 )
-from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+    TempLocalArtifactCache,
+)
 from pants.cache.pinger import BestUrlSelector, InvalidRESTfulCacheProtoError
 from pants.cache.restful_artifact_cache import RequestsSession, RESTfulArtifactCache
 from pants.invalidation.build_invalidator import CacheKey
 from pants.testutil.subsystem.util import init_subsystems
 from pants.testutil.test_base import TestBase
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import safe_mkdir, safe_rmtree
 from pants.util.meta import classproperty
 from pants_test.cache.cache_server import cache_server
 
@@ -36,7 +41,7 @@ class TestArtifactCache(TestBase):
         return super().subsystems + (RequestsSession.Factory,)
 
     @contextmanager
-    def setup_local_cache(self, seperate_extraction_root=False):
+    def setup_local_cache(self, seperate_extraction_root=False, stream_extraction=False):
         with temporary_dir() as artifact_root:
             with temporary_dir() as artifact_extraction_root:
                 with temporary_dir() as cache_root:
@@ -44,9 +49,26 @@ class TestArtifactCache(TestBase):
                         artifact_extraction_root if seperate_extraction_root else artifact_root
                     )
                     yield LocalArtifactCache(
-                        artifact_root, extraction_root, cache_root, compression=1
+                        artifact_root,
+                        extraction_root,
+                        cache_root,
+                        compression=1,
+                        stream_extraction=stream_extraction,
                     )
 
+    @contextmanager
+    def setup_content_addressed_cache(self, hardlink=False):
+        with temporary_dir() as artifact_root:
+            with temporary_dir() as cache_root:
+                yield ContentAddressedLocalArtifactCache(
+                    artifact_root,
+                    artifact_root,
+                    os.path.join(cache_root, "task"),
+                    os.path.join(cache_root, "blobs"),
+                    compression=1,
+                    hardlink=hardlink,
+                )
+
     @contextmanager
     def setup_server(self, return_failed=False, cache_root=None):
         with cache_server(return_failed=return_failed, cache_root=cache_root) as server:
@@ -99,6 +121,85 @@ class TestArtifactCache(TestBase):
         with self.setup_local_cache(seperate_extraction_root=True) as artifact_cache:
             self.do_test_artifact_cache(artifact_cache)
 
+    def test_content_addressed_cache(self):
+        with self.setup_content_addressed_cache() as artifact_cache:
+            self.do_test_artifact_cache(artifact_cache)
+
+    def test_content_addressed_cache_hardlink(self):
+        with self.setup_content_addressed_cache(hardlink=True) as artifact_cache:
+            self.do_test_artifact_cache(artifact_cache)
+
+    def test_content_addressed_cache_shares_blobs(self):
+        with self.setup_content_addressed_cache() as artifact_cache:
+            blob_root = artifact_cache._blob_store._root
+            with self.setup_test_file(artifact_cache.artifact_root) as path1:
+                with self.setup_test_file(artifact_cache.artifact_root) as path2:
+                    artifact_cache.insert(CacheKey("key1", "fake_hash"), [path1])
+                    artifact_cache.insert(CacheKey("key2", "fake_hash"), [path2])
+
+            # Both files had the same content, and so should be stored as a single blob.
+            blobs = [f for _, _, files in os.walk(blob_root) for f in files]
+            self.assertEqual(1, len(blobs))
+
+            # But each key should still extract its own file.
+            self.assertTrue(artifact_cache.use_cached_files(CacheKey("key1", "fake_hash")))
+            self.assertTrue(artifact_cache.use_cached_files(CacheKey("key2", "fake_hash")))
+            self.assertTrue(os.path.exists(path1))
+            self.assertTrue(os.path.exists(path2))
+
+    def test_content_addressed_cache_collects_unreferenced_blobs(self):
+        with self.setup_content_addressed_cache() as artifact_cache:
+            blob_root = artifact_cache._blob_store._root
+            key1 = CacheKey("key1", "fake_hash")
+            with self.setup_test_file(artifact_cache.artifact_root) as path:
+                artifact_cache.insert(key1, [path])
+                with open(path, "wb") as fp:
+                    fp.write(TEST_CONTENT2)
+                artifact_cache.insert(CacheKey("key2", "fake_hash"), [path])
+            artifact_cache.delete(key1)
+
+            with unittest.mock.patch.object(
+                ContentAddressedLocalArtifactCache, "_BLOB_COLLECTION_INTERVAL_SECS", 0
+            ):
+                artifact_cache._maybe_collect_blob_garbage()
+
+            # Only the blob of the remaining manifest should be retained.
+            blobs = [f for _, _, files in os.walk(blob_root) for f in files if f[0] != "."]
+            self.assertEqual(1, len(blobs))
+            self.assertTrue(artifact_cache.use_cached_files(CacheKey("key2", "fake_hash")))
+
+    def test_content_addressed_cache_missing_blob(self):
+        key = CacheKey("muppet_key", "fake_hash")
+        with self.setup_content_addressed_cache() as artifact_cache:
+            with self.setup_test_file(artifact_cache.artifact_root) as path:
+                artifact_cache.insert(key, [path])
+            safe_rmtree(artifact_cache._blob_store._root)
+
+            self.assertFalse(artifact_cache.use_cached_files(key))
+            self.assertFalse(artifact_cache.has(key))
+
+    def test_content_addressed_local_backed_remote_cache(self):
+        with self.setup_server() as server:
+            with self.setup_content_addressed_cache() as local:
+                tmp = TempLocalArtifactCache(
+                    local.artifact_root, local.artifact_extraction_root, compression=1
+                )
+                remote = RESTfulArtifactCache(local.artifact_root, BestUrlSelector([server.url]), tmp)
+                combined = RESTfulArtifactCache(
+                    local.artifact_root, BestUrlSelector([server.url]), local
+                )
+                key = CacheKey("muppet_key", "fake_hash")
+
+                with self.setup_test_file(local.artifact_root) as path:
+                    remote.insert(key, [path])
+                    os.unlink(path)
+
+                    # Reading through the combined cache should backfill the content-addressed cache.
+                    self.assertTrue(bool(combined.use_cached_files(key)))
+                    self.assertTrue(local.has(key))
+                    with open(path, "rb") as infile:
+                        self.assertEqual(TEST_CONTENT1, infile.read())
+
     @pytest.mark.skip(reason="flaky: https://github.com/pantsbuild/pants/issues/6838")
     def test_restful_cache(self):
         with self.assertRaises(InvalidRESTfulCacheProtoError):
@@ -256,6 +357,40 @@ class TestArtifactCache(TestBase):
                 call_insert((cache, key, [path], False))
                 self.assertTrue(call_use_cached_files((cache, key, None)))
 
+    def test_restful_cache_bulk_requests(self):
+        keys = [CacheKey("muppet_key{}".format(i), "fake_hash") for i in range(4)]
+
+        with self.setup_rest_cache() as cache:
+            self.assertTrue(cache.supports_bulk_requests)
+            self.assertEqual([False] * 4, cache.has_many(keys))
+            results = cache.fetch_many([(key, None) for key in keys])
+            self.assertEqual([False] * 4, [bool(r) for r in results])
+
+            with self.setup_test_file(cache.artifact_root) as path:
+                for key in keys[:2]:
+                    cache.insert(key, [path])
+
+            self.assertEqual([True, True, False, False], cache.has_many(keys))
+            results = cache.fetch_many([(key, None) for key in keys])
+            self.assertEqual([True, True, False, False], [bool(r) for r in results])
+
+    def test_restful_cache_bulk_requests_failed(self):
+        keys = [CacheKey("muppet_key{}".format(i), "fake_hash") for i in range(4)]
+
+        # Failed requests should be reported as misses, but not raise exceptions.
+        with self.setup_rest_cache(return_failed=True) as cache:
+            self.assertEqual([False] * 4, cache.has_many(keys))
+            results = cache.fetch_many([(key, None) for key in keys])
+            self.assertEqual([False] * 4, [bool(r) for r in results])
+
+    def test_restful_cache_bulk_requests_interrupted(self):
+        with self.setup_rest_cache() as cache:
+            with unittest.mock.patch(
+                "multiprocessing.pool.ApplyResult.wait", side_effect=KeyboardInterrupt
+            ):
+                with self.assertRaises(KeyboardInterrupt):
+                    cache._map_concurrently(lambda _: time.sleep(0.1), [1, 2])
+
     def test_failed_multiproc(self):
         key = CacheKey("muppet_key", "fake_hash")
 
@@ -335,6 +470,62 @@ class TestArtifactCache(TestBase):
                     self.assertFalse(call_use_cached_files((cache, key, results_dir)))
                     self.assertTrue(os.path.exists(canary))
 
+    def _artifact_chunks(self, artifact_cache, key, path, chunk_size=7):
+        with artifact_cache.insert_paths(key, [path]) as tarball:
+            with open(tarball, "rb") as infile:
+                content = infile.read()
+        artifact_cache.delete(key)
+        return [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def test_stream_extraction(self):
+        key = CacheKey("muppet_key", "fake_hash")
+        with self.setup_local_cache(stream_extraction=True) as artifact_cache:
+            with self.setup_test_file(artifact_cache.artifact_root) as path:
+                chunks = self._artifact_chunks(artifact_cache, key, path)
+                os.unlink(path)
+
+                results_dir = os.path.join(artifact_cache.artifact_root, "results")
+                self.assertTrue(
+                    artifact_cache.store_and_use_artifact(key, iter(chunks), results_dir)
+                )
+                with open(path, "rb") as infile:
+                    self.assertEqual(TEST_CONTENT1, infile.read())
+
+                # The complete artifact should have been stored in the local cache as well.
+                self.assertTrue(artifact_cache.has(key))
+                os.unlink(path)
+                self.assertTrue(artifact_cache.use_cached_files(key))
+                self.assertTrue(os.path.exists(path))
+
+    def test_stream_extraction_without_local_storage(self):
+        key = CacheKey("muppet_key", "fake_hash")
+        with temporary_dir() as artifact_root:
+            artifact_cache = TempLocalArtifactCache(
+                artifact_root, artifact_root, compression=1, stream_extraction=True
+            )
+            with self.setup_test_file(artifact_root) as path:
+                chunks = self._artifact_chunks(artifact_cache, key, path)
+                os.unlink(path)
+                self.assertTrue(artifact_cache.store_and_use_artifact(key, iter(chunks)))
+                with open(path, "rb") as infile:
+                    self.assertEqual(TEST_CONTENT1, infile.read())
+
+    def test_stream_extraction_corrupt_artifact(self):
+        key = CacheKey("muppet_key", "fake_hash")
+        with self.setup_local_cache(stream_extraction=True) as artifact_cache:
+            results_dir = os.path.join(artifact_cache.artifact_root, "a/sub/dir")
+            safe_mkdir(results_dir)
+            with self.setup_test_file(results_dir) as path:
+                chunks = self._artifact_chunks(artifact_cache, key, path)
+                truncated = chunks[: len(chunks) // 2]
+
+                with self.assertRaises(ArtifactError):
+                    artifact_cache.store_and_use_artifact(key, iter(truncated), results_dir)
+
+                # Nothing should have been stored, and the results_dir should be empty.
+                self.assertFalse(artifact_cache.has(key))
+                self.assertEqual([], os.listdir(results_dir))
+
     def test_corrupted_cached_file_cleaned_up(self):
         key = CacheKey("muppet_key", "fake_hash")
 
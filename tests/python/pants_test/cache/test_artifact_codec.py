@@ -0,0 +1,62 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import io
+import os
+import unittest
+
+from pants.cache.artifact_codec import (
+    CODECS,
+    GZIP,
+    LZ4,
+    ZSTD,
+    ArtifactCodecError,
+    codec_named,
+    detect_codec,
+    detect_codec_for_file,
+    open_tarball_for_read,
+    open_tarball_for_write,
+)
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class ArtifactCodecTest(unittest.TestCase):
+    def test_codec_named(self):
+        self.assertIs(GZIP, codec_named("gzip"))
+        self.assertIs(ZSTD, codec_named("zstd"))
+        self.assertIs(LZ4, codec_named("lz4"))
+        with self.assertRaises(ArtifactCodecError):
+            codec_named("bzip2")
+
+    def test_clamp_level(self):
+        self.assertEqual(9, GZIP.clamp_level(19))
+        self.assertEqual(19, ZSTD.clamp_level(19))
+        self.assertEqual(16, LZ4.clamp_level(19))
+        self.assertEqual(1, GZIP.clamp_level(0))
+        self.assertEqual(0, LZ4.clamp_level(0))
+
+    def test_detect_codec(self):
+        for codec in CODECS.values():
+            out = io.BytesIO()
+            with codec.compressor(out, 1) as compressed:
+                compressed.write(b"some content")
+            self.assertIs(codec, detect_codec(out.getvalue()))
+        self.assertIsNone(detect_codec(b"uncompressed"))
+
+    def test_tarball_round_trip(self):
+        for codec in CODECS.values():
+            with temporary_dir() as tmpdir:
+                src = os.path.join(tmpdir, "src.txt")
+                safe_file_dump(src, "content")
+                tarball = os.path.join(tmpdir, "artifact.tar")
+                with open(tarball, "wb") as fp:
+                    with open_tarball_for_write(fp, codec, 5) as tar:
+                        tar.add(src, "a/b.txt")
+
+                self.assertIs(codec, detect_codec_for_file(tarball))
+                with open(tarball, "rb") as fp:
+                    with open_tarball_for_read(fp) as tar:
+                        member = tar.next()
+                        self.assertEqual("a/b.txt", member.name)
+                        self.assertEqual(b"content", tar.extractfile(member).read())
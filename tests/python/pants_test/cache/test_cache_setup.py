@@ -4,6 +4,7 @@
 import os
 from unittest.mock import Mock
 
+from pants.cache.artifact_codec import LZ4
 from pants.cache.cache_setup import (
     CacheFactory,
     CacheSetup,
@@ -15,7 +16,11 @@ from pants.cache.cache_setup import (
     RemoteCacheSpecRequiredError,
     TooManyCacheSpecsError,
 )
-from pants.cache.local_artifact_cache import LocalArtifactCache
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+)
+from pants.cache.local_cache_index import EvictionPolicy
 from pants.cache.resolver import Resolver
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
 from pants.subsystem.subsystem import Subsystem
@@ -84,9 +89,17 @@ class TestCacheSetup(TestBase):
             "write_to": [self.EMPTY_URI],
             "write": False,
             "compression_level": 1,
+            "max_concurrent_requests": 16,
+            "stream_remote_artifacts": False,
+            "local_codec": "gzip",
+            "remote_codec": "gzip",
             "max_entries_per_target": 1,
             "write_permissions": None,
             "dereference_symlinks": True,
+            "local_format": "tarball",
+            "hardlink_extracted_files": False,
+            "max_local_bytes": None,
+            "local_eviction_policy": EvictionPolicy.lru,
             # Usually read from global scope.
             "pants_workdir": self.pants_workdir,
         }
@@ -220,6 +233,57 @@ class TestCacheSetup(TestBase):
             with self.assertRaises(TooManyCacheSpecsError):
                 mk_cache([tmpdir, self.REMOTE_URI_1, self.REMOTE_URI_2])
 
+    def test_content_addressed_local_cache(self):
+        with temporary_dir() as tmpdir:
+            cache_factory = self.cache_factory(
+                read_from=[tmpdir], local_format="content-addressed", hardlink_extracted_files=True
+            )
+            cache = cache_factory.get_read_cache()
+            self.assertIsInstance(cache, ContentAddressedLocalArtifactCache)
+            self.assertTrue(cache._hardlink)
+            # Blobs are shared between the caches of all tasks.
+            self.assertEqual(
+                os.path.join(tmpdir, CacheFactory._BLOB_DIRNAME), cache._blob_store._root
+            )
+
+    def test_codecs(self):
+        with temporary_dir() as tmpdir:
+            local_cache = self.cache_factory(
+                read_from=[tmpdir], local_codec="lz4", remote_codec="zstd", compression_level=19
+            ).get_read_cache()
+            self.assertIs(LZ4, local_cache._codec)
+            self.assertEqual(16, local_cache._compression)
+
+    def test_compression_level_zero(self):
+        with temporary_dir() as tmpdir:
+            local_cache = self.cache_factory(
+                read_from=[tmpdir], local_codec="lz4", compression_level=0
+            ).get_read_cache()
+            self.assertEqual(0, local_cache._compression)
+            gzip_cache = self.cache_factory(
+                read_from=[tmpdir], local_codec="gzip", compression_level=0
+            ).get_read_cache()
+            self.assertEqual(1, gzip_cache._compression)
+            cache_factory = self.cache_factory(read_from=[tmpdir], compression_level=-1)
+            with self.assertRaises(ValueError):
+                cache_factory.get_read_cache()
+
+    def test_max_local_bytes(self):
+        with temporary_dir() as tmpdir:
+            cache = self.cache_factory(
+                read_from=[tmpdir], max_local_bytes=1024, local_eviction_policy=EvictionPolicy.lfu
+            ).get_read_cache()
+            self.assertEqual(os.path.join(tmpdir, ".index.sqlite"), cache._index.path)
+            self.assertEqual(1024, cache._index.max_bytes)
+
+    def test_max_local_bytes_content_addressed(self):
+        with temporary_dir() as tmpdir:
+            cache_factory = self.cache_factory(
+                read_from=[tmpdir], max_local_bytes=1024, local_format="content-addressed"
+            )
+            with self.assertRaises(ValueError):
+                cache_factory.get_read_cache()
+
     def test_read_cache_available(self):
         self.assertFalse(
             self.cache_factory(
@@ -0,0 +1,135 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import sqlite3
+import time
+import unittest
+from contextlib import contextmanager
+
+from pants.cache.local_artifact_cache import LocalArtifactCache
+from pants.cache.local_cache_index import EvictionPolicy, LocalCacheIndex
+from pants.invalidation.build_invalidator import CacheKey
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump, safe_mkdir
+
+
+class LocalCacheIndexTest(unittest.TestCase):
+    @contextmanager
+    def index(self, max_bytes, policy=EvictionPolicy.lru):
+        with temporary_dir() as cache_dir:
+            yield cache_dir, LocalCacheIndex.for_cache_dir(cache_dir, max_bytes, policy=policy)
+
+    def store(self, index, cache_dir, name, size):
+        path = os.path.join(cache_dir, name)
+        safe_file_dump(path, b"x" * size, mode="wb")
+        index.record_store(path, size)
+        # Ensure distinct access times.
+        time.sleep(0.01)
+        return path
+
+    def test_total_bytes(self):
+        with self.index(max_bytes=100) as (cache_dir, index):
+            self.assertEqual(0, index.total_bytes())
+            a = self.store(index, cache_dir, "a", 10)
+            self.store(index, cache_dir, "b", 20)
+            self.assertEqual(30, index.total_bytes())
+            index.record_removal(a)
+            self.assertEqual(20, index.total_bytes())
+
+    def test_total_bytes_restore(self):
+        with self.index(max_bytes=100) as (cache_dir, index):
+            a = self.store(index, cache_dir, "a", 10)
+            self.store(index, cache_dir, "a", 30)
+            self.assertEqual(30, index.total_bytes())
+            index.record_removal(a)
+            index.record_removal(a)
+            self.assertEqual(0, index.total_bytes())
+
+    def test_total_bytes_of_existing_index(self):
+        with self.index(max_bytes=100) as (cache_dir, index):
+            self.store(index, cache_dir, "a", 10)
+            # Simulate an index created before the total was maintained.
+            conn = sqlite3.connect(index.path)
+            with conn:
+                conn.execute("DROP TRIGGER entries_insert")
+                conn.execute("DROP TRIGGER entries_delete")
+                conn.execute("DROP TABLE total")
+            conn.close()
+
+            index = LocalCacheIndex.for_cache_dir(cache_dir, 100)
+            self.assertEqual(10, index.total_bytes())
+            self.store(index, cache_dir, "b", 20)
+            self.assertEqual(30, index.total_bytes())
+
+    def test_evict_within_budget(self):
+        with self.index(max_bytes=100) as (cache_dir, index):
+            a = self.store(index, cache_dir, "a", 50)
+            self.assertEqual([], index.evict())
+            self.assertTrue(os.path.exists(a))
+
+    def test_evict_lru(self):
+        with self.index(max_bytes=20) as (cache_dir, index):
+            a = self.store(index, cache_dir, "a", 10)
+            b = self.store(index, cache_dir, "b", 10)
+            c = self.store(index, cache_dir, "c", 10)
+            index.record_access(a)
+
+            self.assertEqual([b], index.evict())
+            self.assertFalse(os.path.exists(b))
+            self.assertTrue(os.path.exists(a))
+            self.assertTrue(os.path.exists(c))
+            self.assertEqual(20, index.total_bytes())
+
+    def test_evict_lfu(self):
+        with self.index(max_bytes=20, policy=EvictionPolicy.lfu) as (cache_dir, index):
+            a = self.store(index, cache_dir, "a", 10)
+            b = self.store(index, cache_dir, "b", 10)
+            c = self.store(index, cache_dir, "c", 10)
+            index.record_access(a)
+            index.record_access(a)
+            index.record_access(b)
+            index.record_access(c)
+            index.record_access(c)
+
+            self.assertEqual([b], index.evict())
+
+    def test_evict_limit(self):
+        with self.index(max_bytes=0) as (cache_dir, index):
+            paths = [self.store(index, cache_dir, name, 10) for name in "abc"]
+            self.assertEqual(paths[:2], index.evict(limit=2))
+            self.assertEqual(paths[2:], index.evict(limit=2))
+            self.assertEqual([], index.evict(limit=2))
+
+    def test_reconcile(self):
+        with self.index(max_bytes=100) as (cache_dir, index):
+            indexed_missing = os.path.join(cache_dir, "task", "missing")
+            index.record_store(indexed_missing, 10)
+            unindexed = os.path.join(cache_dir, "task", "unindexed")
+            safe_file_dump(unindexed, b"x" * 5, mode="wb")
+            safe_mkdir(os.path.join(cache_dir, ".blobs"))
+            safe_file_dump(os.path.join(cache_dir, ".blobs", "blob"), b"x" * 50, mode="wb")
+
+            index.reconcile(cache_dir)
+            self.assertEqual(5, index.total_bytes())
+
+    def test_local_artifact_cache(self):
+        with temporary_dir() as artifact_root, self.index(max_bytes=0) as (cache_dir, index):
+            cache = LocalArtifactCache(
+                artifact_root, artifact_root, os.path.join(cache_dir, "task"), 1, index=index
+            )
+            path = os.path.join(artifact_root, "file")
+            safe_file_dump(path, "content")
+            key = CacheKey("key", "hash")
+
+            # The budget is zero, so the artifact is evicted as soon as it is stored.
+            cache.insert(key, [path])
+            self.assertFalse(cache.has(key))
+            self.assertEqual(0, index.total_bytes())
+
+            index.max_bytes = 1024 * 1024
+            cache.insert(key, [path])
+            self.assertTrue(cache.has(key))
+            self.assertGreater(index.total_bytes(), 0)
+            cache.delete(key)
+            self.assertEqual(0, index.total_bytes())
@@ -3,11 +3,17 @@
 
 import functools
 import os
-from typing import cast
+import unittest.mock
+from dataclasses import dataclass
+from typing import Tuple, cast
 
+from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.build_file_aliases import BuildFileAliases, TargetMacro
 from pants.build_graph.files import Files
+from pants.build_graph.target import Target
+from pants.engine.legacy.graph import _DependentGraph
+from pants.scm.subsystems.changed import DependentGraphCache
 from pants.testutil.test_base import TestBase
 
 
@@ -89,3 +95,72 @@ class GraphTest(TestBase):
         files = self.create_library(path="src/example", target_type="tagged_files", name="things")
         self.assertIn(self._TAG, files.tags)
         self.assertEqual(type(files), Files)
+
+
+@dataclass(frozen=True)
+class FakeTargetAdaptor:
+    address: Address
+    dependencies: Tuple[Address, ...] = ()
+    type_alias: str = "target"
+
+    def kwargs(self):
+        return {}
+
+
+class DependentGraphTest(unittest.TestCase):
+    A = Address.parse("src:a")
+    B = Address.parse("src:b")
+    C = Address.parse("src:c")
+
+    def graph(self, *target_adaptors):
+        address_mapper = unittest.mock.Mock(subproject_roots=[])
+        return _DependentGraph.from_iterable({"target": Target}, address_mapper, target_adaptors)
+
+    def test_transitive_dependents(self):
+        graph = self.graph(
+            FakeTargetAdaptor(self.A),
+            FakeTargetAdaptor(self.B, (self.A,)),
+            FakeTargetAdaptor(self.C, (self.B,)),
+        )
+        self.assertEqual([self.A, self.B], list(graph.dependents_of_addresses([self.A])))
+        self.assertEqual(
+            [self.A, self.B, self.C], graph.transitive_dependents_of_addresses([self.A])
+        )
+
+    def test_update(self):
+        a = FakeTargetAdaptor(self.A)
+        b = FakeTargetAdaptor(self.B, (self.A,))
+        c = FakeTargetAdaptor(self.C, (self.B,))
+        graph = self.graph(a, b, c)
+
+        # C changes to depend on A directly, and B is deleted.
+        graph.update([a, FakeTargetAdaptor(self.C, (self.A,))])
+        self.assertEqual([self.A, self.C], graph.transitive_dependents_of_addresses([self.A]))
+        self.assertEqual([self.B], graph.transitive_dependents_of_addresses([self.B]))
+
+    def test_update_missing_dependency(self):
+        graph = self.graph(FakeTargetAdaptor(self.A), FakeTargetAdaptor(self.B, (self.A,)))
+        with self.assertRaises(AddressLookupError):
+            graph.update([FakeTargetAdaptor(self.B, (self.A,))])
+
+    def test_dependent_graph_cache(self):
+        cache = DependentGraphCache()
+        address_mapper = unittest.mock.Mock(subproject_roots=[])
+        a = FakeTargetAdaptor(self.A)
+        b = FakeTargetAdaptor(self.B, (self.A,))
+
+        def dependents(target_adaptors, transitive):
+            return cache.dependents(
+                {"target": Target}, address_mapper, target_adaptors, [self.A], transitive
+            )
+
+        self.assertEqual((self.A, self.B), dependents([a, b], transitive=False))
+        c = FakeTargetAdaptor(self.C, (self.B,))
+        self.assertEqual((self.A, self.B, self.C), dependents([a, b, c], transitive=True))
+        c = FakeTargetAdaptor(self.C, (self.A,))
+        self.assertEqual((self.A, self.C), dependents([a, c], transitive=False))
+
+        # A failed update discards the graph, rather than serving a partially updated one.
+        with self.assertRaises(AddressLookupError):
+            dependents([b], transitive=True)
+        self.assertEqual((self.A, self.B), dependents([a, b], transitive=True))
@@ -0,0 +1,125 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import unittest
+from unittest.mock import patch
+
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.engine.legacy.parsed_build_file_cache import ParsedBuildFileCache
+from pants.engine.legacy.parser import LegacyPythonCallbacksParser
+from pants.engine.legacy.structs import TargetAdaptor
+from pants.engine.parser import SymbolTable
+from pants.option.global_options import BuildFileImportsBehavior
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class Unpicklable(TargetAdaptor):
+    def __init__(self, **kwargs):
+        super().__init__(callback=lambda: None, **kwargs)
+
+
+class ParsedBuildFileCacheTest(unittest.TestCase):
+    SYMBOL_TABLE = SymbolTable({"target": TargetAdaptor, "unpicklable": Unpicklable})
+
+    def parser(self, cache_dir, symbol_table=SYMBOL_TABLE, aliases=BuildFileAliases()):
+        imports = BuildFileImportsBehavior.warn
+        cache = ParsedBuildFileCache.for_symbols(cache_dir, symbol_table, aliases, imports)
+        return LegacyPythonCallbacksParser(symbol_table, aliases, imports, cache=cache)
+
+    def assert_cached(self, parser, filepath, filecontent, expected):
+        with patch.object(parser, "_parse", side_effect=AssertionError("Not cached.")):
+            self.assertEqual(expected, parser.parse(filepath, filecontent))
+
+    def assert_not_cached(self, parser, filepath, filecontent):
+        with patch.object(parser, "_parse", return_value=[]) as parse:
+            parser.parse(filepath, filecontent)
+        parse.assert_called_once_with(filepath, filecontent)
+
+    def test_persists_across_parsers(self) -> None:
+        with temporary_dir() as cache_dir:
+            content = b"target(name='a', dependencies=[':b'])\ntarget()"
+            objects = self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assertEqual(["a", "foo"], [obj.name for obj in objects])
+
+            self.assert_cached(self.parser(cache_dir), "src/foo/BUILD", content, objects)
+
+    def test_content_change(self) -> None:
+        with temporary_dir() as cache_dir:
+            self.parser(cache_dir).parse("src/foo/BUILD", b"target(name='a')")
+            parser = self.parser(cache_dir)
+            self.assert_not_cached(parser, "src/foo/BUILD", b"target(name='b')")
+            self.assert_not_cached(parser, "src/bar/BUILD", b"target(name='a')")
+
+    def test_symbol_change(self) -> None:
+        with temporary_dir() as cache_dir:
+            self.parser(cache_dir).parse("src/foo/BUILD", b"target(name='a')")
+            parser = self.parser(cache_dir, SymbolTable({"target": TargetAdaptor}))
+            self.assert_not_cached(parser, "src/foo/BUILD", b"target(name='a')")
+
+    def test_imports_not_cached(self) -> None:
+        with temporary_dir() as cache_dir:
+            content = b"import os\ntarget(name='a')"
+            self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assert_not_cached(self.parser(cache_dir), "src/foo/BUILD", content)
+
+    def test_dynamic_imports_not_cached(self) -> None:
+        with temporary_dir() as cache_dir:
+            content = b"target(name=__import__('os').path.basename('a'))"
+            self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assert_not_cached(self.parser(cache_dir), "src/foo/BUILD", content)
+
+    def test_opens_not_cached(self) -> None:
+        with temporary_dir() as cache_dir, temporary_dir() as buildroot:
+            version_path = os.path.join(buildroot, "VERSION")
+            safe_file_dump(version_path, "1.0")
+            content = f"target(name='a', description=open({version_path!r}).read())".encode()
+            objects = self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assertEqual(["1.0"], [obj.description for obj in objects])
+            self.assert_not_cached(self.parser(cache_dir), "src/foo/BUILD", content)
+
+    def test_mentions_of_import_cached(self) -> None:
+        with temporary_dir() as cache_dir:
+            content = b"target(name='important', description='import')"
+            objects = self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assert_cached(self.parser(cache_dir), "src/foo/BUILD", content, objects)
+
+    def test_context_aware_object_factories_not_cached(self) -> None:
+        class Requirements:
+            def __init__(self, parse_context):
+                self._parse_context = parse_context
+
+            def __call__(self, name):
+                # Stands in for a factory which reads a file next to the BUILD file.
+                self._parse_context.create_object("target", name=name)
+
+        aliases = BuildFileAliases(context_aware_object_factories={"requirements": Requirements})
+        with temporary_dir() as cache_dir:
+            content = b"requirements(name='a')"
+            objects = self.parser(cache_dir, aliases=aliases).parse("src/foo/BUILD", content)
+            self.assertEqual(["a"], [obj.name for obj in objects])
+            parser = self.parser(cache_dir, aliases=aliases)
+            self.assert_not_cached(parser, "src/foo/BUILD", content)
+
+    def test_unpicklable_not_cached(self) -> None:
+        with temporary_dir() as cache_dir:
+            content = b"unpicklable(name='a')"
+            objects = self.parser(cache_dir).parse("src/foo/BUILD", content)
+            self.assertEqual(["a"], [obj.name for obj in objects])
+            self.assert_not_cached(self.parser(cache_dir), "src/foo/BUILD", content)
+
+    def test_fingerprint_symbols(self) -> None:
+        def fingerprint(symbol_table, imports=BuildFileImportsBehavior.error):
+            return ParsedBuildFileCache.fingerprint_symbols(
+                symbol_table, BuildFileAliases(objects={"TRUE": True}), imports
+            )
+
+        self.assertEqual(fingerprint(self.SYMBOL_TABLE), fingerprint(self.SYMBOL_TABLE))
+        self.assertNotEqual(
+            fingerprint(self.SYMBOL_TABLE), fingerprint(SymbolTable({"target": TargetAdaptor}))
+        )
+        self.assertNotEqual(
+            fingerprint(self.SYMBOL_TABLE),
+            fingerprint(self.SYMBOL_TABLE, BuildFileImportsBehavior.warn),
+        )
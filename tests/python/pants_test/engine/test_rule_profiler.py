@@ -0,0 +1,116 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import time
+import types
+import unittest
+
+from pants.engine.rule_profiler import RuleProfiler, RuleStats
+
+
+def as_rule(func):
+    func.rule = object()
+    func.__line_number__ = func.__code__.co_firstlineno
+    return func
+
+
+@types.coroutine
+def fake_get():
+    value = yield "get"
+    return value
+
+
+@as_rule
+async def coroutine_rule(x):
+    y = await fake_get()
+    return x + y
+
+
+@as_rule
+def slow_rule():
+    time.sleep(0.01)
+    return 42
+
+
+def not_a_rule():
+    return None
+
+
+class RuleProfilerTest(unittest.TestCase):
+    def test_rule_name(self):
+        self.assertEqual(
+            f"{__name__}:{slow_rule.__code__.co_firstlineno}:slow_rule",
+            RuleProfiler.rule_name(slow_rule),
+        )
+        self.assertIsNone(RuleProfiler.rule_name(not_a_rule))
+
+    def test_not_a_rule(self):
+        profiler = RuleProfiler()
+        self.assertIs(not_a_rule, profiler.profiled(not_a_rule))
+        self.assertEqual({}, profiler.stats())
+
+    def test_coroutine_rule(self):
+        profiler = RuleProfiler()
+        name = RuleProfiler.rule_name(coroutine_rule)
+
+        coroutine = profiler.profiled(coroutine_rule)(1)
+        self.assertEqual("get", profiler.send(coroutine, None))
+        stats = profiler.stats()[name]
+        self.assertEqual(1, stats.invocations)
+        self.assertEqual(0.0, stats.total_time)
+
+        with self.assertRaises(StopIteration) as e:
+            profiler.send(coroutine, 2)
+        self.assertEqual(3, e.exception.value)
+        stats = profiler.stats()[name]
+        self.assertEqual(1, stats.invocations)
+        self.assertGreater(stats.total_time, 0.0)
+        self.assertLessEqual(stats.self_time, stats.total_time)
+
+    def test_sync_rule(self):
+        profiler = RuleProfiler()
+        invoke = profiler.profiled(slow_rule)
+        self.assertEqual(42, invoke())
+        self.assertEqual(42, invoke())
+
+        stats = profiler.stats()[RuleProfiler.rule_name(slow_rule)]
+        self.assertEqual(2, stats.invocations)
+        self.assertGreaterEqual(stats.total_time, 0.02)
+        self.assertEqual(stats.total_time, stats.self_time)
+
+    def test_requests(self):
+        profiler = RuleProfiler()
+        profiler.profiled(slow_rule)()
+        name = RuleProfiler.rule_name(slow_rule)
+        profiler.record_requests({name: 4, "other:1:rule": 2})
+
+        stats = profiler.stats()
+        self.assertEqual(3, stats[name].memoized)
+        self.assertEqual(0.75, stats[name].hit_ratio)
+        self.assertEqual(0, stats["other:1:rule"].invocations)
+        self.assertEqual(2, stats["other:1:rule"].memoized)
+
+        json_dict = profiler.to_json_dict()
+        self.assertEqual(sorted([name, "other:1:rule"]), list(json_dict))
+        self.assertEqual(4, json_dict[name]["requests"])
+        self.assertEqual(0.75, json_dict[name]["hit_ratio"])
+
+        lines = profiler.format_table().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[0].endswith("rule"))
+        self.assertEqual(["invoked", "requested", "memoized", "hit%"], lines[0].split()[3:7])
+        self.assertTrue(lines[1].endswith(name))
+        self.assertEqual(["1", "4", "3", "75%"], lines[1].split()[3:7])
+        self.assertTrue(lines[2].endswith("other:1:rule"))
+
+    def test_unknown_requests(self):
+        stats = RuleStats(invocations=1)
+        self.assertIsNone(stats.memoized)
+        self.assertIsNone(stats.hit_ratio)
+
+    def test_decline(self):
+        profiler = RuleProfiler()
+        self.assertIsNone(profiler.decline_reason)
+        profiler.decline("first")
+        profiler.decline("second")
+        self.assertEqual("first", profiler.decline_reason)
@@ -0,0 +1,89 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import time
+import unittest
+
+from pants.goal.aggregated_timings import AggregatedTimings
+from pants.goal.stats_log import StatsLog
+from pants.util.contextutil import temporary_dir
+
+
+class StatsLogTest(unittest.TestCase):
+    def test_append_and_read(self):
+        with temporary_dir() as tmpdir:
+            log = StatsLog(os.path.join(tmpdir, "stats.jsonl"))
+            log.append(a=1, b="x")
+            log.append(a=2, b="y")
+            log.close()
+            self.assertEqual(
+                [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}], list(StatsLog.read(log.path))
+            )
+
+    def test_flushed_after_burst(self):
+        with temporary_dir() as tmpdir:
+            log = StatsLog(os.path.join(tmpdir, "stats.jsonl"), flush_interval_secs=0.1)
+            try:
+                log.append(a=1)
+                log.append(a=2)
+                # The second record is flushed by a timer, without any further appends.
+                deadline = time.time() + 10
+                while len(list(StatsLog.read(log.path))) < 2 and time.time() < deadline:
+                    time.sleep(0.05)
+                self.assertEqual([{"a": 1}, {"a": 2}], list(StatsLog.read(log.path)))
+            finally:
+                log.close()
+
+    def test_read_skips_partial_record(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "stats.jsonl")
+            with open(path, "w") as f:
+                f.write('{"a":1}\n{"a":')
+            self.assertEqual([{"a": 1}], list(StatsLog.read(path)))
+
+    def test_read_missing(self):
+        with temporary_dir() as tmpdir:
+            self.assertEqual([], list(StatsLog.read(os.path.join(tmpdir, "missing.jsonl"))))
+
+    def test_append_without_dir(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "gone", "stats.jsonl")
+            log = StatsLog(path)
+            log.append(a=1)
+            log.close()
+            self.assertFalse(os.path.exists(path))
+
+
+class AggregatedTimingsTest(unittest.TestCase):
+    def test_write(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "timings")
+            timings = AggregatedTimings(path)
+            timings.add_timing("main:compile", 1.0)
+            timings.add_timing("main:compile:javac", 2.0, is_tool=True)
+            timings.add_timing("main:compile", 2.5)
+            self.assertFalse(os.path.exists(path))
+
+            timings.write()
+            with open(path, "r") as f:
+                self.assertEqual("main:compile: 3.5\nmain:compile:javac: 2.0\n", f.read())
+
+    def test_from_log(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "timings")
+            timings = AggregatedTimings(path)
+            timings.add_timing("main:compile", 1.0)
+            timings.add_timing("main:compile:javac", 2.0, is_tool=True)
+            timings.add_timing("main:compile", 2.5)
+            timings.write()
+
+            replayed = AggregatedTimings.from_log(AggregatedTimings.log_path(path))
+            self.assertEqual(timings.get_all(), replayed.get_all())
+            self.assertEqual(
+                [
+                    {"label": "main:compile", "timing": 3.5, "is_tool": False},
+                    {"label": "main:compile:javac", "timing": 2.0, "is_tool": True},
+                ],
+                replayed.get_all(),
+            )
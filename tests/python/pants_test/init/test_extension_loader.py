@@ -1,6 +1,7 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import importlib
 import sys
 import types
 import unittest
@@ -30,8 +31,10 @@ from pants.init.extension_loader import (
     PluginNotFound,
     load_backend,
     load_backends_and_plugins,
+    load_build_configuration_from_source,
     load_plugins,
 )
+from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.subsystem.subsystem import Subsystem
 from pants.task.task import Task
 from pants.util.ordered_set import OrderedSet
@@ -126,6 +129,7 @@ class LoaderTest(unittest.TestCase):
         self,
         build_file_aliases=None,
         register_goals=None,
+        registered_goals=None,
         global_subsystems=None,
         rules=None,
         module_name="register",
@@ -149,6 +153,7 @@ class LoaderTest(unittest.TestCase):
             register_entrypoint("build_file_aliases", build_file_aliases)
             register_entrypoint("global_subsystems", global_subsystems)
             register_entrypoint("register_goals", register_goals)
+            register_entrypoint("registered_goals", registered_goals)
             register_entrypoint("rules", rules)
 
             yield package_name
@@ -208,6 +213,70 @@ class LoaderTest(unittest.TestCase):
             task_name = task_names[0]
             self.assertEqual("jill", task_name)
 
+    def test_load_deferred_goals(self):
+        def register_goals():
+            Goal.by_name("jack").install(TaskRegistrar("jill", DummyTask))
+
+        with self.create_register(
+            register_goals=register_goals, registered_goals=lambda: ["jack"]
+        ) as backend_package:
+            Goal.clear()
+            load_backend(
+                self.build_configuration, backend_package, is_v1_backend=True, defer_goals=True
+            )
+            self.assertEqual(0, len(Goal.all()))
+            self.assertEqual(["jack"], list(self.build_configuration.deferred_goals()))
+
+            self.build_configuration.load_deferred_goals()
+            self.assertEqual(["jill"], Goal.by_name("jack").ordered_task_names())
+            self.assertEqual(0, len(self.build_configuration.deferred_goals()))
+
+    def test_load_undeclared_goals_after_deferred_goals(self):
+        def register_declared_goals():
+            Goal.by_name("jack").install(TaskRegistrar("jill", DummyTask))
+
+        def register_undeclared_goals():
+            Goal.by_name("jack").install(TaskRegistrar("jane", DummyTask), after="jill")
+
+        with self.create_register(
+            register_goals=register_declared_goals, registered_goals=lambda: ["jack"]
+        ) as declared_package, self.create_register(
+            register_goals=register_undeclared_goals
+        ) as undeclared_package:
+            Goal.clear()
+            load_build_configuration_from_source(
+                self.build_configuration,
+                [declared_package, undeclared_package],
+                [],
+                defer_goals=True,
+            )
+            # The undeclared backend's tasks can't be deferred, and may be installed relative to the
+            # declared backend's tasks, so those are registered first.
+            self.assertEqual(["jill", "jane"], Goal.by_name("jack").ordered_task_names())
+            self.assertEqual(0, len(self.build_configuration.deferred_goals()))
+
+    def test_registered_goals_of_default_backends(self):
+        def task_names_by_goal():
+            return {goal.name: list(goal.ordered_task_names()) for goal in Goal.all()}
+
+        bootstrap_options = (
+            OptionsBootstrapper.create(args=["--pants-config-files=[]"])
+            .get_bootstrap_options()
+            .for_global_scope()
+        )
+        Goal.clear()
+        for backend_package in ["pants.core_tasks", *bootstrap_options.backend_packages]:
+            module = importlib.import_module(f"{backend_package}.register")
+            if not hasattr(module, "register_goals"):
+                continue
+            before = task_names_by_goal()
+            module.register_goals()
+            after = task_names_by_goal()
+            changed_goals = {name for name in after if after[name] != before.get(name)}
+            self.assertEqual(
+                changed_goals, set(module.registered_goals()), f"in {backend_package}"
+            )
+
     def test_load_invalid_entrypoint(self):
         def build_file_aliases(bad_arg):
             return BuildFileAliases()
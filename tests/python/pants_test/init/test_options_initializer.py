@@ -4,9 +4,14 @@
 import unittest
 
 from pants.base.exceptions import BuildConfigurationError
+from pants.goal.goal import Goal
+from pants.goal.task_registrar import TaskRegistrar
 from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
 from pants.option.errors import OptionsError
 from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.task.task import Task
+from pants.util.contextutil import temporary_file_path
+from pants.util.dirutil import safe_file_dump
 
 
 class OptionsInitializerTest(unittest.TestCase):
@@ -35,3 +40,114 @@ class OptionsInitializerTest(unittest.TestCase):
         with self.assertRaises(OptionsError) as exc:
             OptionsInitializer.create(ob, build_config)
         self.assertIn("The `--loop` option requires `--enable-pantsd`", str(exc.exception))
+
+    def test_build_config_is_cached_until_backends_change(self):
+        def get(*backend_packages):
+            options_bootstrapper = OptionsBootstrapper.create(
+                args=[f"--backend-packages={list(backend_packages)}", "--backend-packages2=[]"]
+            )
+            return BuildConfigInitializer.get(options_bootstrapper)
+
+        BuildConfigInitializer.reset()
+        try:
+            build_config = get()
+            self.assertIs(build_config, get())
+
+            Goal.by_name("stale").install(TaskRegistrar("stale", Task))
+            with_graph_info = get("pants.backend.graph_info")
+            self.assertIsNot(build_config, with_graph_info)
+            self.assertIs(with_graph_info, get("pants.backend.graph_info"))
+            self.assertNotIn("stale", [goal.name for goal in Goal.all()])
+            self.assertIn("dependees", [goal.name for goal in Goal.all()])
+        finally:
+            BuildConfigInitializer.reset()
+            Goal.clear()
+
+    def test_build_config_defers_goals_until_used(self):
+        def get(*args):
+            options_bootstrapper = OptionsBootstrapper.create(
+                env={},
+                args=[
+                    "./pants",
+                    "--pants-config-files=[]",
+                    "--backend-packages=['pants.backend.graph_info']",
+                    "--backend-packages2=[]",
+                    *args,
+                ],
+            )
+            return BuildConfigInitializer.get(options_bootstrapper)
+
+        BuildConfigInitializer.reset()
+        Goal.clear()
+        try:
+            build_config = get("list", "::")
+            self.assertIn("dependees", build_config.deferred_goals())
+            self.assertIn("clean-all", build_config.deferred_goals())
+            self.assertEqual([], Goal.all())
+
+            self.assertIs(build_config, get("dependees", "::"))
+            self.assertEqual(0, len(build_config.deferred_goals()))
+            self.assertIn("dependees", [goal.name for goal in Goal.all()])
+        finally:
+            BuildConfigInitializer.reset()
+            Goal.clear()
+
+    def test_build_config_loads_goals_configured_for_subsystems_of_tasks(self):
+        with temporary_file_path(suffix=".toml") as config_path:
+            safe_file_dump(config_path, '[jvm.test.junit]\noptions = ["-Xmx1g"]\n')
+            options_bootstrapper = OptionsBootstrapper.create(
+                env={},
+                args=[
+                    "./pants",
+                    f"--pants-config-files=['{config_path}']",
+                    "--backend-packages=[]",
+                    "--backend-packages2=[]",
+                    "list",
+                    "::",
+                ],
+            )
+            BuildConfigInitializer.reset()
+            Goal.clear()
+            try:
+                build_config = BuildConfigInitializer.get(options_bootstrapper)
+                self.assertEqual(0, len(build_config.deferred_goals()))
+                self.assertIn("test", [goal.name for goal in Goal.all()])
+            finally:
+                BuildConfigInitializer.reset()
+                Goal.clear()
+
+    def test_uses_goals(self):
+        def uses_goals(*args, env=None, config=None):
+            with temporary_file_path(suffix=".toml") as config_path:
+                safe_file_dump(config_path, config or "")
+                options_bootstrapper = OptionsBootstrapper.create(
+                    env=env or {},
+                    args=[
+                        "./pants",
+                        f"--pants-config-files=['{config_path}']",
+                        "--backend-packages=[]",
+                        "--backend-packages2=[]",
+                        *args,
+                    ],
+                )
+            return BuildConfigInitializer._uses_goals(
+                options_bootstrapper, ["compile", "test", "clean-all"]
+            )
+
+        self.assertFalse(uses_goals("list", "::"))
+        self.assertFalse(uses_goals("list", "--cache-read-from=[]", "::"))
+        self.assertFalse(uses_goals("list", "::", config="[cache]\nread = false\n"))
+        self.assertFalse(uses_goals("run", "src:bin", "--", "compile"))
+        self.assertTrue(uses_goals("list", "compile", "::"))
+        self.assertTrue(uses_goals("compile.rsc", "::"))
+        self.assertTrue(uses_goals("list", "--compile-rsc-workers=2", "::"))
+        self.assertTrue(uses_goals("list", "--no-test-fast", "::"))
+        self.assertTrue(uses_goals("list", "--jvm-test-junit-options=['-Xmx1g']", "::"))
+        self.assertTrue(uses_goals("list", "--cache-clean-all-read", "::"))
+        self.assertTrue(uses_goals("list", "::", config="[compile.rsc]\nworker_count = 2\n"))
+        self.assertTrue(uses_goals("list", "::", config="[jvm.test.junit]\noptions = []\n"))
+        self.assertTrue(uses_goals("list", "::", env={"PANTS_JVM_TEST_JUNIT_OPTIONS": "[]"}))
+        self.assertTrue(uses_goals("list", "::", env={"PANTS_CLEAN_ALL_ASYNC": "true"}))
+        self.assertTrue(uses_goals("help"))
+        self.assertTrue(uses_goals("list", "-h"))
+        self.assertTrue(uses_goals())
@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import tempfile
+import threading
 import unittest
 from contextlib import contextmanager
 
@@ -58,10 +59,12 @@ class BaseBuildInvalidatorTest(unittest.TestCase):
 
 
 class BuildInvalidatorTest(BaseBuildInvalidatorTest):
+    store = BuildInvalidator.FILES_STORE
+
     @contextmanager
     def invalidator(self):
         with temporary_dir() as root:
-            yield BuildInvalidator(root)
+            yield BuildInvalidator(root, store=self.store)
 
     def test_cache_key_previous(self):
         with self.invalidator() as invalidator:
@@ -131,13 +134,81 @@ class BuildInvalidatorTest(BaseBuildInvalidatorTest):
             self.assertTrue(invalidator.needs_update(key1))
             self.assertTrue(invalidator.needs_update(key2))
 
+    def test_needs_update_many(self):
+        with self.invalidator() as invalidator:
+            key1 = self.cache_key(key_id="1", key_hash="1")
+            key2 = self.cache_key(key_id="2", key_hash="2")
+            key3 = self.uncacheable_cache_key(key_id="3")
+            invalidator.update(key1)
+            invalidator.update(key3)
+            self.assertEqual(
+                [False, True, True, True],
+                invalidator.needs_update_many(
+                    [key1, key2, key3, self.update_hash(key1, new_hash="11")]
+                ),
+            )
+            self.assertEqual(
+                [key1, None, None, key1],
+                invalidator.previous_keys(
+                    [key1, key2, key3, self.update_hash(key1, new_hash="11")]
+                ),
+            )
+
+    def test_needs_update_many_empty(self):
+        with self.invalidator() as invalidator:
+            self.assertEqual([], invalidator.needs_update_many([]))
+
+    def test_update_many(self):
+        with self.invalidator() as invalidator:
+            key1 = self.cache_key(key_id="1", key_hash="1")
+            key2 = self.cache_key(key_id="2", key_hash="2")
+            key3 = self.uncacheable_cache_key(key_id="3")
+            invalidator.update_many([key1, key2, key3])
+            self.assertEqual(
+                [False, False, True], invalidator.needs_update_many([key1, key2, key3])
+            )
+            invalidator.update_many([])
+            invalidator.update_many([self.update_hash(key1, new_hash="11")])
+            self.assertEqual([True, False], invalidator.needs_update_many([key1, key2]))
+
+    def test_update_from_threads(self):
+        with self.invalidator() as invalidator:
+            keys = [self.cache_key(key_id=str(i), key_hash=str(i)) for i in range(8)]
+            threads = [threading.Thread(target=invalidator.update, args=(key,)) for key in keys]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual([False] * 8, invalidator.needs_update_many(keys))
+
+
+class SqliteBuildInvalidatorTest(BuildInvalidatorTest):
+    store = BuildInvalidator.SQLITE_STORE
+
+    def test_needs_update_many_large(self):
+        with self.invalidator() as invalidator:
+            keys = [self.cache_key(key_id=str(i), key_hash=str(i)) for i in range(2000)]
+            for key in keys[::2]:
+                invalidator.update(key)
+            self.assertEqual(
+                [i % 2 == 1 for i in range(2000)], invalidator.needs_update_many(keys)
+            )
+
 
 class BuildInvalidatorFactoryTest(BaseBuildInvalidatorTest):
+    store = BuildInvalidator.FILES_STORE
+
     def setUp(self):
         pants_workdir = tempfile.mkdtemp()
         self.addCleanup(safe_rmtree, pants_workdir)
 
-        init_subsystem(BuildInvalidator.Factory, options={"": {"pants_workdir": pants_workdir}})
+        init_subsystem(
+            BuildInvalidator.Factory,
+            options={
+                "": {"pants_workdir": pants_workdir},
+                "build-invalidator": {"store": self.store},
+            },
+        )
         self.root_invalidator = BuildInvalidator.Factory.create()
         self.scoped_invalidator1 = BuildInvalidator.Factory.create(build_task="gen")
         self.scoped_invalidator2 = BuildInvalidator.Factory.create(build_task="resolve")
@@ -165,3 +236,7 @@ class BuildInvalidatorFactoryTest(BaseBuildInvalidatorTest):
 
         self.assertTrue(self.scoped_invalidator1.needs_update(self.key))
         self.assertFalse(self.scoped_invalidator2.needs_update(self.key))
+
+
+class SqliteBuildInvalidatorFactoryTest(BuildInvalidatorFactoryTest):
+    store = BuildInvalidator.SQLITE_STORE
@@ -8,7 +8,7 @@ import unittest
 # collection and a conflicting Test type in scope during that process.
 from pants.java.junit.junit_xml_parser import ParseError, RegistryOfTests
 from pants.java.junit.junit_xml_parser import Test as JUnitTest
-from pants.java.junit.junit_xml_parser import parse_failed_targets
+from pants.java.junit.junit_xml_parser import parse_failed_targets, parse_test_class_durations
 from pants.util.contextutil import temporary_dir
 from pants.util.dirutil import safe_open
 from pants.util.xml_parser import XmlParser
@@ -261,3 +261,55 @@ class TestParseFailedTargets(unittest.TestCase):
             self.assertEqual(
                 {None: {JUnitTest("org.pantsbuild.Error", "testError")}}, failed_targets
             )
+
+
+class TestParseTestClassDurations(unittest.TestCase):
+    def _write_report(self, path, mtime, *testcases):
+        with safe_open(path, "w") as fp:
+            fp.write("<testsuite>{}</testsuite>".format("".join(testcases)))
+        os.utime(path, (mtime, mtime))
+
+    def test_parse_test_class_durations(self):
+        with temporary_dir() as junit_xml_dir:
+            self._write_report(
+                os.path.join(junit_xml_dir, "old", "TEST-a.xml"),
+                1000,
+                '<testcase classname="org.pantsbuild.Slow" name="testA" time="10.0"/>',
+                '<testcase classname="org.pantsbuild.Fast" name="testA" time="0.5"/>',
+            )
+            self._write_report(
+                os.path.join(junit_xml_dir, "new", "TEST-b.xml"),
+                2000,
+                '<testcase classname="org.pantsbuild.Slow" name="testA" time="3.0"/>',
+                '<testcase classname="org.pantsbuild.Slow" name="testB" time="4.5"/>',
+                '<testcase classname="org.pantsbuild.NoTime" name="testA"/>',
+            )
+
+            durations = parse_test_class_durations(
+                junit_xml_dir, TestParseFailedTargets._raise_handler
+            )
+            self.assertEqual(
+                {
+                    "org.pantsbuild.Slow": 7.5,
+                    "org.pantsbuild.Fast": 0.5,
+                    "org.pantsbuild.NoTime": 0.0,
+                },
+                durations,
+            )
+
+    def test_parse_test_class_durations_error_continue(self):
+        with temporary_dir() as junit_xml_dir:
+            bad_file = os.path.join(junit_xml_dir, "TEST-bad.xml")
+            self._write_report(
+                bad_file, 1000, '<testcase classname="org.pantsbuild.Bad" name="test" time="x"/>'
+            )
+            self._write_report(
+                os.path.join(junit_xml_dir, "TEST-good.xml"),
+                1000,
+                '<testcase classname="org.pantsbuild.Good" name="test" time="1.0"/>',
+            )
+
+            collect_handler = TestParseFailedTargets.CollectHandler()
+            durations = parse_test_class_durations(junit_xml_dir, collect_handler)
+            self.assertEqual([bad_file], [e.xml_path for e in collect_handler.errors])
+            self.assertEqual({"org.pantsbuild.Good": 1.0}, durations)
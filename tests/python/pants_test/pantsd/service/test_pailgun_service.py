@@ -44,3 +44,15 @@ class TestPailgunService(unittest.TestCase):
         self.service._shutdown_after_run = True
         self.service._request_complete_callback()
         self.assertIs(self.service.terminate.called, True)
+
+    def test_request_is_concurrent(self):
+        service = PailgunService(
+            bind_addr=(None, None),
+            runner_class=self.mock_runner_class,
+            scheduler_service=self.mock_scheduler_service,
+            shutdown_after_run=False,
+            concurrent_goals=["list", "filedeps"],
+        )
+        self.assertTrue(service._request_is_concurrent(["--no-v1", "list", "::"], {}))
+        self.assertFalse(service._request_is_concurrent(["compile", "::"], {}))
+        self.assertFalse(self.service._request_is_concurrent(["list", "::"], {}))
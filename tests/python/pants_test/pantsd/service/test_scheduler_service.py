@@ -0,0 +1,79 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import threading
+import unittest
+import unittest.mock
+
+from pants.pantsd.service.fs_event_service import FSEventService
+from pants.pantsd.service.scheduler_service import SchedulerService
+
+
+class TestSchedulerService(unittest.TestCase):
+    def setUp(self):
+        self.mock_fs_event_service = unittest.mock.Mock(spec=FSEventService)
+        self.mock_fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME = "all_files"
+        self.mock_fs_event_service.PANTS_PID_SUBSCRIPTION_NAME = "pid"
+        self.mock_graph_helper = unittest.mock.Mock()
+        self.mock_scheduler = self.mock_graph_helper.scheduler
+        self.mock_scheduler.invalidate_files.return_value = 0
+        self.service = SchedulerService(
+            fs_event_service=self.mock_fs_event_service,
+            legacy_graph_scheduler=self.mock_graph_helper,
+            build_root="/build/root",
+            invalidation_globs=[],
+            pantsd_pidfile=None,
+            union_membership=unittest.mock.Mock(),
+            invalidation_debounce=0.01,
+        )
+
+    def enqueue(self, *files, subscription="all_files", is_fresh_instance=False):
+        self.service._enqueue_fs_event(
+            dict(subscription=subscription, is_fresh_instance=is_fresh_instance, files=files)
+        )
+
+    def invalidated_files(self):
+        return [set(c[0][0]) for c in self.mock_scheduler.invalidate_files.call_args_list]
+
+    def test_coalesces_events(self):
+        self.enqueue("a", "b")
+        self.enqueue("b", "c")
+        self.enqueue("ignored", is_fresh_instance=True)
+        self.service._process_event_queue()
+        self.assertEqual([{"a", "b", "c"}], self.invalidated_files())
+        self.assertTrue(self.service._watchman_is_running.is_set())
+
+    def test_debounces_events(self):
+        self.enqueue("a")
+        timer = threading.Timer(0.005, self.enqueue, args=("b",))
+        timer.start()
+        self.service._process_event_queue()
+        timer.join()
+        self.service._process_event_queue()
+        # Either both files are invalidated together, or the second event narrowly missed the
+        # debounce window.
+        self.assertEqual({"a", "b"}, set.union(*self.invalidated_files()))
+        self.assertLessEqual(len(self.invalidated_files()), 2)
+
+    def test_no_events(self):
+        self.service._process_event_queue()
+        self.assertEqual([], self.invalidated_files())
+
+    def test_invalid_event(self):
+        self.service._enqueue_fs_event(dict(subscription="all_files", files=["a"]))
+        self.enqueue("b")
+        self.service._process_event_queue()
+        self.assertEqual([{"b"}], self.invalidated_files())
+        self.assertEqual(2, self.service._events_processed)
+
+    def test_runs_wait_for_enqueued_events(self):
+        self.enqueue("a")
+        waiter = threading.Thread(target=self.service._wait_for_enqueued_events)
+        waiter.start()
+        waiter.join(timeout=0.1)
+        self.assertTrue(waiter.is_alive())
+
+        self.service._process_event_queue()
+        waiter.join(timeout=5)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual([{"a"}], self.invalidated_files())
@@ -10,7 +10,12 @@ from queue import Queue
 from socketserver import TCPServer
 
 from pants.java.nailgun_protocol import ChunkType, MaybeShutdownSocket, NailgunProtocol
-from pants.pantsd.pailgun_server import PailgunHandler, PailgunServer
+from pants.pantsd.pailgun_server import (
+    ConcurrentRequestDeclined,
+    PailgunHandler,
+    PailgunRequestLock,
+    PailgunServer,
+)
 
 PATCH_OPTS = dict(autospec=True, spec_set=True)
 
@@ -221,6 +226,74 @@ class TestPailgunServer(unittest.TestCase):
             )
 
 
+    def test_concurrent_request(self):
+        self.server.request_is_concurrent = lambda arguments, environment: True
+        self.server._handle_request_under_lock(
+            self.mock_handler_inst, self.fake_environment, unittest.mock.Mock()
+        )
+        self.mock_handler_inst.handle_request.assert_called_once_with(concurrent=True)
+        assert self.after_request_callback_calls == 1
+
+    def test_declined_concurrent_request_runs_exclusively(self):
+        self.server.request_is_concurrent = lambda arguments, environment: True
+
+        def handle_request(concurrent=False):
+            if concurrent:
+                raise ConcurrentRequestDeclined("v1 goals cannot run concurrently")
+
+        self.mock_handler_inst.handle_request.side_effect = handle_request
+        self.server._handle_request_under_lock(
+            self.mock_handler_inst, self.fake_environment, unittest.mock.Mock()
+        )
+        self.assertEqual(
+            [unittest.mock.call(concurrent=True), unittest.mock.call()],
+            self.mock_handler_inst.handle_request.call_args_list,
+        )
+        assert self.after_request_callback_calls == 1
+
+
+class TestPailgunRequestLock(unittest.TestCase):
+    def test_concurrent_holders(self):
+        lock = PailgunRequestLock()
+        self.assertTrue(lock.acquire(concurrent=True))
+        self.assertTrue(lock.acquire(concurrent=True))
+        self.assertFalse(lock.acquire(concurrent=False, timeout=0.01))
+        lock.release(concurrent=True)
+        self.assertFalse(lock.acquire(concurrent=False, timeout=0.01))
+        lock.release(concurrent=True)
+        self.assertTrue(lock.acquire(concurrent=False))
+
+    def test_exclusive_holder(self):
+        lock = PailgunRequestLock()
+        self.assertTrue(lock.acquire(concurrent=False))
+        self.assertFalse(lock.acquire(concurrent=True, timeout=0.01))
+        self.assertFalse(lock.acquire(concurrent=False, timeout=0.01))
+        lock.release(concurrent=False)
+        self.assertTrue(lock.acquire(concurrent=True))
+
+    def test_waiting_exclusive_request_takes_priority(self):
+        lock = PailgunRequestLock()
+        self.assertTrue(lock.acquire(concurrent=True))
+
+        acquired = threading.Event()
+
+        def acquire_exclusively():
+            if lock.acquire(concurrent=False, timeout=10):
+                acquired.set()
+
+        thread = threading.Thread(target=acquire_exclusively)
+        thread.start()
+        # Wait for the exclusive request to start waiting.
+        while not lock._exclusive_waiters:
+            thread.join(0.01)
+
+        # New concurrent requests wait behind the exclusive one.
+        self.assertFalse(lock.acquire(concurrent=True, timeout=0.01))
+        lock.release(concurrent=True)
+        thread.join(10)
+        self.assertTrue(acquired.is_set())
+
+
 class TestPailgunHandler(unittest.TestCase):
     def setUp(self):
         self.client_sock, self.server_sock = socket.socketpair()
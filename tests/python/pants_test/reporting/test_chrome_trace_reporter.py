@@ -0,0 +1,123 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import os
+import threading
+import unittest
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.reporting.chrome_trace_reporter import ChromeTraceReporter, assign_lanes
+from pants.reporting.report import Report
+from pants.util.contextutil import temporary_dir
+
+
+def engine_workunit(name, span_id, start, duration, parent_id=None):
+    workunit = {
+        "name": name,
+        "span_id": span_id,
+        "start_secs": start,
+        "start_nanos": 0,
+        "duration_secs": duration,
+        "duration_nanos": 0,
+    }
+    if parent_id:
+        workunit["parent_id"] = parent_id
+    return workunit
+
+
+class ChromeTraceReporterTest(unittest.TestCase):
+    def write_trace(self, report_workunits):
+        with temporary_dir() as tmpdir:
+            trace_file = os.path.join(tmpdir, "trace", "trace.json")
+            settings = ChromeTraceReporter.Settings(log_level=Report.INFO, trace_file=trace_file)
+            reporter = ChromeTraceReporter(None, settings)
+            reporter.open()
+            report_workunits(reporter, tmpdir)
+            reporter.close()
+            with open(trace_file, "r") as f:
+                return json.load(f)["traceEvents"]
+
+    @staticmethod
+    def complete_events(events, pid):
+        return {
+            event["name"]: event for event in events if event["ph"] == "X" and event["pid"] == pid
+        }
+
+    def test_v1_workunits(self):
+        def report_workunits(reporter, run_info_dir):
+            def run(parent, name, labels=None):
+                workunit = WorkUnit(run_info_dir, parent, name, labels=labels, cmd="javac")
+                workunit.start(start_time=10)
+                reporter.start_workunit(workunit)
+                workunit.end_time = 12
+                workunit.set_outcome(WorkUnit.SUCCESS)
+                reporter.end_workunit(workunit)
+
+            root = WorkUnit(run_info_dir, None, "main")
+            root.start(start_time=9)
+            reporter.start_workunit(root)
+            run(root, "compile", labels=[WorkUnitLabel.TOOL])
+            thread = threading.Thread(target=run, args=(root, "background"), name="background")
+            thread.start()
+            thread.join()
+            root.end_time = 13
+            reporter.end_workunit(root)
+
+        events = self.write_trace(report_workunits)
+        workunits = self.complete_events(events, ChromeTraceReporter.V1_PID)
+        self.assertEqual({"main", "compile", "background"}, set(workunits))
+
+        compile = workunits["compile"]
+        self.assertEqual("tool", compile["cat"])
+        self.assertEqual(10000000, compile["ts"])
+        self.assertEqual(2000000, compile["dur"])
+        self.assertEqual("SUCCESS", compile["args"]["outcome"])
+        self.assertEqual("javac", compile["args"]["cmd"])
+
+        self.assertEqual("workunit", workunits["main"]["cat"])
+        self.assertEqual(workunits["main"]["tid"], compile["tid"])
+        self.assertNotEqual(workunits["main"]["tid"], workunits["background"]["tid"])
+        thread_names = {
+            event["tid"]: event["args"]["name"]
+            for event in events
+            if event["name"] == "thread_name" and event["pid"] == ChromeTraceReporter.V1_PID
+        }
+        self.assertEqual("background", thread_names[workunits["background"]["tid"]])
+
+    def test_engine_workunits(self):
+        def report_workunits(reporter, run_info_dir):
+            reporter.bulk_record_workunits(
+                [
+                    engine_workunit("lint", "a", 1, 10),
+                    engine_workunit("Executing process: flake8", "b", 2, 3, parent_id="a"),
+                    engine_workunit("local cache hit", "c", 2, 1, parent_id="b"),
+                    engine_workunit("Executing process: isort", "d", 3, 5, parent_id="a"),
+                ]
+            )
+
+        events = self.write_trace(report_workunits)
+        workunits = self.complete_events(events, ChromeTraceReporter.V2_PID)
+
+        self.assertEqual("rule", workunits["lint"]["cat"])
+        self.assertEqual("cache", workunits["local cache hit"]["cat"])
+        flake8 = workunits["Executing process: flake8"]
+        self.assertEqual("process", flake8["cat"])
+        self.assertEqual("local", flake8["args"]["cache_hit"])
+        self.assertEqual("a", flake8["args"]["parent_id"])
+        isort = workunits["Executing process: isort"]
+        self.assertEqual("process", isort["cat"])
+        self.assertNotIn("cache_hit", isort["args"])
+
+        # The overlapping processes can't both nest in the lane of the rule which ran them.
+        self.assertEqual(workunits["lint"]["tid"], flake8["tid"])
+        self.assertEqual(flake8["tid"], workunits["local cache hit"]["tid"])
+        self.assertNotEqual(flake8["tid"], isort["tid"])
+
+
+class AssignLanesTest(unittest.TestCase):
+    def test_nested(self):
+        self.assertEqual([0, 0, 0, 0], list(assign_lanes([(0, 10), (0, 5), (1, 2), (5, 10)])))
+
+    def test_overlapping(self):
+        self.assertEqual([0, 1, 0, 0], list(assign_lanes([(0, 4), (2, 6), (4, 5), (6, 7)])))
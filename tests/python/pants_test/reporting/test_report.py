@@ -0,0 +1,170 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import threading
+import unittest
+from io import BytesIO
+
+from pants.base.workunit import WorkUnit
+from pants.reporting.html_reporter import HtmlReporter
+from pants.reporting.report import OverflowPolicy, Report
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import read_file
+
+
+class FakeWorkUnit:
+    def __init__(self, id, output=b""):
+        self.id = id
+        self._outputs = {"stdout": BytesIO(output)}
+
+    def outputs(self):
+        return self._outputs
+
+
+class RecordingReporter:
+    def __init__(self):
+        self.events = []
+        self.threads = set()
+        self.flushes = 0
+        self.closed = False
+
+    def _record(self, *event):
+        self.events.append(event)
+        self.threads.add(threading.current_thread())
+
+    def open(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def flush(self):
+        self.flushes += 1
+
+    def start_workunit(self, workunit):
+        self._record("start", workunit.id)
+
+    def end_workunit(self, workunit):
+        self._record("end", workunit.id)
+
+    def handle_log(self, workunit, level, *msg_elements):
+        self._record("log", workunit.id, msg_elements)
+
+    def handle_output(self, workunit, label, s):
+        self._record("output", workunit.id, label, s)
+
+
+class BlockingReporter(RecordingReporter):
+    """Blocks in its first callback until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocked = threading.Event()
+        self.released = threading.Event()
+
+    def start_workunit(self, workunit):
+        self.blocked.set()
+        self.released.wait()
+        super().start_workunit(workunit)
+
+
+class ReportTest(unittest.TestCase):
+    def report_workunit(self, report, workunit):
+        report.start_workunit(workunit)
+        report.log(workunit, Report.INFO, "hello")
+        report.end_workunit(workunit)
+
+    def test_synchronous(self):
+        report = Report()
+        reporter = RecordingReporter()
+        report.add_reporter("recording", reporter, asynchronous=True)
+        report.open()
+        self.report_workunit(report, FakeWorkUnit("a", b"out"))
+        self.assertEqual({threading.current_thread()}, reporter.threads)
+        report.close()
+
+        self.assertEqual(
+            [
+                ("start", "a"),
+                ("log", "a", ("hello",)),
+                ("output", "a", "stdout", "out"),
+                ("end", "a"),
+            ],
+            reporter.events,
+        )
+        self.assertEqual(4, reporter.flushes)
+        self.assertTrue(reporter.closed)
+
+    def test_asynchronous(self):
+        report = Report(queue_size=16)
+        sync_reporter = RecordingReporter()
+        async_reporter = RecordingReporter()
+        report.add_reporter("sync", sync_reporter)
+        report.add_reporter("async", async_reporter, asynchronous=True)
+        report.open()
+        for i in range(100):
+            self.report_workunit(report, FakeWorkUnit(i))
+        report.close()
+
+        self.assertEqual(300, len(async_reporter.events))
+        self.assertEqual(sync_reporter.events, async_reporter.events)
+        self.assertEqual({threading.current_thread()}, sync_reporter.threads)
+        self.assertEqual(1, len(async_reporter.threads))
+        self.assertNotIn(threading.current_thread(), async_reporter.threads)
+        self.assertTrue(async_reporter.closed)
+
+    def test_remove_asynchronous_reporter(self):
+        report = Report(queue_size=16)
+        reporter = RecordingReporter()
+        report.add_reporter("async", reporter, asynchronous=True)
+        report.open()
+        self.report_workunit(report, FakeWorkUnit("a"))
+        self.assertIs(reporter, report.remove_reporter("async"))
+        self.assertEqual(3, len(reporter.events))
+        report.close()
+
+    def test_drop_output_on_overflow(self):
+        report = Report(queue_size=1, overflow_policy=OverflowPolicy.drop_output)
+        reporter = BlockingReporter()
+        report.add_reporter("async", reporter, asynchronous=True)
+        report.open()
+
+        workunit = FakeWorkUnit("a", b"out")
+        report.start_workunit(workunit)
+        reporter.blocked.wait()
+        # The writer thread is blocked, so this fills the queue, and the output is dropped.
+        report.log(workunit, Report.INFO, "hello")
+        report.flush()
+        reporter.released.set()
+        report.end_workunit(workunit)
+        report.close()
+
+        self.assertEqual([("start", "a"), ("log", "a", ("hello",)), ("end", "a")], reporter.events)
+
+    def test_html_reporter_flushed_while_open(self):
+        for queue_size in (0, 16):
+            with self.subTest(queue_size=queue_size), temporary_dir() as tmpdir:
+                html_dir = os.path.join(tmpdir, "html")
+                os.mkdir(html_dir)
+                settings = HtmlReporter.Settings(
+                    log_level=Report.INFO, html_dir=html_dir, template_dir=None
+                )
+                reporter = HtmlReporter(None, settings)
+                report = Report(queue_size=queue_size)
+                report.add_reporter("html", reporter, asynchronous=True)
+                report.open()
+
+                workunit = WorkUnit(tmpdir, None, "main")
+                workunit.start()
+                report.start_workunit(workunit)
+                report.log(workunit, Report.INFO, "hello")
+                workunit.output("stdout").write(b"out")
+                report.flush()
+                # Wait for the writer thread, if any, to write the events reported so far.
+                self.assertIs(reporter, report.remove_reporter("html"))
+
+                self.assertIn("hello", read_file(reporter.report_path()))
+                self.assertEqual("out", read_file(os.path.join(html_dir, f"{workunit.id}.stdout")))
+                reporter.close()
+                report.close()
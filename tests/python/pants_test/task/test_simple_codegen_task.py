@@ -2,11 +2,13 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import os
+import threading
 from dataclasses import dataclass
 from textwrap import dedent
 from typing import Any
 
 from pants.base.payload import Payload
+from pants.base.exceptions import TaskError
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.register import build_file_aliases as register_core
 from pants.build_graph.target import Target
@@ -365,6 +367,102 @@ class SimpleCodegenTaskTest(TaskTestBase):
         self.assertNotEqual(t1_hash, t2_hash)
 
 
+class ConcurrentDummyGen(DummyGen):
+    """A DummyGen which records the order in which targets are generated, and may fail."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.generated = []
+        self.failing_targets = set()
+        self.prepared_targets = None
+
+    @classmethod
+    def supports_concurrent_codegen(cls):
+        return True
+
+    def prepare_concurrent_codegen(self, targets):
+        assert threading.current_thread() is threading.main_thread()
+        assert not self.generated
+        self.prepared_targets = targets
+
+    def execute_codegen(self, target, target_workdir):
+        if target in self.failing_targets:
+            raise TaskError(f"Failed to generate {target.address.spec}.")
+        super().execute_codegen(target, target_workdir)
+        with self.lock:
+            self.generated.append(target)
+
+
+class ConcurrentSimpleCodegenTaskTest(TaskTestBase):
+    @classmethod
+    def task_type(cls):
+        return ConcurrentDummyGen
+
+    @classmethod
+    def alias_groups(cls):
+        return register_core().merge(BuildFileAliases({"dummy_library": DummyLibrary}))
+
+    def _create_targets(self):
+        self.add_to_build_file(
+            "gen",
+            dedent(
+                """
+                dummy_library(name='base', sources=['base.dummy'])
+                dummy_library(name='a', sources=['a.dummy'], dependencies=[':base'])
+                dummy_library(name='b', sources=['b.dummy'], dependencies=[':base'])
+                dummy_library(name='c', sources=['c.dummy'])
+                """
+            ),
+        )
+        for name in ("base", "a", "b", "c"):
+            self.create_file(f"gen/{name}.dummy", f"org.pantsbuild.example {name.upper()}")
+        return [self.target(f"gen:{name}") for name in ("a", "b", "c")]
+
+    def _create_dummy_task(self, target_roots, **options):
+        self.set_options(worker_count=4, **options)
+        task = self.create_task(self.context(target_roots=target_roots))
+        task.setup_for_testing(self)
+        return task
+
+    def _synthetic_targets(self):
+        return [
+            self.build_graph.get_target(syn_addr)
+            for syn_addr in self.build_graph.synthetic_addresses
+        ]
+
+    def test_dependencies_generated_first(self):
+        task = self._create_dummy_task(target_roots=self._create_targets())
+        task.execute()
+
+        base = self.target("gen:base")
+        self.assertEqual(set(task.generated), set(task.prepared_targets))
+        self.assertEqual(4, len(task.generated))
+        for spec in ("gen:a", "gen:b"):
+            self.assertLess(
+                task.generated.index(base), task.generated.index(self.target(spec)),
+            )
+        self.assertEqual(
+            {"base", "a", "b", "c"},
+            {target.derived_from.address.target_name for target in self._synthetic_targets()},
+        )
+
+    def test_failure(self):
+        task = self._create_dummy_task(target_roots=self._create_targets())
+        task.failing_targets = {self.target("gen:base")}
+        with self.assertRaises(TaskError):
+            task.execute()
+
+        # Nothing which depends on the failed target is generated, and nothing is injected.
+        self.assertEqual([self.target("gen:c")], task.generated)
+        self.assertEqual([], self._synthetic_targets())
+
+        # But the targets which were generated successfully are valid for the next run.
+        task = self._create_dummy_task(target_roots=[self.target("gen:c")])
+        task.execute()
+        self.assertEqual([], task.generated)
+
+
 class ExportingDummyGen(DummyGen):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
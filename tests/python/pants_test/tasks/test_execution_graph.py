@@ -1,19 +1,23 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import json
+import os
 import re
 import unittest
 from collections import defaultdict
 from typing import Dict, List
 
-from pants.backend.jvm.tasks.jvm_compile.execution_graph import (
+from pants.base.execution_graph import (
     ExecutionFailure,
     ExecutionGraph,
     Job,
+    JobDurationHistory,
     JobExistsError,
     NoRootJobError,
     UnknownJobError,
 )
+from pants.util.contextutil import temporary_dir
 
 
 class ImmediatelyExecutingPool:
@@ -342,6 +346,77 @@ class ExecutionGraphTest(unittest.TestCase):
         self.execute(exec_graph)
         self.assertEqual(self.jobs_run, ["A", "D", "B", "C", "E"])
 
+    def test_priorities_from_job_durations(self):
+        # By estimated size, B is on the critical path. By past durations, it is C.
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, [], 1),
+                self.job("B", passing_fn, ["A"], 4),
+                self.job("C", passing_fn, ["A"], 2),
+            ],
+            False,
+            job_durations={"A": 1.0, "B": 1.0, "C": 6.0},
+        )
+        self.assertEqual(exec_graph._job_priority, {"A": 7.0, "B": 1.0, "C": 6.0})
+        self.execute(exec_graph)
+        self.assertEqual(self.jobs_run, ["A", "C", "B"])
+
+    def test_priorities_from_partial_job_durations(self):
+        # A and B take 1.5 seconds per unit of estimated size, so C is estimated at 6 seconds.
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, [], 2),
+                self.job("B", passing_fn, ["A"], 2),
+                self.job("C", passing_fn, ["A"], 4),
+            ],
+            False,
+            job_durations={"A": 1.0, "B": 5.0, "Unscheduled": 100.0},
+        )
+        self.assertEqual(exec_graph._job_priority, {"A": 7.0, "B": 5.0, "C": 6.0})
+
+    def test_priorities_without_relevant_job_durations(self):
+        exec_graph = ExecutionGraph(
+            [self.job("A", passing_fn, [], 4), self.job("B", passing_fn, ["A"], 2)],
+            False,
+            job_durations={"Unscheduled": 100.0},
+        )
+        self.assertEqual(exec_graph._job_priority, {"A": 6, "B": 2})
+
+    def test_successful_job_durations(self):
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, []),
+                self.job("B", raising_fn, ["A"]),
+                self.job("C", passing_fn, ["B"]),
+            ],
+            False,
+        )
+        with self.assertRaises(ExecutionFailure):
+            self.execute(exec_graph)
+        self.assertEqual(["A"], list(exec_graph.successful_job_durations()))
+
+    def test_job_duration_history(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "job_durations.json")
+            history = JobDurationHistory(path)
+            self.assertEqual({}, history.durations)
+
+            history.record({"A": 2.0, "B": 4.0})
+            history.record({"A": 4.0})
+            history.save()
+            self.assertEqual({"A": 3.0, "B": 4.0}, JobDurationHistory(path).durations)
+
+    def test_job_duration_history_unreadable(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "job_durations.json")
+            with open(path, "w") as fp:
+                fp.write("{not json")
+            self.assertEqual({}, JobDurationHistory(path).durations)
+
+            with open(path, "w") as fp:
+                json.dump({"A": 1, "B": "slow"}, fp)
+            self.assertEqual({"A": 1.0}, JobDurationHistory(path).durations)
+
     def test_jobs_not_canceled_multiple_times(self):
         failures = list()
 
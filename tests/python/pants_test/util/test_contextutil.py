@@ -7,11 +7,13 @@ import shutil
 import signal
 import subprocess
 import sys
+import threading
 import unittest
 import unittest.mock
 import uuid
 import zipfile
 from contextlib import contextmanager
+from io import StringIO
 from typing import Iterator
 
 from pants.util.contextutil import (
@@ -27,6 +29,8 @@ from pants.util.contextutil import (
     stdio_as,
     temporary_dir,
     temporary_file,
+    thread_bound_stream,
+    thread_local_stdio_as,
 )
 
 PATCH_OPTS = dict(autospec=True, spec_set=True)
@@ -317,6 +321,67 @@ class ContextutilTest(unittest.TestCase):
                 print("garbage", file=sys.stdout)
                 print("garbage", file=sys.stderr)
 
+    def test_thread_local_stdio_as(self) -> None:
+        default_stdout, default_stderr = StringIO(), StringIO()
+        with unittest.mock.patch.multiple(
+            sys, stdout=default_stdout, stderr=default_stderr, stdin=StringIO()
+        ):
+            with temporary_file(binary_mode=False) as stdout, temporary_file(
+                binary_mode=False
+            ) as stderr, open(os.devnull) as stdin:
+                with thread_local_stdio_as(
+                    stdout_fd=stdout.fileno(), stderr_fd=stderr.fileno(), stdin_fd=stdin.fileno()
+                ):
+                    print("redirected out", file=sys.stdout)
+                    print("redirected err", file=sys.stderr)
+                    bound_stdout = thread_bound_stream(sys.stdout)
+                    self.assertIsNot(bound_stdout, default_stdout)
+
+                    def write_from_other_thread():
+                        print("not redirected", file=sys.stdout)
+                        bound_stdout.write("bound\n")
+                        bound_stdout.flush()
+
+                    thread = threading.Thread(target=write_from_other_thread)
+                    thread.start()
+                    thread.join()
+
+                # The file descriptors are left open, and the original streams are restored.
+                self.assertIs(default_stdout, sys.stdout)
+                self.assertIs(default_stderr, sys.stderr)
+                print("restored", file=sys.stdout)
+                stdout.seek(0)
+                stderr.seek(0)
+                self.assertEqual("redirected out\nbound\n", stdout.read())
+                self.assertEqual("redirected err\n", stderr.read())
+        self.assertEqual("not redirected\nrestored\n", default_stdout.getvalue())
+
+    def test_thread_local_stdio_as_overlapping(self) -> None:
+        default_stdout = StringIO()
+        with unittest.mock.patch.multiple(
+            sys, stdout=default_stdout, stderr=StringIO(), stdin=StringIO()
+        ):
+            first_bound = threading.Event()
+            first_may_exit = threading.Event()
+
+            def redirect_in_other_thread():
+                with open(os.devnull, "w") as devnull:
+                    with thread_local_stdio_as(devnull.fileno(), devnull.fileno(), 0):
+                        first_bound.set()
+                        first_may_exit.wait()
+
+            thread = threading.Thread(target=redirect_in_other_thread)
+            thread.start()
+            first_bound.wait()
+            with open(os.devnull, "w") as devnull:
+                with thread_local_stdio_as(devnull.fileno(), devnull.fileno(), 0):
+                    pass
+            # The other thread still has its streams bound.
+            self.assertIsNot(default_stdout, sys.stdout)
+            first_may_exit.set()
+            thread.join()
+            self.assertIs(default_stdout, sys.stdout)
+
     def test_signal_handler_as(self) -> None:
         mock_initial_handler = 1
         mock_new_handler = 2